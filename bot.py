@@ -31,6 +31,31 @@ import okama as ok
 
 # Import OKAMA service for robust API handling
 from services.okama_service import okama_service
+from services.okama_cache import okama_cache
+from services.executors import run_data, run_render, get_executor_stats
+from services.chart_render_pool import ChartSpec, chart_render_pool
+from services.chart_cache import chart_cache, make_chart_key
+from services.telegram_file_cache import telegram_file_cache
+from services.cached_data_service import cached_data_service
+from services.timeseries_store import timeseries_store
+from services.http_client import http_client
+from services.health_monitor import HEALTH_CHECK_INTERVAL, health_monitor
+from services.metrics_engine import compute_metrics, returns_from_prices, trailing
+from services.risk_free_rate import (
+    DEFAULT_FALLBACK_RATE, FALLBACK_RATES, RISK_FREE_RATE_REFRESH_INTERVAL, risk_free_rate_service
+)
+from services.period_metrics import AssetSnapshot, period_metrics_cache
+from services.monte_carlo import (
+    DEFAULT_PERCENTILES, MONTE_CARLO_PATHS, MONTE_CARLO_PLOT_PATHS, MONTE_CARLO_SEED, simulate_wealth
+)
+from services.simulation_cache import make_simulation_key, simulation_cache
+from services.efficient_frontier import frontier_cache
+from services.correlation import correlation_service
+from services.portfolio_series import portfolio_series
+from services.search_cache import okama_search, search_cache
+from services.symbol_catalog import SYMBOL_CATALOG_FETCH_TIMEOUT, SYMBOL_CATALOG_REFRESH_INTERVAL, symbol_catalog
+from services.search_embedded import get_default_index
+from services.instrumentation import PHASE_COMPUTE, create_telegram_request, instrumentation, phase
 
 # Optional Excel support
 try:
@@ -75,7 +100,7 @@ if sys.version_info < (3, 7):
 # Local imports
 from config import Config
 from services.yandexgpt_service import YandexGPTService
-from services.tushare_service import TushareService
+from services.tushare_service import TUSHARE_LISTING_REFRESH_INTERVAL, TushareService
 from services.gemini_service import GeminiService
 from services.examples_service import ExamplesService
 from services.support_service import SupportService
@@ -144,6 +169,18 @@ class ShansAi:
             self.gemini_service = None
             self.logger.warning(f"Gemini service not initialized: {e}")
             
+        # Register background health probes for external services
+        health_monitor.register('okama', okama_service.probe)
+        if self.tushare_service:
+            health_monitor.register('tushare', self.tushare_service.probe)
+        if self.yandexgpt_service.is_available():
+            health_monitor.register('yandexgpt', self.yandexgpt_service.probe)
+        if self.gemini_service and self.gemini_service.is_available():
+            health_monitor.register('gemini', self.gemini_service.probe)
+            
+        # Load prebuilt fuzzy search index once instead of on the first query
+        get_default_index()
+            
         # Initialize Botality analytics service
         initialize_botality_service(Config.BOTALITY_TOKEN)
         
@@ -201,6 +238,10 @@ class ShansAi:
         """
         Get appropriate risk-free rate for given currency using okama rates
         
+        Rates are memoized per (currency, period bucket) by the risk-free rate
+        service; okama rate series are downloaded by a background job, so this
+        call never waits for the network.
+        
         Args:
             currency: Currency code (USD, EUR, RUB, etc.)
             period_years: Investment period in years (for selecting appropriate rate)
@@ -209,158 +250,10 @@ class ShansAi:
             Risk-free rate as decimal (e.g., 0.05 for 5%)
         """
         try:
-            # Special handling for HKD - fixed rate (as requested)
-            if currency.upper() == 'HKD':
-                fixed_rate = 0.0285  # 2.85% fixed rate for Hong Kong Dollar
-                self.logger.info(f"Using fixed risk-free rate for HKD: {fixed_rate:.4f}")
-                return fixed_rate
-            
-            # Special handling for RUB - use more realistic rates based on current OFZ yields
-            # Skip okama API for RUB as it returns unrealistic values (33%+)
-            if currency.upper() == 'RUB':
-                if period_years is not None:
-                    if period_years <= 0.25:  # 3 months or less
-                        fixed_rate = 0.08  # 8% - OFZ 3M approximation
-                    elif period_years <= 0.5:  # 6 months or less
-                        fixed_rate = 0.085  # 8.5% - OFZ 6M approximation
-                    elif period_years <= 1.0:  # 1 year or less
-                        fixed_rate = 0.09  # 9% - OFZ 1Y approximation
-                    elif period_years <= 3.0:  # 3 years or less
-                        fixed_rate = 0.095  # 9.5% - OFZ 3Y approximation
-                    elif period_years <= 5.0:  # 5 years or less
-                        fixed_rate = 0.10  # 10% - OFZ 5Y approximation
-                    else:  # More than 5 years
-                        fixed_rate = 0.105  # 10.5% - OFZ 10Y approximation
-                else:
-                    fixed_rate = 0.09  # 9% - default OFZ 1Y rate
-                
-                self.logger.info(f"Using OFZ-based risk-free rate for RUB ({period_years} years): {fixed_rate:.4f}")
-                return fixed_rate
-            
-            # Try to get rate from okama.Rate for other currencies
-            try:
-                rate_data = self._get_okama_rate_data(currency, period_years)
-                if rate_data is not None:
-                    self.logger.info(f"Using okama rate for {currency}: {rate_data:.4f}")
-                    return rate_data
-            except Exception as e:
-                self.logger.warning(f"Could not get okama rate for {currency}: {e}")
-            
-            # Special handling for CNY - period-dependent rates
-            if currency.upper() == 'CNY':
-                if period_years is not None and period_years > 5:
-                    fixed_rate = 0.04  # 4% - 5-year rate approximation
-                else:
-                    fixed_rate = 0.035  # 3.5% - 1-year rate approximation
-                
-                self.logger.info(f"Using period-based risk-free rate for CNY ({period_years} years): {fixed_rate:.4f}")
-                return fixed_rate
-            
-            # For all other currencies, use fallback rates directly
-            # This avoids okama API calls that fail due to RATE namespace not being supported
-            self.logger.info(f"Using fallback risk-free rate for {currency} (okama RATE namespace not supported)")
-            
+            return risk_free_rate_service.get_rate(currency, period_years)
         except Exception as e:
             self.logger.warning(f"Error in risk-free rate calculation for {currency}: {e}")
-        
-        # Fallback rates if okama data is not available
-        fallback_rates = {
-            'USD': 0.05,  # 5% - current Fed funds rate
-            'EUR': 0.04,  # 4% - current ECB rate
-            'GBP': 0.05,  # 5% - current BoE rate
-            'RUB': 0.10,  # 10% - OFZ 5Y rate (updated to realistic current rate)
-            'CNY': 0.035, # 3.5% - current LPR rate
-            'JPY': 0.05,  # 5% - use US rate as proxy
-            'CHF': 0.04,  # 4% - use EU rate as proxy
-            'CAD': 0.05,  # 5% - use US rate as proxy
-            'AUD': 0.05,  # 5% - use US rate as proxy
-            'ILS': 0.045, # 4.5% - current BoI rate
-            'HKD': 0.0285, # 2.85% - Hong Kong Dollar fixed rate (not supported by okama)
-        }
-        
-        fallback_rate = fallback_rates.get(currency.upper(), 0.05)  # Default to 5%
-        self.logger.info(f"Using fallback risk-free rate for {currency}: {fallback_rate:.4f}")
-        return fallback_rate
-
-    def _get_okama_rate_data(self, currency: str, period_years: float = None) -> float:
-        """
-        Get risk-free rate from okama.Rate for given currency and period
-        
-        Args:
-            currency: Currency code
-            period_years: Investment period in years
-            
-        Returns:
-            Risk-free rate as decimal
-        """
-        try:
-            # Map currencies to appropriate okama rate symbols
-            rate_symbols = self._get_rate_symbol_for_currency(currency, period_years)
-            
-            if not rate_symbols:
-                return None
-            
-            # Try to get rate data from okama
-            for rate_symbol in rate_symbols:
-                try:
-                    rate_obj = ok.Rate(rate_symbol)
-                    rate_values = rate_obj.values_monthly
-                    
-                    if rate_values is not None and len(rate_values) > 0:
-                        # Calculate average rate over the period
-                        avg_rate = rate_values.mean()
-                        return float(avg_rate)
-                        
-                except Exception as e:
-                    self.logger.debug(f"Could not get rate for {rate_symbol}: {e}")
-                    continue
-            
-            return None
-            
-        except Exception as e:
-            self.logger.warning(f"Error getting okama rate data: {e}")
-            return None
-
-    def _get_rate_symbol_for_currency(self, currency: str, period_years: float = None) -> list:
-        """
-        Get appropriate rate symbols for currency and period
-        
-        Args:
-            currency: Currency code
-            period_years: Investment period in years
-            
-        Returns:
-            List of rate symbols to try
-        """
-        currency_upper = currency.upper()
-        
-        if currency_upper == 'USD':
-            return ['US_EFFR.RATE']
-        elif currency_upper == 'EUR':
-            return ['EU_DFR.RATE', 'EU_MLR.RATE', 'EU_MRO.RATE']
-        elif currency_upper == 'RUB':
-            if period_years is not None:
-                if period_years <= 0.25:  # 3 months or less
-                    return ['RUONIA.RATE', 'RUONIA_AVG_1M.RATE']
-                elif period_years <= 0.5:  # 6 months or less
-                    return ['RUONIA_AVG_3M.RATE', 'RUONIA_AVG_1M.RATE']
-                elif period_years <= 1.0:  # 1 year or less
-                    return ['RUONIA_AVG_6M.RATE', 'RUONIA_AVG_3M.RATE']
-                else:  # More than 1 year
-                    return ['RUS_CBR.RATE', 'RUONIA_AVG_6M.RATE']
-            else:
-                return ['RUS_CBR.RATE', 'RUONIA_AVG_6M.RATE']
-        elif currency_upper == 'CNY':
-            if period_years is not None and period_years > 5:
-                return ['CHN_LPR5.RATE']
-            else:
-                return ['CHN_LPR1.RATE']
-        elif currency_upper == 'GBP':
-            return ['UK_BR.RATE']
-        elif currency_upper == 'ILS':
-            return ['ISR_IR.RATE']
-        else:
-            return []
+            return FALLBACK_RATES.get(str(currency).upper(), DEFAULT_FALLBACK_RATE)
 
     def calculate_sharpe_ratio(self, returns: Union[float, pd.Series], volatility: float, 
                               currency: str = 'USD', period_years: float = None, 
@@ -811,10 +704,14 @@ class ShansAi:
                     return {'symbol': upper, 'type': 'ticker', 'source': 'input'}
 
             if self._looks_like_isin(upper):
+                # Local catalog first (no network call)
+                catalog_row = symbol_catalog.find_isin(upper)
+                if catalog_row:
+                    return {'symbol': catalog_row['symbol'], 'type': 'isin', 'source': 'catalog'}
+
                 # For ISIN, search for the corresponding symbol
                 try:
-                    import okama as ok
-                    search_result = ok.search(upper)
+                    search_result = okama_search(upper)
                     if len(search_result) > 0:
                         # Found the asset, use the first result
                         symbol = search_result.iloc[0]['symbol']
@@ -826,10 +723,20 @@ class ShansAi:
                     # Search failed, return error
                     return {'error': f'Ошибка поиска ISIN {upper}: {str(e)}'}
 
+            # Plain ticker listed in the local catalog (no network call)
+            if self._looks_like_ticker(raw):
+                catalog_row = symbol_catalog.find_ticker(upper)
+                if catalog_row:
+                    return {
+                        'symbol': catalog_row['symbol'],
+                        'type': 'ticker',
+                        'source': 'catalog',
+                        'name': catalog_row['name']
+                    }
+
             # Try to search for company name or plain ticker
             try:
-                import okama as ok
-                search_result = ok.search(raw)  # Use original case for better search
+                search_result = okama_search(raw)
                 if len(search_result) > 0:
                     # Found the asset, select the best result
                     symbol = self._select_best_search_result(search_result, raw)
@@ -1026,7 +933,7 @@ class ShansAi:
                 if '.' in symbol and symbol.split('.')[-1] == exchange:
                     # Verify the symbol is actually supported by okama
                     try:
-                        ok.Asset(symbol)
+                        okama_cache.asset(symbol)
                         return symbol
                     except Exception:
                         continue  # Skip this symbol if it's not supported
@@ -1034,7 +941,7 @@ class ShansAi:
         # If no allowed exchange found, try the first result
         first_symbol = search_result.iloc[0]['symbol']
         try:
-            ok.Asset(first_symbol)
+            okama_cache.asset(first_symbol)
             return first_symbol
         except Exception:
             # If even the first result fails, return it anyway (will be handled by caller)
@@ -1278,12 +1185,12 @@ class ShansAi:
             years = int(current_period[:-1])
             end_date = datetime.now()
             start_date = end_date - timedelta(days=years * 365)
-            portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency,
+            portfolio = okama_cache.portfolio(symbols, weights=weights, ccy=currency,
                                    first_date=start_date.strftime('%Y-%m-%d'), 
                                    last_date=end_date.strftime('%Y-%m-%d'))
             self.logger.info(f"Created portfolio with period {current_period}")
         else:
-            portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+            portfolio = okama_cache.portfolio(symbols, weights=weights, ccy=currency)
             self.logger.info("Created portfolio without period (MAX)")
         
         return portfolio
@@ -1304,12 +1211,12 @@ class ShansAi:
                     from datetime import timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=years * 365)
-                    portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency,
+                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency,
                                            first_date=start_date.strftime('%Y-%m-%d'), 
                                            last_date=end_date.strftime('%Y-%m-%d'))
                     self.logger.info(f"Created portfolio with period {specified_period}")
                 else:
-                    portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency)
                     self.logger.info(f"Created portfolio with maximum available period")
                 
                 # Create portfolio information text
@@ -1744,9 +1651,9 @@ class ShansAi:
             for symbol in symbols:
                 if self._is_chinese_symbol(symbol):
                     try:
-                        symbol_info = self.tushare_service.get_symbol_info(symbol)
+                        symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
                         # Получаем месячные данные для лучшего отображения
-                        historical_data = self.tushare_service.get_monthly_data(symbol, start_date='19900101')
+                        historical_data = await run_data(self.tushare_service.get_monthly_data, symbol, start_date='19900101')
                         
                         if not historical_data.empty:
                             # Устанавливаем дату как индекс
@@ -1774,7 +1681,7 @@ class ShansAi:
                 try:
                     import okama as ok
                     self.logger.info(f"Creating okama Asset for {inflation_ticker}")
-                    inflation_asset = ok.Asset(inflation_ticker)
+                    inflation_asset = await okama_service.run_with_retry(okama_cache.asset, inflation_ticker)
                     self.logger.info(f"Got inflation asset, wealth_index type: {type(inflation_asset.wealth_index)}")
                     # Получаем месячные данные инфляции для соответствия основным данным
                     inflation_data = inflation_asset.wealth_index.resample('M').last()
@@ -1837,26 +1744,18 @@ class ShansAi:
             title = ", ".join(title_parts)
             
             # Используем единый метод создания графика сравнения
-            fig, ax = self.chart_styles.create_unified_wealth_chart(
-                data=comparison_df,
-                symbols=list(comparison_data.keys()),
-                currency=currency,
+            img_bytes = await self._render_chart_bytes(
+                'create_unified_wealth_chart',
+                comparison_df,
+                list(comparison_data.keys()),
+                currency,
                 data_source='tushare',
                 title=title,
                 xlabel='',  # Скрываем подпись оси X
-                ylabel=''   # Скрываем подпись оси Y
+                ylabel='',  # Скрываем подпись оси Y
+                save_kwargs={'dpi': 300}
             )
             
-            # Сохраняем график в bytes
-            img_buffer = io.BytesIO()
-            fig.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Очищаем matplotlib
-            import matplotlib.pyplot as plt
-            plt.close(fig)
-            
             # Создаем caption
             caption = f"📈 Сравнение: {', '.join(symbols)}\n\n"
             caption += f"💱 Валюта: {currency} ({currency_info})\n"
@@ -2087,6 +1986,63 @@ class ShansAi:
             self.logger.error(f"Error in vertical describe table formatting: {e}")
             return "📊 Ошибка при формировании таблицы статистики"
 
+    async def _render_chart_bytes(self, method: str, *args, cache_key: tuple = None, save_kwargs: dict = None,
+                                  **kwargs) -> bytes:
+        """Render ChartStyles method in the chart render pool and return PNG bytes"""
+        if cache_key is not None:
+            cached = chart_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        spec = ChartSpec(method=method, args=args, kwargs=kwargs, save_kwargs=save_kwargs or {})
+        img_bytes = await chart_render_pool.render(spec)
+        
+        if cache_key is not None:
+            chart_cache.set(cache_key, img_bytes)
+        return img_bytes
+
+    async def _render_asset_chart_cached(self, chart_type: str, symbol: str, period: str, series_kind: str,
+                                         draw_chart) -> Optional[bytes]:
+        """
+        Render single asset chart, reusing cached PNG for unchanged data
+        
+        Asset info and the price series are fetched in the data pool; only
+        draw_chart(asset_info, series) runs in the render pool.
+        """
+        asset_info = await run_data(okama_service.get_asset_info, symbol)
+        cache_key = make_chart_key(
+            chart_type, symbol,
+            currency=asset_info.get('currency'),
+            period=period,
+            last_date=asset_info.get('last_date') or None
+        )
+        
+        chart_bytes = chart_cache.get(cache_key)
+        if chart_bytes is not None:
+            self.logger.info(f"Using cached {chart_type} chart for {symbol} ({period})")
+            return chart_bytes
+        
+        series = await run_data(okama_service.get_asset_series, symbol, series_kind)
+        chart_bytes = await run_render(draw_chart, asset_info, series, timeout=30.0)
+        if chart_bytes:
+            chart_cache.set(cache_key, chart_bytes)
+        return chart_bytes
+
+    async def _send_photo_with_file_id_reuse(self, send_photo, photo_bytes: bytes):
+        """Send chart via send_photo(photo), reusing Telegram file_id if identical chart was uploaded before"""
+        file_id = telegram_file_cache.get(photo_bytes)
+        if file_id:
+            try:
+                return await send_photo(file_id)
+            except Exception as e:
+                # file_id may be rejected (e.g. after bot token change) - upload bytes instead
+                self.logger.warning(f"Cached file_id was rejected, uploading chart again: {e}")
+                telegram_file_cache.forget(photo_bytes)
+        
+        message = await send_photo(io.BytesIO(photo_bytes))
+        telegram_file_cache.remember(photo_bytes, message)
+        return message
+
     async def _send_photo_safe(self, update: Update, photo_bytes: bytes, caption: str = None, reply_markup=None, context: ContextTypes.DEFAULT_TYPE = None, parse_mode: str = 'Markdown'):
         """Безопасная отправка фотографии с обработкой ошибок"""
         try:
@@ -2114,12 +2070,15 @@ class ShansAi:
                 processed_caption = self._safe_markdown(caption)
             
             # Отправляем фотографию с обработанным caption
-            await bot.send_photo(
-                chat_id=update.effective_chat.id,
-                photo=io.BytesIO(photo_bytes),
-                caption=processed_caption,
-                parse_mode=parse_mode,
-                reply_markup=reply_markup
+            await self._send_photo_with_file_id_reuse(
+                lambda photo: bot.send_photo(
+                    chat_id=update.effective_chat.id,
+                    photo=photo,
+                    caption=processed_caption,
+                    parse_mode=parse_mode,
+                    reply_markup=reply_markup
+                ),
+                photo_bytes
             )
             
         except Exception as e:
@@ -2333,6 +2292,10 @@ class ShansAi:
     def _get_efficient_frontier_portfolio_data(self, ef, asset_names):
         """Получить данные портфелей для эффективной границы"""
         try:
+            if hasattr(ef, 'portfolio_data'):
+                # Портфели уже рассчитаны вместе с границей (services.efficient_frontier)
+                return ef.portfolio_data()
+            
             portfolio_data = {}
             
             # GMV портфель (минимальный риск)
@@ -2404,24 +2367,21 @@ class ShansAi:
             self.logger.error(f"Error formatting portfolio weights: {e}")
             return "Ошибка форматирования"
     
-    def _format_correlation_values(self, correlation_matrix: pd.DataFrame) -> str:
-        """Форматировать численные значения корреляции для отображения под матрицей"""
+    def _format_correlation_values(self, correlation) -> str:
+        """Форматировать численные значения корреляции для отображения под матрицей
+        
+        Args:
+            correlation: CorrelationResult из correlation_service
+        """
         try:
-            if correlation_matrix is None or correlation_matrix.empty:
+            if correlation is None:
                 return ""
             
-            values_text = ""
-            
-            # Get upper triangle values only (avoid duplicates)
-            symbols = correlation_matrix.columns.tolist()
-            
-            for i, symbol1 in enumerate(symbols):
-                for j, symbol2 in enumerate(symbols):
-                    if i < j:  # Only upper triangle
-                        corr_value = correlation_matrix.iloc[i, j]
-                        values_text += f"• {symbol1} ↔ {symbol2}: {corr_value:.3f}\n"
-            
-            return values_text
+            # Upper triangle pairs only (avoid duplicates)
+            return "".join(
+                f"• {symbol1} ↔ {symbol2}: {corr_value:.3f}\n"
+                for symbol1, symbol2, corr_value in correlation.pairs()
+            )
             
         except Exception as e:
             self.logger.error(f"Error formatting correlation values: {e}")
@@ -2448,25 +2408,20 @@ class ShansAi:
     async def _create_drawdowns_chart(self, update: Update, context: ContextTypes.DEFAULT_TYPE, asset_list, symbols: list, currency: str):
         """Создать график drawdowns"""
         try:
-            # Check if drawdowns data is available
-            if not hasattr(asset_list, 'drawdowns') or asset_list.drawdowns.empty:
+            # Check if drawdowns data is available (computed once per cached AssetList)
+            drawdowns = None
+            if hasattr(asset_list, 'drawdowns'):
+                series = portfolio_series.get(asset_list)
+                drawdowns = await run_data(lambda: series.drawdowns)
+            if drawdowns is None or drawdowns.empty:
                 await self._send_message_safe(update, "ℹ️ Данные о drawdowns недоступны для выбранных активов")
                 return
             
             # Create drawdowns chart using chart_styles
-            fig, ax = chart_styles.create_drawdowns_chart(
-                asset_list.drawdowns, symbols, currency, data_source='okama'
+            img_bytes = await self._render_chart_bytes(
+                'create_drawdowns_chart', drawdowns, symbols, currency, data_source='okama'
             )
             
-            # Save chart to bytes with memory optimization
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(fig)
-            
             # Send drawdowns chart without keyboard
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id, 
@@ -2481,25 +2436,23 @@ class ShansAi:
     async def _create_dividend_yield_chart(self, update: Update, context: ContextTypes.DEFAULT_TYPE, asset_list, symbols: list, currency: str):
         """Создать график dividend yield"""
         try:
-            # Check if dividend yield data is available
-            if not hasattr(asset_list, 'dividend_yield') or asset_list.dividend_yield.empty:
+            # Check if dividend yield data is available (computed once per cached AssetList)
+            series = portfolio_series.get(asset_list)
+            dividend_yield_data = await run_data(lambda: series.dividend_yield)
+            if dividend_yield_data is None or dividend_yield_data.empty:
                 await self._send_message_safe(update, "📊 По данным биржи, у выбранных активов нет дивидендной истории.")
                 return
             
             # Create dividend yield chart using chart_styles
-            fig, ax = chart_styles.create_dividend_yield_chart(
-                asset_list.dividend_yield, symbols, data_source='okama'
+            img_bytes = await self._render_chart_bytes(
+                'create_dividend_yield_chart', dividend_yield_data, symbols, data_source='okama',
+                cache_key=make_chart_key(
+                    'dividend_yield', symbols, currency=currency,
+                    period=str(dividend_yield_data.index[0])[:10],
+                    last_date=dividend_yield_data.index[-1]
+                )
             )
             
-            # Save chart to bytes with memory optimization
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(fig)
-            
             # Send dividend yield chart without keyboard
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id, 
@@ -2532,8 +2485,9 @@ class ShansAi:
                 await self._send_message_safe(update, "ℹ️ Данные о доходности активов недоступны для создания корреляционной матрицы")
                 return
             
-            # Get correlation matrix
-            correlation_matrix = asset_list.assets_ror.corr()
+            # Get correlation matrix (shared with AI analysis and Excel export)
+            correlation = await run_data(lambda: correlation_service.get_or_compute(asset_list.assets_ror, currency))
+            correlation_matrix = await run_data(correlation.matrix)
             
             self.logger.info(f"Correlation matrix created successfully, shape: {correlation_matrix.shape}")
             
@@ -2543,21 +2497,13 @@ class ShansAi:
                 return
             
             # Create correlation matrix visualization using chart_styles
-            fig, ax = chart_styles.create_correlation_matrix_chart(
+            img_bytes = await self._render_chart_bytes(
+                'create_correlation_matrix_chart',
                 correlation_matrix, data_source='okama'
             )
             
-            # Save chart to bytes with memory optimization
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(fig)
-            
             # Prepare correlation values text for caption
-            correlation_values_text = self._format_correlation_values(correlation_matrix)
+            correlation_values_text = self._format_correlation_values(correlation)
             
             # Send correlation matrix without keyboard
             self.logger.info("Sending correlation matrix image...")
@@ -2568,8 +2514,6 @@ class ShansAi:
             )
             self.logger.info("Correlation matrix image sent successfully")
             
-            plt.close(fig)
-            
         except Exception as e:
             self.logger.error(f"Error creating correlation matrix: {e}")
             # Check if this is an FX-related error
@@ -2677,9 +2621,10 @@ class ShansAi:
             
             # OKAMA API status
             if api_status['available']:
-                response_time = api_status.get('response_time', 0)
+                response_time = api_status.get('response_time')
                 status_message += f"✅ *OKAMA API*: Доступен\n"
-                status_message += f"⏱️ Время отклика: {response_time:.2f} сек\n"
+                if response_time is not None:
+                    status_message += f"⏱️ Время отклика: {response_time:.2f} сек\n"
             else:
                 status_message += f"❌ *OKAMA API*: Недоступен\n"
                 if api_status.get('error'):
@@ -2704,14 +2649,17 @@ class ShansAi:
             
             # Tushare service
             if hasattr(self, 'tushare_service') and self.tushare_service:
-                status_message += f"✅ Tushare (китайские акции): Доступен\n"
+                if health_monitor.is_available('tushare'):
+                    status_message += f"✅ Tushare (китайские акции): Доступен\n"
+                else:
+                    status_message += f"❌ Tushare (китайские акции): Недоступен\n"
             else:
                 status_message += f"❌ Tushare: Не настроен\n"
             
             # Gemini service
             if hasattr(self, 'gemini_service') and self.gemini_service:
                 gemini_status = self.gemini_service.get_service_status()
-                if gemini_status.get('available'):
+                if gemini_status.get('available') and health_monitor.is_available('gemini'):
                     status_message += f"✅ Gemini AI: Доступен\n"
                 else:
                     status_message += f"❌ Gemini AI: Недоступен\n"
@@ -2720,7 +2668,10 @@ class ShansAi:
             
             # YandexGPT service
             if hasattr(self, 'yandexgpt_service') and self.yandexgpt_service:
-                status_message += f"✅ YandexGPT: Доступен\n"
+                if health_monitor.is_available('yandexgpt'):
+                    status_message += f"✅ YandexGPT: Доступен\n"
+                else:
+                    status_message += f"❌ YandexGPT: Недоступен\n"
             else:
                 status_message += f"❌ YandexGPT: Не настроен\n"
             
@@ -2816,12 +2767,12 @@ class ShansAi:
                     await self._send_message_safe(update, error_msg)
                 return
             
-            # Get symbols from Tushare
+            # Get symbols from the cached Tushare listing
             try:
-                symbols_data = self.tushare_service.get_exchange_symbols(namespace)
-                total_count = self.tushare_service.get_exchange_symbols_count(namespace)
+                listing = await run_data(self.tushare_service.get_exchange_listing, namespace)
+                total_count = len(listing)
                 
-                if not symbols_data:
+                if total_count == 0:
                     error_msg = f"❌ Символы для биржи '{namespace}' не найдены"
                     if is_callback:
                         await context.bot.send_message(
@@ -2857,14 +2808,14 @@ class ShansAi:
             
             # Calculate start and end indices for current page
             start_idx = current_page * symbols_per_page
-            end_idx = min(start_idx + symbols_per_page, len(symbols_data))
+            end_idx = min(start_idx + symbols_per_page, total_count)
             
             response = f"📊 **{exchange_names.get(namespace, namespace)}**\n\n"
             response += f"📈 Всего: {total_count:,}\n"
             response += f"📄 Страница {current_page + 1} из {total_pages}\n\n"
             
             # Get symbols for current page
-            page_symbols = symbols_data[start_idx:end_idx]
+            page_symbols = listing.iloc[start_idx:end_idx].to_dict('records')
             
             # Create bullet list format
             symbol_list = []
@@ -2973,6 +2924,13 @@ class ShansAi:
             else:
                 await self._send_message_safe(update, error_msg)
     
+    async def _get_namespace_listing(self, namespace: str):
+        """Listing of an okama namespace from the symbol catalog (downloaded only if not loaded yet)"""
+        listing = symbol_catalog.get_loaded(namespace)
+        if listing is None:
+            listing = await run_data(symbol_catalog.load_namespace, namespace)
+        return listing
+
     async def _show_namespace_symbols(self, update: Update, context: ContextTypes.DEFAULT_TYPE, namespace: str, is_callback: bool = False, page: int = 0):
         """Единый метод для показа символов в пространстве имен с навигацией"""
         try:
@@ -2982,9 +2940,9 @@ class ShansAi:
                 await self._show_tushare_namespace_symbols(update, context, namespace, is_callback, page)
                 return
             
-            symbols_df = ok.symbols_in_namespace(namespace)
+            listing = await self._get_namespace_listing(namespace)
             
-            if symbols_df.empty:
+            if len(listing) == 0:
                 error_msg = f"❌ Пространство имен '{namespace}' не найдено или пусто"
                 if is_callback:
                     # Для callback сообщений отправляем через context.bot
@@ -2997,7 +2955,7 @@ class ShansAi:
                 return
             
             # Show statistics first
-            total_symbols = len(symbols_df)
+            total_symbols = len(listing)
             symbols_per_page = 20  # Показываем по 20 символов на страницу
             
             # Calculate pagination
@@ -3014,14 +2972,14 @@ class ShansAi:
             response += f"📄 Страница {current_page + 1} из {total_pages}\n\n"
             
             # Get symbols for current page
-            page_symbols = symbols_df.iloc[start_idx:end_idx]
+            page_symbols = listing.page(current_page, symbols_per_page)
             
             # Create bullet list format
             symbol_list = []
             
-            for _, row in page_symbols.iterrows():
-                symbol = row['symbol'] if pd.notna(row['symbol']) else 'N/A'
-                name = row['name'] if pd.notna(row['name']) else 'N/A'
+            for row in page_symbols:
+                symbol = row['symbol']
+                name = row['name']
                 
                 # Simple escaping for list display - only escape characters that interfere with bold formatting
                 escaped_name = name.replace('*', '\\*')
@@ -3079,9 +3037,9 @@ class ShansAi:
     async def _show_namespace_symbols_with_reply_keyboard(self, update: Update, context: ContextTypes.DEFAULT_TYPE, namespace: str, page: int = 0):
         """Show namespace symbols with reply keyboard - for namespace button clicks"""
         try:
-            symbols_df = ok.symbols_in_namespace(namespace)
+            listing = await self._get_namespace_listing(namespace)
             
-            if symbols_df.empty:
+            if len(listing) == 0:
                 error_msg = f"❌ Пространство имен '{namespace}' не найдено или пусто"
                 await context.bot.send_message(
                     chat_id=update.callback_query.message.chat_id,
@@ -3090,7 +3048,7 @@ class ShansAi:
                 return
             
             # Show statistics first
-            total_symbols = len(symbols_df)
+            total_symbols = len(listing)
             symbols_per_page = 20  # Показываем по 20 символов на страницу
             
             # Calculate pagination
@@ -3107,14 +3065,14 @@ class ShansAi:
             response += f"📄 Страница {current_page + 1} из {total_pages}\n\n"
             
             # Get symbols for current page
-            page_symbols = symbols_df.iloc[start_idx:end_idx]
+            page_symbols = listing.page(current_page, symbols_per_page)
             
             # Create bullet list format
             symbol_list = []
             
-            for _, row in page_symbols.iterrows():
-                symbol = row['symbol'] if pd.notna(row['symbol']) else 'N/A'
-                name = row['name'] if pd.notna(row['name']) else 'N/A'
+            for row in page_symbols:
+                symbol = row['symbol']
+                name = row['name']
                 
                 # Escape special characters for Markdown
                 escaped_name = name.replace('*', '\\*').replace('[', '\\[').replace(']', '\\]')
@@ -3161,10 +3119,10 @@ class ShansAi:
                 )
                 return
             
-            # Get symbols from Tushare
-            symbols_data = self.tushare_service.get_exchange_symbols(namespace)
+            # Get symbols from the cached Tushare listing
+            listing = await run_data(self.tushare_service.get_exchange_listing, namespace)
             
-            if not symbols_data:
+            if len(listing) == 0:
                 await context.bot.send_message(
                     chat_id=update.callback_query.message.chat_id,
                     text=f"❌ Пространство имен '{namespace}' не найдено или пусто"
@@ -3172,7 +3130,7 @@ class ShansAi:
                 return
             
             # Show statistics first
-            total_count = len(symbols_data)
+            total_count = len(listing)
             symbols_per_page = 20  # Показываем по 20 символов на страницу
             
             # Calculate pagination
@@ -3189,7 +3147,7 @@ class ShansAi:
             response += f"📄 Страница {current_page + 1} из {total_pages}\n\n"
             
             # Get symbols for current page
-            page_symbols = symbols_data[start_idx:end_idx]
+            page_symbols = listing.iloc[start_idx:end_idx].to_dict('records')
             
             # Create bullet list format
             symbol_list = []
@@ -3274,7 +3232,7 @@ class ShansAi:
         
         try:
             # Search for assets with selection possibility
-            search_result = self.search_assets_with_selection(symbol)
+            search_result = await run_data(self.search_assets_with_selection, symbol)
             
             if 'error' in search_result:
                 await self._send_message_safe(update, f"❌ Ошибка: {search_result['error']}")
@@ -3430,7 +3388,7 @@ class ShansAi:
         
         try:
             # Search for assets with selection possibility
-            search_result = self.search_assets_with_selection(symbol)
+            search_result = await run_data(self.search_assets_with_selection, symbol)
             
             if 'error' in search_result:
                 await self._send_message_safe(update, f"❌ Ошибка: {search_result['error']}")
@@ -3478,7 +3436,7 @@ class ShansAi:
         try:
             # Получаем объект актива
             try:
-                asset = ok.Asset(symbol)
+                asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                 
                 # Получаем ключевые метрики за 1 год
                 key_metrics = await self._get_asset_key_metrics(asset, symbol, period='1Y')
@@ -3527,7 +3485,7 @@ class ShansAi:
                 return
             
             # Get symbol information from Tushare
-            symbol_info = self.tushare_service.get_symbol_info(symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
             
             if 'error' in symbol_info:
                 # При ошибке отправляем сообщение об ошибке с кнопками для консистентности
@@ -3541,7 +3499,7 @@ class ShansAi:
                 return
             
             # Format information according to new structure
-            info_text = self._format_tushare_info_response(symbol_info, symbol)
+            info_text = await run_data(self._format_tushare_info_response, symbol_info, symbol)
             
             # Create reply keyboard for management
             reply_markup = self._create_info_reply_keyboard()
@@ -3791,7 +3749,7 @@ class ShansAi:
                 return None
             
             # Get symbol info to get ts_code
-            symbol_info = self.tushare_service.get_symbol_info(symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
             if 'error' in symbol_info or 'ts_code' not in symbol_info:
                 self.logger.warning(f"No ts_code found for {symbol}")
                 return None
@@ -3799,13 +3757,13 @@ class ShansAi:
             ts_code = symbol_info['ts_code']
             
             # Get 1 year of daily data
-            daily_data = self.tushare_service.get_daily_data_by_days(ts_code, 252)
+            daily_data = await run_data(self.tushare_service.get_daily_data_by_days, ts_code, 252)
             if daily_data is None or daily_data.empty:
                 self.logger.warning(f"No daily data available for {symbol}")
                 return None
             
             # Create chart using ChartStyles
-            chart_data = self._create_tushare_price_chart(symbol, daily_data, symbol_info, '1Y')
+            chart_data = await run_render(self._create_tushare_price_chart, symbol, daily_data, symbol_info, '1Y')
             return chart_data
             
         except Exception as e:
@@ -3819,7 +3777,7 @@ class ShansAi:
                 return None
             
             # Get symbol info to get ts_code
-            symbol_info = self.tushare_service.get_symbol_info(symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
             if 'error' in symbol_info or 'ts_code' not in symbol_info:
                 self.logger.warning(f"No ts_code found for {symbol}")
                 return None
@@ -3837,13 +3795,13 @@ class ShansAi:
                 days = 252
             
             # Get daily data for the period
-            daily_data = self.tushare_service.get_daily_data_by_days(ts_code, days)
+            daily_data = await run_data(self.tushare_service.get_daily_data_by_days, ts_code, days)
             if daily_data is None or daily_data.empty:
                 self.logger.warning(f"No daily data available for {symbol} period {period}")
                 return None
             
             # Create chart using ChartStyles
-            chart_data = self._create_tushare_price_chart(symbol, daily_data, symbol_info, period)
+            chart_data = await run_render(self._create_tushare_price_chart, symbol, daily_data, symbol_info, period)
             return chart_data
             
         except Exception as e:
@@ -3904,132 +3862,36 @@ class ShansAi:
             self.logger.error(f"Error creating Tushare price chart for {symbol}: {e}")
             return None
 
-    def _get_data_for_period(self, asset, period: str):
-        """Get filtered data for the specified period"""
+    async def _get_asset_snapshot(self, symbol: str, asset=None) -> AssetSnapshot:
+        """
+        Get cached /info snapshot of an asset (header fields and precomputed price history)
+        
+        While the snapshot is cached, switching /info periods does not touch okama.
+        """
+        snapshot = period_metrics_cache.get(symbol)
+        if snapshot is not None:
+            return snapshot
+        if asset is None:
+            asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
+        with phase(PHASE_COMPUTE):
+            return await run_data(self._build_asset_snapshot, symbol, asset)
+
+    def _build_asset_snapshot(self, symbol: str, asset) -> AssetSnapshot:
+        """Build /info snapshot, taking daily prices from the local time series store"""
         try:
-            if not hasattr(asset, 'close_daily'):
-                return None, None
-            
-            data = asset.close_daily
-            
-            if period == '1Y':
-                # Last 252 trading days (approximately 1 year)
-                filtered_data = data.tail(252)
-            elif period == '5Y':
-                # Last 1260 trading days (approximately 5 years)
-                filtered_data = data.tail(1260)
-            elif period == 'MAX':
-                # All available data
-                filtered_data = data
-            else:
-                # Default to 1Y
-                filtered_data = data.tail(252)
-            
-            # Calculate returns for the filtered period
-            returns = filtered_data.pct_change().dropna()
-            
-            return filtered_data, returns
-            
+            prices = okama_service.get_asset_series(symbol, 'close_daily')
         except Exception as e:
-            self.logger.error(f"Error filtering data for period {period}: {e}")
-            return None, None
+            self.logger.warning(f"Could not get stored daily prices for {symbol}, using asset data: {e}")
+            prices = None
+        return period_metrics_cache.get_or_build(symbol, asset, prices)
 
     async def _get_asset_key_metrics(self, asset, symbol: str, period: str = '1Y') -> Dict[str, Any]:
         """Get key metrics for an asset for the specified period"""
         try:
-            metrics = {}
-            
-            # Get filtered data for the period
-            filtered_data, returns = self._get_data_for_period(asset, period)
-            
-            if filtered_data is None or len(filtered_data) == 0:
+            snapshot = await self._get_asset_snapshot(symbol, asset)
+            metrics = snapshot.metrics(period)
+            if not metrics:
                 self.logger.warning(f"No data available for {symbol} for period {period}")
-                return {}
-            
-            # Get current price (always the latest price)
-            try:
-                if hasattr(asset, 'close_daily'):
-                    current_price = asset.close_daily.iloc[-1]
-                    metrics['current_price'] = current_price
-                    
-                    # Calculate price change for the selected period
-                    if filtered_data is not None and len(filtered_data) > 1:
-                        # For period-specific price change, use start and end of filtered data
-                        start_price = filtered_data.iloc[0]
-                        end_price = filtered_data.iloc[-1]
-                        price_change = ((end_price - start_price) / start_price) * 100
-                        metrics['price_change_pct'] = price_change
-                    elif len(asset.close_daily) > 1:
-                        # Fallback: use last two prices for daily change
-                        prev_price = asset.close_daily.iloc[-2]
-                        price_change = ((current_price - prev_price) / prev_price) * 100
-                        metrics['price_change_pct'] = price_change
-                else:
-                    metrics['current_price'] = None
-                    metrics['price_change_pct'] = None
-            except Exception as e:
-                self.logger.warning(f"Could not get current price for {symbol}: {e}")
-                metrics['current_price'] = None
-                metrics['price_change_pct'] = None
-            
-            # Calculate CAGR for the specific period
-            try:
-                if returns is not None and len(returns) > 0:
-                    # Calculate total return for the period
-                    total_return = (1 + returns).prod() - 1
-                    
-                    # Calculate years based on the period
-                    if period == '1Y':
-                        years = 1.0
-                    elif period == '5Y':
-                        years = 5.0
-                    elif period == 'MAX':
-                        # Calculate actual years from data
-                        years = len(filtered_data) / 252.0  # Approximate trading days per year
-                    else:
-                        years = 1.0
-                    
-                    if years > 0:
-                        cagr = (1 + total_return) ** (1 / years) - 1
-                        metrics['cagr'] = cagr
-                    else:
-                        metrics['cagr'] = None
-                else:
-                    metrics['cagr'] = None
-            except Exception as e:
-                self.logger.warning(f"Could not calculate CAGR for {symbol} period {period}: {e}")
-                metrics['cagr'] = None
-            
-            # Calculate volatility for the specific period
-            try:
-                if returns is not None and len(returns) > 0:
-                    # Calculate annualized volatility for the period
-                    volatility = returns.std() * (252 ** 0.5)  # Annualized for daily data
-                    metrics['volatility'] = volatility
-                else:
-                    metrics['volatility'] = None
-            except Exception as e:
-                self.logger.warning(f"Could not calculate volatility for {symbol} period {period}: {e}")
-                metrics['volatility'] = None
-            
-            # Get dividend yield (this is typically a current metric, not period-specific)
-            try:
-                if hasattr(asset, 'dividend_yield'):
-                    dividend_yield = asset.dividend_yield
-                    if hasattr(dividend_yield, 'iloc'):
-                        metrics['dividend_yield'] = dividend_yield.iloc[-1]
-                    else:
-                        metrics['dividend_yield'] = dividend_yield
-                else:
-                    metrics['dividend_yield'] = None
-            except Exception as e:
-                self.logger.warning(f"Could not get dividend yield for {symbol}: {e}")
-                metrics['dividend_yield'] = None
-            
-            # Add period information to metrics
-            metrics['period'] = period
-            metrics['data_points'] = len(filtered_data)
-            
             return metrics
             
         except Exception as e:
@@ -4093,6 +3955,11 @@ class ShansAi:
                 volatility = key_metrics['volatility']
                 metrics_text += f"Волатильность: {volatility:.1%}\n"
             
+            # Max drawdown
+            if key_metrics.get('max_drawdown') is not None:
+                max_drawdown = key_metrics['max_drawdown']
+                metrics_text += f"Макс. просадка: {max_drawdown:.1%}\n"
+            
             # Dividend yield
             if key_metrics.get('dividend_yield') is not None:
                 dividend_yield = key_metrics['dividend_yield']
@@ -4144,17 +4011,12 @@ class ShansAi:
         try:
             import io
             
-            def create_daily_chart():
+            def draw_daily_chart(asset_info, daily_data):
                 self.logger.info(f"Creating daily chart for {symbol}")
                 # Устанавливаем backend для headless режима
                 import matplotlib
                 matplotlib.use('Agg')
                 
-                asset = ok.Asset(symbol)
-                self.logger.info(f"Asset created for {symbol}")
-                
-                # Получаем данные за последний год
-                daily_data = asset.close_daily
                 self.logger.info(f"Daily data shape: {daily_data.shape if hasattr(daily_data, 'shape') else 'No shape'}")
                 
                 # Берем последние 252 торговых дня (примерно год)
@@ -4162,8 +4024,8 @@ class ShansAi:
                 self.logger.info(f"Filtered data shape: {filtered_data.shape if hasattr(filtered_data, 'shape') else 'No shape'}")
                 
                 # Получаем информацию об активе для заголовка
-                asset_name = getattr(asset, 'name', symbol)
-                currency = getattr(asset, 'currency', '')
+                asset_name = asset_info.get('name') or symbol
+                currency = asset_info.get('currency', '')
                 self.logger.info(f"Asset name: {asset_name}, currency: {currency}")
                 
                 # Используем ChartStyles для создания графика
@@ -4192,10 +4054,7 @@ class ShansAi:
             
             # Выполняем с таймаутом
             self.logger.info(f"Starting chart creation for {symbol}")
-            chart_data = await asyncio.wait_for(
-                asyncio.to_thread(create_daily_chart),
-                timeout=30.0
-            )
+            chart_data = await self._render_asset_chart_cached('daily', symbol, '1Y', 'close_daily', draw_daily_chart)
             
             self.logger.info(f"Chart creation completed for {symbol}")
             return chart_data
@@ -4320,7 +4179,7 @@ class ShansAi:
             await self._send_message_safe(update, f"🔍 Ищу активы по запросу: `{cleaned_query}`...")
             
             # Use unified search function
-            all_results = self._unified_search(cleaned_query)
+            all_results = await run_data(self._unified_search, cleaned_query)
             
             if not all_results:
                 await self._send_message_safe(update, 
@@ -4570,7 +4429,7 @@ class ShansAi:
                     
                     # Create portfolio using okama
                     try:
-                        portfolio = ok.Portfolio(portfolio_symbols, weights=portfolio_weights, ccy=portfolio_currency)
+                        portfolio = await okama_service.run_with_retry(okama_cache.portfolio, portfolio_symbols, weights=portfolio_weights, ccy=portfolio_currency)
                         
                         # Add portfolio wealth index to expanded symbols
                         expanded_symbols.append(portfolio.wealth_index)
@@ -4693,7 +4552,7 @@ class ShansAi:
                                         self.logger.info(f"Using existing portfolio object for {portfolio_context['symbol']}")
                                     else:
                                         # Create portfolio object using okama
-                                        portfolio = ok.Portfolio(
+                                        portfolio = await okama_service.run_with_retry(okama_cache.portfolio,
                                             portfolio_context['portfolio_symbols'], 
                                             weights=portfolio_context['portfolio_weights'], 
                                             ccy=portfolio_context['portfolio_currency']
@@ -4721,7 +4580,7 @@ class ShansAi:
                                     if ' (' in desc:
                                         portfolio_symbols = desc.split(' (')[1].rstrip(')').split(', ')
                                         portfolio_weights = [1.0/len(portfolio_symbols)] * len(portfolio_symbols)
-                                        portfolio = ok.Portfolio(portfolio_symbols, weights=portfolio_weights, ccy=currency)
+                                        portfolio = await okama_service.run_with_retry(okama_cache.portfolio, portfolio_symbols, weights=portfolio_weights, ccy=currency)
                                         assets_for_comparison.append(portfolio)
                                         self.logger.info(f"Added generic portfolio to comparison")
                                     else:
@@ -4814,7 +4673,8 @@ class ShansAi:
                             end_date = datetime.now()
                             start_date = end_date - timedelta(days=years * 365)
                             self.logger.info(f"DEBUG: Creating AssetList with portfolios and period {specified_period}, start_date={start_date.strftime('%Y-%m-%d')}, end_date={end_date.strftime('%Y-%m-%d')}")
-                            comparison = okama_service.create_asset_list(
+                            comparison = await okama_service.run_with_retry(
+                                okama_cache.asset_list,
                                 assets_for_comparison, 
                                 ccy=currency, 
                                 inflation=True, 
@@ -4824,7 +4684,7 @@ class ShansAi:
                             self.logger.info(f"Successfully created AssetList comparison with period {specified_period} and inflation ({inflation_ticker}) using first_date/last_date parameters")
                         else:
                             self.logger.info(f"DEBUG: No period specified for portfolio comparison, creating AssetList without period filter")
-                            comparison = okama_service.create_asset_list(assets_for_comparison, currency=currency, inflation=True)
+                            comparison = await okama_service.run_with_retry(okama_cache.asset_list, assets_for_comparison, ccy=currency, inflation=True)
                             self.logger.info(f"Successfully created AssetList comparison with inflation ({inflation_ticker})")
                     except Exception as asset_list_error:
                         self.logger.error(f"Error creating AssetList: {asset_list_error}")
@@ -4897,9 +4757,10 @@ class ShansAi:
                         end_date = datetime.now()
                         start_date = end_date - timedelta(days=years * 365)
                         self.logger.info(f"DEBUG: Creating AssetList with period {specified_period}, start_date={start_date.strftime('%Y-%m-%d')}, end_date={end_date.strftime('%Y-%m-%d')}")
-                        comparison = okama_service.create_asset_list(
+                        comparison = await okama_service.run_with_retry(
+                            okama_cache.asset_list,
                             symbols, 
-                            currency=currency, 
+                            ccy=currency, 
                             inflation=True,
                             first_date=start_date.strftime('%Y-%m-%d'), 
                             last_date=end_date.strftime('%Y-%m-%d')
@@ -4907,7 +4768,7 @@ class ShansAi:
                         self.logger.info(f"Successfully created regular comparison with period {specified_period} and inflation ({inflation_ticker}) using first_date/last_date parameters")
                     else:
                         self.logger.info(f"DEBUG: No period specified, creating AssetList without period filter")
-                        comparison = okama_service.create_asset_list(symbols, currency=currency, inflation=True)
+                        comparison = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency, inflation=True)
                         self.logger.info(f"Successfully created regular comparison with inflation ({inflation_ticker})")
                 
                 # Store context for buttons - use clean portfolio symbols for current_symbols
@@ -4951,23 +4812,16 @@ class ShansAi:
                 if specified_period:
                     chart_title += f" | {specified_period}"
                 
-                fig, ax = chart_styles.create_unified_wealth_chart(
+                img_bytes = await self._render_chart_bytes(
+                    'create_unified_wealth_chart',
                     comparison.wealth_indexes, symbols, currency, title=chart_title
                 )
                 
-                # Save chart to bytes with memory optimization
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(fig, img_buffer)
-                img_buffer.seek(0)
-                img_bytes = img_buffer.getvalue()
-                
-                # Clear matplotlib cache to free memory
-                chart_styles.cleanup_figure(fig)
-                
                 # Chart analysis is now only available via buttons
                 
                 # Create summary metrics table for separate message
-                summary_table = self._create_summary_metrics_table(
+                summary_table = await run_data(
+                    self._create_summary_metrics_table,
                     symbols, currency, expanded_symbols, portfolio_contexts, specified_period
                 )
                 
@@ -5268,12 +5122,12 @@ class ShansAi:
                         from datetime import timedelta
                         end_date = datetime.now()
                         start_date = end_date - timedelta(days=years * 365)
-                        portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency,
+                        portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency,
                                                first_date=start_date.strftime('%Y-%m-%d'), 
                                                last_date=end_date.strftime('%Y-%m-%d'))
                         self.logger.info(f"DEBUG: Successfully created portfolio with period {specified_period}")
                     else:
-                        portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+                        portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency)
                         self.logger.info(f"DEBUG: Successfully created portfolio")
                 except Exception as e:
                     self.logger.error(f"DEBUG: Error creating portfolio: {e}")
@@ -5851,7 +5705,7 @@ class ShansAi:
                 first_symbol = symbols[0]
                 try:
                     # Create asset to get its currency
-                    first_asset = ok.Asset(first_symbol)
+                    first_asset = await okama_service.run_with_retry(okama_cache.asset, first_symbol)
                     currency, currency_info = self._get_currency_with_russian_indices(first_symbol, first_asset.currency)
                     self.logger.info(f"Currency determined from asset {first_symbol}: {currency}")
                 except Exception as e:
@@ -5867,12 +5721,12 @@ class ShansAi:
                     from datetime import timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=years * 365)
-                    portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency,
+                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency,
                                            first_date=start_date.strftime('%Y-%m-%d'), 
                                            last_date=end_date.strftime('%Y-%m-%d'))
                     self.logger.info(f"Created portfolio with period {specified_period}")
                 else:
-                    portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency)
                     self.logger.info(f"Created portfolio with maximum available period")
                 
                 # Create portfolio information text (without raw object)
@@ -6117,7 +5971,7 @@ class ShansAi:
                 first_symbol = symbols[0]
                 try:
                     # Create asset to get its currency
-                    first_asset = ok.Asset(first_symbol)
+                    first_asset = await okama_service.run_with_retry(okama_cache.asset, first_symbol)
                     currency, currency_info = self._get_currency_with_russian_indices(first_symbol, first_asset.currency)
                     self.logger.info(f"Currency determined from asset {first_symbol}: {currency}")
                 except Exception as e:
@@ -6133,12 +5987,12 @@ class ShansAi:
                     from datetime import timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=years * 365)
-                    portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency,
+                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency,
                                            first_date=start_date.strftime('%Y-%m-%d'), 
                                            last_date=end_date.strftime('%Y-%m-%d'))
                     self.logger.info(f"Created portfolio with period {specified_period}")
                 else:
-                    portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency)
                     self.logger.info(f"Created portfolio with maximum available period")
                 
                 # Create portfolio information text (without raw object)
@@ -6431,7 +6285,7 @@ class ShansAi:
                 # Auto-detect currency from the first asset
                 first_symbol = symbols[0]
                 try:
-                    first_asset = ok.Asset(first_symbol)
+                    first_asset = await okama_service.run_with_retry(okama_cache.asset, first_symbol)
                     currency, currency_info = self._get_currency_with_russian_indices(first_symbol, first_asset.currency)
                 except Exception as e:
                     self.logger.warning(f"Could not determine currency from asset {first_symbol}: {e}")
@@ -6963,6 +6817,7 @@ class ShansAi:
         """
         Unified search function that combines all search sources.
         Uses the same logic as the embedded search service for consistency.
+        Provider searches are cached per query (services.search_cache).
         
         Args:
             query: Search query
@@ -6982,12 +6837,10 @@ class ShansAi:
         # Fallback to okama search
         okama_results = []
         try:
-            import okama as ok
-            search_result = ok.search(query)
+            search_result = okama_search(query)
             if not search_result.empty:
-                for _, row in search_result.head(30).iterrows():
-                    symbol = row.get('symbol', '')
-                    name = row.get('name', '')
+                head = search_result.head(30)
+                for symbol, name in zip(head['symbol'], head['name']):
                     if symbol and name:
                         okama_results.append({
                             'symbol': symbol,
@@ -7963,7 +7816,7 @@ class ShansAi:
                         if i < len(portfolio_contexts):
                             pctx = portfolio_contexts[i]
                             try:
-                                p = ok.Portfolio(
+                                p = await okama_service.run_with_retry(okama_cache.portfolio,
                                     pctx.get('portfolio_symbols', []),
                                     weights=pctx.get('portfolio_weights', []),
                                     ccy=pctx.get('portfolio_currency') or currency,
@@ -7982,29 +7835,32 @@ class ShansAi:
                 return
 
             # Create AssetList with selected assets/portfolios
-            img_buffer = None
+            img_bytes = None
             try:
-                asset_list = ok.AssetList(asset_list_items, ccy=currency)
-                
-                # okama plotting
-                asset_list.plot_assets(kind="cagr")
-                current_fig = plt.gcf()
-                
-                # Apply styling
-                if current_fig.axes:
-                    ax = current_fig.axes[0]
-                    chart_styles.apply_styling(
-                        ax,
-                        title=f"Risk / Return: CAGR\n{', '.join(asset_names)}",
-                        ylabel='CAGR (%)',
-                        grid=True,
-                        legend=True,
-                        copyright=True
-                    )
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(current_fig, img_buffer)
-                img_buffer.seek(0)
-                chart_styles.cleanup_figure(current_fig)
+                asset_list = await okama_service.run_with_retry(okama_cache.asset_list, asset_list_items, ccy=currency)
+                
+                def plot_risk_return():
+                    # okama plotting uses pyplot global state - render pool only
+                    asset_list.plot_assets(kind="cagr")
+                    current_fig = plt.gcf()
+                    
+                    # Apply styling
+                    if current_fig.axes:
+                        ax = current_fig.axes[0]
+                        chart_styles.apply_styling(
+                            ax,
+                            title=f"Risk / Return: CAGR\n{', '.join(asset_names)}",
+                            ylabel='CAGR (%)',
+                            grid=True,
+                            legend=True,
+                            copyright=True
+                        )
+                    buffer = io.BytesIO()
+                    chart_styles.save_figure(current_fig, buffer)
+                    chart_styles.cleanup_figure(current_fig)
+                    return buffer.getvalue()
+                
+                img_bytes = await run_render(plot_risk_return)
             except Exception as plot_error:
                 # Fallback: compute CAGR manually and plot as bar chart
                 self.logger.warning(f"Risk/Return okama plot failed, falling back to manual bar: {plot_error}")
@@ -8017,11 +7873,11 @@ class ShansAi:
                         try:
                             if isinstance(asset, str):
                                 # Individual asset
-                                asset_obj = ok.Asset(asset)
-                                cagr = asset_obj.get_cagr()
+                                asset_obj = await okama_service.run_with_retry(okama_cache.asset, asset)
+                                cagr = await run_data(asset_obj.get_cagr)
                             else:
                                 # Portfolio
-                                cagr = asset.get_cagr()
+                                cagr = await run_data(asset.get_cagr)
                             
                             if hasattr(cagr, 'iloc'):
                                 cagr_val = float(cagr.iloc[0])
@@ -8033,7 +7889,7 @@ class ShansAi:
                             # Manual CAGR calculation
                             try:
                                 if isinstance(asset, str):
-                                    asset_obj = ok.Asset(asset)
+                                    asset_obj = await okama_service.run_with_retry(okama_cache.asset, asset)
                                     wealth_index = asset_obj.wealth_index
                                 else:
                                     wealth_index = asset.wealth_index
@@ -8048,15 +7904,19 @@ class ShansAi:
 
                     cagr_df = pd.DataFrame.from_dict(cagr_values, orient='index')
                     cagr_df.columns = ['CAGR']
-                    fig, ax = chart_styles.create_bar_chart(
-                        cagr_df['CAGR'],
-                        title=f"Risk / Return: CAGR\n{', '.join(asset_names)}",
-                        ylabel='CAGR (%)'
-                    )
-                    img_buffer = io.BytesIO()
-                    chart_styles.save_figure(fig, img_buffer)
-                    img_buffer.seek(0)
-                    chart_styles.cleanup_figure(fig)
+                    
+                    def plot_cagr_bars():
+                        fig, ax = chart_styles.create_bar_chart(
+                            cagr_df['CAGR'],
+                            title=f"Risk / Return: CAGR\n{', '.join(asset_names)}",
+                            ylabel='CAGR (%)'
+                        )
+                        buffer = io.BytesIO()
+                        chart_styles.save_figure(fig, buffer)
+                        chart_styles.cleanup_figure(fig)
+                        return buffer.getvalue()
+                    
+                    img_bytes = await run_render(plot_cagr_bars)
                 except Exception as fallback_error:
                     self.logger.error(f"Risk/Return manual bar failed: {fallback_error}")
                     await self._send_callback_message(update, context, "❌ Не удалось построить график Risk / Return (CAGR)")
@@ -8072,7 +7932,7 @@ class ShansAi:
             # Send image with keyboard
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=img_buffer,
+                photo=io.BytesIO(img_bytes),
                 caption=self._truncate_caption(f"⚖️ Risk / Return (CAGR) для сравнения: {', '.join(asset_names)}"),
                 reply_markup=keyboard
             )
@@ -8115,7 +7975,7 @@ class ShansAi:
                         if i < len(portfolio_contexts):
                             pctx = portfolio_contexts[i]
                             try:
-                                p = ok.Portfolio(
+                                p = await okama_service.run_with_retry(okama_cache.portfolio,
                                     pctx.get('portfolio_symbols', []),
                                     weights=pctx.get('portfolio_weights', []),
                                     ccy=pctx.get('portfolio_currency') or currency,
@@ -8136,29 +7996,20 @@ class ShansAi:
             # Create AssetList with selected assets/portfolios
             img_buffer = None
             try:
-                asset_list = ok.AssetList(asset_list_items, ccy=currency)
-                
-                # Create Efficient Frontier
-                ef = ok.EfficientFrontier(asset_list, ccy=currency)
+                # Create (or reuse cached) Efficient Frontier
+                ef = await self._get_efficient_frontier(asset_list_items, currency)
                 
                 # Log debug information
                 self.logger.info(f"Created EfficientFrontier with {len(asset_names)} assets: {asset_names}")
                 
                 # Create chart with proper styling using chart_styles
-                current_fig, ax = chart_styles.create_efficient_frontier_chart(
+                img_bytes = await self._render_chart_bytes(
+                    'create_efficient_frontier_chart',
                     ef, 
                     asset_names, 
                     data_source='okama'
                 )
-                
-                # Check if chart creation was successful
-                if current_fig is None:
-                    raise Exception("Failed to create efficient frontier chart - chart creation returned None")
-                
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(current_fig, img_buffer)
-                img_buffer.seek(0)
-                chart_styles.cleanup_figure(current_fig)
+                img_buffer = io.BytesIO(img_bytes)
             except Exception as plot_error:
                 self.logger.error(f"Efficient Frontier plot failed: {plot_error}")
                 await self._send_callback_message(update, context, f"❌ Не удалось построить график эффективной границы: {str(plot_error)}")
@@ -8317,7 +8168,7 @@ class ShansAi:
                 data_info = await self._prepare_data_for_analysis(symbols, currency, expanded_symbols, portfolio_contexts, user_id)
                 
                 # Analyze data with Gemini
-                data_analysis = self.gemini_service.analyze_data(data_info)
+                data_analysis = await self.gemini_service.analyze_data(data_info)
                 
                 if data_analysis and data_analysis.get('success'):
                     analysis_text = data_analysis.get('analysis', '')
@@ -8387,7 +8238,7 @@ class ShansAi:
                 
                 if data_info:
                     # Perform Gemini analysis
-                    gemini_analysis = self.gemini_service.analyze_data(data_info)
+                    gemini_analysis = await self.gemini_service.analyze_data(data_info)
                     
                     if gemini_analysis and gemini_analysis.get('success'):
                         analysis_text = gemini_analysis.get('analysis', '')
@@ -8445,7 +8296,8 @@ class ShansAi:
 
             # Create summary metrics table
             try:
-                summary_table = self._create_summary_metrics_table(
+                summary_table = await run_data(
+                    self._create_summary_metrics_table,
                     symbols, currency, expanded_symbols, portfolio_contexts, specified_period
                 )
                 
@@ -8464,7 +8316,8 @@ class ShansAi:
                             footnote = f"Источник: шанс, okama • валюта: {currency}"
                             
                             # Create image buffer
-                            img_buffer = self.chart_styles.render_table_image(
+                            img_buffer = io.BytesIO(await self._render_chart_bytes(
+                                'render_table_image',
                                 df=df,
                                 title=title,
                                 footnote=footnote,
@@ -8481,7 +8334,7 @@ class ShansAi:
                                 title_fontsize=14,
                                 footnote_fontsize=9,
                                 dpi=200
-                            )
+                            ))
                             
                             # Create keyboard for compare command
                             keyboard = self._create_compare_command_keyboard(symbols, currency, update)
@@ -8804,7 +8657,8 @@ class ShansAi:
             # Create individual assets metrics table for comparison
             individual_assets_metrics = ""
             try:
-                individual_assets_metrics = self._create_summary_metrics_table(
+                individual_assets_metrics = await run_data(
+                    self._create_summary_metrics_table,
                     symbols=symbols,
                     currency=currency,
                     expanded_symbols=symbols,  # Individual assets
@@ -8818,10 +8672,11 @@ class ShansAi:
             correlations = []
             try:
                 if len(symbols) > 1:
-                    asset_list = ok.AssetList(symbols, ccy=currency)
-                    corr_matrix = asset_list.assets_ror.corr()
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency)
+                    correlation = await run_data(lambda: correlation_service.get_or_compute(asset_list.assets_ror, currency))
+                    corr_matrix = await run_data(correlation.matrix)
                     if corr_matrix is not None and not corr_matrix.empty:
-                        correlations = corr_matrix.values.tolist()
+                        correlations = correlation.to_list()
                         self.logger.info(f"Portfolio correlation matrix calculated successfully, shape: {corr_matrix.shape}")
                     else:
                         self.logger.warning("Portfolio correlation matrix is empty")
@@ -8832,56 +8687,8 @@ class ShansAi:
             efficient_frontier_data = None
             try:
                 if len(symbols) > 1:
-                    asset_list = ok.AssetList(symbols, ccy=currency)
-                    ef = ok.EfficientFrontier(asset_list, ccy=currency)
-                    
-                    # Extract key points from efficient frontier
-                    efficient_frontier_data = {
-                        'min_risk_portfolio': {
-                            'risk': ef.gmv_annualized[0] if hasattr(ef, 'gmv_annualized') and ef.gmv_annualized is not None else None,
-                            'return': ef.gmv_annualized[1] if hasattr(ef, 'gmv_annualized') and ef.gmv_annualized is not None else None,
-                            'weights': ef.gmv_weights.tolist() if hasattr(ef, 'gmv_weights') and ef.gmv_weights is not None else None
-                        },
-                        'max_return_portfolio': {
-                            'risk': None,  # Will be calculated from optimize_return
-                            'return': None,  # Will be calculated from optimize_return
-                            'weights': None  # Will be calculated from optimize_return
-                        },
-                        'max_sharpe_portfolio': {
-                            'risk': None,  # Will be calculated from get_tangency_portfolio
-                            'return': None,  # Will be calculated from get_tangency_portfolio
-                            'weights': None,  # Will be calculated from get_tangency_portfolio
-                            'sharpe_ratio': None
-                        },
-                        'asset_names': symbols,
-                        'currency': currency
-                    }
-                    
-                    # Try to get max return portfolio
-                    try:
-                        max_return_result = ef.optimize_return()
-                        if max_return_result is not None and len(max_return_result) >= 2:
-                            efficient_frontier_data['max_return_portfolio']['risk'] = max_return_result[0]
-                            efficient_frontier_data['max_return_portfolio']['return'] = max_return_result[1]
-                            if hasattr(ef, 'weights') and ef.weights is not None:
-                                efficient_frontier_data['max_return_portfolio']['weights'] = ef.weights.tolist()
-                    except Exception as e:
-                        self.logger.warning(f"Failed to get max return portfolio: {e}")
-                    
-                    # Try to get tangency portfolio (max Sharpe)
-                    try:
-                        tangency_result = ef.get_tangency_portfolio()
-                        if tangency_result is not None and len(tangency_result) >= 2:
-                            efficient_frontier_data['max_sharpe_portfolio']['risk'] = tangency_result[0]
-                            efficient_frontier_data['max_sharpe_portfolio']['return'] = tangency_result[1]
-                            if hasattr(ef, 'weights') and ef.weights is not None:
-                                efficient_frontier_data['max_sharpe_portfolio']['weights'] = ef.weights.tolist()
-                                # Calculate Sharpe ratio
-                                risk_free_rate = self.get_risk_free_rate(currency, 5.0)
-                                if tangency_result[0] > 0:
-                                    efficient_frontier_data['max_sharpe_portfolio']['sharpe_ratio'] = (tangency_result[1] - risk_free_rate) / tangency_result[0]
-                    except Exception as e:
-                        self.logger.warning(f"Failed to get tangency portfolio: {e}")
+                    ef = await self._get_efficient_frontier(symbols, currency)
+                    efficient_frontier_data = ef.to_analysis_dict(symbols, currency)
                         
             except Exception as e:
                 self.logger.warning(f"Failed to calculate efficient frontier: {e}")
@@ -8891,7 +8698,7 @@ class ShansAi:
             try:
                 for symbol in symbols:
                     try:
-                        asset = ok.Asset(symbol)
+                        asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                         if hasattr(asset, 'name') and asset.name:
                             asset_names[symbol] = asset.name
                         else:
@@ -8946,7 +8753,8 @@ class ShansAi:
             # Create summary metrics table for Gemini analysis (using the same optimized table)
             summary_metrics_table = ""
             try:
-                summary_metrics_table = self._create_summary_metrics_table(
+                summary_metrics_table = await run_data(
+                    self._create_summary_metrics_table,
                     symbols=symbols,
                     currency=currency,
                     expanded_symbols=expanded_symbols,
@@ -8970,7 +8778,8 @@ class ShansAi:
                 'asset_names': {}  # Dictionary to store asset names
             }
             
-            # Calculate detailed performance metrics for each symbol
+            # Collect monthly returns of every asset/portfolio into one matrix
+            returns_by_symbol = {}
             for i, symbol in enumerate(symbols):
                 asset_data = None
                 
@@ -8986,7 +8795,7 @@ class ShansAi:
                     else:
                         # This is a regular asset symbol - create Asset object
                         try:
-                            asset_data = ok.Asset(symbol)
+                            asset_data = await okama_service.run_with_retry(okama_cache.asset, symbol)
                         except Exception as e:
                             self.logger.warning(f"Failed to create Asset object for {symbol}: {e}")
                             asset_data = None
@@ -8994,7 +8803,7 @@ class ShansAi:
                 # Fallback: try to create Asset from symbol if we don't have asset_data
                 if asset_data is None:
                     try:
-                        asset_data = ok.Asset(symbol)
+                        asset_data = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     except Exception as e:
                         self.logger.warning(f"Failed to create Asset object for {symbol}: {e}")
                         asset_data = None
@@ -9012,227 +8821,16 @@ class ShansAi:
                 
                 data_info['asset_names'][symbol] = asset_name
                 
-                # Get comprehensive performance metrics
-                performance_metrics = {}
-                
-                # Calculate metrics from price data
+                # Monthly returns for the metrics engine
                 try:
-                    # Get price data for calculations (синхронизировано с AssetList - приоритет месячным данным)
-                    if asset_data is not None:
-                        if hasattr(asset_data, 'close_monthly') and asset_data.close_monthly is not None:
-                            prices = asset_data.close_monthly
-                            data_type = "monthly"
-                        elif hasattr(asset_data, 'wealth_index') and asset_data.wealth_index is not None:
-                            # For Portfolio objects
-                            wealth_index = asset_data.wealth_index
-                            if hasattr(wealth_index, 'iloc') and len(wealth_index) > 1:
-                                if hasattr(wealth_index, 'columns'):
-                                    prices = wealth_index.iloc[:, 0]
-                                else:
-                                    prices = wealth_index
-                            data_type = "wealth_index"
-                        elif hasattr(asset_data, 'adj_close') and asset_data.adj_close is not None:
-                            prices = asset_data.adj_close
-                            data_type = "adjusted"
-                        elif hasattr(asset_data, 'close_daily') and asset_data.close_daily is not None:
-                            prices = asset_data.close_daily
-                            data_type = "daily"
-                        else:
-                            prices = None
-                            data_type = "none"
-                    else:
-                        prices = None
-                        data_type = "none"
-                    
-                    self.logger.info(f"Data preparation for {symbol}: type={data_type}, prices_length={len(prices) if prices is not None else 0}")
-                    
+                    prices = await run_data(self._get_monthly_prices, asset_data) if asset_data is not None else None
                     if prices is not None and len(prices) > 1:
-                        # Calculate returns from prices
-                        returns = prices.pct_change().dropna()
-                        
-                        # Basic metrics
-                        if asset_data is not None and hasattr(asset_data, 'total_return'):
-                            performance_metrics['total_return'] = asset_data.total_return
-                        else:
-                            # Calculate total return from first and last price
-                            total_return = (prices.iloc[-1] / prices.iloc[0]) - 1
-                            performance_metrics['total_return'] = total_return
-                        
-                        # Annual return (CAGR)
-                        if asset_data is not None and hasattr(asset_data, 'annual_return'):
-                            performance_metrics['annual_return'] = asset_data.annual_return
-                        else:
-                            # Calculate CAGR based on data frequency
-                            periods = len(prices)
-                            
-                            # Determine data frequency and calculate years accordingly
-                            if asset_data is not None and hasattr(asset_data, 'close_monthly') and asset_data.close_monthly is not None:
-                                # Monthly data
-                                years = periods / 12.0
-                            elif asset_data is not None and hasattr(asset_data, 'close_daily') and asset_data.close_daily is not None:
-                                # Daily data - use 252 trading days per year
-                                years = periods / 252.0
-                            else:
-                                # Default to monthly assumption
-                                years = periods / 12.0
-                            
-                            if years > 0:
-                                cagr = ((prices.iloc[-1] / prices.iloc[0]) ** (1.0 / years)) - 1
-                                performance_metrics['annual_return'] = cagr
-                                self.logger.info(f"CAGR calculation for {symbol}: periods={periods}, years={years:.2f}, cagr={cagr:.4f}")
-                            else:
-                                performance_metrics['annual_return'] = 0.0
-                                self.logger.warning(f"CAGR calculation failed for {symbol}: years={years}")
-                        
-                        # Volatility
-                        if asset_data is not None and hasattr(asset_data, 'volatility'):
-                            performance_metrics['volatility'] = asset_data.volatility
-                        else:
-                            # Calculate annualized volatility based on data frequency
-                            if asset_data is not None and hasattr(asset_data, 'close_monthly') and asset_data.close_monthly is not None:
-                                # Monthly data - annualize by sqrt(12)
-                                volatility = returns.std() * (12 ** 0.5)
-                            elif asset_data is not None and hasattr(asset_data, 'close_daily') and asset_data.close_daily is not None:
-                                # Daily data - annualize by sqrt(252)
-                                volatility = returns.std() * (252 ** 0.5)
-                            else:
-                                # Default to monthly assumption
-                                volatility = returns.std() * (12 ** 0.5)
-                            
-                            performance_metrics['volatility'] = volatility
-                            self.logger.info(f"Volatility calculation for {symbol}: data_type={data_type}, volatility={volatility:.4f}")
-                        
-                        # Max drawdown
-                        if asset_data is not None and hasattr(asset_data, 'max_drawdown'):
-                            performance_metrics['max_drawdown'] = asset_data.max_drawdown
-                        else:
-                            # Calculate max drawdown
-                            cumulative = (1 + returns).cumprod()
-                            running_max = cumulative.expanding().max()
-                            drawdown = (cumulative - running_max) / running_max
-                            max_drawdown = drawdown.min()
-                            performance_metrics['max_drawdown'] = max_drawdown
-                        
-                        # Store returns for Sortino calculation
-                        performance_metrics['_returns'] = returns
-                    
-                    else:
-                        # Fallback values if no price data
-                        performance_metrics['total_return'] = 0.0
-                        performance_metrics['annual_return'] = 0.0
-                        performance_metrics['volatility'] = 0.0
-                        performance_metrics['max_drawdown'] = 0.0
-                        performance_metrics['_returns'] = None
-                
-                except Exception as e:
-                    self.logger.warning(f"Failed to calculate basic metrics for {symbol}: {e}")
-                    performance_metrics['total_return'] = 0.0
-                    performance_metrics['annual_return'] = 0.0
-                    performance_metrics['volatility'] = 0.0
-                    performance_metrics['max_drawdown'] = 0.0
-                    performance_metrics['_returns'] = None
-                
-                # Sharpe ratio calculation
-                try:
-                    annual_return = performance_metrics.get('annual_return', 0)
-                    volatility = performance_metrics.get('volatility', 0)
-                    sharpe_ratio = self.calculate_sharpe_ratio(annual_return, volatility, currency, asset_data=asset_data)
-                    performance_metrics['sharpe_ratio'] = sharpe_ratio
-                except Exception as e:
-                    self.logger.warning(f"Failed to calculate Sharpe ratio for {symbol}: {e}")
-                    performance_metrics['sharpe_ratio'] = 0.0
-                
-                # Sortino ratio calculation
-                try:
-                    if asset_data is not None and hasattr(asset_data, 'sortino_ratio'):
-                        performance_metrics['sortino_ratio'] = asset_data.sortino_ratio
-                    else:
-                        # Manual Sortino ratio calculation
-                        annual_return = performance_metrics.get('annual_return', 0)
-                        returns = performance_metrics.get('_returns')
-                        
-                        if returns is not None and len(returns) > 0:
-                            # Calculate downside deviation (only negative returns)
-                            negative_returns = returns[returns < 0]
-                            if len(negative_returns) > 0:
-                                # Annualize downside deviation based on data frequency
-                                if asset_data is not None and hasattr(asset_data, 'close_monthly') and asset_data.close_monthly is not None:
-                                    # Monthly data - annualize by sqrt(12)
-                                    downside_deviation = negative_returns.std() * (12 ** 0.5)
-                                elif asset_data is not None and hasattr(asset_data, 'close_daily') and asset_data.close_daily is not None:
-                                    # Daily data - annualize by sqrt(252)
-                                    downside_deviation = negative_returns.std() * (252 ** 0.5)
-                                else:
-                                    # Default to monthly assumption
-                                    downside_deviation = negative_returns.std() * (12 ** 0.5)
-                                
-                                if downside_deviation > 0:
-                                    # Use proper risk-free rate based on currency
-                                    risk_free_rate = self.get_risk_free_rate(currency, years)
-                                    sortino_ratio = (annual_return - risk_free_rate) / downside_deviation
-                                    performance_metrics['sortino_ratio'] = sortino_ratio
-                                else:
-                                    performance_metrics['sortino_ratio'] = 0.0
-                            else:
-                                # No negative returns, use volatility as fallback
-                                volatility = performance_metrics.get('volatility', 0)
-                                if volatility > 0:
-                                    # Use proper risk-free rate based on currency
-                                    risk_free_rate = self.get_risk_free_rate(currency, years)
-                                    sortino_ratio = (annual_return - risk_free_rate) / volatility
-                                    performance_metrics['sortino_ratio'] = sortino_ratio
-                                else:
-                                    performance_metrics['sortino_ratio'] = 0.0
-                        else:
-                            # Fallback to Sharpe ratio if no returns data
-                            performance_metrics['sortino_ratio'] = performance_metrics.get('sharpe_ratio', 0.0)
-                except Exception as e:
-                    self.logger.warning(f"Failed to calculate Sortino ratio for {symbol}: {e}")
-                    performance_metrics['sortino_ratio'] = 0.0
-                
-                # Additional metrics calculation
-                try:
-                    # Calmar Ratio = Annual Return / Max Drawdown (absolute value)
-                    annual_return = performance_metrics.get('annual_return', 0)
-                    max_drawdown = performance_metrics.get('max_drawdown', 0)
-                    if max_drawdown != 0:
-                        calmar_ratio = annual_return / abs(max_drawdown)
-                        performance_metrics['calmar_ratio'] = calmar_ratio
-                        self.logger.info(f"Calmar ratio for {symbol}: {calmar_ratio:.4f}")
-                    else:
-                        performance_metrics['calmar_ratio'] = 0.0
-                    
-                    # VaR 95% and CVaR 95% calculation
-                    returns = performance_metrics.get('_returns')
-                    if returns is not None and len(returns) > 0:
-                        # VaR 95% - 5th percentile of returns (worst 5% of returns)
-                        var_95 = returns.quantile(0.05)
-                        performance_metrics['var_95'] = var_95
-                        
-                        # CVaR 95% - Expected value of returns below VaR 95%
-                        returns_below_var = returns[returns <= var_95]
-                        if len(returns_below_var) > 0:
-                            cvar_95 = returns_below_var.mean()
-                            performance_metrics['cvar_95'] = cvar_95
-                        else:
-                            performance_metrics['cvar_95'] = var_95
-                        
-                        self.logger.info(f"VaR 95% for {symbol}: {var_95:.4f}, CVaR 95%: {performance_metrics['cvar_95']:.4f}")
-                    else:
-                        performance_metrics['var_95'] = 0.0
-                        performance_metrics['cvar_95'] = 0.0
-                        
+                        returns_by_symbol[symbol] = returns_from_prices(prices)
                 except Exception as e:
-                    self.logger.warning(f"Failed to calculate additional metrics for {symbol}: {e}")
-                    performance_metrics['calmar_ratio'] = 0.0
-                    performance_metrics['var_95'] = 0.0
-                    performance_metrics['cvar_95'] = 0.0
-                
-                # Clean up temporary data
-                if '_returns' in performance_metrics:
-                    del performance_metrics['_returns']
-                
-                data_info['performance'][symbol] = performance_metrics
+                    self.logger.warning(f"Failed to get price data for {symbol}: {e}")
+            
+            # Calculate all metrics for all symbols at once
+            data_info['performance'] = await run_data(self._compute_performance_metrics, returns_by_symbol, symbols, currency)
             
             # Calculate correlation matrix if we have multiple assets
             if len(expanded_symbols) > 1:
@@ -9269,7 +8867,7 @@ class ShansAi:
                                 
                                 if assets and weights and len(assets) == len(weights):
                                     # Create portfolio using ok.Portfolio
-                                    portfolio = ok.Portfolio(
+                                    portfolio = await okama_service.run_with_retry(okama_cache.portfolio,
                                         assets=assets,
                                         weights=weights,
                                         rebalancing_strategy=ok.Rebalance(period="year"),
@@ -9288,7 +8886,7 @@ class ShansAi:
                     # Process individual assets separately
                     if asset_symbols:
                         try:
-                            asset_asset_list = ok.AssetList(asset_symbols, ccy=currency)
+                            asset_asset_list = await okama_service.run_with_retry(okama_cache.asset_list, asset_symbols, ccy=currency)
                             
                             for symbol in asset_symbols:
                                 if symbol in asset_asset_list.wealth_indexes.columns:
@@ -9305,9 +8903,10 @@ class ShansAi:
                         # Combine all returns into a DataFrame
                         returns_df = pd.DataFrame(correlation_data)
                         
-                        # Calculate correlation matrix (same as in _create_mixed_comparison_correlation_matrix)
-                        correlation_matrix_df = returns_df.corr()
-                        correlation_matrix = correlation_matrix_df.values.tolist()
+                        # Calculate correlation matrix (cached, same service as the correlation button)
+                        correlation = await run_data(correlation_service.get_or_compute, returns_df, currency)
+                        correlation_matrix_df = await run_data(correlation.matrix)
+                        correlation_matrix = correlation.to_list()
                         
                         self.logger.info(f"AI analysis correlation matrix calculated successfully, shape: {correlation_matrix_df.shape}")
                     else:
@@ -9354,7 +8953,7 @@ class ShansAi:
                                 if i < len(portfolio_contexts):
                                     pctx = portfolio_contexts[i]
                                     try:
-                                        p = ok.Portfolio(
+                                        p = await okama_service.run_with_retry(okama_cache.portfolio,
                                             pctx.get('portfolio_symbols', []),
                                             weights=pctx.get('portfolio_weights', []),
                                             ccy=pctx.get('portfolio_currency') or currency,
@@ -9369,59 +8968,12 @@ class ShansAi:
                                 asset_names.append(symbol)
                     
                     if len(asset_list_items) > 1:
-                        # Create AssetList and EfficientFrontier
-                        asset_list = ok.AssetList(asset_list_items, ccy=currency)
-                        ef = ok.EfficientFrontier(asset_list, ccy=currency)
+                        # Get (cached) efficient frontier
+                        ef = await self._get_efficient_frontier(asset_list_items, currency)
                         
                         # Get efficient frontier data
                         try:
-                            # Extract key points from efficient frontier using correct okama methods
-                            efficient_frontier_data = {
-                                'min_risk_portfolio': {
-                                    'risk': ef.gmv_annualized[0] if hasattr(ef, 'gmv_annualized') and ef.gmv_annualized is not None else None,
-                                    'return': ef.gmv_annualized[1] if hasattr(ef, 'gmv_annualized') and ef.gmv_annualized is not None else None,
-                                    'weights': ef.gmv_weights.tolist() if hasattr(ef, 'gmv_weights') and ef.gmv_weights is not None else None
-                                },
-                                'max_return_portfolio': {
-                                    'risk': None,  # Will be calculated from optimize_return
-                                    'return': None,  # Will be calculated from optimize_return
-                                    'weights': None  # Will be calculated from optimize_return
-                                },
-                                'max_sharpe_portfolio': {
-                                    'risk': None,  # Will be calculated from get_tangency_portfolio
-                                    'return': None,  # Will be calculated from get_tangency_portfolio
-                                    'weights': None,  # Will be calculated from get_tangency_portfolio
-                                    'sharpe_ratio': None
-                                },
-                                'asset_names': asset_names,
-                                'currency': currency
-                            }
-                            
-                            # Get max return portfolio
-                            try:
-                                max_return_result = ef.optimize_return()
-                                if max_return_result and 'Weights' in max_return_result:
-                                    efficient_frontier_data['max_return_portfolio']['weights'] = max_return_result['Weights'].tolist()
-                                    efficient_frontier_data['max_return_portfolio']['return'] = max_return_result.get('Mean_return_monthly', 0) * 12  # Annualize
-                                    efficient_frontier_data['max_return_portfolio']['risk'] = max_return_result.get('Risk_monthly', 0) * (12 ** 0.5)  # Annualize
-                            except Exception as e:
-                                self.logger.warning(f"Failed to get max return portfolio: {e}")
-                            
-                            # Get max Sharpe portfolio (tangency portfolio)
-                            try:
-                                tangency_result = ef.get_tangency_portfolio()
-                                if tangency_result and 'Weights' in tangency_result:
-                                    efficient_frontier_data['max_sharpe_portfolio']['weights'] = tangency_result['Weights'].tolist()
-                                    efficient_frontier_data['max_sharpe_portfolio']['return'] = tangency_result.get('Rate_of_return', 0)
-                                    efficient_frontier_data['max_sharpe_portfolio']['risk'] = tangency_result.get('Risk', 0)
-                                    # Calculate Sharpe ratio
-                                    if efficient_frontier_data['max_sharpe_portfolio']['risk'] > 0:
-                                        efficient_frontier_data['max_sharpe_portfolio']['sharpe_ratio'] = (
-                                            efficient_frontier_data['max_sharpe_portfolio']['return'] / 
-                                            efficient_frontier_data['max_sharpe_portfolio']['risk']
-                                        )
-                            except Exception as e:
-                                self.logger.warning(f"Failed to get tangency portfolio: {e}")
+                            efficient_frontier_data = ef.to_analysis_dict(asset_names, currency)
                             
                             # Log the extracted data for debugging
                             self.logger.info(f"Efficient frontier data extracted:")
@@ -9496,7 +9048,8 @@ class ShansAi:
                 'asset_names': {}  # Dictionary to store asset names
             }
             
-            # Calculate detailed performance metrics for each symbol
+            # Collect monthly returns of every asset/portfolio into one matrix
+            returns_by_symbol = {}
             for i, symbol in enumerate(symbols):
                 try:
                     # Get the actual asset/portfolio object from portfolio_contexts
@@ -9517,7 +9070,7 @@ class ShansAi:
                                 asset_symbol = symbol  # Fallback to the symbol from the loop
                             
                             try:
-                                asset_data = ok.Asset(asset_symbol)
+                                asset_data = okama_cache.asset(asset_symbol)
                             except Exception as e:
                                 self.logger.warning(f"Failed to create Asset object for {asset_symbol}: {e}")
                                 asset_data = None
@@ -9525,7 +9078,7 @@ class ShansAi:
                     if asset_data is None:
                         # Fallback: try to create Asset from symbol
                         try:
-                            asset_data = ok.Asset(symbol)
+                            asset_data = okama_cache.asset(symbol)
                         except Exception as e:
                             self.logger.warning(f"Failed to create Asset object for {symbol}: {e}")
                             asset_data = None
@@ -9543,196 +9096,15 @@ class ShansAi:
                     
                     metrics_data['asset_names'][symbol] = asset_name
                     
-                    # Get comprehensive performance metrics
-                    detailed_metrics = {}
-                    
-                    if asset_data is not None:
-                        # Calculate metrics from asset/portfolio data
-                        try:
-                            # Get price data for calculations
-                            if hasattr(asset_data, 'close_monthly') and asset_data.close_monthly is not None:
-                                prices = asset_data.close_monthly
-                            elif hasattr(asset_data, 'close_daily') and asset_data.close_daily is not None:
-                                prices = asset_data.close_daily
-                            elif hasattr(asset_data, 'adj_close') and asset_data.adj_close is not None:
-                                prices = asset_data.adj_close
-                            elif hasattr(asset_data, 'wealth_index') and asset_data.wealth_index is not None:
-                                prices = asset_data.wealth_index
-                            else:
-                                prices = None
-                            
-                            if prices is not None and len(prices) > 1:
-                                # Calculate returns from prices
-                                returns = prices.pct_change().dropna()
-                                
-                                # Basic metrics
-                                if hasattr(asset_data, 'total_return'):
-                                    detailed_metrics['total_return'] = asset_data.total_return
-                                else:
-                                    # Calculate total return from first and last price
-                                    total_return = (prices.iloc[-1] / prices.iloc[0]) - 1
-                                    detailed_metrics['total_return'] = total_return
-                                
-                                # Annual return (CAGR)
-                                if hasattr(asset_data, 'annual_return'):
-                                    detailed_metrics['annual_return'] = asset_data.annual_return
-                                else:
-                                    # Calculate CAGR
-                                    periods = len(prices)
-                                    years = periods / 12.0  # Assuming monthly data
-                                    if years > 0:
-                                        cagr = ((prices.iloc[-1] / prices.iloc[0]) ** (1.0 / years)) - 1
-                                        detailed_metrics['annual_return'] = cagr
-                                    else:
-                                        detailed_metrics['annual_return'] = 0.0
-                                
-                                # Volatility
-                                if hasattr(asset_data, 'volatility'):
-                                    detailed_metrics['volatility'] = asset_data.volatility
-                                else:
-                                    # Calculate annualized volatility
-                                    volatility = returns.std() * (12 ** 0.5)  # Annualized for monthly data
-                                    detailed_metrics['volatility'] = volatility
-                                
-                                # Max drawdown
-                                if hasattr(asset_data, 'max_drawdown'):
-                                    detailed_metrics['max_drawdown'] = asset_data.max_drawdown
-                                else:
-                                    # Calculate max drawdown
-                                    cumulative = (1 + returns).cumprod()
-                                    running_max = cumulative.expanding().max()
-                                    drawdown = (cumulative - running_max) / running_max
-                                    max_drawdown = drawdown.min()
-                                    detailed_metrics['max_drawdown'] = max_drawdown
-                                
-                                # Store returns for Sharpe and Sortino calculations
-                                detailed_metrics['_returns'] = returns
-                                
-                            else:
-                                # Fallback values if no price data
-                                detailed_metrics['total_return'] = 0.0
-                                detailed_metrics['annual_return'] = 0.0
-                                detailed_metrics['volatility'] = 0.0
-                                detailed_metrics['max_drawdown'] = 0.0
-                                detailed_metrics['_returns'] = None
-                        
-                        except Exception as e:
-                            self.logger.warning(f"Failed to calculate basic metrics for {symbol}: {e}")
-                            detailed_metrics['total_return'] = 0.0
-                            detailed_metrics['annual_return'] = 0.0
-                            detailed_metrics['volatility'] = 0.0
-                            detailed_metrics['max_drawdown'] = 0.0
-                            detailed_metrics['_returns'] = None
-                    else:
-                        # No asset data available
-                        detailed_metrics['total_return'] = 0.0
-                        detailed_metrics['annual_return'] = 0.0
-                        detailed_metrics['volatility'] = 0.0
-                        detailed_metrics['max_drawdown'] = 0.0
-                        detailed_metrics['_returns'] = None
-                        
-                    # Sharpe ratio calculation
-                    try:
-                        annual_return = detailed_metrics.get('annual_return', 0)
-                        volatility = detailed_metrics.get('volatility', 0)
-                        sharpe_ratio = self.calculate_sharpe_ratio(annual_return, volatility, currency, asset_data=asset_data)
-                        detailed_metrics['sharpe_ratio'] = sharpe_ratio
-                    except Exception as e:
-                        self.logger.warning(f"Failed to calculate Sharpe ratio for {symbol}: {e}")
-                        detailed_metrics['sharpe_ratio'] = 0.0
-                    
-                    # Sortino ratio calculation
-                    try:
-                        if asset_data is not None and hasattr(asset_data, 'sortino_ratio'):
-                            detailed_metrics['sortino_ratio'] = asset_data.sortino_ratio
-                        else:
-                            # Manual Sortino ratio calculation
-                            annual_return = detailed_metrics.get('annual_return', 0)
-                            returns = detailed_metrics.get('_returns')
-                            
-                            if returns is not None and len(returns) > 0:
-                                # Calculate downside deviation (only negative returns)
-                                negative_returns = returns[returns < 0]
-                                if len(negative_returns) > 0:
-                                    downside_deviation = negative_returns.std() * (12 ** 0.5)  # Annualized
-                                    if downside_deviation > 0:
-                                        # Use proper risk-free rate based on currency
-                                        risk_free_rate = self.get_risk_free_rate(currency, years)
-                                        sortino_ratio = (annual_return - risk_free_rate) / downside_deviation
-                                        detailed_metrics['sortino_ratio'] = sortino_ratio
-                                    else:
-                                        detailed_metrics['sortino_ratio'] = 0.0
-                                else:
-                                    # No negative returns, use volatility as fallback
-                                    volatility = detailed_metrics.get('volatility', 0)
-                                    if volatility > 0:
-                                        # Use proper risk-free rate based on currency
-                                        risk_free_rate = self.get_risk_free_rate(currency, years)
-                                        sortino_ratio = (annual_return - risk_free_rate) / volatility
-                                        detailed_metrics['sortino_ratio'] = sortino_ratio
-                                    else:
-                                        detailed_metrics['sortino_ratio'] = 0.0
-                            else:
-                                # Fallback to Sharpe ratio if no returns data
-                                detailed_metrics['sortino_ratio'] = detailed_metrics.get('sharpe_ratio', 0.0)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to calculate Sortino ratio for {symbol}: {e}")
-                        detailed_metrics['sortino_ratio'] = 0.0
-                    
-                    # Additional metrics calculation
-                    try:
-                        # Calmar Ratio = Annual Return / Max Drawdown (absolute value)
-                        annual_return = detailed_metrics.get('annual_return', 0)
-                        max_drawdown = detailed_metrics.get('max_drawdown', 0)
-                        if max_drawdown != 0:
-                            calmar_ratio = annual_return / abs(max_drawdown)
-                            detailed_metrics['calmar_ratio'] = calmar_ratio
-                        else:
-                            detailed_metrics['calmar_ratio'] = 0.0
-                        
-                        # VaR 95% and CVaR 95% calculation
-                        returns = detailed_metrics.get('_returns')
-                        if returns is not None and len(returns) > 0:
-                            # VaR 95% - 5th percentile of returns (worst 5% of returns)
-                            var_95 = returns.quantile(0.05)
-                            detailed_metrics['var_95'] = var_95
-                            
-                            # CVaR 95% - Expected value of returns below VaR 95%
-                            returns_below_var = returns[returns <= var_95]
-                            if len(returns_below_var) > 0:
-                                cvar_95 = returns_below_var.mean()
-                                detailed_metrics['cvar_95'] = cvar_95
-                            else:
-                                detailed_metrics['cvar_95'] = var_95
-                        else:
-                            detailed_metrics['var_95'] = 0.0
-                            detailed_metrics['cvar_95'] = 0.0
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Failed to calculate additional metrics for {symbol}: {e}")
-                        detailed_metrics['calmar_ratio'] = 0.0
-                        detailed_metrics['var_95'] = 0.0
-                        detailed_metrics['cvar_95'] = 0.0
-                    
-                    # Clean up temporary data
-                    if '_returns' in detailed_metrics:
-                        del detailed_metrics['_returns']
-                    
-                    metrics_data['detailed_metrics'][symbol] = detailed_metrics
+                    prices = self._get_monthly_prices(asset_data) if asset_data is not None else None
+                    if prices is not None and len(prices) > 1:
+                        returns_by_symbol[symbol] = returns_from_prices(prices)
                         
                 except Exception as e:
-                    self.logger.warning(f"Failed to get detailed metrics for {symbol}: {e}")
-                    metrics_data['detailed_metrics'][symbol] = {
-                        'total_return': 0.0,
-                        'annual_return': 0.0,
-                        'volatility': 0.0,
-                        'sharpe_ratio': 0.0,
-                        'sortino_ratio': 0.0,
-                        'max_drawdown': 0.0,
-                        'calmar_ratio': 0.0,
-                        'var_95': 0.0,
-                        'cvar_95': 0.0
-                    }
+                    self.logger.warning(f"Failed to get price data for {symbol}: {e}")
+            
+            # Calculate all metrics for all symbols at once
+            metrics_data['detailed_metrics'] = self._compute_performance_metrics(returns_by_symbol, symbols, currency)
             
             # Calculate correlations if we have multiple assets
             if len(symbols) > 1:
@@ -9756,21 +9128,10 @@ class ShansAi:
                         clean_symbols = list(dict.fromkeys(clean_symbols))
                         
                         if len(clean_symbols) > 1:
-                            # Create AssetList for correlation calculation
-                            asset_list = ok.AssetList(clean_symbols)
-                            if hasattr(asset_list, 'correlation_matrix'):
-                                correlation_matrix = asset_list.correlation_matrix.tolist()
-                            else:
-                                # Fallback correlation matrix
-                                correlation_matrix = []
-                                for i in range(len(clean_symbols)):
-                                    row = []
-                                    for j in range(len(clean_symbols)):
-                                        if i == j:
-                                            row.append(1.0)
-                                        else:
-                                            row.append(0.3)  # Conservative estimate
-                                    correlation_matrix.append(row)
+                            # Same cached correlation result as the correlation matrix button
+                            asset_list = okama_cache.asset_list(clean_symbols, ccy=currency)
+                            correlation = correlation_service.get_or_compute(asset_list.assets_ror, currency)
+                            correlation_matrix = correlation.to_list()
                         else:
                             # Single asset - identity matrix
                             correlation_matrix = [[1.0]]
@@ -9820,7 +9181,7 @@ class ShansAi:
         """Create optimized metrics table using only okama.AssetList.describe data with additional metrics"""
         try:
             # Create AssetList for describe data
-            asset_list = ok.AssetList(symbols, ccy=currency)
+            asset_list = okama_cache.asset_list(symbols, ccy=currency)
             describe_data = asset_list.describe()
             
             if describe_data is None or describe_data.empty:
@@ -9870,9 +9231,7 @@ class ShansAi:
             
             # Add additional metrics at the end
             self._add_risk_free_rate_row(table_data, symbols, currency)
-            self._add_sharpe_ratio_row(table_data, symbols, currency, asset_list)
-            self._add_sortino_ratio_row(table_data, symbols, currency)
-            self._add_calmar_ratio_row(table_data, symbols, currency)
+            self._add_ratio_rows(table_data, symbols, currency, asset_list)
             
             # Create markdown table
             table_markdown = self._create_enhanced_markdown_table(table_data, headers)
@@ -9896,179 +9255,80 @@ class ShansAi:
             risk_free_row = ["Risk free rate"] + ["N/A"] * len(symbols)
             table_data.append(risk_free_row)
 
-    def _add_sharpe_ratio_row(self, table_data: list, symbols: list, currency: str, asset_list):
-        """Add Sharpe ratio row using manual calculation with okama data"""
-        try:
-            risk_free_rate = self.get_risk_free_rate(currency, 5.0)
-            sharpe_row = ["Sharpe Ratio"]
-            
-            for symbol in symbols:
-                try:
-                    # Calculate Sharpe ratio manually using CAGR and Risk from describe data
-                    describe_data = asset_list.describe()
-                    
-                    # Find CAGR and Risk values for the symbol
-                    cagr_value = None
-                    risk_value = None
-                    
-                    # First, try to find CAGR for 5 years period
-                    for idx in describe_data.index:
-                        property_name = describe_data.loc[idx, 'property']
-                        period = describe_data.loc[idx, 'period']
-                        
-                        if symbol in describe_data.columns:
-                            value = describe_data.loc[idx, symbol]
-                            if not pd.isna(value):
-                                if property_name == 'CAGR' and period == '5 years':
-                                    cagr_value = value
-                                elif property_name == 'Risk' and period == '5 years':
-                                    risk_value = value
-                    
-                    # Fallback: if no 5-year data, try to find any available CAGR and Risk
-                    if cagr_value is None:
-                        for idx in describe_data.index:
-                            property_name = describe_data.loc[idx, 'property']
-                            if symbol in describe_data.columns:
-                                value = describe_data.loc[idx, symbol]
-                                if not pd.isna(value) and property_name == 'CAGR':
-                                    cagr_value = value
-                                    break
-                    
-                    if risk_value is None:
-                        for idx in describe_data.index:
-                            property_name = describe_data.loc[idx, 'property']
-                            if symbol in describe_data.columns:
-                                value = describe_data.loc[idx, symbol]
-                                if not pd.isna(value) and property_name == 'Risk':
-                                    risk_value = value
-                                    break
-                    
-                    if cagr_value is not None and risk_value is not None and risk_value > 0:
-                        sharpe = (cagr_value - risk_free_rate) / risk_value
-                        sharpe_row.append(f"{sharpe:.3f}")
-                    else:
-                        sharpe_row.append("N/A")
-                        
-                except Exception as e:
-                    self.logger.warning(f"Could not calculate Sharpe ratio for {symbol}: {e}")
-                    sharpe_row.append("N/A")
-            
-            table_data.append(sharpe_row)
-        except Exception as e:
-            self.logger.warning(f"Could not add Sharpe ratio row: {e}")
-            sharpe_row = ["Sharpe Ratio"] + ["N/A"] * len(symbols)
-            table_data.append(sharpe_row)
-
-    def _add_sortino_ratio_row(self, table_data: list, symbols: list, currency: str):
-        """Add Sortino ratio row"""
+    def _compute_performance_metrics(self, returns_by_symbol: dict, symbols: list, currency: str) -> Dict[str, Dict[str, float]]:
+        """Compute performance metrics of all symbols with the metrics engine (0.0 where there is no data)"""
+        metric_keys = ['total_return', 'annual_return', 'volatility', 'sharpe_ratio', 'sortino_ratio',
+                       'max_drawdown', 'calmar_ratio', 'var_95', 'cvar_95']
+        metrics = None
+        if returns_by_symbol:
+            try:
+                returns = pd.concat(returns_by_symbol, axis=1).sort_index()
+                years = returns.notna().sum() / 12.0
+                # Risk-free rate depends on currency and investment period
+                risk_free_rates = [self.get_risk_free_rate(currency, float(y)) for y in years]
+                metrics = compute_metrics(returns, risk_free_rate=risk_free_rates)
+            except Exception as e:
+                self.logger.warning(f"Failed to calculate metrics: {e}")
+        
+        performance = {}
+        for symbol in symbols:
+            symbol_metrics = {}
+            for key in metric_keys:
+                value = metrics.at[key, symbol] if metrics is not None and symbol in metrics.columns else None
+                symbol_metrics[key] = 0.0 if value is None or pd.isna(value) else float(value)
+            performance[symbol] = symbol_metrics
+        return performance
+
+    def _get_monthly_prices(self, asset_data) -> Optional[pd.Series]:
+        """Get monthly price (or wealth index) series of an okama asset or portfolio"""
+        if hasattr(asset_data, 'close_monthly') and asset_data.close_monthly is not None:
+            prices = asset_data.close_monthly
+        elif hasattr(asset_data, 'close_daily') and asset_data.close_daily is not None:
+            prices = asset_data.close_daily
+        elif hasattr(asset_data, 'adj_close') and asset_data.adj_close is not None:
+            prices = asset_data.adj_close
+        elif hasattr(asset_data, 'wealth_index') and asset_data.wealth_index is not None:
+            prices = asset_data.wealth_index
+        else:
+            return None
+        
+        # Portfolio wealth index includes inflation column - portfolio comes first
+        if isinstance(prices, pd.DataFrame):
+            prices = prices.iloc[:, 0]
+        
+        # Daily data is converted to month-end values
+        index = prices.index
+        if isinstance(index, pd.DatetimeIndex):
+            prices = prices.groupby(index.to_period('M')).last()
+        elif isinstance(index, pd.PeriodIndex) and index.freqstr != 'M':
+            prices = prices.groupby(index.asfreq('M')).last()
+        return prices
+
+    def _get_assets_returns(self, asset_list, symbols: list) -> pd.DataFrame:
+        """Get monthly returns matrix of AssetList assets (already loaded, no extra downloads)"""
+        returns = getattr(asset_list, 'assets_ror', None)
+        if returns is None:
+            returns = returns_from_prices(asset_list.wealth_indexes)
+        return returns[[symbol for symbol in symbols if symbol in returns.columns]]
+
+    def _add_ratio_rows(self, table_data: list, symbols: list, currency: str, asset_list):
+        """Add Sharpe, Sortino and Calmar ratio rows for the last 5 years using the metrics engine"""
+        rows = [("Sharpe Ratio", 'sharpe_ratio'), ("Sortino Ratio", 'sortino_ratio'), ("Calmar Ratio", 'calmar_ratio')]
         try:
             risk_free_rate = self.get_risk_free_rate(currency, 5.0)
-            sortino_row = ["Sortino Ratio"]
-            
-            for symbol in symbols:
-                try:
-                    asset = ok.Asset(symbol)
-                    if hasattr(asset, 'close_monthly') and asset.close_monthly is not None:
-                        prices = asset.close_monthly
-                        returns = prices.pct_change().dropna()
-                        
-                        if len(returns) > 1:
-                            # Calculate downside deviation (only negative returns)
-                            downside_returns = returns[returns < 0]
-                            if len(downside_returns) > 1:
-                                downside_deviation = downside_returns.std() * np.sqrt(12)  # Annualized
-                                if downside_deviation > 0:
-                                    # Get CAGR from asset
-                                    cagr = asset.annual_return if hasattr(asset, 'annual_return') else 0
-                                    sortino = (cagr - risk_free_rate) / downside_deviation
-                                    sortino_row.append(f"{sortino:.3f}")
-                                else:
-                                    sortino_row.append("N/A")
-                            else:
-                                sortino_row.append("N/A")
-                        else:
-                            sortino_row.append("N/A")
-                    else:
-                        sortino_row.append("N/A")
-                except Exception as e:
-                    self.logger.warning(f"Could not calculate Sortino ratio for {symbol}: {e}")
-                    sortino_row.append("N/A")
-            
-            table_data.append(sortino_row)
-        except Exception as e:
-            self.logger.warning(f"Could not add Sortino ratio row: {e}")
-            sortino_row = ["Sortino Ratio"] + ["N/A"] * len(symbols)
-            table_data.append(sortino_row)
-
-    def _add_calmar_ratio_row(self, table_data: list, symbols: list, currency: str):
-        """Add Calmar ratio row using describe data"""
-        try:
-            calmar_row = ["Calmar Ratio"]
-            
-            # Create AssetList to get describe data
-            asset_list = ok.AssetList(symbols, ccy=currency)
-            describe_data = asset_list.describe()
+            returns = self._get_assets_returns(asset_list, symbols)
+            metrics = compute_metrics(trailing(returns, 5.0), risk_free_rate=risk_free_rate)
             
-            for symbol in symbols:
-                try:
-                    # Find CAGR and Max drawdown values for the symbol
-                    cagr_value = None
-                    max_drawdown_value = None
-                    
-                    # Try to find 5-year period first, then fallback to available periods
-                    for idx in describe_data.index:
-                        property_name = describe_data.loc[idx, 'property']
-                        period = describe_data.loc[idx, 'period']
-                        
-                        if symbol in describe_data.columns:
-                            value = describe_data.loc[idx, symbol]
-                            if not pd.isna(value):
-                                # Look for 5-year CAGR first
-                                if property_name == 'CAGR' and ('5 years' in str(period) or period == '5 years'):
-                                    cagr_value = value
-                                # Look for Max drawdowns - try 5-year first, then any available
-                                elif property_name == 'Max drawdowns' and ('5 years' in str(period) or period == '5 years'):
-                                    max_drawdown_value = value
-                    
-                    # If we didn't find 5-year Max drawdowns, try to find any Max drawdowns period
-                    if max_drawdown_value is None:
-                        for idx in describe_data.index:
-                            property_name = describe_data.loc[idx, 'property']
-                            period = describe_data.loc[idx, 'period']
-                            
-                            if symbol in describe_data.columns:
-                                value = describe_data.loc[idx, symbol]
-                                if not pd.isna(value) and property_name == 'Max drawdowns':
-                                    max_drawdown_value = value
-                                    break
-                    
-                    # If we didn't find 5-year CAGR, try to find any CAGR period
-                    if cagr_value is None:
-                        for idx in describe_data.index:
-                            property_name = describe_data.loc[idx, 'property']
-                            period = describe_data.loc[idx, 'period']
-                            
-                            if symbol in describe_data.columns:
-                                value = describe_data.loc[idx, symbol]
-                                if not pd.isna(value) and property_name == 'CAGR':
-                                    cagr_value = value
-                                    break
-                    
-                    if cagr_value is not None and max_drawdown_value is not None and max_drawdown_value < 0:
-                        calmar = cagr_value / abs(max_drawdown_value)
-                        calmar_row.append(f"{calmar:.3f}")
-                    else:
-                        calmar_row.append("N/A")
-                        
-                except Exception as e:
-                    self.logger.warning(f"Could not calculate Calmar ratio for {symbol}: {e}")
-                    calmar_row.append("N/A")
-            
-            table_data.append(calmar_row)
+            for title, key in rows:
+                row = [title]
+                for symbol in symbols:
+                    value = metrics.at[key, symbol] if symbol in metrics.columns else None
+                    row.append("N/A" if value is None or pd.isna(value) else f"{value:.3f}")
+                table_data.append(row)
         except Exception as e:
-            self.logger.warning(f"Could not add Calmar ratio row: {e}")
-            calmar_row = ["Calmar Ratio"] + ["N/A"] * len(symbols)
-            table_data.append(calmar_row)
+            self.logger.warning(f"Could not add ratio rows: {e}")
+            for title, _ in rows:
+                table_data.append([title] + ["N/A"] * len(symbols))
 
 
     def _create_portfolio_summary_metrics_table(self, portfolio, symbols: list, weights: list, currency: str) -> str:
@@ -11223,14 +10483,12 @@ class ShansAi:
                     if current_namespace in chinese_exchanges:
                         # For Chinese exchanges, get count from tushare
                         if self.tushare_service:
-                            total_count = self.tushare_service.get_exchange_symbols_count(current_namespace)
+                            total_count = await run_data(self.tushare_service.get_exchange_symbols_count, current_namespace)
                         else:
                             total_count = 0
                     else:
-                        # For regular exchanges, get count from okama
-                        import okama as ok
-                        symbols_df = ok.symbols_in_namespace(current_namespace)
-                        total_count = len(symbols_df)
+                        # For regular exchanges, get count from the symbol catalog
+                        total_count = len(await self._get_namespace_listing(current_namespace))
                     
                     symbols_per_page = 20
                     total_pages = (total_count + symbols_per_page - 1) // symbols_per_page
@@ -11478,13 +10736,13 @@ class ShansAi:
         """Handle period switching for Tushare assets via reply keyboard"""
         try:
             # Get symbol info
-            symbol_info = self.tushare_service.get_symbol_info(symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
             if not symbol_info:
                 await self._send_message_safe(update, f"❌ Информация о символе {symbol} не найдена")
                 return
             
             # Format information according to new structure
-            info_text = self._format_tushare_info_response(symbol_info, symbol)
+            info_text = await run_data(self._format_tushare_info_response, symbol_info, symbol)
             
             # Create reply keyboard for management
             reply_markup = self._create_info_reply_keyboard()
@@ -11513,14 +10771,12 @@ class ShansAi:
     async def _handle_okama_info_period_reply_button(self, update: Update, context: ContextTypes.DEFAULT_TYPE, symbol: str, period: str):
         """Handle period switching for Okama assets via reply keyboard"""
         try:
-            # Get asset
-            asset = ok.Asset(symbol)
-            
-            # Get key metrics for the period
-            key_metrics = await self._get_asset_key_metrics(asset, symbol, period=period)
+            # Get precomputed asset snapshot and key metrics for the period
+            snapshot = await self._get_asset_snapshot(symbol)
+            key_metrics = snapshot.metrics(period)
             
             # Format information
-            info_text = self._format_asset_info_response(asset, symbol, key_metrics)
+            info_text = self._format_asset_info_response(snapshot, symbol, key_metrics)
             
             # Create reply keyboard for management
             reply_markup = self._create_info_reply_keyboard()
@@ -11584,21 +10840,15 @@ class ShansAi:
                 await self._create_mixed_comparison_wealth_chart(update, context, symbols, currency)
             else:
                 # Regular comparison, create AssetList
-                comparison = ok.AssetList(symbols, ccy=currency)
+                comparison = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency)
+                wealth_indexes = await run_data(lambda: comparison.wealth_indexes)
                 
                 # Create chart using unified method
-                fig, ax = chart_styles.create_unified_wealth_chart(
-                    comparison.wealth_indexes, symbols, currency, title="Сравнение накопленной доходности"
+                img_bytes = await self._render_chart_bytes(
+                    'create_unified_wealth_chart',
+                    wealth_indexes, symbols, currency, title="Сравнение накопленной доходности"
                 )
-                
-                # Save chart to bytes
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(fig, img_buffer)
-                img_buffer.seek(0)
-                img_bytes = img_buffer.getvalue()
-                
-                # Clear matplotlib cache
-                chart_styles.cleanup_figure(fig)
+                img_buffer = io.BytesIO(img_bytes)
                 
                 # Create caption
                 caption = f"⚖️ Сравнение накопленной доходности: {', '.join(symbols)}\n\n"
@@ -11667,7 +10917,7 @@ class ShansAi:
                             
                             # Create portfolio using ok.Portfolio
                             import okama as ok
-                            portfolio = ok.Portfolio(
+                            portfolio = await okama_service.run_with_retry(okama_cache.portfolio,
                                 assets=assets,
                                 weights=weights,
                                 rebalancing_strategy=ok.Rebalance(period="year"),
@@ -11692,7 +10942,7 @@ class ShansAi:
             # Process individual assets separately
             if asset_symbols:
                 try:
-                    asset_asset_list = ok.AssetList(asset_symbols, ccy=currency)
+                    asset_asset_list = await okama_service.run_with_retry(okama_cache.asset_list, asset_symbols, ccy=currency)
                     
                     for symbol in asset_symbols:
                         if symbol in asset_asset_list.wealth_indexes.columns:
@@ -11719,19 +10969,11 @@ class ShansAi:
                 # Combine all wealth indexes into a DataFrame
                 wealth_df = pd.DataFrame(wealth_data)
                 
-                fig, ax = chart_styles.create_unified_wealth_chart(
+                img_bytes = await self._render_chart_bytes(
+                    'create_unified_wealth_chart',
                     wealth_df, list(wealth_data.keys()), currency, title="Сравнение накопленной доходности"
                 )
                 
-                # Save chart to bytes with memory optimization
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(fig, img_buffer)
-                img_buffer.seek(0)
-                img_bytes = img_buffer.getvalue()
-                
-                # Clear matplotlib cache to free memory
-                chart_styles.cleanup_figure(fig)
-                
                 
                 # Remove keyboard from previous message before sending new message
                 await self._remove_keyboard_before_new_message(update, context)
@@ -12113,11 +11355,11 @@ class ShansAi:
                     from datetime import timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=years * 365)
-                    asset_list = ok.AssetList(symbols, ccy=currency, 
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency, 
                                             first_date=start_date.strftime('%Y-%m-%d'), 
                                             last_date=end_date.strftime('%Y-%m-%d'))
                 else:
-                    asset_list = ok.AssetList(symbols, ccy=currency)
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency)
                 await self._create_drawdowns_chart(update, context, asset_list, symbols, currency)
         
         except Exception as e:
@@ -12166,7 +11408,7 @@ class ShansAi:
                             
                             # Create portfolio using ok.Portfolio
                             import okama as ok
-                            portfolio = ok.Portfolio(
+                            portfolio = await okama_service.run_with_retry(okama_cache.portfolio,
                                 assets=assets,
                                 weights=weights,
                                 rebalancing_strategy=ok.Rebalance(period="year"),
@@ -12195,7 +11437,7 @@ class ShansAi:
             # Process individual assets separately
             if asset_symbols:
                 try:
-                    asset_asset_list = ok.AssetList(asset_symbols, ccy=currency)
+                    asset_asset_list = await okama_service.run_with_retry(okama_cache.asset_list, asset_symbols, ccy=currency)
                     
                     for symbol in asset_symbols:
                         if symbol in asset_asset_list.wealth_indexes.columns:
@@ -12226,19 +11468,10 @@ class ShansAi:
                 # Combine all drawdowns into a DataFrame
                 drawdowns_df = pd.DataFrame(drawdowns_data)
                 
-                fig, ax = chart_styles.create_drawdowns_chart(
-                    drawdowns_df, list(drawdowns_data.keys()), currency
+                img_bytes = await self._render_chart_bytes(
+                    'create_drawdowns_chart', drawdowns_df, list(drawdowns_data.keys()), currency
                 )
                 
-                # Save chart to bytes with memory optimization
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(fig, img_buffer)
-                img_buffer.seek(0)
-                img_bytes = img_buffer.getvalue()
-                
-                # Clear matplotlib cache to free memory
-                chart_styles.cleanup_figure(fig)
-                
                 
                 # Remove keyboard from previous message before sending new message
                 await self._remove_keyboard_before_new_message(update, context)
@@ -12276,27 +11509,20 @@ class ShansAi:
                     cleaned_drawdowns_data[key] = series
             
             # Create drawdowns chart
-            fig, ax = chart_styles.create_drawdowns_chart(
-                data=pd.DataFrame(cleaned_drawdowns_data),
-                symbols=list(cleaned_drawdowns_data.keys()),
-                ccy=currency
+            img_bytes = await self._render_chart_bytes(
+                'create_drawdowns_chart',
+                pd.DataFrame(cleaned_drawdowns_data),
+                list(cleaned_drawdowns_data.keys()),
+                currency
             )
             
-            # Save chart
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            
-            # Clear matplotlib cache
-            chart_styles.cleanup_figure(fig)
-            
             # Create caption
             portfolio_count = len(portfolio_data)
             asset_count = len(asset_symbols)
             
             # Get portfolio names from context
             portfolio_names = []
-            for i, portfolio_series in enumerate(portfolio_data):
+            for i, _ in enumerate(portfolio_data):
                 if i < len(portfolio_contexts):
                     portfolio_names.append(portfolio_contexts[i]['symbol'])
                 else:
@@ -12320,7 +11546,7 @@ class ShansAi:
             # Send chart with keyboard
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=img_buffer,
+                photo=io.BytesIO(img_bytes),
                 caption=self._truncate_caption(caption),
                 reply_markup=keyboard
             )
@@ -12369,11 +11595,11 @@ class ShansAi:
                     from datetime import timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=years * 365)
-                    asset_list = ok.AssetList(symbols, ccy=currency, 
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency, 
                                             first_date=start_date.strftime('%Y-%m-%d'), 
                                             last_date=end_date.strftime('%Y-%m-%d'))
                 else:
-                    asset_list = ok.AssetList(symbols, ccy=currency)
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency)
                 await self._create_dividend_yield_chart(update, context, asset_list, symbols, currency)
             
         except Exception as e:
@@ -12422,7 +11648,7 @@ class ShansAi:
                             
                             # Create separate AssetList for portfolio assets
                             try:
-                                portfolio_asset_list = ok.AssetList(assets, ccy=currency)
+                                portfolio_asset_list = await okama_service.run_with_retry(okama_cache.asset_list, assets, ccy=currency)
                                 
                                 if hasattr(portfolio_asset_list, 'dividend_yields'):
                                     # Calculate weighted dividend yield
@@ -12454,7 +11680,7 @@ class ShansAi:
             # Process individual assets separately
             if asset_symbols:
                 try:
-                    asset_asset_list = ok.AssetList(asset_symbols, ccy=currency)
+                    asset_asset_list = await okama_service.run_with_retry(okama_cache.asset_list, asset_symbols, ccy=currency)
                     
                     if hasattr(asset_asset_list, 'dividend_yields'):
                         for symbol in asset_symbols:
@@ -12501,19 +11727,10 @@ class ShansAi:
             try:
                 # Convert Series to DataFrame for chart creation
                 dividends_df = pd.DataFrame(valid_dividends_data, index=[0]).T
-                fig, ax = chart_styles.create_dividend_yield_chart(
-                    dividends_df, list(valid_dividends_data.keys())
+                img_bytes = await self._render_chart_bytes(
+                    'create_dividend_yield_chart', dividends_df, list(valid_dividends_data.keys())
                 )
                 
-                # Save chart to bytes with memory optimization
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(fig, img_buffer)
-                img_buffer.seek(0)
-                img_bytes = img_buffer.getvalue()
-                
-                # Clear matplotlib cache to free memory
-                chart_styles.cleanup_figure(fig)
-                
                 
                 # Remove keyboard from previous message before sending new message
                 await self._remove_keyboard_before_new_message(update, context)
@@ -12577,11 +11794,11 @@ class ShansAi:
                     from datetime import timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=years * 365)
-                    asset_list = ok.AssetList(symbols, ccy=currency, 
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency, 
                                             first_date=start_date.strftime('%Y-%m-%d'), 
                                             last_date=end_date.strftime('%Y-%m-%d'))
                 else:
-                    asset_list = ok.AssetList(symbols, ccy=currency)
+                    asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency)
                 await self._create_correlation_matrix(update, context, asset_list, symbols, currency)
             
         except Exception as e:
@@ -12618,7 +11835,8 @@ class ShansAi:
                     # This is an individual asset symbol
                     all_assets.add(expanded_symbol)
             
-            all_assets = list(all_assets)
+            # Stable order: the same comparison context always maps to the same cached result
+            all_assets = sorted(all_assets)
             self.logger.info(f"Total unique assets for correlation: {len(all_assets)} - {all_assets}")
             
             if len(all_assets) < 2:
@@ -12629,7 +11847,7 @@ class ShansAi:
             # Create AssetList with all assets for correlation matrix
             try:
                 import okama as ok
-                asset_list = ok.AssetList(all_assets, ccy=currency)
+                asset_list = await okama_service.run_with_retry(okama_cache.asset_list, all_assets, ccy=currency)
                 
                 # Check if assets_ror data is available
                 if not hasattr(asset_list, 'assets_ror') or asset_list.assets_ror is None or asset_list.assets_ror.empty:
@@ -12637,8 +11855,9 @@ class ShansAi:
                     await self._send_callback_message(update, context, "ℹ️ Данные о доходности активов недоступны для создания корреляционной матрицы")
                     return
                 
-                # Get correlation matrix
-                correlation_matrix = asset_list.assets_ror.corr()
+                # Get correlation matrix (shared with AI analysis and Excel export)
+                correlation = await run_data(lambda: correlation_service.get_or_compute(asset_list.assets_ror, currency))
+                correlation_matrix = await run_data(correlation.matrix)
                 
                 self.logger.info(f"Correlation matrix created successfully, shape: {correlation_matrix.shape}")
                 
@@ -12648,21 +11867,13 @@ class ShansAi:
                     return
                 
                 # Create correlation matrix visualization using chart_styles
-                fig, ax = chart_styles.create_correlation_matrix_chart(
+                img_bytes = await self._render_chart_bytes(
+                    'create_correlation_matrix_chart',
                     correlation_matrix, data_source='okama'
                 )
                 
-                # Save chart to bytes with memory optimization
-                img_buffer = io.BytesIO()
-                chart_styles.save_figure(fig, img_buffer)
-                img_buffer.seek(0)
-                img_bytes = img_buffer.getvalue()
-                
-                # Clear matplotlib cache to free memory
-                chart_styles.cleanup_figure(fig)
-                
                 # Prepare correlation values text for caption
-                correlation_values_text = self._format_correlation_values(correlation_matrix)
+                correlation_values_text = self._format_correlation_values(correlation)
                 
                 
                 # Remove keyboard from previous message before sending new message
@@ -12681,8 +11892,6 @@ class ShansAi:
                 )
                 self.logger.info("Correlation matrix image sent successfully")
                 
-                plt.close(fig)
-                
             except Exception as chart_error:
                 self.logger.error(f"Error creating correlation matrix chart: {chart_error}")
                 await self._send_callback_message(update, context, f"❌ Ошибка при создании корреляционной матрицы: {str(chart_error)}")
@@ -12785,12 +11994,12 @@ class ShansAi:
             except Exception as e:
                 self.logger.warning(f"Could not remove buttons from old message: {e}")
             
-            # Get asset and metrics for the new period
-            asset = ok.Asset(symbol)
-            key_metrics = await self._get_asset_key_metrics(asset, symbol, period)
+            # Get precomputed asset snapshot and metrics for the new period
+            snapshot = await self._get_asset_snapshot(symbol)
+            key_metrics = snapshot.metrics(period)
             
             # Format response with new period
-            info_text = self._format_asset_info_response(asset, symbol, key_metrics)
+            info_text = self._format_asset_info_response(snapshot, symbol, key_metrics)
             info_text = info_text.replace("(за 1 год)", f"(за {period})")
             
             # Create updated keyboard with new period selected
@@ -12826,14 +12035,14 @@ class ShansAi:
                 return
             
             # Get symbol information from Tushare
-            symbol_info = self.tushare_service.get_symbol_info(symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
             
             if 'error' in symbol_info:
                 await self._send_callback_message(update, context, f"❌ Ошибка: {symbol_info['error']}")
                 return
             
             # Format information according to new structure
-            info_text = self._format_tushare_info_response(symbol_info, symbol, period)
+            info_text = await run_data(self._format_tushare_info_response, symbol_info, symbol, period)
             
             # Create updated keyboard with new period selected
             keyboard = self._create_info_interactive_keyboard_with_period(symbol, period)
@@ -12870,7 +12079,7 @@ class ShansAi:
             
             await self._send_ephemeral_message(update, context, "📉 Анализирую риски и просадки...", delete_after=2)
             
-            asset = ok.Asset(symbol)
+            asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
             
             # Get risk metrics
             risk_text = f"📉 **Анализ рисков для {symbol}**\n\n"
@@ -12928,7 +12137,7 @@ class ShansAi:
             
             await self._send_ephemeral_message(update, context, "🔍 Получаю все метрики...", delete_after=2)
             
-            asset = ok.Asset(symbol)
+            asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
             
             # Get comprehensive metrics
             metrics_text = f"📊 **Все метрики для {symbol}**\n\n"
@@ -12998,7 +12207,7 @@ class ShansAi:
             await self._send_ephemeral_message(update, context, "🧠 Анализирую график с помощью AI...", delete_after=3)
             
             # Get asset data for analysis
-            asset = ok.Asset(symbol)
+            asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
             
             # Prepare data for AI analysis
             data_info = {
@@ -13012,7 +12221,7 @@ class ShansAi:
             
             # Get AI analysis
             if self.gemini_service:
-                analysis_result = self.gemini_service.analyze_data(data_info)
+                analysis_result = await self.gemini_service.analyze_data(data_info)
                 if analysis_result and 'analysis' in analysis_result:
                     analysis_text = f"🧠 **AI-анализ графика {symbol}**\n\n{analysis_result['analysis']}"
                 else:
@@ -13090,22 +12299,21 @@ class ShansAi:
     async def _update_message_with_chart(self, update: Update, context: ContextTypes.DEFAULT_TYPE, chart_data: bytes, caption: str, reply_markup):
         """Update existing message with new chart and caption"""
         try:
-            import io
             from telegram import InputMediaPhoto
             
-            # Create media object
-            media = InputMediaPhoto(
-                media=io.BytesIO(chart_data),
-                caption=caption,
-                parse_mode='Markdown'
-            )
-            
-            # Update the message
-            await context.bot.edit_message_media(
-                chat_id=update.callback_query.message.chat_id,
-                message_id=update.callback_query.message.message_id,
-                media=media,
-                reply_markup=reply_markup
+            # Update the message (media object is built per attempt: file_id or uploaded bytes)
+            await self._send_photo_with_file_id_reuse(
+                lambda photo: context.bot.edit_message_media(
+                    chat_id=update.callback_query.message.chat_id,
+                    message_id=update.callback_query.message.message_id,
+                    media=InputMediaPhoto(
+                        media=photo,
+                        caption=caption,
+                        parse_mode='Markdown'
+                    ),
+                    reply_markup=reply_markup
+                ),
+                chart_data
             )
             
         except Exception as e:
@@ -13134,16 +12342,11 @@ class ShansAi:
         try:
             import io
             
-            def create_period_chart():
+            def draw_period_chart(asset_info, daily_data):
                 # Устанавливаем backend для headless режима
                 import matplotlib
                 matplotlib.use('Agg')
                 
-                asset = ok.Asset(symbol)
-                
-                # Получаем дневные данные
-                daily_data = asset.close_daily
-                
                 # Определяем количество торговых дней для периода
                 if period == '1Y':
                     trading_days = 252  # ~1 год торговых дней
@@ -13161,8 +12364,8 @@ class ShansAi:
                     filtered_data = daily_data
                 
                 # Получаем информацию об активе для заголовка
-                asset_name = getattr(asset, 'name', symbol)
-                currency = getattr(asset, 'currency', '')
+                asset_name = asset_info.get('name') or symbol
+                currency = asset_info.get('currency', '')
                 
                 # Используем ChartStyles для создания графика
                 fig, ax = self.chart_styles.create_price_chart(
@@ -13190,10 +12393,8 @@ class ShansAi:
                 
                 return chart_bytes
             
-            # Выполняем создание графика в отдельном потоке
-            import asyncio
-            loop = asyncio.get_event_loop()
-            chart_bytes = await loop.run_in_executor(None, create_period_chart)
+            # Выполняем создание графика в пуле рендеринга
+            chart_bytes = await self._render_asset_chart_cached('period', symbol, period, 'close_daily', draw_period_chart)
             
             return chart_bytes
             
@@ -13218,9 +12419,10 @@ class ShansAi:
             
             # Получаем информацию о дивидендах
             try:
-                asset = ok.Asset(symbol)
-                if hasattr(asset, 'dividends') and asset.dividends is not None:
-                    dividend_info = {'dividends': asset.dividends, 'currency': getattr(asset, 'currency', '')}
+                asset_info = await run_data(okama_service.get_asset_info, symbol)
+                dividends = await run_data(okama_service.get_asset_series, symbol, 'dividends')
+                if dividends is not None:
+                    dividend_info = {'dividends': dividends, 'currency': asset_info.get('currency', '')}
                 else:
                     dividend_info = {'error': 'No dividends data'}
             except Exception as e:
@@ -13276,7 +12478,7 @@ class ShansAi:
             
             if chart_bytes:
                 # Get symbol info for enhanced caption
-                symbol_info = self.tushare_service.get_symbol_info(symbol)
+                symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
                 chart_caption = self._format_tushare_chart_caption(symbol_info, symbol, "1 год")
                 await context.bot.send_photo(
                     chat_id=update.effective_chat.id,
@@ -13304,7 +12506,7 @@ class ShansAi:
             
             if chart_bytes:
                 # Get symbol info for enhanced caption
-                symbol_info = self.tushare_service.get_symbol_info(symbol)
+                symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
                 chart_caption = self._format_tushare_chart_caption(symbol_info, symbol, "5 лет")
                 await context.bot.send_photo(
                     chat_id=update.effective_chat.id,
@@ -13348,15 +12550,12 @@ class ShansAi:
         try:
             import io
             
-            def create_tushare_all_chart():
+            def create_tushare_all_chart(monthly_data):
                 try:
                     # Set backend for headless mode
                     import matplotlib
                     matplotlib.use('Agg')
                     
-                    # Get monthly data from Tushare (for all period)
-                    monthly_data = self.tushare_service.get_monthly_data(symbol)
-                    
                     if monthly_data.empty:
                         self.logger.warning(f"Monthly data is empty for {symbol}")
                         return None
@@ -13403,11 +12602,9 @@ class ShansAi:
                     self.logger.error(f"Traceback: {traceback.format_exc()}")
                     return None
             
-            # Run chart creation in thread to avoid blocking
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(create_tushare_all_chart)
-                chart_bytes = future.result(timeout=30)
+            # Fetch monthly data for all period in the data pool, draw in the render pool
+            monthly_data = await run_data(self.tushare_service.get_monthly_data, symbol)
+            chart_bytes = await run_render(create_tushare_all_chart, monthly_data, timeout=30.0)
             
             return chart_bytes
             
@@ -13425,14 +12622,14 @@ class ShansAi:
                 return
             
             # Get symbol info for English name
-            symbol_info = self.tushare_service.get_symbol_info(symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
             english_name = symbol_info.get('name', symbol.split('.')[0])
             
             # Get dividend data from Tushare
-            dividend_data = self.tushare_service.get_dividend_data(symbol)
+            dividend_data = await run_data(self.tushare_service.get_dividend_data, symbol)
             
             # Get rating data if available
-            rating_data = self.tushare_service.get_rating_data(symbol)
+            rating_data = await run_data(self.tushare_service.get_rating_data, symbol)
             
             # Format dividend information
             info_text = f"💵 Дивиденды {symbol}\n"
@@ -13563,33 +12760,38 @@ class ShansAi:
             if yearly_dividends.empty:
                 return None
             
-            # Create chart using ChartStyles
-            chart_styles = ChartStyles()
-            fig, ax = chart_styles.create_dividends_chart(
-                data=yearly_dividends,
-                symbol=symbol,
-                currency='HKD' if symbol.endswith('.HK') else 'CNY',
-                asset_name=symbol_info.get('name', symbol.split('.')[0])
-            )
-            
-            # Set title with proper format
-            english_name = symbol_info.get('name', symbol.split('.')[0])
-            currency = 'HKD' if symbol.endswith('.HK') else 'CNY'
-            title = f"{symbol} | {english_name} | {currency} | Дивиденды"
-            ax.set_title(title, **chart_styles.title)
-            
-            # Убираем подписи осей
-            ax.set_xlabel('')
-            ax.set_ylabel('')
-            
-            # Convert to bytes
-            buffer = io.BytesIO()
-            fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-            buffer.seek(0)
-            chart_bytes = buffer.getvalue()
-            buffer.close()
+            def draw_dividend_chart():
+                # Create chart using ChartStyles
+                chart_styles = ChartStyles()
+                fig, ax = chart_styles.create_dividends_chart(
+                    data=yearly_dividends,
+                    symbol=symbol,
+                    currency='HKD' if symbol.endswith('.HK') else 'CNY',
+                    asset_name=symbol_info.get('name', symbol.split('.')[0])
+                )
+                
+                # Set title with proper format
+                english_name = symbol_info.get('name', symbol.split('.')[0])
+                currency = 'HKD' if symbol.endswith('.HK') else 'CNY'
+                title = f"{symbol} | {english_name} | {currency} | Дивиденды"
+                ax.set_title(title, **chart_styles.title)
+                
+                # Убираем подписи осей
+                ax.set_xlabel('')
+                ax.set_ylabel('')
+                
+                # Convert to bytes
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+                buffer.seek(0)
+                chart_bytes = buffer.getvalue()
+                buffer.close()
+                chart_styles.cleanup_figure(fig)
+                
+                return chart_bytes
             
-            return chart_bytes
+            # Render in the render pool to avoid blocking
+            return await run_render(draw_dividend_chart, timeout=30.0)
             
         except Exception as e:
             self.logger.error(f"Error creating Tushare dividend chart for {symbol}: {e}")
@@ -13600,22 +12802,17 @@ class ShansAi:
         try:
             import io
             
-            def create_monthly_chart():
+            def draw_monthly_chart(asset_info, monthly_data):
                 # Устанавливаем backend для headless режима
                 import matplotlib
                 matplotlib.use('Agg')
                 
-                asset = ok.Asset(symbol)
-                
-                # Получаем месячные данные
-                monthly_data = asset.close_monthly
-                
                 # Берем последние 60 месяцев (5 лет)
                 filtered_data = monthly_data.tail(60)
                 
                 # Получаем информацию об активе для заголовка
-                asset_name = getattr(asset, 'name', symbol)
-                currency = getattr(asset, 'currency', '')
+                asset_name = asset_info.get('name') or symbol
+                currency = asset_info.get('currency', '')
                 
                 # Используем ChartStyles для создания графика
                 fig, ax = chart_styles.create_price_chart(
@@ -13645,10 +12842,7 @@ class ShansAi:
                 return output.getvalue()
             
             # Выполняем с таймаутом
-            chart_data = await asyncio.wait_for(
-                asyncio.to_thread(create_monthly_chart),
-                timeout=30.0
-            )
+            chart_data = await self._render_asset_chart_cached('monthly', symbol, '5Y', 'close_monthly', draw_monthly_chart)
             
             return chart_data
             
@@ -13664,19 +12858,14 @@ class ShansAi:
         try:
             import io
             
-            def create_all_chart():
+            def draw_all_chart(asset_info, monthly_data):
                 # Устанавливаем backend для headless режима
                 import matplotlib
                 matplotlib.use('Agg')
                 
-                asset = ok.Asset(symbol)
-                
-                # Получаем месячные данные за весь период
-                monthly_data = asset.close_monthly
-                
                 # Получаем информацию об активе для заголовка
-                asset_name = getattr(asset, 'name', symbol)
-                currency = getattr(asset, 'currency', '')
+                asset_name = asset_info.get('name') or symbol
+                currency = asset_info.get('currency', '')
                 
                 # Используем ChartStyles для создания графика
                 fig, ax = chart_styles.create_price_chart(
@@ -13706,10 +12895,7 @@ class ShansAi:
                 return output.getvalue()
             
             # Выполняем с таймаутом
-            chart_data = await asyncio.wait_for(
-                asyncio.to_thread(create_all_chart),
-                timeout=30.0
-            )
+            chart_data = await self._render_asset_chart_cached('all', symbol, 'MAX', 'close_monthly', draw_all_chart)
             
             return chart_data
             
@@ -13725,9 +12911,10 @@ class ShansAi:
         try:
             # Получаем данные о дивидендах
             try:
-                asset = ok.Asset(symbol)
-                if hasattr(asset, 'dividends') and asset.dividends is not None:
-                    dividend_info = {'dividends': asset.dividends, 'currency': getattr(asset, 'currency', '')}
+                asset_info = await run_data(okama_service.get_asset_info, symbol)
+                dividends = await run_data(okama_service.get_asset_series, symbol, 'dividends')
+                if dividends is not None:
+                    dividend_info = {'dividends': dividends, 'currency': asset_info.get('currency', '')}
                 else:
                     dividend_info = {'error': 'No dividends data'}
             except Exception as e:
@@ -13751,17 +12938,21 @@ class ShansAi:
                     return None
             
             # Получаем название компании
-            asset_name = symbol  # Default to symbol
-            try:
-                if hasattr(asset, 'name') and asset.name:
-                    asset_name = asset.name
-                elif hasattr(asset, 'symbol') and asset.symbol:
-                    asset_name = asset.symbol
-            except Exception as e:
-                self.logger.warning(f"Failed to get asset name for {symbol}: {e}")
+            asset_name = asset_info.get('name') or symbol
             
-            # Создаем график дивидендов
-            dividend_chart = self._create_dividend_chart(symbol, dividend_info['dividends'], dividend_info.get('currency', ''), asset_name)
+            # Создаем график дивидендов (повторные просмотры берутся из кэша)
+            cache_key = make_chart_key(
+                'dividends', symbol,
+                currency=dividend_info.get('currency', ''),
+                last_date=dividends.index[-1] if isinstance(dividends, pd.Series) else None
+            )
+            dividend_chart = chart_cache.get(cache_key)
+            if dividend_chart is None:
+                dividend_chart = await run_render(
+                    self._create_dividend_chart, symbol, dividend_info['dividends'], dividend_info.get('currency', ''), asset_name
+                )
+                if dividend_chart:
+                    chart_cache.set(cache_key, dividend_chart)
             
             if dividend_chart:
                 # Копирайт уже добавлен в _create_dividend_chart
@@ -13778,15 +12969,12 @@ class ShansAi:
         try:
             import io
             
-            def create_tushare_daily_chart():
+            def create_tushare_daily_chart(daily_data, symbol_info):
                 try:
                     # Set backend for headless mode
                     import matplotlib
                     matplotlib.use('Agg')
                     
-                    # Get daily data from Tushare
-                    daily_data = self.tushare_service.get_daily_data(symbol)
-                    
                     if daily_data.empty:
                         self.logger.warning(f"Daily data is empty for {symbol}")
                         return None
@@ -13800,8 +12988,7 @@ class ShansAi:
                     # Determine currency based on exchange
                     currency = 'HKD' if symbol.endswith('.HK') else 'CNY'
                     
-                    # Get asset information including English name
-                    symbol_info = self.tushare_service.get_symbol_info(symbol)
+                    # English name from asset information
                     english_name = symbol_info.get('name', symbol.split('.')[0])
                     
                     # Create chart using ChartStyles
@@ -13837,11 +13024,10 @@ class ShansAi:
                     self.logger.error(f"Traceback: {traceback.format_exc()}")
                     return None
             
-            # Run chart creation in thread to avoid blocking
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(create_tushare_daily_chart)
-                chart_bytes = future.result(timeout=30)
+            # Fetch Tushare data in the data pool, draw in the render pool
+            daily_data = await run_data(self.tushare_service.get_daily_data, symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
+            chart_bytes = await run_render(create_tushare_daily_chart, daily_data, symbol_info, timeout=30.0)
                 
             return chart_bytes
             
@@ -13856,15 +13042,12 @@ class ShansAi:
         try:
             import io
             
-            def create_tushare_monthly_chart():
+            def create_tushare_monthly_chart(monthly_data, symbol_info):
                 try:
                     # Set backend for headless mode
                     import matplotlib
                     matplotlib.use('Agg')
                     
-                    # Get monthly data from Tushare
-                    monthly_data = self.tushare_service.get_monthly_data(symbol)
-                    
                     if monthly_data.empty:
                         self.logger.warning(f"Monthly data is empty for {symbol}")
                         return None
@@ -13878,8 +13061,7 @@ class ShansAi:
                     # Determine currency based on exchange
                     currency = 'HKD' if symbol.endswith('.HK') else 'CNY'
                     
-                    # Get asset information including English name
-                    symbol_info = self.tushare_service.get_symbol_info(symbol)
+                    # English name from asset information
                     english_name = symbol_info.get('name', symbol.split('.')[0])
                     
                     # Create chart using ChartStyles
@@ -13915,11 +13097,10 @@ class ShansAi:
                     self.logger.error(f"Traceback: {traceback.format_exc()}")
                     return None
             
-            # Run chart creation in thread to avoid blocking
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(create_tushare_monthly_chart)
-                chart_bytes = future.result(timeout=30)
+            # Fetch Tushare data in the data pool, draw in the render pool
+            monthly_data = await run_data(self.tushare_service.get_monthly_data, symbol)
+            symbol_info = await run_data(self.tushare_service.get_symbol_info, symbol)
+            chart_bytes = await run_render(create_tushare_monthly_chart, monthly_data, symbol_info, timeout=30.0)
                 
             return chart_bytes
             
@@ -13934,9 +13115,10 @@ class ShansAi:
         try:
             # Получаем данные о дивидендах
             try:
-                asset = ok.Asset(symbol)
-                if hasattr(asset, 'dividends') and asset.dividends is not None:
-                    dividend_info = {'dividends': asset.dividends, 'currency': getattr(asset, 'currency', '')}
+                asset_info = await run_data(okama_service.get_asset_info, symbol)
+                dividends = await run_data(okama_service.get_asset_series, symbol, 'dividends')
+                if dividends is not None:
+                    dividend_info = {'dividends': dividends, 'currency': asset_info.get('currency', '')}
                 else:
                     dividend_info = {'error': 'No dividends data'}
             except Exception as e:
@@ -14141,7 +13323,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -14171,7 +13353,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_risk_metrics_report(update, context, portfolio, final_symbols, currency)
             
@@ -14232,7 +13414,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -14262,12 +13444,12 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             # Create portfolio metrics table using portfolio-specific logic
             try:
                 # Create portfolio object for metrics calculation
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency)
                 
                 # Create portfolio-specific metrics table
                 summary_table = self._create_portfolio_summary_metrics_table(
@@ -14286,7 +13468,8 @@ class ShansAi:
                             footnote = f"Источник: okama + расчёты Shans.ai • Валюта: {currency}"
                             
                             # Create image buffer
-                            img_buffer = self.chart_styles.render_table_image(
+                            img_buffer = io.BytesIO(await self._render_chart_bytes(
+                                'render_table_image',
                                 df=df,
                                 title=title,
                                 footnote=footnote,
@@ -14303,7 +13486,7 @@ class ShansAi:
                                 title_fontsize=14,
                                 footnote_fontsize=9,
                                 dpi=200
-                            )
+                            ))
                             
                             # Send image with reply keyboard
                             await self._send_portfolio_image_with_reply_keyboard(
@@ -14390,7 +13573,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -14420,7 +13603,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_monte_carlo_forecast(update, context, portfolio, final_symbols, currency)
             
@@ -14481,7 +13664,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -14511,7 +13694,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_monte_carlo_forecast(update, context, portfolio, final_symbols, currency)
             
@@ -14577,7 +13760,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -14607,7 +13790,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_forecast_chart(update, context, portfolio, final_symbols, currency)
             
@@ -14668,7 +13851,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -14698,7 +13881,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_forecast_chart(update, context, portfolio, final_symbols, currency)
             
@@ -14713,11 +13896,13 @@ class ShansAi:
             await self._send_ephemeral_message(update, context, "📊 Подготавливаю детальную статистику...", parse_mode='Markdown', delete_after=3)
 
             # Prepare comprehensive metrics data
-            metrics_data = self._prepare_portfolio_metrics_data(portfolio, symbols, currency)
+            with phase(PHASE_COMPUTE):
+                metrics_data = await run_data(self._prepare_portfolio_metrics_data, portfolio, symbols, currency)
             
             if metrics_data:
                 # Create Excel file
-                excel_buffer = self._create_portfolio_metrics_excel(metrics_data, symbols, currency)
+                with phase(PHASE_COMPUTE):
+                    excel_buffer = await run_data(self._create_portfolio_metrics_excel, metrics_data, symbols, currency)
                 
                 if excel_buffer:
                     # Ensure portfolio keyboard is shown
@@ -15054,7 +14239,7 @@ class ShansAi:
             # Individual asset metrics - use the same calculation logic as in _prepare_comprehensive_metrics
             for symbol in symbols:
                 try:
-                    asset = ok.Asset(symbol)
+                    asset = okama_cache.asset(symbol)
                     asset_metrics = {}
                     
                     # Get asset returns data
@@ -15599,8 +14784,8 @@ class ShansAi:
                 self.logger.warning(f"Could not get CVaR: {e}")
             
             # 5. Максимальная просадка
-            if hasattr(portfolio, 'drawdowns'):
-                drawdowns = portfolio.drawdowns
+            drawdowns = portfolio_series.get(portfolio).drawdowns
+            if drawdowns is not None:
                 if hasattr(drawdowns, 'min'):
                     max_dd = drawdowns.min()
                     if max_dd is not None:
@@ -15639,8 +14824,8 @@ class ShansAi:
                         )
             
             # 6. Период восстановления
-            if hasattr(portfolio, 'recovery_period'):
-                recovery = portfolio.recovery_period
+            recovery = portfolio_series.get(portfolio).recovery_period
+            if recovery is not None:
                 if hasattr(recovery, 'max'):
                     max_recovery = recovery.max()
                     if max_recovery is not None:
@@ -15736,8 +14921,8 @@ class ShansAi:
                         recommendations.append("• Увеличьте долю защитных активов (облигации, золото)")
             
             # Check max drawdown (weight: 30%)
-            if hasattr(portfolio, 'drawdowns'):
-                drawdowns = portfolio.drawdowns
+            drawdowns = portfolio_series.get(portfolio).drawdowns
+            if drawdowns is not None:
                 if hasattr(drawdowns, 'min'):
                     max_dd = drawdowns.min()
                     if max_dd is not None:
@@ -15842,8 +15027,8 @@ class ShansAi:
                     assessment += f"📊 **Ключевые показатели:**\n"
                     assessment += f"• Волатильность: {volatility_emoji} {volatility_assessment} ({risk_pct:.1f}%)\n"
                     
-                    if hasattr(portfolio, 'drawdowns'):
-                        drawdowns = portfolio.drawdowns
+                    drawdowns = portfolio_series.get(portfolio).drawdowns
+                    if drawdowns is not None:
                         if hasattr(drawdowns, 'min'):
                             max_dd = drawdowns.min()
                             if max_dd is not None:
@@ -15863,45 +15048,87 @@ class ShansAi:
             self.logger.error(f"Error assessing portfolio risk: {e}")
             return "Не удалось оценить общий уровень риска портфеля."
 
+    def _get_portfolio_wealth_history(self, portfolio):
+        """Historical portfolio wealth series (first column of wealth_index)"""
+        return portfolio_series.get(portfolio).wealth
+
+    async def _get_portfolio_simulation(self, portfolio, years: int = 10, distribution: str = 'norm'):
+        """
+        Get portfolio forecast simulation shared by Monte Carlo and percentile charts
+        
+        The run is simulated once per (portfolio spec, distribution, horizon, seed) and
+        stored normalized in the simulation cache; callers rescale it to their starting value.
+        
+        Returns:
+            Tuple (SimulationResult, historical wealth series)
+        """
+        history = await run_data(self._get_portfolio_wealth_history, portfolio)
+        weights = getattr(portfolio, 'weights', None)
+        key = make_simulation_key(
+            getattr(portfolio, 'symbols', None) or [],
+            list(weights) if weights is not None else None,
+            getattr(portfolio, 'currency', None),
+            history.index[0], history.index[-1],
+            distribution, years, MONTE_CARLO_PATHS, MONTE_CARLO_SEED,
+            extra=str(getattr(portfolio, 'rebalancing_strategy', ''))
+        )
+        with phase(PHASE_COMPUTE):
+            simulation = await run_data(
+                simulation_cache.get_or_create, key,
+                lambda: simulate_wealth(returns_from_prices(history), years=years, distribution=distribution)
+            )
+        return simulation, history
+
+    async def _get_efficient_frontier(self, items: list, currency: str):
+        """
+        Get efficient frontier for assets and/or portfolios
+        
+        The frontier is computed from the AssetList monthly returns by the
+        warm-start optimizer and cached per (asset set, currency, period).
+        
+        Returns:
+            FrontierResult
+        """
+        asset_list = await okama_service.run_with_retry(okama_cache.asset_list, items, ccy=currency)
+        returns = asset_list.assets_ror
+        years = len(returns) / 12 if len(returns) else None
+        risk_free_rate = self.get_risk_free_rate(currency, years)
+        with phase(PHASE_COMPUTE):
+            return await run_data(frontier_cache.get_or_compute, returns, currency, risk_free_rate)
+
     async def _create_monte_carlo_forecast(self, update: Update, context: ContextTypes.DEFAULT_TYPE, portfolio, symbols: list, currency: str):
         """Create and send Monte Carlo forecast chart for portfolio"""
         try:
             self.logger.info(f"Creating Monte Carlo forecast chart for portfolio: {symbols}")
             
-            # Generate Monte Carlo forecast (okama creates the figure)
-            forecast_data = portfolio.plot_forecast_monte_carlo(distr="norm", years=10, n=20)
-
-            # Get the current figure from matplotlib (created by okama)
-            current_fig = plt.gcf()
-
-            # Apply chart styles to the current figure using chart_styles
-            if current_fig.axes:
-                ax = current_fig.axes[0]
-                
-                # Get portfolio weights
-                weights = portfolio.weights if hasattr(portfolio, 'weights') else None
-                
-                # Apply Monte Carlo chart styling using chart_styles
-                chart_styles.create_monte_carlo_chart(
-                    current_fig, ax, symbols, currency, weights, forecast_data=forecast_data
-                )
+            # Simulate all paths at once, then plot a sample of them with percentile bands
+            simulation, history = await self._get_portfolio_simulation(portfolio, years=10, distribution='norm')
+            simulation = simulation.rescaled(float(history.iloc[-1]))
             
-            # Save the figure using chart_styles
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(current_fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
+            # Get portfolio weights
+            weights = portfolio.weights if hasattr(portfolio, 'weights') else None
             
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(current_fig)
+            img_bytes = await self._render_chart_bytes(
+                'create_monte_carlo_forecast_chart',
+                history=history,
+                paths=simulation.sample_paths(MONTE_CARLO_PLOT_PATHS),
+                bands=simulation.bands(DEFAULT_PERCENTILES),
+                symbols=symbols,
+                currency=currency,
+                weights=list(weights) if weights is not None else None,
+                n_paths=simulation.n_paths,
+                years=simulation.years
+            )
             
             # Ensure portfolio keyboard is shown
             await self._manage_reply_keyboard(update, context, "portfolio")
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=img_buffer,
+                photo=io.BytesIO(img_bytes),
                 caption=self._truncate_caption(
-                    f"💡 Возможные траектории роста портфеля на основе исторической волатильности и доходности."
+                    f"💡 Возможные траектории роста портфеля на основе исторической волатильности и доходности.\n\n"
+                    f"• Смоделировано траекторий: {simulation.n_paths}\n"
+                    f"• Полоса: 10–90 процентили, линия — медиана"
                 ),
             )
             
@@ -15914,51 +15141,34 @@ class ShansAi:
         try:
             self.logger.info(f"Creating forecast chart with percentiles for portfolio: {symbols}")
             
-            # Generate forecast chart using okama
-            # y.plot_forecast(years=10, today_value=1000, percentiles=[10, 50, 90])
-            forecast_data = portfolio.plot_forecast(
-                years=10, 
-                today_value=1000, 
-                percentiles=[10, 50, 90]
-            )
-            
-            # Get the current figure from matplotlib (created by okama)
-            current_fig = plt.gcf()
-            
-            # Apply chart styles to the current figure using the new unified method
-            if current_fig.axes:
-                ax = current_fig.axes[0]  # Get the first (and usually only) axes
-                
-                # Apply unified percentile forecast chart styling
-                chart_styles.create_percentile_forecast_chart(
-                    current_fig,
-                    ax,
-                    symbols=symbols,
-                    currency=currency,
-                    data_source='okama'
-                )
+            # Percentile bands come from the same simulation run as the Monte Carlo chart
+            simulation, _ = await self._get_portfolio_simulation(portfolio, years=10, distribution='norm')
+            summary = simulation.summary(DEFAULT_PERCENTILES)
+            weights = portfolio.weights if hasattr(portfolio, 'weights') else None
             
-            # Save the figure using chart_styles
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(current_fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(current_fig)
+            img_bytes = await self._render_chart_bytes(
+                'create_percentile_forecast_bands_chart',
+                bands=simulation.rescaled(1000).bands(DEFAULT_PERCENTILES),
+                symbols=symbols,
+                currency=currency,
+                weights=list(weights) if weights is not None else None,
+                data_source='okama'
+            )
             
             # Ensure portfolio keyboard is shown
             await self._manage_reply_keyboard(update, context, "portfolio")
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=img_buffer,
+                photo=io.BytesIO(img_bytes),
                 caption=self._truncate_caption(
                     f"📈 Прогноз с процентилями для портфеля: {', '.join(symbols)}\n\n"
                     f"• Период: 10 лет\n"
                     f"• Начальная стоимость: 1000 {currency}\n"
                     f"• 10% процентиль: пессимистичный сценарий\n"
                     f"• 50% процентиль: средний сценарий\n"
-                    f"• 90% процентиль: оптимистичный сценарий"
+                    f"• 90% процентиль: оптимистичный сценарий\n"
+                    f"• Медианная CAGR: {summary['cagr'][50]:.1%}\n"
+                    f"• Вероятность убытка: {summary['probability_of_loss']:.0%}"
                 ),
             )
             
@@ -16019,7 +15229,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     if i < len(weights):
@@ -16057,12 +15267,12 @@ class ShansAi:
                 from datetime import timedelta
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=years * 365)
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency,
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency,
                                        first_date=start_date.strftime('%Y-%m-%d'), 
                                        last_date=end_date.strftime('%Y-%m-%d'))
                 self.logger.info(f"Created portfolio with period {period}")
             else:
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency)
                 self.logger.info(f"Created portfolio with maximum available period")
             await self._create_portfolio_drawdowns_chart(update, context, portfolio, final_symbols, currency, weights, portfolio_symbol)
             
@@ -16131,7 +15341,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -16161,7 +15371,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_portfolio_drawdowns_chart(update, context, portfolio, final_symbols, currency, weights, "Портфель")
             
@@ -16174,27 +15384,30 @@ class ShansAi:
         try:
             self.logger.info(f"Creating portfolio drawdowns chart for portfolio: {symbols}")
             
-            # Get drawdowns data from portfolio
-            drawdowns_data = portfolio.drawdowns
+            # Get drawdowns data from portfolio (computed once per cached portfolio)
+            series = portfolio_series.get(portfolio)
+            drawdowns_data = await run_data(lambda: series.drawdowns)
             
             # Create drawdowns chart using chart_styles
-            fig, ax = chart_styles.create_portfolio_drawdowns_chart(
-                data=drawdowns_data, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_name
+            img_bytes = await self._render_chart_bytes(
+                'create_portfolio_drawdowns_chart',
+                data=drawdowns_data, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_name,
+                cache_key=make_chart_key(
+                    'portfolio_drawdowns', symbols, weights, currency,
+                    period=str(drawdowns_data.index[0])[:10] if len(drawdowns_data) else None,
+                    last_date=drawdowns_data.index[-1] if len(drawdowns_data) else None,
+                    extra=portfolio_name
+                )
             )
-            
-            # Save the figure using chart_styles
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            chart_styles.cleanup_figure(fig)
-            img_buffer.seek(0)
+            img_buffer = io.BytesIO(img_bytes)
             
             # Get drawdowns statistics
             try:
                 # Get 5 largest drawdowns
-                largest_drawdowns = portfolio.drawdowns.nsmallest(5)
+                largest_drawdowns = series.largest_drawdowns(5)
                 
-                # Get longest recovery periods (convert to years)
-                longest_recoveries = portfolio.recovery_period.nlargest(5) / 12
+                # Get longest recovery periods (in years)
+                longest_recoveries = await run_data(series.longest_recoveries, 5)
                 
                 # Build enhanced caption with weights in title
                 symbols_with_weights = []
@@ -16249,14 +15462,9 @@ class ShansAi:
             
             # Try to get dividend yield data from portfolio first (respects period)
             try:
-                # First try portfolio dividend yield with assets (shows individual assets)
-                if hasattr(portfolio, 'dividend_yield_with_assets'):
-                    dividend_yield_data = portfolio.dividend_yield_with_assets
-                    self.logger.info("Using portfolio.dividend_yield_with_assets (respects period)")
-                else:
-                    # Fallback to portfolio dividend yield (aggregated)
-                    dividend_yield_data = portfolio.dividend_yield
-                    self.logger.info("Using portfolio.dividend_yield (respects period)")
+                # Portfolio dividend yield with assets (shows individual assets) or aggregated one
+                series = portfolio_series.get(portfolio)
+                dividend_yield_data = await run_data(lambda: series.dividend_yield)
                 
                 if dividend_yield_data is None or dividend_yield_data.empty:
                     await self._send_callback_message(update, context, "❌ Данные о дивидендах не содержат информацию для отображения.")
@@ -16276,12 +15484,12 @@ class ShansAi:
                         from datetime import datetime, time, timedelta
                         end_date = datetime.now()
                         start_date = end_date - timedelta(days=years * 365)
-                        asset_list = ok.AssetList(symbols, ccy=currency,
+                        asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency,
                                                 first_date=start_date.strftime('%Y-%m-%d'), 
                                                 last_date=end_date.strftime('%Y-%m-%d'))
                         self.logger.info(f"Created AssetList with period {current_period}")
                     else:
-                        asset_list = ok.AssetList(symbols, ccy=currency)
+                        asset_list = await okama_service.run_with_retry(okama_cache.asset_list, symbols, ccy=currency)
                         self.logger.info("Created AssetList without period (MAX)")
                     
                     if hasattr(asset_list, 'dividend_yields') and not asset_list.dividend_yields.empty:
@@ -16296,16 +15504,11 @@ class ShansAi:
                     return
             
             # Create dividends chart using chart_styles
-            fig, ax = chart_styles.create_dividend_yield_chart(
+            img_bytes = await self._render_chart_bytes(
+                'create_dividend_yield_chart',
                 data=dividend_yield_data, symbols=symbols, weights=weights, portfolio_name=portfolio_name
             )
             
-            # Save the figure using chart_styles
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            chart_styles.cleanup_figure(fig)
-            img_buffer.seek(0)
-            
             # Build caption with weights in title
             symbols_with_weights = []
             for i, symbol in enumerate(symbols):
@@ -16319,7 +15522,7 @@ class ShansAi:
             await self._manage_reply_keyboard(update, context, "portfolio")
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=img_buffer,
+                photo=io.BytesIO(img_bytes),
                 caption=self._truncate_caption(caption),
             )
             
@@ -16383,7 +15586,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -16413,7 +15616,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_portfolio_returns_chart(update, context, portfolio, final_symbols, currency, weights)
             
@@ -16474,7 +15677,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     if i < len(weights):
@@ -16512,12 +15715,12 @@ class ShansAi:
                 from datetime import timedelta
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=years * 365)
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency,
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency,
                                        first_date=start_date.strftime('%Y-%m-%d'), 
                                        last_date=end_date.strftime('%Y-%m-%d'))
                 self.logger.info(f"Created portfolio with period {period}")
             else:
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency)
                 self.logger.info(f"Created portfolio with maximum available period")
             await self._create_portfolio_dividends_chart(update, context, portfolio, final_symbols, currency, weights, portfolio_symbol)
             
@@ -16578,7 +15781,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -16613,12 +15816,12 @@ class ShansAi:
                 from datetime import timedelta
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=years * 365)
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency,
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency,
                                        first_date=start_date.strftime('%Y-%m-%d'), 
                                        last_date=end_date.strftime('%Y-%m-%d'))
                 self.logger.info(f"Created portfolio with period {period}")
             else:
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency)
                 self.logger.info(f"Created portfolio with maximum available period")
             
             await self._create_portfolio_returns_chart(update, context, portfolio, final_symbols, currency, weights)
@@ -16633,41 +15836,27 @@ class ShansAi:
         try:
             self.logger.info(f"Creating portfolio returns chart for portfolio: {symbols}")
             
-            # Generate annual returns data
-            returns_data = portfolio.annual_return_ts
-            
-            # Create portfolio returns chart with chart_styles
-            fig, ax = chart_styles.create_portfolio_returns_chart(
-                data=returns_data, symbols=symbols, currency=currency, weights=weights
+            # Annual returns data (computed once per cached portfolio)
+            series = portfolio_series.get(portfolio)
+            returns_data = await run_data(lambda: series.annual_returns)
+            
+            # Create portfolio returns chart in the render pool
+            img_bytes = await self._render_chart_bytes(
+                'create_portfolio_returns_chart',
+                data=returns_data, symbols=symbols, currency=currency, weights=weights,
+                cache_key=make_chart_key(
+                    'portfolio_returns', symbols, weights, currency,
+                    period=str(returns_data.index[0]) if len(returns_data) else None
+                )
             )
-            
-            # Save chart to bytes with memory optimization
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(fig)
+            img_buffer = io.BytesIO(img_bytes)
             
             # Get returns statistics
             try:
                 # Get returns statistics
-                mean_return_monthly = portfolio.mean_return_monthly
-                mean_return_annual = portfolio.mean_return_annual
-                cagr = portfolio.get_cagr()
-                
-                # Handle CAGR which might be a Series
-                if hasattr(cagr, '__iter__') and not isinstance(cagr, str):
-                    # If it's a Series or array-like, get the first value
-                    if hasattr(cagr, 'iloc'):
-                        cagr_value = cagr.iloc[0]
-                    elif hasattr(cagr, '__getitem__'):
-                        cagr_value = cagr[0]
-                    else:
-                        cagr_value = list(cagr)[0]
-                else:
-                    cagr_value = cagr
+                return_stats = await run_data(lambda: series.return_stats)
+                mean_return_annual = return_stats['mean_return_annual']
+                cagr_value = return_stats['cagr']
                 
                 # Build enhanced caption with weights in title
                 symbols_with_weights = []
@@ -16676,6 +15865,7 @@ class ShansAi:
                     weight = weights[i] if i < len(weights) else 0.0
                     symbols_with_weights.append(f"{symbol_name} ({weight:.1%})")
                 
+                caption = f"Динамика доходности портфеля\n\n"
                 caption += f"• Средняя годовая доходность: {mean_return_annual:.2%}\n"
                 caption += f"• CAGR (Compound Annual Growth Rate): {cagr_value:.2%}\n\n"
                 
@@ -16758,7 +15948,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database - be more lenient
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     # Don't check price data length as it might be empty but symbol still valid
                     valid_symbols.append(symbol)
@@ -16797,12 +15987,12 @@ class ShansAi:
                 from datetime import timedelta
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=years * 365)
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency,
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency,
                                        first_date=start_date.strftime('%Y-%m-%d'), 
                                        last_date=end_date.strftime('%Y-%m-%d'))
                 self.logger.info(f"Created portfolio with period {current_period}")
             else:
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency)
                 self.logger.info(f"Created portfolio with maximum available period")
             
             await self._create_portfolio_wealth_chart(update, context, portfolio, final_symbols, currency, weights, "Портфель")
@@ -16820,19 +16010,17 @@ class ShansAi:
             wealth_index = portfolio.wealth_index
             
             # Create portfolio chart with chart_styles using unified method
-            fig, ax = chart_styles.create_unified_wealth_chart(
-                data=wealth_index, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_symbol
+            img_bytes = await self._render_chart_bytes(
+                'create_unified_wealth_chart',
+                data=wealth_index, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_symbol,
+                cache_key=make_chart_key(
+                    'portfolio_wealth', symbols, weights, currency,
+                    period=str(wealth_index.index[0])[:10] if len(wealth_index) else None,
+                    last_date=wealth_index.index[-1] if len(wealth_index) else None,
+                    extra=portfolio_symbol
+                )
             )
             
-            # Save chart to bytes with memory optimization
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(fig)
-            
             # Get final portfolio value safely
             try:
                 final_value = portfolio.wealth_index.iloc[-1]
@@ -17003,19 +16191,17 @@ class ShansAi:
             wealth_index = portfolio.wealth_index
             
             # Create portfolio chart with chart_styles using unified method
-            fig, ax = chart_styles.create_unified_wealth_chart(
-                data=wealth_index, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_name
+            img_bytes = await self._render_chart_bytes(
+                'create_unified_wealth_chart',
+                data=wealth_index, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_name,
+                cache_key=make_chart_key(
+                    'portfolio_wealth', symbols, weights, currency,
+                    period=str(wealth_index.index[0])[:10] if len(wealth_index) else None,
+                    last_date=wealth_index.index[-1] if len(wealth_index) else None,
+                    extra=portfolio_name
+                )
             )
             
-            # Save chart to bytes with memory optimization
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            img_buffer.seek(0)
-            img_bytes = img_buffer.getvalue()
-            
-            # Clear matplotlib cache to free memory
-            chart_styles.cleanup_figure(fig)
-            
             # Build caption with weights in title
             symbols_with_weights = []
             for i, symbol in enumerate(symbols):
@@ -17115,12 +16301,12 @@ class ShansAi:
                 from datetime import timedelta
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=years * 365)
-                portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency,
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency,
                                        first_date=start_date.strftime('%Y-%m-%d'), 
                                        last_date=end_date.strftime('%Y-%m-%d'))
                 self.logger.info(f"Created portfolio with period {period}")
             else:
-                portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency)
                 self.logger.info(f"Created portfolio with maximum available period")
             
             await self._create_portfolio_wealth_chart(update, context, portfolio, symbols, currency, weights, portfolio_symbol)
@@ -17185,7 +16371,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -17215,7 +16401,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_portfolio_rolling_cagr_chart(update, context, portfolio, final_symbols, currency, weights)
             
@@ -17275,7 +16461,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -17305,7 +16491,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_portfolio_rolling_cagr_chart(update, context, portfolio, final_symbols, currency, weights)
             
@@ -17319,24 +16505,26 @@ class ShansAi:
         try:
             self.logger.info(f"Creating portfolio rolling CAGR chart for portfolio: {symbols}")
             
-            # Get rolling CAGR data
-            rolling_cagr_data = portfolio.get_rolling_cagr()
-            
-            # Create standardized rolling CAGR chart using chart_styles
-            fig, ax = chart_styles.create_portfolio_rolling_cagr_chart(
-                data=rolling_cagr_data, symbols=symbols, currency=currency, weights=weights
+            # Get rolling CAGR data (computed once per cached portfolio)
+            series = portfolio_series.get(portfolio)
+            rolling_cagr_data = await run_data(series.rolling_cagr)
+            
+            # Create standardized rolling CAGR chart in the render pool
+            img_bytes = await self._render_chart_bytes(
+                'create_portfolio_rolling_cagr_chart',
+                data=rolling_cagr_data, symbols=symbols, currency=currency, weights=weights,
+                cache_key=make_chart_key(
+                    'portfolio_rolling_cagr', symbols, weights, currency,
+                    period=str(rolling_cagr_data.index[0]) if len(rolling_cagr_data) else None,
+                    last_date=rolling_cagr_data.index[-1] if len(rolling_cagr_data) else None
+                )
             )
-            
-            # Save the figure using standardized method
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            chart_styles.cleanup_figure(fig)
-            img_buffer.seek(0)
+            img_buffer = io.BytesIO(img_bytes)
             
             # Get rolling CAGR statistics
             try:
-                # Get rolling CAGR data for statistics
-                rolling_cagr_series = portfolio.get_rolling_cagr()
+                # Rolling CAGR data for statistics
+                rolling_cagr_series = rolling_cagr_data
                 
                 # Calculate statistics
                 mean_rolling_cagr = rolling_cagr_series.mean()
@@ -17457,7 +16645,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -17487,7 +16675,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_portfolio_compare_assets_chart(update, context, portfolio, final_symbols, currency, weights, portfolio_name)
             
@@ -17549,7 +16737,7 @@ class ShansAi:
                     self.logger.info(f"Validating symbol {i}: '{symbol}' (type: {type(symbol)})")
                     
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -17579,7 +16767,7 @@ class ShansAi:
                 valid_weights = [1.0 / len(valid_symbols)] * len(valid_symbols)
             
             # Create Portfolio with validated symbols and period
-            portfolio = self._create_portfolio_with_period(valid_symbols, valid_weights, currency, user_context)
+            portfolio = await okama_service.run_with_retry(self._create_portfolio_with_period, valid_symbols, valid_weights, currency, user_context)
             
             await self._create_portfolio_compare_assets_chart(update, context, portfolio, final_symbols, currency, weights, portfolio_name)
             
@@ -17594,19 +16782,14 @@ class ShansAi:
             self.logger.info(f"Creating portfolio compare assets chart for portfolio: {symbols}")
             
             # Get wealth index with assets data
-            compare_data = portfolio.wealth_index_with_assets
+            compare_data = await run_data(lambda: portfolio.wealth_index_with_assets)
             
             # Create standardized comparison chart using chart_styles
-            fig, ax = chart_styles.create_portfolio_compare_assets_chart(
+            img_bytes = await self._render_chart_bytes(
+                'create_portfolio_compare_assets_chart',
                 data=compare_data, symbols=symbols, currency=currency, weights=weights, portfolio_name=portfolio_name
             )
             
-            # Save the figure using standardized method
-            img_buffer = io.BytesIO()
-            chart_styles.save_figure(fig, img_buffer)
-            chart_styles.cleanup_figure(fig)
-            img_buffer.seek(0)
-            
             # Get portfolio comparison statistics
             try:
                 # Build enhanced caption with weights in title
@@ -17648,7 +16831,7 @@ class ShansAi:
                             continue
                         
                         # Get individual asset
-                        asset = ok.Asset(symbol, ccy=currency)
+                        asset = await okama_service.run_with_retry(okama_cache.asset, symbol, ccy=currency)
                         
                         # Calculate wealth index from price data
                         price_data = asset.price
@@ -17693,7 +16876,7 @@ class ShansAi:
             await self._manage_reply_keyboard(update, context, "portfolio")
             await context.bot.send_photo(
                 chat_id=update.effective_chat.id,
-                photo=img_buffer,
+                photo=io.BytesIO(img_bytes),
                 caption=self._truncate_caption(caption),
             )
             
@@ -17753,7 +16936,7 @@ class ShansAi:
             for i, symbol in enumerate(final_symbols):
                 try:
                     # Test if symbol exists in database
-                    test_asset = ok.Asset(symbol)
+                    test_asset = await okama_service.run_with_retry(okama_cache.asset, symbol)
                     # If asset was created successfully, consider it valid
                     valid_symbols.append(symbol)
                     valid_weights.append(weights[i])
@@ -17784,7 +16967,7 @@ class ShansAi:
             
             # Create portfolio object for analysis
             try:
-                portfolio = ok.Portfolio(valid_symbols, weights=valid_weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, valid_symbols, weights=valid_weights, ccy=currency)
             except Exception as e:
                 self.logger.error(f"Failed to create portfolio object: {e}")
                 await self._send_callback_message(update, context, f"❌ Ошибка создания портфеля: {str(e)}", parse_mode='Markdown')
@@ -17801,7 +16984,7 @@ class ShansAi:
                 )
                 
                 # Analyze portfolio with Gemini using the new portfolio analysis method
-                portfolio_analysis = self.gemini_service.analyze_portfolio(portfolio_data)
+                portfolio_analysis = await self.gemini_service.analyze_portfolio(portfolio_data)
                 
                 if portfolio_analysis and portfolio_analysis.get('success'):
                     analysis_text = portfolio_analysis.get('analysis', '')
@@ -17877,7 +17060,7 @@ class ShansAi:
             # Add basic metrics if available
             try:
                 # Create portfolio for metrics calculation
-                portfolio = ok.Portfolio(symbols, weights=weights, ccy=currency)
+                portfolio = await okama_service.run_with_retry(okama_cache.portfolio, symbols, weights=weights, ccy=currency)
                 metrics_text = self._get_portfolio_basic_metrics(portfolio, symbols, weights, currency)
                 portfolio_text += metrics_text
             except Exception as e:
@@ -17928,7 +17111,7 @@ class ShansAi:
             
             # Get symbols in namespace for non-Chinese exchanges
             try:
-                symbols_df = ok.symbols_in_namespace(namespace)
+                symbols_df = (await self._get_namespace_listing(namespace)).to_frame()
                 
                 # Check if DataFrame is empty
                 if symbols_df.empty:
@@ -17941,9 +17124,7 @@ class ShansAi:
                 await self._send_ephemeral_message(update, context, f"📊 Создаю Excel файл...", delete_after=3)
                 
                 # Create Excel file in memory
-                excel_buffer = io.BytesIO()
-                symbols_df.to_excel(excel_buffer, index=False, sheet_name=f'{namespace}_Symbols')
-                excel_buffer.seek(0)
+                excel_buffer = await run_data(self._create_namespace_listing_excel, symbols_df, namespace)
                 
                 # Send Excel file
                 await context.bot.send_document(
@@ -17974,55 +17155,16 @@ class ShansAi:
             # Show progress message
             await self._send_ephemeral_message(update, context, f"📊 Создаю Excel файл для {namespace}...", delete_after=3)
             
-            # Get ALL symbols data from Tushare (no limit for Excel export)
-            symbols_data = self.tushare_service.get_exchange_symbols_full(namespace)
-            total_count = len(symbols_data)
+            # Get ALL symbols from the cached Tushare listing (no limit for Excel export)
+            listing = await run_data(self.tushare_service.get_exchange_listing, namespace)
+            total_count = len(listing)
             
-            if not symbols_data:
+            if total_count == 0:
                 await self._send_callback_message(update, context, f"❌ Символы для биржи '{namespace}' не найдены")
                 return
             
-            # Create DataFrame from symbols data
-            df = pd.DataFrame(symbols_data)
-            
-            # Add additional columns for better Excel formatting
-            df['Exchange'] = namespace
-            df['Exchange_Name'] = {
-                'SSE': 'Shanghai Stock Exchange',
-                'SZSE': 'Shenzhen Stock Exchange',
-                'BSE': 'Beijing Stock Exchange',
-                'HKEX': 'Hong Kong Stock Exchange'
-            }.get(namespace, namespace)
-            
-            # Reorder columns
-            df = df[['symbol', 'name', 'currency', 'list_date', 'Exchange', 'Exchange_Name']]
-            
-            # Rename columns for better readability
-            df.columns = ['Symbol', 'Company Name', 'Currency', 'List Date', 'Exchange Code', 'Exchange Name']
-            
             # Create Excel file in memory
-            excel_buffer = io.BytesIO()
-            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name=f'{namespace}_Symbols')
-                
-                # Get the workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets[f'{namespace}_Symbols']
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            excel_buffer.seek(0)
+            excel_buffer = await run_data(self._create_tushare_listing_excel, listing, namespace)
             
             # Send Excel file
             await context.bot.send_document(
@@ -18038,6 +17180,53 @@ class ShansAi:
             self.logger.error(f"Error in Tushare Excel export for {namespace}: {e}")
             await self._send_callback_message(update, context, f"❌ Ошибка при создании Excel файла: {str(e)}")
 
+    def _create_namespace_listing_excel(self, symbols_df: pd.DataFrame, namespace: str) -> io.BytesIO:
+        """Create Excel file with the symbols of an okama namespace"""
+        excel_buffer = io.BytesIO()
+        symbols_df.to_excel(excel_buffer, index=False, sheet_name=f'{namespace}_Symbols')
+        excel_buffer.seek(0)
+        return excel_buffer
+
+    def _create_tushare_listing_excel(self, listing: pd.DataFrame, namespace: str) -> io.BytesIO:
+        """Create Excel file with the symbols of a Chinese exchange"""
+        # Copy of the shared listing for Excel formatting
+        df = listing.copy()
+        
+        # Add additional columns for better Excel formatting
+        df['Exchange'] = namespace
+        df['Exchange_Name'] = {
+            'SSE': 'Shanghai Stock Exchange',
+            'SZSE': 'Shenzhen Stock Exchange',
+            'BSE': 'Beijing Stock Exchange',
+            'HKEX': 'Hong Kong Stock Exchange'
+        }.get(namespace, namespace)
+        
+        # Reorder columns
+        df = df[['symbol', 'name', 'currency', 'list_date', 'Exchange', 'Exchange_Name']]
+        
+        # Rename columns for better readability
+        df.columns = ['Symbol', 'Company Name', 'Currency', 'List Date', 'Exchange Code', 'Exchange Name']
+        
+        # Create Excel file in memory
+        from openpyxl.utils import get_column_letter
+        excel_buffer = io.BytesIO()
+        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+            df.to_excel(writer, index=False, sheet_name=f'{namespace}_Symbols')
+            
+            # Get the workbook and worksheet
+            workbook = writer.book
+            worksheet = writer.sheets[f'{namespace}_Symbols']
+            
+            # Auto-adjust column widths (longest value or header per column)
+            for column_index, (header, values) in enumerate(df.items(), start=1):
+                column_letter = get_column_letter(column_index)
+                max_length = max(len(str(header)), int(values.astype(str).str.len().max()))
+                adjusted_width = min(max_length + 2, 50)
+                worksheet.column_dimensions[column_letter].width = adjusted_width
+        
+        excel_buffer.seek(0)
+        return excel_buffer
+
     async def _handle_namespace_home_button(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle namespace home button click - show main namespace list"""
         try:
@@ -18418,37 +17607,107 @@ class ShansAi:
         except Exception as e:
             self.logger.error(f"Error during scheduled cleanup: {e}")
 
+    async def health_monitor_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Periodic job probing external services
+        Results are kept in memory for /status and availability checks
+        """
+        try:
+            results = await health_monitor.probe_all()
+            unavailable = [name for name, ok in results.items() if not ok]
+            if unavailable:
+                self.logger.warning(f"Unavailable services: {', '.join(unavailable)}")
+        except Exception as e:
+            self.logger.error(f"Error during health probing: {e}")
+
+    async def risk_free_rate_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Periodic job refreshing okama risk-free rate series
+        The first run warms the rates at startup
+        """
+        try:
+            results = await run_data(risk_free_rate_service.refresh, force=True)
+            missing = [symbol for symbol, loaded in results.items() if not loaded]
+            if missing:
+                self.logger.warning(f"Risk-free rate series not loaded, using fallback rates: {', '.join(missing)}")
+        except Exception as e:
+            self.logger.error(f"Error during risk-free rate refresh: {e}")
+
+    async def symbol_catalog_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Periodic job refreshing the okama namespace listings
+        The first run loads the catalog at startup
+        """
+        try:
+            namespaces = await run_data(symbol_catalog.list_namespaces)
+        except Exception as e:
+            self.logger.error(f"Error during symbol catalog refresh: {e}")
+            return
+
+        # One data pool job per namespace: a slow namespace times out alone
+        missing = []
+        for namespace in namespaces:
+            try:
+                results = await run_data(symbol_catalog.refresh, [namespace], force=True,
+                                         timeout=SYMBOL_CATALOG_FETCH_TIMEOUT)
+                missing += [ns for ns, loaded in results.items() if not loaded]
+            except Exception as e:
+                self.logger.warning(f"Error refreshing namespace {namespace}: {e}")
+                missing.append(namespace)
+        if missing:
+            self.logger.warning(f"Namespace listings not loaded: {', '.join(missing)}")
+
+    async def tushare_listings_job(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Periodic job refreshing the Tushare exchange listings
+        The first run loads the listings at startup
+        """
+        try:
+            results = await run_data(self.tushare_service.refresh_listings, force=True)
+            missing = [market for market, loaded in results.items() if not loaded]
+            if missing:
+                self.logger.warning(f"Tushare listings not loaded: {', '.join(missing)}")
+        except Exception as e:
+            self.logger.error(f"Error during Tushare listings refresh: {e}")
+
     def run(self):
         """Run the bot"""
-        # Create application with job queue
-        application = Application.builder().token(Config.TELEGRAM_BOT_TOKEN).job_queue(JobQueue()).build()
+        # Create application with job queue; Bot API requests of handlers are measured as the send phase
+        # (connection_pool_size matches the ApplicationBuilder default)
+        application = (
+            Application.builder()
+            .token(Config.TELEGRAM_BOT_TOKEN)
+            .request(create_telegram_request(connection_pool_size=256))
+            .job_queue(JobQueue())
+            .build()
+        )
         
         # Store job queue reference
         self.job_queue = application.job_queue
         
-        # Add handlers
-        application.add_handler(CommandHandler("start", self.start_command))
-        application.add_handler(CommandHandler("help", self.help_command))
-        application.add_handler(CommandHandler("status", self.status_command))
-        application.add_handler(CommandHandler("support", self.support_command))
-        application.add_handler(CommandHandler("info", self.info_command))
-        application.add_handler(CommandHandler("list", self.namespace_command))
-        application.add_handler(CommandHandler("search", self.search_command))
-        application.add_handler(CommandHandler("compare", self.compare_command))
-        application.add_handler(CommandHandler("portfolio", self.portfolio_command))
-        application.add_handler(CommandHandler("buy", self.buy_command))
-        application.add_handler(CommandHandler("profile", self.profile_command))
-        application.add_handler(CommandHandler("cleanup", self.cleanup_command))
+        # Add handlers (wrapped for per-handler latency / resource metrics)
+        application.add_handler(CommandHandler("start", instrumentation.command("start", self.start_command)))
+        application.add_handler(CommandHandler("help", instrumentation.command("help", self.help_command)))
+        application.add_handler(CommandHandler("status", instrumentation.command("status", self.status_command)))
+        application.add_handler(CommandHandler("support", instrumentation.command("support", self.support_command)))
+        application.add_handler(CommandHandler("info", instrumentation.command("info", self.info_command)))
+        application.add_handler(CommandHandler("list", instrumentation.command("list", self.namespace_command)))
+        application.add_handler(CommandHandler("search", instrumentation.command("search", self.search_command)))
+        application.add_handler(CommandHandler("compare", instrumentation.command("compare", self.compare_command)))
+        application.add_handler(CommandHandler("portfolio", instrumentation.command("portfolio", self.portfolio_command)))
+        application.add_handler(CommandHandler("buy", instrumentation.command("buy", self.buy_command)))
+        application.add_handler(CommandHandler("profile", instrumentation.command("profile", self.profile_command)))
+        application.add_handler(CommandHandler("cleanup", instrumentation.command("cleanup", self.cleanup_command)))
         
         # Add callback query handler for buttons
-        application.add_handler(CallbackQueryHandler(self.button_callback))
+        application.add_handler(CallbackQueryHandler(instrumentation.callback(self.button_callback)))
         
         # Add payment handlers
-        application.add_handler(MessageHandler(filters.SUCCESSFUL_PAYMENT, self.payment_service.handle_successful_payment))
-        application.add_handler(PreCheckoutQueryHandler(self.payment_service.handle_pre_checkout_query))
+        application.add_handler(MessageHandler(filters.SUCCESSFUL_PAYMENT, instrumentation.message("payment", self.payment_service.handle_successful_payment)))
+        application.add_handler(PreCheckoutQueryHandler(instrumentation.message("pre_checkout", self.payment_service.handle_pre_checkout_query)))
         
         # Add message handler for waiting user input after empty /info
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
+        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, instrumentation.message("text", self.handle_message)))
         
         # Add global error handler
         application.add_error_handler(self.error_handler)
@@ -18461,6 +17720,39 @@ class ShansAi:
         )
         logger.info("Scheduled daily cleanup job for expired subscriptions")
         
+        # Schedule background health probing of external services
+        self.job_queue.run_repeating(
+            self.health_monitor_job,
+            interval=HEALTH_CHECK_INTERVAL,
+            first=5,
+            name="health_monitor"
+        )
+        
+        # Warm risk-free rates at startup and refresh them in the background
+        self.job_queue.run_repeating(
+            self.risk_free_rate_job,
+            interval=RISK_FREE_RATE_REFRESH_INTERVAL,
+            first=1,
+            name="risk_free_rates"
+        )
+        
+        # Load okama namespace listings in the background and refresh them daily
+        self.job_queue.run_repeating(
+            self.symbol_catalog_job,
+            interval=SYMBOL_CATALOG_REFRESH_INTERVAL,
+            first=10,
+            name="symbol_catalog"
+        )
+        
+        # Load Tushare exchange listings in the background and refresh them daily
+        if self.tushare_service:
+            self.job_queue.run_repeating(
+                self.tushare_listings_job,
+                interval=TUSHARE_LISTING_REFRESH_INTERVAL,
+                first=15,
+                name="tushare_listings"
+            )
+        
         # Start the bot
         logger.info("Starting Okama Finance Bot...")
         application.run_polling()
@@ -18526,10 +17818,35 @@ if __name__ == "__main__":
                 bind_port = int(port_env)
                 class HealthHandler(BaseHTTPRequestHandler):
                     def do_GET(self):
+                        if self.path.split('?')[0] == '/metrics':
+                            body = instrumentation.render_prometheus().encode('utf-8')
+                            self.send_response(200)
+                            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                            self.end_headers()
+                            self.wfile.write(body)
+                            return
                         payload = {
                             "status": "ok",
                             "service": "okama-finance-bot",
-                            "environment": "RENDER" if os.getenv('RENDER') else "LOCAL"
+                            "environment": "RENDER" if os.getenv('RENDER') else "LOCAL",
+                            "executors": get_executor_stats(),
+                            "chart_render_pool": chart_render_pool.get_stats(),
+                            "chart_cache": chart_cache.get_stats(),
+                            "telegram_file_cache": telegram_file_cache.get_stats(),
+                            "cached_data": cached_data_service.get_stats(),
+                            "timeseries_store": timeseries_store.get_stats(),
+                            "http_client": http_client.get_stats(),
+                            "okama_circuit": okama_service.get_circuit_state(),
+                            "risk_free_rates": risk_free_rate_service.get_stats(),
+                            "period_metrics": period_metrics_cache.get_stats(),
+                            "simulation_cache": simulation_cache.get_stats(),
+                            "efficient_frontier": frontier_cache.get_stats(),
+                            "correlation": correlation_service.get_stats(),
+                            "portfolio_series": portfolio_series.get_stats(),
+                            "search_cache": search_cache.get_stats(),
+                            "symbol_catalog": symbol_catalog.get_stats(),
+                            "handlers": instrumentation.get_stats(),
+                            "services": health_monitor.get_stats()
                         }
                         self.send_response(200)
                         self.send_header('Content-Type', 'application/json')
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Build the prebuilt fuzzy search index (services/search_index.json)
+
+The bot loads the file at startup instead of running the alias pipeline
+(regex, stopwords, transliteration) over every symbol in each process.
+Rebuild it after changing EMBEDDED or the normalization tables in
+services/search_embedded.py: a stale file is detected by its version hash
+and rebuilt in memory from EMBEDDED only.
+
+Usage:
+    python scripts/build_search_index.py                      # curated EMBEDDED list
+    python scripts/build_search_index.py --namespace MOEX     # plus all okama MOEX symbols (needs network)
+    python scripts/build_search_index.py --output /tmp/index.json
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.search_embedded import SEARCH_INDEX_PATH, MoexSearchIndex, index_version
+
+# Configure logging
+logging.basicConfig(
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    level=logging.INFO
+)
+logger = logging.getLogger(__name__)
+
+
+def add_namespace(index: MoexSearchIndex, namespace: str) -> int:
+    """Add every symbol of an okama namespace with its name."""
+    import okama as ok
+
+    symbols = ok.symbols_in_namespace(namespace)
+    before = len(index.assets)
+    for symbol, name in zip(symbols['symbol'], symbols['name']):
+        if symbol not in index.assets:
+            index.add_asset(str(symbol), str(name) if name else str(symbol))
+    return len(index.assets) - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the prebuilt fuzzy search index")
+    parser.add_argument('--output', default=SEARCH_INDEX_PATH, help="Output file")
+    parser.add_argument('--namespace', action='append', default=[],
+                        help="Also index all symbols of an okama namespace (repeatable)")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    index = MoexSearchIndex()
+    index.build_from_embedded()
+    for namespace in args.namespace:
+        added = add_namespace(index, namespace)
+        logger.info(f"Added {added} symbols from namespace {namespace}")
+
+    index.save(args.output)
+    logger.info(f"Search index {index_version()} with {len(index.assets)} assets and "
+                f"{len(index.alias2symbol)} aliases written to {args.output} "
+                f"({os.path.getsize(args.output) / 1024:.1f} KiB, {time.monotonic() - started:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,8 @@ from datetime import datetime
 import json
 import threading
 
+from services.http_client import HTTPTimeoutError, get_sync_session, http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,10 +28,37 @@ class BotalityService:
         """
         self.token = token
         self.api_url = "https://botality.cc/api/v1/messages"
-        self.session = requests.Session()
-        self.session.headers.update({'Content-Type': 'application/json'})
+        self.session = get_sync_session()
         self.timeout = 10
     
+    def _build_payload(self, message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Тело запроса к Botality API"""
+        return {
+            "token": self.token,
+            "data": message_data
+        }
+    
+    def _handle_response(self, response) -> bool:
+        """
+        Разбор ответа Botality API
+        
+        Args:
+            response: Ответ requests или httpx
+            
+        Returns:
+            bool: True если Botality принял сообщение
+        """
+        if response.status_code != 200:
+            logger.warning(f"Botality API returned status {response.status_code}")
+            return False
+        
+        result = response.json()
+        if result.get("status") == "ok":
+            logger.debug("Botality analytics sent successfully")
+            return True
+        logger.warning(f"Botality API returned non-ok status: {result}")
+        return False
+    
     def send_message_analytics_sync(self, message_data: Dict[str, Any]) -> bool:
         """
         Синхронная отправка аналитики сообщения в Botality
@@ -41,23 +70,8 @@ class BotalityService:
             bool: True если успешно отправлено, False в противном случае
         """
         try:
-            payload = {
-                "token": self.token,
-                "data": message_data
-            }
-            
-            response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("status") == "ok":
-                    logger.debug("Botality analytics sent successfully")
-                    return True
-                else:
-                    logger.warning(f"Botality API returned non-ok status: {result}")
-                    return False
-            else:
-                logger.warning(f"Botality API returned status {response.status_code}")
-                return False
+            response = self.session.post(self.api_url, json=self._build_payload(message_data), timeout=self.timeout)
+            return self._handle_response(response)
                 
         except requests.exceptions.Timeout:
             logger.warning("Botality API request timeout")
@@ -79,9 +93,17 @@ class BotalityService:
         Returns:
             bool: True если успешно отправлено, False в противном случае
         """
-        # Запускаем синхронную отправку в отдельном потоке
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.send_message_analytics_sync, message_data)
+        try:
+            response = await http_client.post(self.api_url, json=self._build_payload(message_data),
+                                              timeout=self.timeout, retries=0)
+            return self._handle_response(response)
+                
+        except HTTPTimeoutError:
+            logger.warning("Botality API request timeout")
+            return False
+        except Exception as e:
+            logger.warning(f"Botality API request error: {e}")
+            return False
     
     def prepare_message_data(self, update) -> Dict[str, Any]:
         """
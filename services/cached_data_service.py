@@ -1,127 +1,277 @@
 """
 Cached Data Service
 Provides fallback data when OKAMA API is unavailable
+
+Data is kept in an indexed SQLite store: one row per (kind, key) with its own
+TTL, so single entries are read and written without loading or rewriting the
+whole cache. Besides asset info and namespaces the store holds price series,
+which lets the bot keep serving charts during OKAMA outages.
 """
 
 import json
+import sqlite3
 import logging
+import threading
+import time
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
 import os
 
 logger = logging.getLogger(__name__)
 
+# Cache configuration
+CACHE_DB_PATH = os.getenv('OKAMA_CACHE_DB_PATH', '/var/data/okama_cache.db')
+LEGACY_CACHE_FILE = os.getenv('OKAMA_CACHE_FILE', '/var/data/okama_cache.json')
+
+# Default TTLs in seconds
+ASSET_INFO_TTL = 24 * 3600
+NAMESPACES_TTL = 7 * 24 * 3600
+SERIES_TTL = 7 * 24 * 3600
+
+# Entry kinds
+KIND_ASSET = 'asset'
+KIND_NAMESPACE = 'namespace'
+KIND_SERIES = 'series'
+
 
 class CachedDataService:
     """
     Service that provides cached financial data as fallback when OKAMA API is unavailable.
     """
-    
-    def __init__(self, cache_file: str = "/var/data/okama_cache.json"):
+
+    def __init__(self, db_path: str = CACHE_DB_PATH, legacy_cache_file: Optional[str] = LEGACY_CACHE_FILE):
         """
         Initialize the cached data service.
-        
+
         Args:
-            cache_file: Path to the cache file
-        """
-        self.cache_file = cache_file
-        self.cache_data = self._load_cache()
-        self.cache_expiry_hours = 24  # Cache expires after 24 hours
-        
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load cache data from file."""
+            db_path: Path to the SQLite cache database (':memory:' for in-memory store)
+            legacy_cache_file: Path to the old JSON cache imported on first start
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        if legacy_cache_file:
+            self._import_legacy_cache(legacy_cache_file)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database, falling back to in-memory storage."""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    logger.info(f"Loaded cache with {len(cache_data.get('assets', {}))} assets")
-                    return cache_data
+            if self.db_path != ':memory:':
+                cache_dir = os.path.dirname(self.db_path)
+                if cache_dir and not os.path.exists(cache_dir):
+                    os.makedirs(cache_dir, exist_ok=True)
+                    logger.info(f"Created cache directory: {cache_dir}")
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         except Exception as e:
-            logger.warning(f"Could not load cache file: {e}")
-        
-        return {
-            'assets': {},
-            'namespaces': {},
-            'last_updated': None
-        }
-    
-    def _save_cache(self):
-        """Save cache data to file."""
+            logger.warning(f"Could not open cache database {self.db_path}, using in-memory cache: {e}")
+            self.db_path = ':memory:'
+            conn = sqlite3.connect(':memory:', check_same_thread=False, isolation_level=None)
+
         try:
-            # Ensure the directory exists
-            cache_dir = os.path.dirname(self.cache_file)
-            if cache_dir and not os.path.exists(cache_dir):
-                os.makedirs(cache_dir, exist_ok=True)
-                logger.info(f"Created cache directory: {cache_dir}")
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_data, f, ensure_ascii=False, indent=2)
-            logger.info("Cache saved successfully")
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
         except Exception as e:
-            logger.warning(f"Could not save cache file: {e}")
-    
-    def _is_cache_valid(self) -> bool:
-        """Check if cache is still valid."""
-        if not self.cache_data.get('last_updated'):
-            return False
-        
+            logger.warning(f"Could not enable WAL mode for cache database: {e}")
+
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at)')
+        logger.info(f"Cache database opened at {self.db_path}")
+        return conn
+
+    def _import_legacy_cache(self, cache_file: str):
+        """Import entries from the old JSON cache file once."""
         try:
-            last_updated = datetime.fromisoformat(self.cache_data['last_updated'])
-            expiry_time = last_updated + timedelta(hours=self.cache_expiry_hours)
-            return datetime.now() < expiry_time
-        except Exception:
-            return False
-    
-    def update_cache(self, asset_data: Dict[str, Any], namespace_data: Dict[str, Any]):
+            if not os.path.exists(cache_file):
+                return
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            self.update_cache(legacy.get('assets', {}), legacy.get('namespaces', {}))
+            os.replace(cache_file, cache_file + '.imported')
+            logger.info(f"Imported legacy cache with {len(legacy.get('assets', {}))} assets")
+        except Exception as e:
+            logger.warning(f"Could not import legacy cache file: {e}")
+
+    # ========= Low level entry access =========
+
+    def _put_many(self, kind: str, items: Dict[str, Any], ttl: float):
+        """Atomically write several entries of one kind."""
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            (kind, str(key), json.dumps(value, ensure_ascii=False, default=str), now, now + ttl)
+            for key, value in items.items()
+        ]
+        with self._lock:
+            try:
+                self._conn.execute('BEGIN IMMEDIATE')
+                self._conn.executemany('''
+                    INSERT OR REPLACE INTO cache_entries (kind, key, value, updated_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', rows)
+                self._conn.execute('COMMIT')
+            except Exception as e:
+                # No transaction is open if BEGIN itself failed (e.g. database is locked)
+                if self._conn.in_transaction:
+                    self._conn.execute('ROLLBACK')
+                logger.warning(f"Could not write cache entries ({kind}): {e}")
+
+    def _get(self, kind: str, key: str, allow_expired: bool = False) -> Optional[Any]:
+        """Read single entry by primary key."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE kind = ? AND key = ?',
+                (kind, str(key))
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if not allow_expired and expires_at < time.time():
+            return None
+        try:
+            return json.loads(value)
+        except Exception as e:
+            logger.warning(f"Corrupted cache entry {kind}:{key}: {e}")
+            return None
+
+    def _get_all(self, kind: str) -> Dict[str, Any]:
+        """Read all valid entries of one kind."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT key, value FROM cache_entries WHERE kind = ? AND expires_at >= ?',
+                (kind, time.time())
+            ).fetchall()
+        result = {}
+        for key, value in rows:
+            try:
+                result[key] = json.loads(value)
+            except Exception:
+                continue
+        return result
+
+    def _count_valid(self, kind: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COUNT(*) FROM cache_entries WHERE kind = ? AND expires_at >= ?',
+                (kind, time.time())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (time.time(),))
+            return cursor.rowcount
+
+    # ========= Public API =========
+
+    def update_cache(self, asset_data: Dict[str, Any], namespace_data: Dict[str, Any],
+                     ttl: Optional[float] = None):
         """
         Update cache with new data.
-        
+
         Args:
-            asset_data: Asset information to cache
-            namespace_data: Namespace information to cache
+            asset_data: Asset information to cache ({symbol: info})
+            namespace_data: Namespace information to cache ({namespace: info})
+            ttl: Optional TTL in seconds for these entries
         """
-        self.cache_data['assets'].update(asset_data)
-        self.cache_data['namespaces'].update(namespace_data)
-        self.cache_data['last_updated'] = datetime.now().isoformat()
-        self._save_cache()
-    
-    def get_cached_asset_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        self._put_many(KIND_ASSET, asset_data or {}, ttl or ASSET_INFO_TTL)
+        self._put_many(KIND_NAMESPACE, namespace_data or {}, ttl or NAMESPACES_TTL)
+
+    def get_cached_asset_info(self, symbol: str, allow_expired: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get cached asset information.
-        
+
         Args:
             symbol: Asset symbol
-            
+            allow_expired: Return stale data (useful during outages)
+
         Returns:
             Cached asset information or None
         """
-        if not self._is_cache_valid():
-            logger.info("Cache is expired, cannot provide fallback data")
-            return None
-        
-        return self.cache_data['assets'].get(symbol)
-    
+        return self._get(KIND_ASSET, symbol, allow_expired=allow_expired)
+
     def get_cached_namespaces(self) -> Optional[Dict[str, Any]]:
         """
         Get cached namespaces.
-        
+
         Returns:
             Cached namespaces or None
         """
-        if not self._is_cache_valid():
+        namespaces = self._get_all(KIND_NAMESPACE)
+        if not namespaces:
             logger.info("Cache is expired, cannot provide fallback data")
             return None
-        
-        return self.cache_data['namespaces']
-    
+        return namespaces
+
+    def update_series(self, symbol: str, kind: str, series, ttl: Optional[float] = None):
+        """
+        Store price series (e.g. close_daily, close_monthly, dividends) for a symbol.
+
+        Args:
+            symbol: Asset symbol
+            kind: Series name
+            series: pandas Series with date-like index
+            ttl: Optional TTL in seconds
+        """
+        try:
+            payload = {
+                'name': str(getattr(series, 'name', '') or symbol),
+                'index': [str(i) for i in series.index],
+                'values': [None if v != v else float(v) for v in series.values],
+            }
+        except Exception as e:
+            logger.warning(f"Could not serialize series {symbol}:{kind}: {e}")
+            return
+        self._put_many(KIND_SERIES, {f"{symbol}:{kind}": payload}, ttl or SERIES_TTL)
+
+    def get_cached_series(self, symbol: str, kind: str, allow_expired: bool = True):
+        """
+        Get cached price series.
+
+        Args:
+            symbol: Asset symbol
+            kind: Series name
+            allow_expired: Return stale data (useful during outages)
+
+        Returns:
+            pandas Series or None
+        """
+        payload = self._get(KIND_SERIES, f"{symbol}:{kind}", allow_expired=allow_expired)
+        if not payload:
+            return None
+        import pandas as pd
+        index = pd.Index(payload['index'])
+        try:
+            if kind.endswith('monthly'):
+                index = pd.PeriodIndex(payload['index'], freq='M')
+            else:
+                index = pd.PeriodIndex(payload['index'], freq='D')
+        except Exception:
+            pass
+        return pd.Series(payload['values'], index=index, name=payload.get('name'), dtype='float64')
+
     def get_fallback_error_message(self) -> str:
         """
         Get a fallback error message when OKAMA API is unavailable.
-        
+
         Returns:
             User-friendly error message
         """
-        if self._is_cache_valid():
+        if self.can_provide_fallback():
             return ("Сервис OKAMA временно недоступен. "
                    "Используются кэшированные данные, которые могут быть неактуальными. "
                    "Попробуйте повторить запрос позже для получения актуальных данных.")
@@ -129,15 +279,24 @@ class CachedDataService:
             return ("Сервис OKAMA временно недоступен и кэшированные данные устарели. "
                    "Попробуйте повторить запрос через несколько минут. "
                    "Если проблема сохраняется, возможно, ведутся технические работы.")
-    
+
     def can_provide_fallback(self) -> bool:
         """
         Check if fallback data is available.
-        
+
         Returns:
             True if fallback data is available, False otherwise
         """
-        return self._is_cache_valid() and bool(self.cache_data.get('assets'))
+        return self._count_valid(KIND_ASSET) > 0 or self._count_valid(KIND_SERIES) > 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get number of valid entries per kind."""
+        return {
+            'db_path': self.db_path,
+            'assets': self._count_valid(KIND_ASSET),
+            'namespaces': self._count_valid(KIND_NAMESPACE),
+            'series': self._count_valid(KIND_SERIES),
+        }
 
 
 # Global instance
@@ -0,0 +1,147 @@
+"""
+Chart Cache Module
+Bounded cache of rendered chart PNG bytes keyed by chart spec.
+
+Users press the same chart buttons on the same popular tickers again and
+again. A rendered PNG only depends on the chart type, symbols, weights,
+currency, period, the last date of the underlying data and the chart style,
+so repeat views are served from memory instead of re-rendering.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Bump when chart rendering changes so stale images are not served
+CHART_STYLE_VERSION = f"{os.getenv('CHART_STYLE', 'nordic')}-1"
+
+
+def make_chart_key(chart_type: str, symbols: Any, weights: Optional[Iterable[float]] = None,
+                   currency: Optional[str] = None, period: Optional[str] = None,
+                   last_date: Any = None, extra: Any = None) -> Tuple:
+    """
+    Build cache key for a rendered chart.
+
+    Args:
+        chart_type: Chart kind (e.g. 'price', 'wealth', 'drawdowns')
+        symbols: Symbol or list of symbols
+        weights: Optional portfolio weights
+        currency: Optional currency
+        period: Optional period ('1Y', '5Y', 'MAX', ...)
+        last_date: Last date of the underlying data (defaults to today)
+        extra: Optional hashable value for other inputs that change the image
+
+    Returns:
+        Hashable key
+    """
+    if isinstance(symbols, str):
+        symbols_key: Tuple = (symbols,)
+    else:
+        symbols_key = tuple(str(s) for s in (symbols or []))
+    weights_key = tuple(round(float(w), 6) for w in weights) if weights is not None else None
+    if last_date is None:
+        last_date = date.today()
+    return (
+        chart_type,
+        symbols_key,
+        weights_key,
+        currency,
+        period,
+        str(last_date)[:10],
+        extra,
+        CHART_STYLE_VERSION,
+    )
+
+
+class ChartBytesCache:
+    """
+    Thread-safe LRU cache of PNG bytes with a memory-size budget.
+    """
+
+    def __init__(self, max_bytes: int = CHART_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size budget for cached images in bytes
+        """
+        self.max_bytes = max(0, int(max_bytes))
+        self._data: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return cached PNG bytes or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: bytes) -> bool:
+        """
+        Store PNG bytes. Images larger than the whole budget are not cached.
+
+        Returns:
+            True if the image was stored
+        """
+        if not value:
+            return False
+        size = len(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._data[key] = value
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+            return True
+
+    def clear(self) -> None:
+        """Drop all cached images (useful for tests)."""
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'items': len(self._data),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / total) if total else 0.0,
+            }
+
+
+# Global instance for use throughout the application
+chart_cache = ChartBytesCache()
@@ -0,0 +1,237 @@
+"""
+Chart Render Pool Module
+Process-pool rendering backend for ChartStyles.
+
+Matplotlib rendering through pyplot global state is GIL-bound and effectively
+serialized inside the bot process. Handlers describe a chart with a picklable
+ChartSpec (ChartStyles method name plus data arguments) and get PNG bytes
+back from a pool of worker processes. Each worker pre-imports matplotlib with
+the Agg backend and applies the unified Shans Pro style once at startup, so
+chart throughput scales with CPU cores.
+
+If the process pool cannot be used (disabled, broken, unpicklable arguments)
+the same spec is rendered in the bot process through the render thread pool.
+"""
+
+import os
+import asyncio
+import logging
+import pickle
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple
+
+from services.executors import run_render
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+CHART_RENDER_PROCESSES = os.getenv("CHART_RENDER_PROCESSES", "true").lower() == "true"
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+CHART_RENDER_TIMEOUT = float(os.getenv("CHART_RENDER_TIMEOUT", "60"))
+
+# ChartStyles methods that may be rendered from a spec
+RENDERABLE_METHODS = frozenset({
+    'create_unified_wealth_chart',
+    'create_correlation_matrix_chart',
+    'create_efficient_frontier_chart',
+    'render_table_image',
+    'create_price_chart',
+    'create_drawdowns_chart',
+    'create_dividends_chart',
+    'create_dividend_yield_chart',
+    'create_portfolio_returns_chart',
+    'create_portfolio_drawdowns_chart',
+    'create_portfolio_rolling_cagr_chart',
+    'create_portfolio_compare_assets_chart',
+    'create_monte_carlo_forecast_chart',
+    'create_percentile_forecast_bands_chart',
+})
+
+
+@dataclass
+class ChartSpec:
+    """Picklable description of a chart: ChartStyles method, its arguments and save options."""
+    method: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    save_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+# ========= Worker side =========
+_worker_chart_styles = None
+
+
+def _init_worker() -> None:
+    """Pre-import matplotlib and apply the unified style once per worker."""
+    global _worker_chart_styles
+    import matplotlib
+    matplotlib.use('Agg')
+    import warnings
+    warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
+    from services.chart_styles import apply_unified_shans_pro_style, chart_styles
+    apply_unified_shans_pro_style()
+    _worker_chart_styles = chart_styles
+
+
+def render_spec(spec: ChartSpec) -> bytes:
+    """
+    Render ChartSpec to PNG bytes.
+
+    Runs in a worker process; also used as the in-process fallback.
+    """
+    if spec.method not in RENDERABLE_METHODS:
+        raise ValueError(f"Chart method is not renderable from spec: {spec.method}")
+
+    styles = _worker_chart_styles
+    if styles is None:
+        from services.chart_styles import chart_styles as styles
+
+    result = getattr(styles, spec.method)(*spec.args, **spec.kwargs)
+
+    # render_table_image returns ready BytesIO
+    if isinstance(result, BytesIO):
+        return result.getvalue()
+
+    fig = result[0] if isinstance(result, tuple) else result
+    if fig is None:
+        raise RuntimeError(f"Chart creation returned None for {spec.method}")
+    try:
+        buffer = BytesIO()
+        styles.save_figure(fig, buffer, **spec.save_kwargs)
+        return buffer.getvalue()
+    finally:
+        styles.cleanup_figure(fig)
+
+
+def _render_pickled(payload: bytes) -> bytes:
+    """Worker entry point for a ChartSpec pickled on the bot side."""
+    return render_spec(pickle.loads(payload))
+
+
+# ========= Bot side =========
+class ChartRenderPool:
+    """
+    Pool of worker processes rendering ChartSpec objects to PNG bytes.
+    """
+
+    def __init__(self, max_workers: int = CHART_RENDER_WORKERS, enabled: bool = CHART_RENDER_PROCESSES):
+        """
+        Initialize the render pool. Worker processes are started lazily.
+
+        Args:
+            max_workers: Number of worker processes
+            enabled: Use worker processes (False - always render in-process)
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.enabled = enabled
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rendered = 0
+        self._fallbacks = 0
+        self._failed = 0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._executor is None:
+                try:
+                    # spawn: forking a process with running threads and an event loop is unsafe
+                    context = multiprocessing.get_context('spawn')
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                         mp_context=context,
+                                                         initializer=_init_worker)
+                    logger.info(f"Chart render pool started with {self.max_workers} processes")
+                except Exception as e:
+                    logger.warning(f"Could not start chart render pool, rendering in-process: {e}")
+                    self.enabled = False
+            return self._executor
+
+    async def render(self, spec: ChartSpec, timeout: Optional[float] = None) -> bytes:
+        """
+        Render chart spec to PNG bytes without blocking the event loop.
+
+        Args:
+            spec: Chart specification
+            timeout: Optional timeout in seconds
+
+        Returns:
+            PNG bytes
+        """
+        timeout = CHART_RENDER_TIMEOUT if timeout is None else timeout
+        executor = self._get_executor()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            if executor is not None:
+                # Pickle here rather than in the pool's feeder thread, so that
+                # pickling failures are told apart from errors of the chart itself
+                try:
+                    payload = pickle.dumps(spec, protocol=pickle.HIGHEST_PROTOCOL)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    logger.warning(f"Chart spec {spec.method} is not picklable, rendering in-process: {e}")
+                    payload = None
+
+                future = None
+                if payload is not None:
+                    try:
+                        future = asyncio.get_running_loop().run_in_executor(executor, _render_pickled, payload)
+                    except (BrokenProcessPool, RuntimeError) as e:
+                        # Pool is broken or already shut down
+                        logger.warning(f"Could not submit {spec.method} to the render pool, rendering in-process: {e}")
+                        self.shutdown()
+
+                if future is not None:
+                    try:
+                        result = await asyncio.wait_for(future, timeout=timeout)
+                        with self._lock:
+                            self._rendered += 1
+                        return result
+                    except BrokenProcessPool as e:
+                        # Worker died - render in-process instead
+                        logger.warning(f"Process rendering of {spec.method} failed, falling back to in-process: {e}")
+                        self.shutdown()
+
+            result = await run_render(render_spec, spec, timeout=timeout)
+            with self._lock:
+                self._rendered += 1
+                if executor is not None:
+                    self._fallbacks += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get render pool metrics."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'processes': self.max_workers,
+                'started': self._executor is not None,
+                'in_flight': self._in_flight,
+                'rendered': self._rendered,
+                'fallbacks': self._fallbacks,
+                'failed': self._failed,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shutdown worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global instance for use throughout the application
+chart_render_pool = ChartRenderPool()
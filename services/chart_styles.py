@@ -1367,7 +1367,49 @@ class ChartStyles:
             ax.axis('off')
             return fig, ax
 
-    def create_monte_carlo_chart(self, fig, ax, symbols, currency, weights=None, portfolio_name=None, data_source='okama', forecast_data=None, **kwargs):
+    def create_monte_carlo_forecast_chart(self, history, paths, bands, symbols, currency, weights=None, portfolio_name=None,
+                                          n_paths=None, years=10, data_source='okama', **kwargs):
+        """Создать график прогноза Монте-Карло по готовым результатам симуляции
+        
+        Args:
+            history: Историческая стоимость портфеля (Series)
+            paths: Выборка траекторий для отрисовки (DataFrame, столбец - траектория)
+            bands: Процентили по всем траекториям (DataFrame, столбцы - процентили)
+            n_paths: Общее число смоделированных траекторий
+            years: Горизонт прогноза в годах
+        """
+        fig, ax = self.create_chart(**kwargs)
+        
+        def to_timestamps(index):
+            return index.to_timestamp() if str(getattr(index, 'dtype', '')).startswith('period') else index
+        
+        history_index = to_timestamps(history.index)
+        paths_index = to_timestamps(paths.index)
+        
+        ax.plot(history_index, history.values, color=self.get_color(0), alpha=self.lines['alpha'])
+        path_lines = ax.plot(paths_index, paths.values, color='gray', alpha=0.35, linewidth=0.6)
+        
+        if bands is not None and len(bands.columns) >= 2:
+            bands_index = to_timestamps(bands.index)
+            ax.fill_between(bands_index, bands.iloc[:, 0].values, bands.iloc[:, -1].values,
+                            color=self.get_color(1), alpha=0.15)
+            if len(bands.columns) >= 3:
+                ax.plot(bands_index, bands.iloc[:, len(bands.columns) // 2].values,
+                        color=self.get_color(1), alpha=self.lines['alpha'])
+        
+        self.create_monte_carlo_chart(
+            fig, ax, symbols, currency, weights=weights, portfolio_name=portfolio_name,
+            data_source=data_source, forecast_data=paths.set_axis(paths_index),
+            n_paths=n_paths or len(paths.columns), years=years
+        )
+        # Individual trajectories stay faint behind the percentile band
+        for line in path_lines:
+            line.set_alpha(0.35)
+            line.set_linewidth(0.6)
+        return fig, ax
+
+    def create_monte_carlo_chart(self, fig, ax, symbols, currency, weights=None, portfolio_name=None, data_source='okama', forecast_data=None,
+                                 n_paths=20, years=10, **kwargs):
         """Применить стили к графику монте-карло"""
         try:
             # Set figure size to standard chart size
@@ -1434,8 +1476,8 @@ class ChartStyles:
             # Add custom legend with forecast period and currency
             from matplotlib.patches import Patch
             legend_elements = [
-                Patch(facecolor='gray', alpha=0.6, label=f'Симуляции (20 траекторий)'),
-                Patch(facecolor='blue', alpha=0.8, label=f'Период: 10 лет'),
+                Patch(facecolor='gray', alpha=0.6, label=f'Симуляции ({n_paths} траекторий)'),
+                Patch(facecolor='blue', alpha=0.8, label=f'Период: {years:g} лет'),
                 Patch(facecolor='green', alpha=0.8, label=f'Валюта: {currency}')
             ]
             ax.legend(handles=legend_elements, loc='upper left', fontsize=9)
@@ -1453,8 +1495,12 @@ class ChartStyles:
                 logger.error("Failed to create chart figure and axes")
                 return None, None
             
-            # Сначала попробуем создать график с валидацией данных
-            success = self._create_efficient_frontier_with_validation(ef, ax, asset_names)
+            if hasattr(ef, 'points'):
+                # Готовые точки границы (services.efficient_frontier) - без пересчета
+                success = self._create_efficient_frontier_from_points(ef, ax, asset_names)
+            else:
+                # Сначала попробуем создать график с валидацией данных
+                success = self._create_efficient_frontier_with_validation(ef, ax, asset_names)
             
             if not success:
                 # Если основной метод не сработал, используем альтернативный подход
@@ -1491,6 +1537,28 @@ class ChartStyles:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None, None
 
+    def create_percentile_forecast_bands_chart(self, bands, symbols, currency, weights=None, portfolio_name=None, data_source='okama', **kwargs):
+        """Создать график прогноза с процентилями по готовым результатам симуляции
+        
+        Args:
+            bands: Процентили стоимости портфеля (DataFrame, столбцы - процентили)
+        """
+        fig, ax = self.create_chart(**kwargs)
+        
+        index = bands.index.to_timestamp() if str(getattr(bands.index, 'dtype', '')).startswith('period') else bands.index
+        if len(bands.columns) >= 2:
+            ax.fill_between(index, bands.iloc[:, 0].values, bands.iloc[:, -1].values,
+                            color=self.get_color(0), alpha=0.12)
+        for i, column in enumerate(bands.columns):
+            ax.plot(index, bands[column].values, color=self.get_color(i),
+                    alpha=self.lines['alpha'], label=f'{column}%')
+        
+        self.create_percentile_forecast_chart(
+            fig, ax, symbols, currency, weights=weights, portfolio_name=portfolio_name, data_source=data_source
+        )
+        self._optimize_x_axis_ticks(ax, index)
+        return fig, ax
+
     def create_percentile_forecast_chart(self, fig, ax, symbols, currency, weights=None, portfolio_name=None, data_source='okama', **kwargs):
         """Применить стили к графику прогноза с процентилями в едином стиле"""
         try:
@@ -1537,6 +1605,30 @@ class ChartStyles:
             # Return the original fig, ax even if styling failed
             return fig, ax
     
+    def _create_efficient_frontier_from_points(self, frontier, ax, asset_names):
+        """Построить карту переходов весов по готовым точкам эффективной границы"""
+        try:
+            ax.clear()
+            points = frontier.points
+            risks = points['Risk'].values * 100
+            
+            if not self._validate_efficient_frontier_data(list(points['Risk'].values), list(points['Mean return'].values)):
+                logger.error("Efficient frontier data validation failed")
+                return False
+            
+            for i, symbol in enumerate(frontier.symbols):
+                label = asset_names[i] if i < len(asset_names) else symbol
+                ax.plot(risks, points[symbol].values * 100, color=self.get_color(i), linewidth=2, label=label)
+            
+            ax.set_xlim(risks.min(), risks.max())
+            ax.set_ylim(0, 100)
+            ax.legend()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error in efficient frontier from points: {e}")
+            return False
+    
     def _create_efficient_frontier_with_validation(self, ef, ax, asset_names):
         """Создать эффективную границу с валидацией данных"""
         try:
@@ -0,0 +1,233 @@
+"""
+Circuit Breaker Module
+Fail-fast protection for calls to external data providers.
+
+During okama 502 storms every request used to sleep through several retry
+attempts before failing, so handlers piled up waiting on a service that was
+down. The breaker counts consecutive transient failures; after
+failure_threshold of them it opens and calls fail immediately with
+CircuitOpenError (callers serve cached data instead). After recovery_timeout
+a limited number of probe calls is let through (half-open): a success closes
+the circuit, a failure opens it again.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from services.instrumentation import record_external_call
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+OKAMA_BREAKER_FAILURES = int(os.getenv("OKAMA_BREAKER_FAILURES", "5"))
+OKAMA_BREAKER_RECOVERY = float(os.getenv("OKAMA_BREAKER_RECOVERY", "60"))
+
+# Circuit states
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+# Fallback classification by message for errors raised as plain Exception
+_TRANSIENT_PATTERN = re.compile(
+    r'50[234]|429|timeout|timed out|connection|max retries exceeded|too many'
+    r'|bad gateway|service unavailable|gateway timeout',
+    re.IGNORECASE
+)
+_TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = max(0.0, retry_in)
+        super().__init__(
+            f"Сервис {name.upper()} временно недоступен. "
+            f"Повторите запрос через {int(self.retry_in) + 1} сек."
+        )
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check if error is a transient provider failure (gateway errors, timeouts, connection problems).
+
+    Args:
+        error: Exception to check
+
+    Returns:
+        True if the call may succeed when retried later
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is not None:
+        return status in _TRANSIENT_STATUSES
+    try:
+        import requests
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True
+    except ImportError:
+        pass
+    return bool(_TRANSIENT_PATTERN.search(str(error)))
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with closed / open / half-open states.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0,
+                 half_open_max_calls: int = 1):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Protected service name
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before probing
+            half_open_max_calls: Concurrent probe calls allowed in half-open state
+        """
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_timeout = float(recovery_timeout)
+        self.half_open_max_calls = max(1, int(half_open_max_calls))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_failure: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """Current state (open turns into half-open once recovery_timeout has passed)."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def is_open(self) -> bool:
+        """True if calls are currently being rejected."""
+        return self.state == STATE_OPEN
+
+    def before_call(self) -> None:
+        """
+        Reserve a call slot.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all probe slots are taken
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return
+            if state == STATE_HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return
+            self.rejected += 1
+            retry_in = self.recovery_timeout - (time.monotonic() - self._opened_at)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._half_open_calls = 0
+
+    def record_failure(self, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            self._failures += 1
+            self.last_failure = str(error)[:200] if error is not None else None
+            state = self._current_state()
+            if state == STATE_HALF_OPEN or (state == STATE_CLOSED and self._failures >= self.failure_threshold):
+                self._state = STATE_OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+                self.times_opened += 1
+                logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures: {self.last_failure}")
+
+    def call(self, func: Callable, *args, is_failure: Callable[[Exception], bool] = is_transient_error,
+             **kwargs) -> Any:
+        """
+        Call func through the breaker.
+
+        Nested calls from the same thread (e.g. a cached constructor called
+        from a retried service method) are counted once, by the outer call.
+
+        Args:
+            func: Callable to protect
+            *args: Callable arguments
+            is_failure: Predicate deciding which exceptions count as provider failures;
+                other exceptions mean the provider responded and count as success
+            **kwargs: Callable keyword arguments
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if getattr(self._local, 'depth', 0):
+            return func(*args, **kwargs)
+
+        self.before_call()
+        record_external_call(self.name)
+        self._local.depth = 1
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure(e)
+            else:
+                self.record_success()
+            raise
+        finally:
+            self._local.depth = 0
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        """Close the circuit and reset counters (useful for tests)."""
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._half_open_calls = 0
+            self.rejected = 0
+            self.times_opened = 0
+            self.last_failure = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = 0.0
+            if state == STATE_OPEN:
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+            return {
+                'name': self.name,
+                'state': state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'retry_in': retry_in,
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+                'last_failure': self.last_failure,
+            }
+
+
+# Global breaker shared by every okama call in the process
+okama_breaker = CircuitBreaker('okama', OKAMA_BREAKER_FAILURES, OKAMA_BREAKER_RECOVERY)
@@ -0,0 +1,301 @@
+"""
+Correlation Module
+Shared correlation / covariance results for comparison contexts.
+
+The correlation matrix chart, the mixed comparison chart, the AI analysis
+data and the Excel export each built their own AssetList and called
+DataFrame.corr() (the Excel path even fell back to a constant 0.3 matrix).
+Correlations are now computed once per returns matrix with NumPy and cached;
+every consumer reads the same CorrelationResult.
+
+Variants derived from one result (computed lazily and memoized):
+- pearson: pairwise-complete Pearson correlation (same as DataFrame.corr())
+- shrinkage: Ledoit-Wolf shrunk covariance converted to correlation, more
+  stable for short common histories and many assets
+- rolling: rolling-window correlations for every pair at once
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.okama_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+# Matrix served to consumers: pearson | shrinkage
+CORRELATION_METHOD = os.getenv("CORRELATION_METHOD", "pearson")
+CORRELATION_MIN_PERIODS = int(os.getenv("CORRELATION_MIN_PERIODS", "3"))
+CORRELATION_CACHE_TTL = float(os.getenv("CORRELATION_CACHE_TTL", "900"))  # seconds
+CORRELATION_CACHE_MAX_ITEMS = int(os.getenv("CORRELATION_CACHE_MAX_ITEMS", "256"))
+
+METHODS = ('pearson', 'shrinkage')
+
+
+def pairwise_correlation(values: np.ndarray, min_periods: int = CORRELATION_MIN_PERIODS) -> np.ndarray:
+    """
+    Pearson correlation over pairwise-complete observations.
+
+    Matches pandas DataFrame.corr() for columns with gaps (e.g. portfolios
+    and assets with different histories) without a Python loop over pairs.
+
+    Args:
+        values: Array of shape (observations, columns), NaN for missing values
+        min_periods: Minimum number of common observations for a pair
+
+    Returns:
+        Array of shape (columns, columns); NaN where there is not enough data
+    """
+    values = np.asarray(values, dtype='float64')
+    mask = np.isfinite(values)
+    if mask.all():
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.corrcoef(values, rowvar=False).reshape(values.shape[1], values.shape[1])
+        count = np.full(corr.shape, values.shape[0])
+    else:
+        present = mask.astype('float64')
+        filled = np.where(mask, values, 0.0)
+        count = present.T @ present
+        sum_x = filled.T @ present          # sum of column i over rows where j is present
+        sum_xx = (filled ** 2).T @ present
+        sum_xy = filled.T @ filled
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = sum_xy - sum_x * sum_x.T / count
+            var_x = sum_xx - sum_x ** 2 / count
+            corr = cov / np.sqrt(var_x * var_x.T)
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[count < max(int(min_periods), 2)] = np.nan
+    return corr
+
+
+def shrunk_covariance(values: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage of the sample covariance towards a scaled identity.
+
+    Args:
+        values: Array of shape (observations, columns) without missing values
+
+    Returns:
+        Tuple (covariance, shrinkage intensity in [0, 1])
+    """
+    values = np.asarray(values, dtype='float64')
+    n_obs, n_cols = values.shape
+    centered = values - values.mean(axis=0)
+    sample = centered.T @ centered / n_obs
+    mu = np.trace(sample) / n_cols
+    target = mu * np.eye(n_cols)
+
+    delta = np.sum((sample - target) ** 2)
+    if delta == 0:
+        return sample * n_obs / max(n_obs - 1, 1), 0.0
+    # Average squared distance of single-observation covariances to the sample covariance
+    squared = centered ** 2
+    beta = (np.sum(squared.T @ squared) / n_obs - np.sum(sample ** 2)) / n_obs
+    shrinkage = float(np.clip(beta / delta, 0.0, 1.0))
+    covariance = shrinkage * target + (1.0 - shrinkage) * sample
+    return covariance * n_obs / max(n_obs - 1, 1), shrinkage
+
+
+def covariance_to_correlation(covariance: np.ndarray) -> np.ndarray:
+    """Convert covariance matrix to correlation matrix."""
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = covariance / np.outer(std, std)
+    return np.clip(corr, -1.0, 1.0)
+
+
+def rolling_correlation(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling-window correlation of all pairs at once.
+
+    Uses cumulative sums of the observations and their outer products, so
+    every window costs O(columns^2) regardless of the window length.
+
+    Args:
+        values: Array of shape (observations, columns) without missing values
+        window: Window length in observations
+
+    Returns:
+        Array of shape (observations - window + 1, columns, columns)
+    """
+    values = np.asarray(values, dtype='float64')
+    n_obs, n_cols = values.shape
+    window = int(window)
+    if window < 2 or window > n_obs:
+        raise ValueError(f"Window must be between 2 and {n_obs}")
+
+    # Center once to reduce cancellation in the running sums
+    values = values - values.mean(axis=0)
+    zeros = np.zeros((1, n_cols))
+    sums = np.concatenate([zeros, np.cumsum(values, axis=0)])
+    products = np.concatenate([np.zeros((1, n_cols, n_cols)),
+                               np.cumsum(values[:, :, None] * values[:, None, :], axis=0)])
+
+    window_sums = sums[window:] - sums[:-window]
+    window_products = products[window:] - products[:-window]
+    cov = window_products - window_sums[:, :, None] * window_sums[:, None, :] / window
+    var = np.diagonal(cov, axis1=1, axis2=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / np.sqrt(var[:, :, None] * var[:, None, :])
+    return np.clip(corr, -1.0, 1.0)
+
+
+class CorrelationResult:
+    """
+    Correlation and covariance of one returns matrix.
+
+    The Pearson matrix is computed on creation; shrinkage and rolling
+    variants are computed on first use and memoized.
+    """
+
+    def __init__(self, returns, min_periods: int = CORRELATION_MIN_PERIODS):
+        """
+        Args:
+            returns: Periodic returns DataFrame (rows - periods, columns - assets)
+            min_periods: Minimum number of common observations for a pair
+        """
+        import pandas as pd
+
+        self.returns = returns
+        self.symbols = [str(c) for c in returns.columns]
+        self._values = returns.to_numpy(dtype='float64')
+        self.pearson = pd.DataFrame(pairwise_correlation(self._values, min_periods),
+                                    index=self.symbols, columns=self.symbols)
+        self._lock = threading.Lock()
+        self._shrinkage: Optional[Tuple[Any, float]] = None
+        self._rolling: Dict[int, Any] = {}
+
+    @property
+    def n_obs(self) -> int:
+        """Number of periods with data for every column."""
+        return int(np.isfinite(self._values).all(axis=1).sum())
+
+    def _complete_values(self) -> np.ndarray:
+        return self._values[np.isfinite(self._values).all(axis=1)]
+
+    def covariance(self):
+        """Sample covariance over common periods as DataFrame."""
+        import pandas as pd
+
+        values = self._complete_values()
+        cov = np.cov(values, rowvar=False, ddof=1).reshape(len(self.symbols), len(self.symbols))
+        return pd.DataFrame(cov, index=self.symbols, columns=self.symbols)
+
+    def _shrunk(self) -> Tuple[Any, float]:
+        with self._lock:
+            if self._shrinkage is None:
+                covariance, intensity = shrunk_covariance(self._complete_values())
+                self._shrinkage = (covariance, intensity)
+            return self._shrinkage
+
+    def shrunk_covariance(self):
+        """Ledoit-Wolf shrunk covariance as DataFrame."""
+        import pandas as pd
+
+        covariance, _ = self._shrunk()
+        return pd.DataFrame(covariance, index=self.symbols, columns=self.symbols)
+
+    @property
+    def shrinkage_intensity(self) -> float:
+        return self._shrunk()[1]
+
+    def matrix(self, method: str = CORRELATION_METHOD):
+        """
+        Correlation matrix as DataFrame.
+
+        Args:
+            method: One of METHODS
+
+        Raises:
+            ValueError: If method is unknown
+        """
+        import pandas as pd
+
+        if method == 'pearson':
+            return self.pearson
+        if method == 'shrinkage':
+            covariance, _ = self._shrunk()
+            return pd.DataFrame(covariance_to_correlation(covariance), index=self.symbols, columns=self.symbols)
+        raise ValueError(f"Unknown correlation method: {method}. Supported: {', '.join(METHODS)}")
+
+    def rolling(self, window: int = 12) -> np.ndarray:
+        """Rolling correlations of shape (windows, columns, columns) over common periods."""
+        window = int(window)
+        with self._lock:
+            if window not in self._rolling:
+                self._rolling[window] = rolling_correlation(self._complete_values(), window)
+            return self._rolling[window]
+
+    def rolling_pair(self, first: str, second: str, window: int = 12):
+        """Rolling correlation of two columns as Series indexed by window end."""
+        import pandas as pd
+
+        index = self.returns.index[np.isfinite(self._values).all(axis=1)][int(window) - 1:]
+        i, j = self.symbols.index(first), self.symbols.index(second)
+        return pd.Series(self.rolling(window)[:, i, j], index=index, name=f"{first} ↔ {second}")
+
+    def pairs(self, method: str = CORRELATION_METHOD) -> List[Tuple[str, str, float]]:
+        """Upper-triangle pairs (first, second, correlation)."""
+        values = self.matrix(method).to_numpy()
+        rows, cols = np.triu_indices(len(self.symbols), k=1)
+        return [(self.symbols[i], self.symbols[j], float(values[i, j])) for i, j in zip(rows, cols)]
+
+    def to_list(self, method: str = CORRELATION_METHOD) -> List[List[float]]:
+        """Correlation matrix as nested lists (for AI analysis and Excel export)."""
+        return self.matrix(method).to_numpy().tolist()
+
+
+def make_correlation_key(returns, currency: Optional[str] = None) -> Tuple:
+    """
+    Cache key: columns, currency, period and a digest of the returns themselves.
+    """
+    values = np.ascontiguousarray(returns.to_numpy(dtype='float64'))
+    digest = hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+    index = returns.index
+    return (
+        tuple(str(c) for c in returns.columns),
+        currency,
+        str(index[0]) if len(index) else None,
+        str(index[-1]) if len(index) else None,
+        digest,
+    )
+
+
+class CorrelationService:
+    """
+    Process-wide cache of correlation results per comparison context.
+    """
+
+    def __init__(self, max_items: int = CORRELATION_CACHE_MAX_ITEMS, ttl: float = CORRELATION_CACHE_TTL):
+        self._cache = TTLLRUCache(max_items=max_items, ttl=ttl)
+
+    def get_or_compute(self, returns, currency: Optional[str] = None) -> CorrelationResult:
+        """
+        Cached correlation result for a returns matrix or a new one.
+
+        Args:
+            returns: Periodic returns DataFrame
+            currency: Base currency of the returns
+
+        Raises:
+            ValueError: If there are fewer than 2 columns
+        """
+        if returns is None or returns.shape[1] < 2:
+            raise ValueError("Correlation requires at least 2 columns")
+        key = make_correlation_key(returns, currency)
+        return self._cache.get_or_create(key, lambda: CorrelationResult(returns))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._cache.get_stats()
+
+
+# Global instance for use throughout the application
+correlation_service = CorrelationService()
@@ -4,6 +4,7 @@ from typing import List, Optional
 import io
 
 from services.chart_styles import chart_styles
+from services.okama_cache import okama_cache
 
 
 class Portfolio:
@@ -30,18 +31,17 @@ class Portfolio:
 
     @staticmethod
     def _create_portfolio(symbols: List[str], weights: List[float], currency: Optional[str] = None):
-        import okama as ok
         try:
             if currency is not None:
-                return ok.Portfolio(assets=symbols, weights=weights, ccy=currency)
-            return ok.Portfolio(assets=symbols, weights=weights)
+                return okama_cache.portfolio(assets=symbols, weights=weights, ccy=currency)
+            return okama_cache.portfolio(assets=symbols, weights=weights)
         except TypeError:
             if currency is not None:
                 try:
-                    return ok.Portfolio(assets=symbols, weights=weights, currency=currency)
+                    return okama_cache.portfolio(assets=symbols, weights=weights, currency=currency)
                 except Exception:
-                    return ok.Portfolio(assets=symbols, weights=weights)
-            return ok.Portfolio(assets=symbols, weights=weights)
+                    return okama_cache.portfolio(assets=symbols, weights=weights)
+            return okama_cache.portfolio(assets=symbols, weights=weights)
 
     def wealth_chart_png(self) -> bytes:
         if self._portfolio is None:
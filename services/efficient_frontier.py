@@ -0,0 +1,258 @@
+"""
+Efficient Frontier Module
+Cached mean-variance frontier with a warm-start optimizer.
+
+ok.EfficientFrontier was built synchronously on every button press: dozens of
+independent scipy optimizations started from equal weights, the most
+expensive thing the bot does. The frontier is now computed from the monthly
+returns matrix of the AssetList:
+
+- the target returns are solved one after another from the GMV portfolio up,
+  each SLSQP solve warm-started from the previous solution and using
+  analytic gradients, so a solve takes a few iterations. SLSQP holds the GIL,
+  so splitting the targets across threads would not run them in parallel;
+- results (points, weights, GMV / max-return / tangency portfolios) are
+  cached per (asset set, currency, period) via a digest of the returns.
+
+Points keep the okama ef_points layout (Risk, Mean return, CAGR and one
+weight column per asset), annualized the same way as okama.
+"""
+
+import os
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.okama_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+EF_POINTS = int(os.getenv("EF_POINTS", "20"))
+EF_CACHE_TTL = float(os.getenv("EF_CACHE_TTL", str(6 * 3600)))  # seconds
+EF_CACHE_MAX_ITEMS = int(os.getenv("EF_CACHE_MAX_ITEMS", "128"))
+
+MONTHS_PER_YEAR = 12
+
+
+def annualize_return(mean_monthly):
+    """Annualized mean return (okama Float.annualize_return)."""
+    return (1.0 + np.asarray(mean_monthly)) ** MONTHS_PER_YEAR - 1.0
+
+
+def annualize_risk(risk_monthly, mean_monthly):
+    """Annualized risk (okama Float.annualize_risk)."""
+    risk_monthly = np.asarray(risk_monthly)
+    mean_monthly = np.asarray(mean_monthly)
+    variance = ((risk_monthly ** 2 + (1.0 + mean_monthly) ** 2) ** MONTHS_PER_YEAR
+                - (1.0 + mean_monthly) ** (2 * MONTHS_PER_YEAR))
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+class _Problem:
+    """Mean-variance problem data with analytic derivatives."""
+
+    def __init__(self, returns: np.ndarray, bounds: Tuple[float, float]):
+        self.returns = returns
+        self.mean = returns.mean(axis=0)
+        self.cov = np.cov(returns, rowvar=False, ddof=1).reshape(returns.shape[1], returns.shape[1])
+        self.n = returns.shape[1]
+        self.bounds = [bounds] * self.n
+        self._ones = np.ones(self.n)
+
+    def variance(self, w: np.ndarray) -> float:
+        return float(w @ self.cov @ w)
+
+    def variance_grad(self, w: np.ndarray) -> np.ndarray:
+        return 2.0 * self.cov @ w
+
+    def _constraints(self, target: Optional[float]) -> List[Dict[str, Any]]:
+        constraints = [{'type': 'eq', 'fun': lambda w: w.sum() - 1.0, 'jac': lambda w: self._ones}]
+        if target is not None:
+            constraints.append({'type': 'eq', 'fun': lambda w: w @ self.mean - target, 'jac': lambda w: self.mean})
+        return constraints
+
+    def min_variance(self, x0: np.ndarray, target: Optional[float] = None) -> np.ndarray:
+        """Minimum variance weights (for the target monthly mean if given)."""
+        from scipy.optimize import minimize
+
+        result = minimize(self.variance, x0, jac=self.variance_grad, method='SLSQP',
+                          bounds=self.bounds, constraints=self._constraints(target),
+                          options={'ftol': 1e-12, 'maxiter': 200})
+        weights = np.clip(result.x, 0.0, None)
+        return weights / weights.sum()
+
+    def max_sharpe(self, x0: np.ndarray, risk_free_rate: float) -> np.ndarray:
+        """Weights maximizing annualized (return - rf) / risk."""
+        from scipy.optimize import minimize
+
+        def negative_sharpe(w):
+            mean = w @ self.mean
+            risk = annualize_risk(np.sqrt(max(self.variance(w), 0.0)), mean)
+            return -(annualize_return(mean) - risk_free_rate) / risk if risk > 0 else 0.0
+
+        result = minimize(negative_sharpe, x0, method='SLSQP', bounds=self.bounds,
+                          constraints=self._constraints(None), options={'ftol': 1e-10, 'maxiter': 200})
+        weights = np.clip(result.x, 0.0, None)
+        return weights / weights.sum()
+
+
+class FrontierResult:
+    """
+    Efficient frontier points and key portfolios.
+    """
+
+    def __init__(self, symbols: List[str], points, gmv: Dict[str, Any], max_return: Dict[str, Any],
+                 tangency: Dict[str, Any], risk_free_rate: float = 0.0):
+        """
+        Args:
+            symbols: Asset symbols (columns of the returns matrix)
+            points: DataFrame in okama ef_points layout
+            gmv: Global minimum variance portfolio (risk, return, weights)
+            max_return: Maximum return portfolio (risk, return, weights)
+            tangency: Maximum Sharpe portfolio (risk, return, weights, sharpe_ratio)
+            risk_free_rate: Annual risk-free rate used for the tangency portfolio
+        """
+        self.symbols = symbols
+        self.points = points
+        self.gmv = gmv
+        self.max_return = max_return
+        self.tangency = tangency
+        self.risk_free_rate = risk_free_rate
+
+    def portfolio_data(self) -> Dict[str, Dict[str, Any]]:
+        """Key portfolios in the format of the efficient frontier caption."""
+        return {'gmv': self.gmv, 'max_return': self.max_return, 'tangency': self.tangency}
+
+    def to_analysis_dict(self, asset_names: Sequence[str], currency: str) -> Dict[str, Any]:
+        """Key portfolios in the format of the AI analysis data."""
+        return {
+            'min_risk_portfolio': {k: self.gmv[k] for k in ('risk', 'return', 'weights')},
+            'max_return_portfolio': {k: self.max_return[k] for k in ('risk', 'return', 'weights')},
+            'max_sharpe_portfolio': dict(self.tangency),
+            'asset_names': list(asset_names),
+            'currency': currency,
+        }
+
+
+def _solve_chain(problem: _Problem, targets: np.ndarray, x0: np.ndarray) -> List[np.ndarray]:
+    """Solve consecutive targets, warm-starting each one from the previous solution."""
+    solutions = []
+    for target in targets:
+        x0 = problem.min_variance(x0, target)
+        solutions.append(x0)
+    return solutions
+
+
+def compute_frontier(returns, n_points: int = EF_POINTS, risk_free_rate: float = 0.0,
+                     bounds: Tuple[float, float] = (0.0, 1.0)) -> FrontierResult:
+    """
+    Compute long-only efficient frontier from monthly returns.
+
+    Args:
+        returns: Monthly returns DataFrame (rows - months, columns - assets)
+        n_points: Number of frontier points
+        risk_free_rate: Annual risk-free rate for the tangency portfolio
+        bounds: Weight bounds of every asset
+
+    Returns:
+        FrontierResult
+
+    Raises:
+        ValueError: If there are fewer than 2 assets or not enough history
+    """
+    import pandas as pd
+
+    returns = returns.dropna()
+    symbols = [str(c) for c in returns.columns]
+    values = returns.to_numpy(dtype='float64')
+    if values.shape[1] < 2:
+        raise ValueError("Efficient frontier requires at least 2 assets")
+    if values.shape[0] < 3:
+        raise ValueError("Not enough common history for efficient frontier")
+
+    problem = _Problem(values, bounds)
+    equal = np.full(problem.n, 1.0 / problem.n)
+
+    gmv_weights = problem.min_variance(equal)
+    max_weights = np.zeros(problem.n)
+    max_weights[int(np.argmax(problem.mean))] = 1.0
+
+    gmv_mean = float(gmv_weights @ problem.mean)
+    max_mean = float(problem.mean.max())
+    targets = np.linspace(gmv_mean, max_mean, max(2, int(n_points)))
+
+    # One warm-started chain from the GMV portfolio to the max-return portfolio
+    weights = np.vstack(_solve_chain(problem, targets, gmv_weights))
+
+    # All points at once: monthly mean / risk and CAGR of monthly rebalanced portfolios
+    means = weights @ problem.mean
+    risks = np.sqrt(np.maximum(np.einsum('ij,jk,ik->i', weights, problem.cov, weights), 0.0))
+    portfolio_returns = values @ weights.T
+    cagr = np.prod(1.0 + portfolio_returns, axis=0) ** (MONTHS_PER_YEAR / values.shape[0]) - 1.0
+
+    points = pd.DataFrame(weights, columns=symbols)
+    points.insert(0, 'CAGR', cagr)
+    points.insert(0, 'Mean return', annualize_return(means))
+    points.insert(0, 'Risk', annualize_risk(risks, means))
+
+    def describe(w: np.ndarray) -> Dict[str, Any]:
+        mean = float(w @ problem.mean)
+        risk = float(annualize_risk(np.sqrt(max(problem.variance(w), 0.0)), mean))
+        return {'risk': risk, 'return': float(annualize_return(mean)), 'weights': w.tolist()}
+
+    sharpe = (points['Mean return'].to_numpy() - risk_free_rate) / points['Risk'].to_numpy()
+    tangency_weights = problem.max_sharpe(weights[int(np.nanargmax(sharpe))], risk_free_rate)
+    tangency = describe(tangency_weights)
+    tangency['sharpe_ratio'] = (tangency['return'] - risk_free_rate) / tangency['risk'] if tangency['risk'] > 0 else None
+
+    return FrontierResult(symbols, points, describe(gmv_weights), describe(max_weights), tangency, risk_free_rate)
+
+
+def make_frontier_key(returns, currency: str, risk_free_rate: float = 0.0, n_points: int = EF_POINTS) -> Tuple:
+    """
+    Cache key: asset set, currency, period and a digest of the returns themselves.
+
+    Portfolios inside an AssetList get generated symbols, so the digest makes
+    sure different weights never share a frontier.
+    """
+    values = np.ascontiguousarray(returns.to_numpy(dtype='float64'))
+    digest = hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+    index = returns.index
+    return (
+        tuple(str(c) for c in returns.columns),
+        currency,
+        str(index[0]) if len(index) else None,
+        str(index[-1]) if len(index) else None,
+        digest,
+        round(float(risk_free_rate), 6),
+        int(n_points),
+    )
+
+
+class FrontierCache:
+    """
+    Process-wide cache of computed frontiers.
+    """
+
+    def __init__(self, max_items: int = EF_CACHE_MAX_ITEMS, ttl: float = EF_CACHE_TTL):
+        self._cache = TTLLRUCache(max_items=max_items, ttl=ttl)
+
+    def get_or_compute(self, returns, currency: str, risk_free_rate: float = 0.0,
+                       n_points: int = EF_POINTS) -> FrontierResult:
+        """Cached frontier or a new one (blocking, run it in the data pool)."""
+        key = make_frontier_key(returns, currency, risk_free_rate, n_points)
+        return self._cache.get_or_create(
+            key, lambda: compute_frontier(returns, n_points=n_points, risk_free_rate=risk_free_rate))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._cache.get_stats()
+
+
+# Global instance for use throughout the application
+frontier_cache = FrontierCache()
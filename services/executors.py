@@ -0,0 +1,196 @@
+"""
+Executors Module
+Bounded thread pools for blocking data fetching and chart rendering.
+
+Handlers must not call okama, Tushare or matplotlib directly on the asyncio
+event loop: one slow efficient frontier would freeze every other user.
+Blocking work is submitted to a named pool instead. Each pool has its own
+concurrency limit (worker count), a bounded queue and basic metrics
+(queue depth, wait time, run time) so cheap commands stay responsive
+while heavy analyses are running. Jobs run in a copy of the caller's context
+and their wall time is attributed to the pool's phase of the current
+handler request (see services/instrumentation.py).
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from services.instrumentation import PHASE_FETCH, PHASE_RENDER, phase
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+# Network-bound okama / Tushare calls
+DATA_POOL_WORKERS = int(os.getenv("DATA_POOL_WORKERS", "8"))
+DATA_POOL_MAX_QUEUE = int(os.getenv("DATA_POOL_MAX_QUEUE", "64"))
+# Matplotlib rendering: pyplot keeps global state, so a single worker by default
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", "1"))
+RENDER_POOL_MAX_QUEUE = int(os.getenv("RENDER_POOL_MAX_QUEUE", "32"))
+# Default timeout for a single job in seconds
+EXECUTOR_DEFAULT_TIMEOUT = float(os.getenv("EXECUTOR_DEFAULT_TIMEOUT", "120"))
+
+
+class ExecutorOverloadedError(RuntimeError):
+    """Raised when a pool queue is full and the job is rejected."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a concurrency limit, a bounded queue and metrics.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int = 0, phase: Optional[str] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            name: Pool name used for thread names and metrics
+            max_workers: Maximum number of jobs running concurrently
+            max_queue: Maximum number of jobs waiting for a worker (0 - unbounded)
+            phase: Request phase the awaited jobs are attributed to
+        """
+        self.name = name
+        self.phase = phase
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    def _job(self, func: Callable, submitted_at: float):
+        started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._total_wait += started_at - submitted_at
+        try:
+            result = func()
+            with self._lock:
+                self._completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._total_run += time.monotonic() - started_at
+
+    def _release_cancelled(self, job) -> None:
+        if job.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run blocking callable in the pool without blocking the event loop.
+
+        Args:
+            func: Blocking callable
+            *args: Callable arguments
+            timeout: Optional timeout in seconds (defaults to EXECUTOR_DEFAULT_TIMEOUT)
+            **kwargs: Callable keyword arguments
+
+        Returns:
+            Callable result
+
+        Raises:
+            ExecutorOverloadedError: If the pool queue is full
+            asyncio.TimeoutError: If the job did not finish in time
+        """
+        with self._lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorOverloadedError(
+                    f"{self.name} pool is overloaded ({self._queued} jobs queued)")
+            self._queued += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        call = functools.partial(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        # run_in_executor does not propagate contextvars (request metrics)
+        context = contextvars.copy_context()
+        try:
+            job = self._executor.submit(context.run, self._job, call, time.monotonic())
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+        # A job cancelled while queued (timeout, shutdown) never reaches _job
+        job.add_done_callback(self._release_cancelled)
+        future = asyncio.wrap_future(job, loop=loop)
+
+        timeout = EXECUTOR_DEFAULT_TIMEOUT if timeout is None else timeout
+        try:
+            if self.phase is None:
+                return await asyncio.wait_for(future, timeout=timeout)
+            with phase(self.phase):
+                return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(f"{self.name} pool job timed out after {timeout:.1f}s")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool metrics."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                'name': self.name,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'active': self._active,
+                'queue_depth': self._queued,
+                'max_queue_depth': self._max_queue_depth,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'timed_out': self._timed_out,
+                'avg_wait': (self._total_wait / finished) if finished else 0.0,
+                'avg_run': (self._total_run / finished) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shutdown the underlying thread pool."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global pools for use throughout the application
+data_executor = BoundedExecutor("data", DATA_POOL_WORKERS, DATA_POOL_MAX_QUEUE, phase=PHASE_FETCH)
+render_executor = BoundedExecutor("render", RENDER_POOL_WORKERS, RENDER_POOL_MAX_QUEUE, phase=PHASE_RENDER)
+
+
+async def run_data(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking okama / Tushare call in the data pool."""
+    return await data_executor.run(func, *args, **kwargs)
+
+
+async def run_render(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking matplotlib rendering in the render pool."""
+    return await render_executor.run(func, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for all pools."""
+    return {pool.name: pool.get_stats() for pool in (data_executor, render_executor)}
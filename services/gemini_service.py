@@ -5,13 +5,11 @@ Gemini API service for chart analysis
 import logging
 import io
 import base64
+import importlib.util
 from typing import Optional, Dict, Any
 import os
 
-try:
-    import requests
-except ImportError:
-    requests = None
+from services.http_client import HTTPTimeoutError, get_sync_session, http_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,10 +31,6 @@ class GeminiService:
         # Централизованные промпты
         self._initialize_prompts()
         
-        if requests is None:
-            logger.warning("Requests library not installed. Chart analysis will be disabled.")
-            return
-            
         try:
             self._initialize_client()
         except Exception as e:
@@ -54,11 +48,6 @@ class GeminiService:
             logger.warning("Invalid Gemini API key format")
             return
         
-        # Check if requests library is available
-        if requests is None:
-            logger.warning("Requests library not available")
-            return
-        
         # Simple validation - Gemini API keys typically start with different patterns
         if len(self.api_key) >= 20:
             self.client = True  # Mark as initialized
@@ -240,7 +229,7 @@ class GeminiService:
             }
             
             # Make API request
-            response = requests.post(
+            response = get_sync_session().post(
                 f"{self.api_url}?key={self.api_key}",
                 json=payload,
                 timeout=30
@@ -349,11 +338,20 @@ class GeminiService:
             'available': self.is_available(),
             'api_key_set': bool(self.api_key),
             'api_key_length': len(self.api_key) if self.api_key else 0,
-            'library_installed': requests is not None,
+            'library_installed': importlib.util.find_spec('aiohttp') is not None,
             'api_url': self.api_url
         }
     
-    def analyze_data(self, data_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def probe(self):
+        """Health probe: fetch model metadata (free request, no generation)"""
+        if not self.is_available():
+            raise RuntimeError("Gemini API key is not configured")
+        model_url = self.api_url.rsplit(':', 1)[0]
+        response = await http_client.get(f"{model_url}?key={self.api_key}", timeout=10, retries=0)
+        if response.status_code != 200:
+            raise RuntimeError(f"Gemini API returned status {response.status_code}")
+    
+    async def analyze_data(self, data_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Analyze financial data using Gemini API (text-only analysis)
         
@@ -396,7 +394,7 @@ class GeminiService:
                 }
             }
             
-            response = requests.post(
+            response = await http_client.post(
                 f"{self.api_url}?key={self.api_key}",
                 headers=headers,
                 json=payload,
@@ -459,7 +457,7 @@ class GeminiService:
                 'analysis_type': 'data'
             }
             
-        except requests.exceptions.Timeout:
+        except HTTPTimeoutError:
             logger.error("Gemini API request timed out")
             return {
                 'error': "Gemini API request timed out",
@@ -655,7 +653,7 @@ class GeminiService:
         
         return "\n".join(description_parts)
     
-    def analyze_portfolio(self, portfolio_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def analyze_portfolio(self, portfolio_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Analyze portfolio data using Gemini API with specialized portfolio analysis prompt
         
@@ -698,7 +696,7 @@ class GeminiService:
                 }
             }
             
-            response = requests.post(
+            response = await http_client.post(
                 f"{self.api_url}?key={self.api_key}",
                 headers=headers,
                 json=payload,
@@ -760,7 +758,7 @@ class GeminiService:
                 'analysis_type': 'portfolio'
             }
             
-        except requests.exceptions.Timeout:
+        except HTTPTimeoutError:
             logger.error("Gemini API request timed out")
             return {
                 'error': "Gemini API request timed out",
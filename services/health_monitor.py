@@ -0,0 +1,191 @@
+"""
+Health Monitor Module
+Background availability probing of external services.
+
+Availability checks used to make a full API round-trip (e.g. okama
+get_namespaces) every time /status or an error path asked. Services now
+register a cheap probe; the bot job queue runs all probes on a schedule and
+the monitor keeps the results in memory: availability, last success time,
+last error and a latency histogram per service. Request handlers read
+these results without any network I/O.
+"""
+
+import os
+import time
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from services.executors import run_data
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "120"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "15"))
+
+# Latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    Cumulative latency histogram (Prometheus-style buckets).
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Dict[str, int]:
+        """Cumulative counts keyed by upper bound ('+Inf' for the last bucket)."""
+        result = {}
+        total = 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            total += count
+            result[str(bound)] = total
+        return result
+
+
+class ServiceHealth:
+    """Last known health of a single service."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.available: Optional[bool] = None  # None - not checked yet
+        self.last_check: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'available': self.available,
+            'last_check': self.last_check,
+            'last_success': self.last_success,
+            'last_latency': self.last_latency,
+            'last_error': self.last_error,
+            'consecutive_failures': self.consecutive_failures,
+            'latency_histogram': self.latency.cumulative(),
+            'latency_sum': self.latency.sum,
+            'latency_count': self.latency.count,
+        }
+
+
+class HealthMonitor:
+    """
+    Registry of service probes with in-memory results.
+    """
+
+    def __init__(self, probe_timeout: float = HEALTH_PROBE_TIMEOUT):
+        """
+        Initialize the monitor.
+
+        Args:
+            probe_timeout: Timeout of a single probe in seconds
+        """
+        self.probe_timeout = probe_timeout
+        self._probes: Dict[str, Callable] = {}
+        self._health: Dict[str, ServiceHealth] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, probe: Callable) -> None:
+        """
+        Register service probe.
+
+        Args:
+            name: Service name
+            probe: Callable or coroutine function; returns normally if the
+                service is healthy and raises otherwise. Blocking probes run
+                in the data pool.
+        """
+        with self._lock:
+            self._probes[name] = probe
+            self._health.setdefault(name, ServiceHealth(name))
+
+    def record(self, name: str, ok: bool, latency: Optional[float] = None, error: Optional[str] = None) -> None:
+        """Record probe (or real call) outcome for a service."""
+        now = time.time()
+        with self._lock:
+            health = self._health.setdefault(name, ServiceHealth(name))
+            health.available = ok
+            health.last_check = now
+            if latency is not None:
+                health.last_latency = latency
+                health.latency.observe(latency)
+            if ok:
+                health.last_success = now
+                health.last_error = None
+                health.consecutive_failures = 0
+            else:
+                health.last_error = error
+                health.consecutive_failures += 1
+
+    async def probe(self, name: str) -> bool:
+        """Run a single registered probe and record the result."""
+        probe = self._probes[name]
+        started = time.monotonic()
+        try:
+            if inspect.iscoroutinefunction(probe):
+                await asyncio.wait_for(probe(), timeout=self.probe_timeout)
+            else:
+                await run_data(probe, timeout=self.probe_timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.record(name, False, time.monotonic() - started, error[:200])
+            logger.warning(f"Health probe for {name} failed: {error[:200]}")
+            return False
+        self.record(name, True, time.monotonic() - started)
+        return True
+
+    async def probe_all(self) -> Dict[str, bool]:
+        """Run all registered probes concurrently."""
+        with self._lock:
+            names = list(self._probes)
+        results = await asyncio.gather(*(self.probe(name) for name in names))
+        return dict(zip(names, results))
+
+    def is_available(self, name: str, default: bool = True) -> bool:
+        """
+        Last known availability of a service (no network I/O).
+
+        Args:
+            name: Service name
+            default: Answer for services that were not probed yet
+        """
+        with self._lock:
+            health = self._health.get(name)
+            if health is None or health.available is None:
+                return default
+            return health.available
+
+    def get_status(self, name: str) -> Optional[Dict[str, Any]]:
+        """Last known health of a service or None if it is unknown."""
+        with self._lock:
+            health = self._health.get(name)
+            return health.to_dict() if health is not None else None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Health of all services."""
+        with self._lock:
+            return {name: health.to_dict() for name, health in self._health.items()}
+
+
+# Global instance for use throughout the application
+health_monitor = HealthMonitor()
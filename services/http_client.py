@@ -0,0 +1,240 @@
+"""
+HTTP Client Module
+Shared pooled HTTP clients for external services (YandexGPT, Gemini, Botality).
+
+Creating a new requests.Session per call (or posting from the default thread
+pool) costs a TCP + TLS handshake and a thread hop on every request. Services
+use the shared clients instead:
+
+- AsyncHTTPClient: aiohttp session with keep-alive pooling, per-host
+  connection limits, timeouts and retry with exponential backoff and jitter.
+  Used from coroutines.
+- get_sync_session(): process-wide requests.Session with a pooled adapter and
+  the same retry policy for synchronous service APIs.
+"""
+
+import os
+import json
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from services.instrumentation import PHASE_FETCH, phase, record_external_call
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8"))
+
+# Statuses worth retrying: rate limiting and transient gateway errors
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Non-idempotent requests (POST completions of AI APIs) may already have been
+# processed after a read timeout or a gateway error, so they are only resent
+# when the server did not accept them: connection failures and these statuses
+NOT_PROCESSED_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+
+
+class HTTPTimeoutError(asyncio.TimeoutError):
+    """Raised when a request timed out after all retry attempts."""
+
+
+def backoff_delay(attempt: int, base: float = HTTP_BACKOFF_BASE, cap: float = HTTP_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given attempt (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HTTPResponse:
+    """
+    Fully read HTTP response with a requests-like interface.
+    """
+
+    def __init__(self, status_code: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncHTTPClient:
+    """
+    Pooled aiohttp client with per-host limits, timeouts and retry with jitter.
+    """
+
+    def __init__(self, limit: int = HTTP_POOL_LIMIT, limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+                 timeout: float = HTTP_DEFAULT_TIMEOUT, retries: int = HTTP_RETRIES):
+        """
+        Initialize the client. The aiohttp session is created lazily in the running loop.
+
+        Args:
+            limit: Total number of pooled connections
+            limit_per_host: Number of pooled connections per host
+            timeout: Default total request timeout in seconds
+            retries: Default number of retries for transient failures
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self._session = None
+        self._session_loop = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+        self.failed = 0
+
+    def _get_session(self):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             ttl_dns_cache=300)
+            # trust_env=False: external APIs are called without environment proxies
+            self._session = aiohttp.ClientSession(connector=connector, trust_env=False)
+            self._session_loop = loop
+        return self._session
+
+    async def request(self, method: str, url: str, *, timeout: Optional[float] = None,
+                      retries: Optional[int] = None, **kwargs) -> HTTPResponse:
+        """
+        Send HTTP request, retrying timeouts, connection errors and RETRY_STATUSES.
+
+        Non-idempotent methods (POST) are only retried on connection failures
+        and NOT_PROCESSED_STATUSES, so a completion is never requested twice.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            timeout: Total timeout of one attempt in seconds
+            retries: Number of retries (defaults to client setting)
+            **kwargs: aiohttp request arguments (json, data, headers, params)
+
+        Returns:
+            HTTPResponse (the last one if retryable statuses persisted)
+
+        Raises:
+            HTTPTimeoutError: If all attempts timed out
+            aiohttp.ClientError: If all attempts failed with connection errors
+        """
+        import aiohttp
+
+        retries = self.retries if retries is None else retries
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout if timeout is None else timeout)
+        session = self._get_session()
+
+        host = urlsplit(url).hostname or 'unknown'
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_statuses = RETRY_STATUSES if idempotent else NOT_PROCESSED_STATUSES
+        with phase(PHASE_FETCH):
+            for attempt in range(retries + 1):
+                with self._lock:
+                    self.requests += 1
+                record_external_call(host)
+                try:
+                    async with session.request(method, url, timeout=client_timeout, **kwargs) as response:
+                        body = await response.read()
+                        result = HTTPResponse(response.status, body, dict(response.headers))
+                    if result.status_code not in retry_statuses or attempt == retries:
+                        return result
+                    logger.warning(f"{method} {url.split('?')[0]} returned {result.status_code}, retrying")
+                except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                    if attempt == retries or not (idempotent or isinstance(e, aiohttp.ClientConnectorError)):
+                        with self._lock:
+                            self.failed += 1
+                        if isinstance(e, asyncio.TimeoutError):
+                            raise HTTPTimeoutError(f"{method} {url.split('?')[0]} timed out") from e
+                        raise
+                    logger.warning(f"{method} {url.split('?')[0]} failed ({type(e).__name__}), retrying")
+                with self._lock:
+                    self.retried += 1
+                await asyncio.sleep(backoff_delay(attempt))
+
+    async def get(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client statistics."""
+        with self._lock:
+            stats = {
+                'requests': self.requests,
+                'retried': self.retried,
+                'failed': self.failed,
+                'limit': self.limit,
+                'limit_per_host': self.limit_per_host,
+            }
+        session = self._session
+        connector = getattr(session, 'connector', None) if session is not None else None
+        stats['open'] = session is not None and not session.closed
+        stats['pooled_connections'] = sum(len(v) for v in getattr(connector, '_conns', {}).values()) if connector else 0
+        return stats
+
+
+# ========= Synchronous session =========
+_sync_session = None
+_sync_session_lock = threading.Lock()
+
+
+def get_sync_session():
+    """
+    Get process-wide pooled requests.Session with retry and jitter.
+
+    Returns:
+        requests.Session
+    """
+    global _sync_session
+    with _sync_session_lock:
+        if _sync_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry_kwargs = dict(
+                total=HTTP_RETRIES,
+                backoff_factor=HTTP_BACKOFF_BASE,
+                status_forcelist=sorted(RETRY_STATUSES),
+                # urllib3 default allowed_methods: POST is only retried on connection errors
+                raise_on_status=False,
+            )
+            try:
+                retry_strategy = Retry(backoff_jitter=HTTP_BACKOFF_BASE, **retry_kwargs)
+            except TypeError:
+                # urllib3 < 2 has no backoff_jitter
+                retry_strategy = Retry(**retry_kwargs)
+
+            adapter = HTTPAdapter(max_retries=retry_strategy,
+                                  pool_connections=HTTP_POOL_LIMIT_PER_HOST,
+                                  pool_maxsize=HTTP_POOL_LIMIT_PER_HOST)
+            session = requests.Session()
+            session.trust_env = False
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sync_session = session
+        return _sync_session
+
+
+# Global instance for use throughout the application
+http_client = AsyncHTTPClient()
@@ -0,0 +1,404 @@
+"""
+Instrumentation Module
+Per-handler latency and resource metrics.
+
+button_callback dispatches to 100+ handlers and the only trace of a slow
+request was a pair of log lines. Every command, callback and message handler
+is now wrapped at registration: a per-request context (contextvar, so it
+follows the handler into executor threads) records
+
+- wall time split into phases: fetch (data pool, external HTTP), compute
+  (explicit compute blocks plus time on the event loop not spent waiting on
+  anything else), render (render pool) and send (Telegram Bot API requests);
+- external calls per service (circuit breakers, HTTP hosts);
+- bytes sent to Telegram.
+
+Metrics are aggregated per handler key ("command:<name>",
+"callback:<callback_data prefix>", "message:<kind>") and exported as
+Prometheus text on the health server (/metrics) and as JSON in the health
+payload.
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "true").lower() == "true"
+# Distinct handler keys kept; the rest are aggregated under "<kind>:other"
+INSTRUMENTATION_MAX_HANDLERS = int(os.getenv("INSTRUMENTATION_MAX_HANDLERS", "200"))
+# Recent samples per handler and phase used for percentiles
+INSTRUMENTATION_SAMPLES = int(os.getenv("INSTRUMENTATION_SAMPLES", "512"))
+# Number of leading callback_data tokens used as the callback key
+CALLBACK_PREFIX_TOKENS = int(os.getenv("CALLBACK_PREFIX_TOKENS", "3"))
+
+PHASE_FETCH = 'fetch'
+PHASE_COMPUTE = 'compute'
+PHASE_RENDER = 'render'
+PHASE_SEND = 'send'
+PHASES = (PHASE_FETCH, PHASE_COMPUTE, PHASE_RENDER, PHASE_SEND)
+
+QUANTILES = (0.5, 0.9, 0.99)
+METRIC_PREFIX = 'shansai'
+
+# Callback key tokens: lowercase words only, symbols / ids / numbers end the prefix
+_CALLBACK_TOKEN = re.compile(r'^[a-z]+$')
+
+
+class RequestMetrics:
+    """Metrics of one handler invocation."""
+
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.started_at = time.monotonic()
+        self.phases: Dict[str, float] = {}
+        self.external_calls: Dict[str, int] = {}
+        self.bytes_sent = 0
+        # Counters are updated from executor threads as well
+        self._lock = threading.Lock()
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_external_call(self, service: str) -> None:
+        with self._lock:
+            self.external_calls[service] = self.external_calls.get(service, 0) + 1
+
+    def add_bytes_sent(self, size: int) -> None:
+        with self._lock:
+            self.bytes_sent += int(size)
+
+    def finish(self) -> Dict[str, float]:
+        """Wall time per phase; unattributed event loop time counts as compute."""
+        total = time.monotonic() - self.started_at
+        with self._lock:
+            phases = {name: self.phases.get(name, 0.0) for name in PHASES}
+        phases[PHASE_COMPUTE] += max(0.0, total - sum(phases.values()))
+        phases['total'] = total
+        return phases
+
+
+_current: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    'shansai_request_metrics', default=None)
+
+
+def current_request() -> Optional[RequestMetrics]:
+    """Metrics of the handler invocation being served (None outside handlers)."""
+    return _current.get()
+
+
+# Phase being timed in the current context: concurrent tasks of one request
+# (gather branches, executor jobs) time their own phases
+_active_phase: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'shansai_active_phase', default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Attribute the enclosed wall time to a phase of the current request.
+
+    Only the outermost phase of a context is timed, so e.g. a data pool job
+    inside an explicit compute block counts as compute. Works in sync code
+    and around awaits; concurrent tasks of the same request each time their
+    own phases, so overlapping phases are all counted.
+    """
+    request = _current.get()
+    if request is None or _active_phase.get() is not None:
+        yield
+        return
+    token = _active_phase.set(name)
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        _active_phase.reset(token)
+        request.add_phase(name, time.monotonic() - started_at)
+
+
+def record_external_call(service: str) -> None:
+    """Count a call to an external service in the current request."""
+    request = _current.get()
+    if request is not None:
+        request.add_external_call(service)
+
+
+def record_bytes_sent(size: int) -> None:
+    """Count bytes sent to Telegram in the current request."""
+    request = _current.get()
+    if request is not None and size:
+        request.add_bytes_sent(size)
+
+
+class CountedClient:
+    """
+    Proxy of an API client counting method calls as external calls.
+
+    Used for clients that do all their I/O in method calls (tushare pro_api).
+    """
+
+    def __init__(self, client, service: str):
+        self._client = client
+        self._service = service
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            record_external_call(self._service)
+            return attr(*args, **kwargs)
+        return call
+
+
+def callback_key(callback_data: Optional[str]) -> str:
+    """
+    Handler key of a callback: leading lowercase tokens of callback_data.
+
+    "portfolio_wealth_chart_PF_1" -> "callback:portfolio_wealth_chart",
+    "namespace_page_US_2" -> "callback:namespace_page".
+    """
+    tokens = []
+    for token in (callback_data or '').split('_'):
+        if len(tokens) >= CALLBACK_PREFIX_TOKENS or not _CALLBACK_TOKEN.match(token):
+            break
+        tokens.append(token)
+    return f"callback:{'_'.join(tokens) or 'other'}"
+
+
+def telegram_payload_size(request_data) -> int:
+    """
+    Size of a Bot API request body: JSON parameters plus uploaded files.
+
+    Args:
+        request_data: telegram.request.RequestData (None for parameterless calls)
+    """
+    if request_data is None:
+        return 0
+    size = 0
+    for value in (getattr(request_data, 'json_payload', None) or {}).values():
+        size += len(value.encode('utf-8')) if isinstance(value, str) else len(str(value))
+    multipart = getattr(request_data, 'multipart_data', None) if getattr(request_data, 'contains_files', False) else None
+    for value in (multipart or {}).values():
+        content = value[1] if isinstance(value, tuple) and len(value) > 1 else value
+        if isinstance(content, (bytes, bytearray)):
+            size += len(content)
+    return size
+
+
+class HandlerStats:
+    """Aggregated metrics of one handler key."""
+
+    def __init__(self, samples: int = INSTRUMENTATION_SAMPLES):
+        # Imported here: health_monitor depends on the executors, which report to this module
+        from services.health_monitor import LatencyHistogram
+
+        self.duration = LatencyHistogram()
+        self.phase_sums: Dict[str, float] = {name: 0.0 for name in PHASES}
+        self.samples: Dict[str, Deque[float]] = {name: deque(maxlen=samples) for name in PHASES + ('total',)}
+        self.requests = 0
+        self.errors = 0
+        self.external_calls: Dict[str, int] = {}
+        self.bytes_sent = 0
+
+    def observe(self, phases: Dict[str, float], request: RequestMetrics, failed: bool) -> None:
+        self.requests += 1
+        if failed:
+            self.errors += 1
+        self.duration.observe(phases['total'])
+        for name, seconds in phases.items():
+            self.samples[name].append(seconds)
+            if name in self.phase_sums:
+                self.phase_sums[name] += seconds
+        for service, count in request.external_calls.items():
+            self.external_calls[service] = self.external_calls.get(service, 0) + count
+        self.bytes_sent += request.bytes_sent
+
+    def quantiles(self, name: str) -> Dict[str, float]:
+        values = sorted(self.samples[name])
+        if not values:
+            return {}
+        return {str(q): values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'duration': self.quantiles('total'),
+            'phases': {name: self.quantiles(name) for name in PHASES},
+            'phase_seconds_total': dict(self.phase_sums),
+            'external_calls': dict(self.external_calls),
+            'bytes_sent': self.bytes_sent,
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Instrumentation:
+    """
+    Registry of per-handler metrics.
+    """
+
+    def __init__(self, max_handlers: int = INSTRUMENTATION_MAX_HANDLERS, samples: int = INSTRUMENTATION_SAMPLES,
+                 enabled: bool = INSTRUMENTATION_ENABLED):
+        """
+        Initialize the registry.
+
+        Args:
+            max_handlers: Distinct handler keys kept before aggregating into "<kind>:other"
+            samples: Recent samples per handler and phase used for percentiles
+            enabled: Disable to make wrapped handlers run without measurement
+        """
+        self.max_handlers = max(1, int(max_handlers))
+        self.samples = samples
+        self.enabled = enabled
+        self._handlers: Dict[str, HandlerStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats_for(self, key: str) -> HandlerStats:
+        stats = self._handlers.get(key)
+        if stats is None:
+            if len(self._handlers) >= self.max_handlers:
+                key = f"{key.split(':', 1)[0]}:other"
+                stats = self._handlers.get(key)
+            if stats is None:
+                stats = self._handlers[key] = HandlerStats(self.samples)
+        return stats
+
+    def record(self, request: RequestMetrics, failed: bool = False) -> None:
+        """Aggregate a finished request."""
+        phases = request.finish()
+        with self._lock:
+            self._stats_for(request.handler).observe(phases, request, failed)
+
+    def wrap(self, key: Callable[..., str], handler: Callable) -> Callable:
+        """
+        Wrap an async handler so each invocation is measured.
+
+        Args:
+            key: Handler key string or callable(update) returning it
+            handler: Async handler (update, context)
+        """
+        key_for = key if callable(key) else (lambda update: key)
+
+        @functools.wraps(handler)
+        async def wrapper(update, context, *args, **kwargs):
+            if not self.enabled:
+                return await handler(update, context, *args, **kwargs)
+            try:
+                name = key_for(update)
+            except Exception:
+                name = 'unknown'
+            request = RequestMetrics(name)
+            token = _current.set(request)
+            failed = False
+            try:
+                return await handler(update, context, *args, **kwargs)
+            except BaseException as e:
+                failed = not isinstance(e, asyncio.CancelledError)
+                raise
+            finally:
+                _current.reset(token)
+                self.record(request, failed)
+
+        return wrapper
+
+    def command(self, name: str, handler: Callable) -> Callable:
+        return self.wrap(f"command:{name}", handler)
+
+    def callback(self, handler: Callable) -> Callable:
+        return self.wrap(lambda update: callback_key(getattr(update.callback_query, 'data', None)), handler)
+
+    def message(self, name: str, handler: Callable) -> Callable:
+        return self.wrap(f"message:{name}", handler)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._handlers.clear()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-handler summary (percentiles in seconds)."""
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in sorted(self._handlers.items())}
+
+    def render_prometheus(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        p = METRIC_PREFIX
+        lines: List[str] = [
+            f"# HELP {p}_handler_duration_seconds Handler wall time.",
+            f"# TYPE {p}_handler_duration_seconds histogram",
+        ]
+        with self._lock:
+            handlers = sorted(self._handlers.items())
+            for key, stats in handlers:
+                label = f'handler="{_escape(key)}"'
+                for bound, count in stats.duration.cumulative().items():
+                    lines.append(f'{p}_handler_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f"{p}_handler_duration_seconds_sum{{{label}}} {stats.duration.sum:.6f}")
+                lines.append(f"{p}_handler_duration_seconds_count{{{label}}} {stats.duration.count}")
+
+            lines += [f"# HELP {p}_handler_phase_seconds Handler wall time per phase (recent requests).",
+                      f"# TYPE {p}_handler_phase_seconds summary"]
+            for key, stats in handlers:
+                for name in PHASES:
+                    label = f'handler="{_escape(key)}",phase="{name}"'
+                    for q, value in stats.quantiles(name).items():
+                        lines.append(f'{p}_handler_phase_seconds{{{label},quantile="{q}"}} {value:.6f}')
+                    lines.append(f"{p}_handler_phase_seconds_sum{{{label}}} {stats.phase_sums[name]:.6f}")
+                    lines.append(f"{p}_handler_phase_seconds_count{{{label}}} {stats.requests}")
+
+            counters = (
+                ('handler_requests_total', 'Handler invocations.', lambda s: s.requests),
+                ('handler_errors_total', 'Handler invocations that raised.', lambda s: s.errors),
+                ('handler_bytes_sent_total', 'Bytes sent to the Telegram Bot API.', lambda s: s.bytes_sent),
+            )
+            for name, help_text, value in counters:
+                lines += [f"# HELP {p}_{name} {help_text}", f"# TYPE {p}_{name} counter"]
+                for key, stats in handlers:
+                    lines.append(f'{p}_{name}{{handler="{_escape(key)}"}} {value(stats)}')
+
+            lines += [f"# HELP {p}_handler_external_calls_total External service calls made by handlers.",
+                      f"# TYPE {p}_handler_external_calls_total counter"]
+            for key, stats in handlers:
+                for service, count in sorted(stats.external_calls.items()):
+                    lines.append(f'{p}_handler_external_calls_total{{handler="{_escape(key)}",'
+                                 f'service="{_escape(service)}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def create_telegram_request(**kwargs):
+    """
+    HTTPXRequest that reports Bot API calls of handlers as the send phase.
+
+    Args:
+        **kwargs: HTTPXRequest arguments
+    """
+    from telegram.request import HTTPXRequest
+
+    class InstrumentedRequest(HTTPXRequest):
+        async def do_request(self, url, method, request_data=None, *args, **kw):
+            record_bytes_sent(telegram_payload_size(request_data))
+            record_external_call('telegram')
+            with phase(PHASE_SEND):
+                return await super().do_request(url, method, request_data, *args, **kw)
+
+    return InstrumentedRequest(**kwargs)
+
+
+# Global instance for use throughout the application
+instrumentation = Instrumentation()
@@ -0,0 +1,126 @@
+"""
+Metrics Engine Module
+Vectorized risk/return metrics for a matrix of monthly returns.
+
+The compare metrics table used to build a fresh ok.Asset per symbol and
+metric (Sharpe, Sortino, Calmar), re-downloading data that the AssetList
+had already loaded, and computed each metric in a Python loop. The engine
+takes the already loaded returns matrix (rows - months, columns - assets)
+and computes every metric for all columns at once with NumPy. Missing
+values (assets with shorter history) are ignored per column.
+"""
+
+import logging
+import warnings
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MONTHS_PER_YEAR = 12
+
+# Row names of the metrics frame
+METRICS = (
+    'total_return',
+    'annual_return',
+    'volatility',
+    'sharpe_ratio',
+    'sortino_ratio',
+    'max_drawdown',
+    'calmar_ratio',
+    'var_95',
+    'cvar_95',
+    'years',
+)
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = numerator / denominator
+    return np.where(np.isfinite(result), result, np.nan)
+
+
+def compute_metrics(returns: Union[pd.DataFrame, np.ndarray], risk_free_rate: Union[float, Iterable[float]] = 0.0,
+                    periods_per_year: int = MONTHS_PER_YEAR, var_level: float = 0.95,
+                    columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Compute metrics for every column of a returns matrix.
+
+    Args:
+        returns: Periodic (monthly) returns, shape (periods, assets); NaN - no data
+        risk_free_rate: Annual risk-free rate, scalar or one value per column
+        periods_per_year: Number of return periods in a year
+        var_level: Confidence level of historical VaR / CVaR
+        columns: Column names when returns is a NumPy array
+
+    Returns:
+        DataFrame with METRICS rows and one column per asset. Volatility uses
+        the okama annualization of monthly mean and standard deviation, so it
+        matches the 'Risk' row of AssetList.describe().
+    """
+    if isinstance(returns, pd.DataFrame):
+        columns = list(returns.columns)
+        values = returns.to_numpy(dtype='float64')
+    else:
+        values = np.asarray(returns, dtype='float64')
+        if values.ndim == 1:
+            values = values[:, None]
+        columns = list(columns) if columns is not None else list(range(values.shape[1]))
+
+    n_columns = values.shape[1]
+    if values.shape[0] == 0:
+        values = np.full((1, n_columns), np.nan)
+    valid = ~np.isnan(values)
+    n_obs = valid.sum(axis=0)
+    filled = np.where(valid, values, 0.0)
+
+    # Wealth index per column (missing months do not change wealth)
+    wealth = np.cumprod(1.0 + filled, axis=0)
+    years = n_obs / periods_per_year
+    total_return = wealth[-1] - 1.0
+
+    # All-NaN columns produce warnings and NaN results, which are expected here
+    with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        annual_return = wealth[-1] ** (1.0 / np.where(years > 0, years, np.nan)) - 1.0
+
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+        # okama Float.annualize_risk
+        volatility = np.sqrt((std ** 2 + (1.0 + mean) ** 2) ** periods_per_year
+                             - (1.0 + mean) ** (2 * periods_per_year))
+        downside = np.sqrt(np.sum(np.minimum(filled, 0.0) ** 2, axis=0) / np.maximum(n_obs, 1)) \
+            * np.sqrt(periods_per_year)
+
+        rf = np.broadcast_to(np.asarray(risk_free_rate, dtype='float64'), annual_return.shape)
+        sharpe = _safe_divide(annual_return - rf, volatility)
+        sortino = _safe_divide(annual_return - rf, downside)
+
+        drawdowns = wealth / np.maximum.accumulate(wealth, axis=0) - 1.0
+        max_drawdown = drawdowns.min(axis=0)
+        calmar = _safe_divide(annual_return, np.abs(max_drawdown))
+
+        var = np.nanpercentile(values, (1.0 - var_level) * 100, axis=0)
+        cvar = np.nanmean(np.where(values <= var, values, np.nan), axis=0)
+
+    no_data = n_obs < 2
+    result = np.vstack([
+        total_return, annual_return, volatility, sharpe, sortino,
+        max_drawdown, calmar, var, cvar, years,
+    ])
+    result[:-1, no_data] = np.nan
+    return pd.DataFrame(result, index=list(METRICS), columns=columns)
+
+
+def trailing(returns: pd.DataFrame, years: float, periods_per_year: int = MONTHS_PER_YEAR) -> pd.DataFrame:
+    """Last `years` of a returns matrix (whole matrix if it is shorter)."""
+    periods = int(round(years * periods_per_year))
+    return returns.iloc[-periods:] if len(returns) > periods else returns
+
+
+def returns_from_prices(prices: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame]:
+    """Periodic returns from a price or wealth index series (without the first NaN)."""
+    return prices.pct_change().iloc[1:]
@@ -0,0 +1,230 @@
+"""
+Monte Carlo Module
+Vectorized Monte Carlo forecasting of portfolio wealth.
+
+The portfolio forecast used okama plot_forecast_monte_carlo with 20 paths,
+generated inside the plotting code, and the figure was then taken from pyplot
+global state. The engine fits a distribution to the monthly returns and
+draws all paths at once as one (months, paths) NumPy array with a seeded
+generator, so thousands of paths cost about as much as a few. Percentile
+bands are returned as data; plotting is a separate step.
+
+Supported distributions:
+- norm: normal monthly returns
+- lognorm: normal monthly log returns
+- t: Student's t with degrees of freedom estimated from kurtosis
+- bootstrap: resampling of historical monthly returns
+"""
+
+import os
+import logging
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+MONTE_CARLO_PATHS = int(os.getenv("MONTE_CARLO_PATHS", "2000"))
+MONTE_CARLO_SEED = int(os.getenv("MONTE_CARLO_SEED", "42"))
+# Number of individual trajectories drawn on the chart
+MONTE_CARLO_PLOT_PATHS = int(os.getenv("MONTE_CARLO_PLOT_PATHS", "50"))
+
+DISTRIBUTIONS = ('norm', 'lognorm', 't', 'bootstrap')
+DEFAULT_PERCENTILES = (10, 50, 90)
+MONTHS_PER_YEAR = 12
+
+# Student's t degrees of freedom bounds (low df has infinite variance)
+_T_DF_MIN = 3.0
+_T_DF_MAX = 30.0
+
+
+def _student_df(returns: np.ndarray) -> float:
+    """Degrees of freedom matching sample excess kurtosis (6 / (df - 4))."""
+    std = returns.std()
+    if len(returns) < 4 or std == 0:
+        return _T_DF_MAX
+    excess_kurtosis = np.mean(((returns - returns.mean()) / std) ** 4) - 3.0
+    if excess_kurtosis <= 0:
+        return _T_DF_MAX
+    return float(np.clip(4.0 + 6.0 / excess_kurtosis, _T_DF_MIN, _T_DF_MAX))
+
+
+def simulate_returns(returns: Sequence[float], n_periods: int, n_paths: int = MONTE_CARLO_PATHS,
+                     distribution: str = 'norm', seed: Optional[int] = MONTE_CARLO_SEED) -> np.ndarray:
+    """
+    Draw simulated periodic returns.
+
+    Args:
+        returns: Historical periodic (monthly) returns; NaN values are ignored
+        n_periods: Number of periods to simulate
+        n_paths: Number of paths
+        distribution: One of DISTRIBUTIONS
+        seed: Random generator seed (None - non-deterministic)
+
+    Returns:
+        Array of shape (n_periods, n_paths)
+
+    Raises:
+        ValueError: If distribution is unknown or there is not enough history
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}. Supported: {', '.join(DISTRIBUTIONS)}")
+    history = np.asarray(returns, dtype='float64').ravel()
+    history = history[np.isfinite(history)]
+    if len(history) < 2:
+        raise ValueError("Not enough return history for simulation")
+
+    rng = np.random.default_rng(seed)
+    shape = (int(n_periods), int(n_paths))
+
+    if distribution == 'bootstrap':
+        return history[rng.integers(0, len(history), size=shape)]
+
+    if distribution == 'lognorm':
+        log_returns = np.log1p(np.maximum(history, -0.999999))
+        return np.expm1(rng.normal(log_returns.mean(), log_returns.std(ddof=1), size=shape))
+
+    mean = history.mean()
+    std = history.std(ddof=1)
+    if distribution == 't':
+        df = _student_df(history)
+        # Scale standard t to the sample standard deviation
+        return mean + std * np.sqrt((df - 2.0) / df) * rng.standard_t(df, size=shape)
+    return rng.normal(mean, std, size=shape)
+
+
+class SimulationResult:
+    """
+    Simulated wealth paths and their percentile bands.
+
+    Paths may be stored normalized (starting at 1.0, e.g. as compact float32
+    in the simulation cache); every output is multiplied by scale, so one
+    stored run serves charts with different starting values.
+    """
+
+    def __init__(self, wealth: np.ndarray, distribution: str, seed: Optional[int],
+                 periods_per_year: int = MONTHS_PER_YEAR, start_period=None, scale: float = 1.0):
+        """
+        Args:
+            wealth: Wealth paths of shape (n_periods + 1, n_paths); row 0 is today's value
+            distribution: Distribution used for simulation
+            seed: Random generator seed
+            periods_per_year: Number of periods in a year
+            start_period: pandas Period of row 0 (None - integer index)
+            scale: Multiplier applied to every output value
+        """
+        self.wealth = wealth
+        self.distribution = distribution
+        self.seed = seed
+        self.periods_per_year = periods_per_year
+        self.start_period = start_period
+        self.scale = float(scale)
+
+    @property
+    def n_paths(self) -> int:
+        return self.wealth.shape[1]
+
+    @property
+    def years(self) -> float:
+        return (self.wealth.shape[0] - 1) / self.periods_per_year
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.wealth.nbytes)
+
+    def rescaled(self, today_value: float) -> 'SimulationResult':
+        """Same paths (shared array) starting from today_value."""
+        return SimulationResult(self.wealth, self.distribution, self.seed, self.periods_per_year,
+                                self.start_period, today_value / float(self.wealth[0, 0]))
+
+    def normalized(self, dtype='float32') -> 'SimulationResult':
+        """Copy with paths starting at 1.0 stored in dtype (compact form for caching)."""
+        wealth = (self.wealth / self.wealth[0:1]).astype(dtype)
+        return SimulationResult(wealth, self.distribution, self.seed, self.periods_per_year, self.start_period)
+
+    def index(self):
+        """Monthly PeriodIndex of the rows (RangeIndex without start_period)."""
+        import pandas as pd
+
+        if self.start_period is None:
+            return pd.RangeIndex(self.wealth.shape[0])
+        return pd.period_range(start=self.start_period, periods=self.wealth.shape[0], freq='M')
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> np.ndarray:
+        """Percentile bands of shape (n_periods + 1, len(percentiles))."""
+        return np.percentile(self.wealth, list(percentiles), axis=1).T.astype('float64') * self.scale
+
+    def bands(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES):
+        """Percentile bands as DataFrame with one column per percentile."""
+        import pandas as pd
+
+        percentiles = list(percentiles)
+        return pd.DataFrame(self.percentiles(percentiles), index=self.index(), columns=percentiles)
+
+    def sample_paths(self, n: int = MONTE_CARLO_PLOT_PATHS):
+        """First n paths as DataFrame (for plotting individual trajectories)."""
+        import pandas as pd
+
+        n = min(int(n), self.n_paths)
+        return pd.DataFrame(np.asarray(self.wealth[:, :n], dtype='float64') * self.scale, index=self.index())
+
+    def final_values(self) -> np.ndarray:
+        """Wealth of every path at the end of the horizon."""
+        return np.asarray(self.wealth[-1], dtype='float64') * self.scale
+
+    def summary(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """
+        Compact forecast summary (for captions and AI analysis).
+
+        Returns:
+            Dict with horizon, number of paths, final value and CAGR percentiles
+            and the probability to end below the starting value
+        """
+        percentiles = list(percentiles)
+        start = float(self.wealth[0, 0])
+        growth = np.asarray(self.wealth[-1], dtype='float64') / start
+        final_percentiles = np.percentile(growth, percentiles)
+        with np.errstate(invalid='ignore'):
+            cagr = np.power(np.maximum(final_percentiles, 0.0), 1.0 / self.years) - 1.0 if self.years else final_percentiles * np.nan
+        return {
+            'years': self.years,
+            'n_paths': self.n_paths,
+            'distribution': self.distribution,
+            'today_value': start * self.scale,
+            'final_value': {p: float(v) * start * self.scale for p, v in zip(percentiles, final_percentiles)},
+            'cagr': {p: float(v) for p, v in zip(percentiles, cagr)},
+            'probability_of_loss': float(np.mean(growth < 1.0)),
+        }
+
+
+def simulate_wealth(returns, years: float = 10, n_paths: int = MONTE_CARLO_PATHS,
+                    distribution: str = 'norm', seed: Optional[int] = MONTE_CARLO_SEED,
+                    today_value: float = 1.0, periods_per_year: int = MONTHS_PER_YEAR) -> SimulationResult:
+    """
+    Simulate wealth paths from historical returns.
+
+    Args:
+        returns: Historical periodic returns (pandas Series with PeriodIndex or array)
+        years: Forecast horizon in years
+        n_paths: Number of paths
+        distribution: One of DISTRIBUTIONS
+        seed: Random generator seed
+        today_value: Starting wealth of every path
+        periods_per_year: Number of return periods in a year
+
+    Returns:
+        SimulationResult
+    """
+    n_periods = int(round(years * periods_per_year))
+    simulated = simulate_returns(returns, n_periods, n_paths, distribution, seed)
+    wealth = np.empty((n_periods + 1, simulated.shape[1]))
+    wealth[0] = today_value
+    np.cumprod(1.0 + simulated, axis=0, out=wealth[1:])
+    wealth[1:] *= today_value
+
+    start_period = None
+    index = getattr(returns, 'index', None)
+    if index is not None and len(index) and hasattr(index[-1], 'asfreq'):
+        start_period = index[-1].asfreq('M')
+    return SimulationResult(wealth, distribution, seed, periods_per_year, start_period)
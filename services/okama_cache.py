@@ -0,0 +1,296 @@
+"""
+Okama Object Cache Module
+Process-wide memoizing cache for ok.Asset / ok.AssetList / ok.Portfolio objects
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from services.circuit_breaker import okama_breaker
+
+logger = logging.getLogger(__name__)
+
+# Default cache settings (can be overridden via environment)
+OKAMA_CACHE_TTL = float(os.getenv("OKAMA_CACHE_TTL", "900"))  # seconds
+OKAMA_CACHE_MAX_ITEMS = int(os.getenv("OKAMA_CACHE_MAX_ITEMS", "256"))
+
+
+class TTLLRUCache:
+    """
+    Thread-safe key/value cache with per-entry TTL and LRU eviction.
+
+    Optionally the entries are also limited by total size in bytes
+    (max_bytes), measured with the sizeof callable.
+    """
+
+    def __init__(self, max_items: int = 256, ttl: float = 900.0, max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_items: Maximum number of entries kept in memory
+            ttl: Time to live of an entry in seconds
+            max_bytes: Total size budget of the entries in bytes (None - no limit)
+            sizeof: Size of a value in bytes (required with max_bytes)
+        """
+        self.max_items = max(1, int(max_items))
+        self.ttl = float(ttl)
+        self.max_bytes = None if max_bytes is None else max(0, int(max_bytes))
+        self._sizeof = sizeof if sizeof is not None else (lambda value: 0)
+        self._bytes = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        # key -> [lock, number of callers holding or waiting for it]
+        self._key_locks: Dict[Hashable, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value for key or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _discard(self, key: Hashable) -> bool:
+        """Remove entry for key (caller holds the lock)."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= self._sizeof(entry[1])
+        return True
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """
+        Store value for key, evicting least recently used entries if needed.
+
+        Returns:
+            True if stored (values larger than the whole max_bytes budget are not)
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else float(ttl))
+        size = self._sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        with self._lock:
+            self._discard(key)
+            self._data[key] = (expires_at, value)
+            self._bytes += size
+            while len(self._data) > self.max_items or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._discard(next(iter(self._data)))
+                self.evictions += 1
+            return True
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any],
+                      ttl: Union[None, float, Callable[[Any], float]] = None) -> Any:
+        """
+        Return cached value or build it with factory.
+
+        Concurrent callers asking for the same key wait for a single factory
+        call instead of downloading the same data several times. ttl may be a
+        callable choosing the lifetime from the built value.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+
+        try:
+            with key_lock[0]:
+                # Another thread may have built the value while we were waiting
+                with self._lock:
+                    entry = self._data.get(key)
+                    if entry is not None and entry[0] >= time.monotonic():
+                        self._data.move_to_end(key)
+                        return entry[1]
+                value = factory()
+                self.set(key, value, ttl(value) if callable(ttl) else ttl)
+                return value
+        finally:
+            # Drop the lock only when nobody else is waiting for it, otherwise
+            # a new caller would get a fresh lock and run factory in parallel
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove entry for key. Returns True if entry existed."""
+        with self._lock:
+            return self._discard(key)
+
+    def clear(self) -> None:
+        """Clear all entries (useful for tests)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_items': self.max_items,
+                'ttl': self.ttl,
+                'size_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / total) if total else 0.0,
+            }
+
+
+def _normalize_value(value: Any) -> Hashable:
+    """Convert constructor argument into a hashable, order-preserving key part."""
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    if isinstance(value, float):
+        return round(value, 10)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize_value(v)) for k, v in value.items()))
+    if hasattr(value, 'tolist') and not hasattr(value, 'symbols'):
+        # numpy arrays / pandas series of weights
+        return _normalize_value(value.tolist())
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(v) for v in value)
+    if hasattr(value, 'period') and type(value).__name__ == 'Rebalance':
+        return (
+            'Rebalance',
+            getattr(value, 'period', None),
+            _normalize_value(getattr(value, 'abs_deviation', None)),
+            _normalize_value(getattr(value, 'rel_deviation', None)),
+        )
+    if hasattr(value, 'symbols'):
+        # okama Portfolio / AssetList passed as an item of another AssetList
+        return (
+            type(value).__name__,
+            str(getattr(value, 'symbol', '')),
+            _normalize_value(list(getattr(value, 'symbols', []) or [])),
+            _normalize_value(getattr(value, 'weights', None)),
+            str(getattr(value, 'currency', '')),
+            str(getattr(value, 'first_date', '')),
+            str(getattr(value, 'last_date', '')),
+        )
+    return (type(value).__name__, repr(value))
+
+
+def make_key(kind: str, args: tuple, kwargs: dict) -> Tuple:
+    """
+    Build cache key for an okama constructor call.
+
+    The key covers (symbols, weights, ccy, first_date, last_date, rebalancing)
+    and any other keyword argument passed to the constructor.
+    """
+    kwargs = dict(kwargs)
+    params = {}
+    if args:
+        params['assets'] = args[0]
+        for name, value in zip(('weights',), args[1:]):
+            params[name] = value
+    if 'assets' in kwargs:
+        params['assets'] = kwargs.pop('assets')
+    params.update(kwargs)
+
+    assets = params.pop('assets', None)
+    if isinstance(assets, str):
+        symbols = assets
+    else:
+        symbols = _normalize_value(list(assets) if assets is not None else [])
+
+    return (
+        kind,
+        symbols,
+        _normalize_value(params.pop('weights', None)),
+        _normalize_value(params.pop('ccy', None)),
+        _normalize_value(params.pop('first_date', None)),
+        _normalize_value(params.pop('last_date', None)),
+        _normalize_value(params.pop('rebalancing_strategy', None)),
+        _normalize_value(params),
+    )
+
+
+class OkamaObjectCache:
+    """
+    Memoizing factory for okama objects.
+
+    All ok.Asset / ok.AssetList / ok.Portfolio constructions in the bot go
+    through this cache, so repeated button presses after /compare or
+    /portfolio reuse already downloaded data.
+    """
+
+    def __init__(self, max_items: int = OKAMA_CACHE_MAX_ITEMS, ttl: float = OKAMA_CACHE_TTL):
+        """
+        Initialize the object cache.
+
+        Args:
+            max_items: Maximum number of cached okama objects
+            ttl: Time to live of a cached object in seconds
+        """
+        self._cache = TTLLRUCache(max_items=max_items, ttl=ttl)
+
+    def _get(self, kind: str, constructor: Callable, args: tuple, kwargs: dict):
+        # Downloads go through the okama circuit breaker: fail fast while okama is down
+        def build():
+            return okama_breaker.call(constructor, *args, **kwargs)
+
+        try:
+            key = make_key(kind, args, kwargs)
+            hash(key)
+        except Exception as e:
+            logger.warning(f"Could not build cache key for {kind}: {e}")
+            return build()
+        return self._cache.get_or_create(key, build)
+
+    def asset(self, *args, **kwargs):
+        """Cached equivalent of ok.Asset(*args, **kwargs)."""
+        import okama as ok
+        return self._get('Asset', ok.Asset, args, kwargs)
+
+    def asset_list(self, *args, **kwargs):
+        """Cached equivalent of ok.AssetList(*args, **kwargs)."""
+        import okama as ok
+        return self._get('AssetList', ok.AssetList, args, kwargs)
+
+    def portfolio(self, *args, **kwargs):
+        """Cached equivalent of ok.Portfolio(*args, **kwargs)."""
+        import okama as ok
+        return self._get('Portfolio', ok.Portfolio, args, kwargs)
+
+    def clear(self) -> None:
+        """Drop all cached objects."""
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return self._cache.get_stats()
+
+
+# Global instance for use throughout the application
+okama_cache = OkamaObjectCache()
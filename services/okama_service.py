@@ -4,7 +4,10 @@ Robust wrapper for OKAMA API calls with retry logic and error handling
 """
 
 import time
+import random
+import asyncio
 import logging
+import threading
 from typing import Any, Dict, List, Optional, Union
 from functools import wraps
 import requests
@@ -12,16 +15,37 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from services.cached_data_service import cached_data_service
+from services.circuit_breaker import CircuitOpenError, is_transient_error, okama_breaker
+from services.executors import run_data
+from services.health_monitor import health_monitor
+from services.instrumentation import PHASE_FETCH, phase
+from services.okama_cache import TTLLRUCache, okama_cache
+from services.search_cache import search_cache
+from services.timeseries_store import SERIES_FREQ, timeseries_store
 
 logger = logging.getLogger(__name__)
 
 
+def _on_event_loop() -> bool:
+    """True if called from the thread running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
 class OkamaService:
     """
     Service wrapper for OKAMA API calls with retry logic and error handling.
     Handles 502 errors and other API failures gracefully.
     """
     
+    # Minimum interval between fallback cache writes for the same key (seconds)
+    STORE_INTERVAL = 3600
+    # Maximum number of keys whose last write time is remembered
+    STORE_MAX_KEYS = 4096
+    
     def __init__(self, max_retries: int = 3, backoff_factor: float = 1.0):
         """
         Initialize OKAMA service with retry configuration.
@@ -32,7 +56,12 @@ class OkamaService:
         """
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.circuit_breaker = okama_breaker
         self.session = self._create_session()
+        # Keys written to the fallback cache within the last STORE_INTERVAL
+        # (checked from data pool threads)
+        self._last_stored = TTLLRUCache(max_items=self.STORE_MAX_KEYS, ttl=self.STORE_INTERVAL)
+        self._store_lock = threading.Lock()
         
     def _create_session(self) -> requests.Session:
         """Create a requests session with retry strategy."""
@@ -52,10 +81,24 @@ class OkamaService:
         
         return session
     
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter so concurrent retries do not hit OKAMA in lockstep."""
+        delay = self.backoff_factor * (2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+    
+    def _attempt(self, func, *args, **kwargs):
+        """Single OKAMA call through the circuit breaker."""
+        return self.circuit_breaker.call(func, *args, is_failure=self._is_retryable_error, **kwargs)
+    
     def _retry_with_backoff(self, func, *args, **kwargs):
         """
         Execute function with exponential backoff retry logic.
         
+        Blocks the calling thread between attempts, so it only retries in
+        worker threads (see run_with_retry for coroutines): called on the
+        event loop thread it makes a single attempt and never sleeps. Fails
+        fast with CircuitOpenError while the OKAMA circuit is open.
+        
         Args:
             func: Function to execute
             *args: Function arguments
@@ -64,28 +107,60 @@ class OkamaService:
         Returns:
             Function result or raises last exception
         """
-        last_exception = None
+        max_retries = self.max_retries
+        if _on_event_loop():
+            logger.warning(f"Blocking OKAMA call {getattr(func, '__name__', func)} on the event loop, "
+                           f"not retrying (use run_with_retry)")
+            max_retries = 0
         
-        for attempt in range(self.max_retries + 1):
+        for attempt in range(max_retries + 1):
             try:
-                return func(*args, **kwargs)
+                return self._attempt(func, *args, **kwargs)
             except Exception as e:
-                last_exception = e
-                
                 # Check if it's a retryable error
                 if not self._is_retryable_error(e):
-                    logger.error(f"Non-retryable error in OKAMA call: {e}")
-                    raise e
+                    if not isinstance(e, CircuitOpenError):
+                        logger.error(f"Non-retryable error in OKAMA call: {e}")
+                    raise
                 
-                if attempt < self.max_retries:
-                    wait_time = self.backoff_factor * (2 ** attempt)
-                    logger.warning(f"OKAMA API call failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
-                    logger.info(f"Retrying in {wait_time:.1f} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"OKAMA API call failed after {self.max_retries + 1} attempts: {e}")
-        
-        raise last_exception
+                if attempt >= max_retries:
+                    logger.error(f"OKAMA API call failed after {attempt + 1} attempts: {e}")
+                    raise
+                
+                wait_time = self._backoff_delay(attempt)
+                logger.warning(f"OKAMA API call failed (attempt {attempt + 1}/{max_retries + 1}): {e}")
+                logger.info(f"Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
+    
+    async def run_with_retry(self, func, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Run blocking OKAMA call in the data pool with non-blocking retries.
+        
+        Attempts run in the data executor; the backoff between them is an
+        asyncio sleep, so the event loop and pool threads stay free while
+        waiting. Fails fast with CircuitOpenError while the circuit is open.
+        
+        Args:
+            func: Blocking function to execute
+            *args: Function arguments
+            timeout: Optional timeout of a single attempt in seconds
+            **kwargs: Function keyword arguments
+            
+        Returns:
+            Function result or raises last exception
+        """
+        # Backoff sleeps are part of the fetch phase of the handler request too
+        with phase(PHASE_FETCH):
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await run_data(self._attempt, func, *args, timeout=timeout, **kwargs)
+                except Exception as e:
+                    if not self._is_retryable_error(e) or attempt >= self.max_retries:
+                        raise
+                    wait_time = self._backoff_delay(attempt)
+                    logger.warning(f"OKAMA API call failed (attempt {attempt + 1}/{self.max_retries + 1}), "
+                                   f"retrying in {wait_time:.1f}s: {e}")
+                    await asyncio.sleep(wait_time)
     
     def _is_retryable_error(self, error: Exception) -> bool:
         """
@@ -97,24 +172,11 @@ class OkamaService:
         Returns:
             True if error is retryable, False otherwise
         """
-        error_str = str(error).lower()
-        
-        # Check for specific retryable error patterns
-        retryable_patterns = [
-            '502',
-            '503', 
-            '504',
-            '429',
-            'timeout',
-            'connection',
-            'max retries exceeded',
-            'too many',
-            'bad gateway',
-            'service unavailable',
-            'gateway timeout'
-        ]
-        
-        return any(pattern in error_str for pattern in retryable_patterns)
+        return is_transient_error(error)
+    
+    def get_circuit_state(self) -> Dict[str, Any]:
+        """Get OKAMA circuit breaker state."""
+        return self.circuit_breaker.get_stats()
     
     def create_asset(self, symbol: str, currency: Optional[str] = None):
         """
@@ -130,12 +192,10 @@ class OkamaService:
         Raises:
             Exception: If all retry attempts fail
         """
-        import okama as ok
-        
         def _create():
             if currency is not None:
-                return ok.Asset(symbol, ccy=currency)
-            return ok.Asset(symbol)
+                return okama_cache.asset(symbol, ccy=currency)
+            return okama_cache.asset(symbol)
         
         return self._retry_with_backoff(_create)
     
@@ -158,8 +218,6 @@ class OkamaService:
         Raises:
             Exception: If all retry attempts fail and no fallback is available
         """
-        import okama as ok
-        
         def _create():
             kwargs = {'inflation': inflation}
             if currency:
@@ -169,7 +227,7 @@ class OkamaService:
             if last_date:
                 kwargs['last_date'] = last_date
             
-            return ok.AssetList(symbols, **kwargs)
+            return okama_cache.asset_list(symbols, **kwargs)
         
         try:
             return self._retry_with_backoff(_create)
@@ -185,7 +243,8 @@ class OkamaService:
     
     def search_assets(self, query: str):
         """
-        Search assets in OKAMA database with retry logic.
+        Search assets in OKAMA database with retry logic (cached per query,
+        empty results included, see services.search_cache).
         
         Args:
             query: Search query
@@ -201,7 +260,7 @@ class OkamaService:
         def _search():
             return ok.search(query)
         
-        return self._retry_with_backoff(_search)
+        return search_cache.get_or_search('okama', query, lambda: self._retry_with_backoff(_search))
     
     def get_namespaces(self):
         """
@@ -260,45 +319,138 @@ class OkamaService:
         
         return self._retry_with_backoff(_create)
     
+    def get_asset_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        Get basic asset information (name, currency, type, dates) with cached fallback.
+        
+        Args:
+            symbol: Asset symbol
+            
+        Returns:
+            Asset information dictionary
+            
+        Raises:
+            Exception: If API fails and no cached information is available
+        """
+        try:
+            asset = self.create_asset(symbol)
+            info = {
+                'symbol': symbol,
+                'name': getattr(asset, 'name', symbol),
+                'currency': getattr(asset, 'currency', ''),
+                'type': getattr(asset, 'type', ''),
+                'exchange': getattr(asset, 'exchange', ''),
+                'first_date': str(getattr(asset, 'first_date', '') or ''),
+                'last_date': str(getattr(asset, 'last_date', '') or ''),
+            }
+            if self._should_store(f"info:{symbol}"):
+                self.update_cache_on_success(asset_data={symbol: info})
+            return info
+        except Exception as e:
+            cached = cached_data_service.get_cached_asset_info(symbol, allow_expired=True)
+            if cached is not None:
+                logger.warning(f"OKAMA API failed for {symbol}, using cached asset info: {e}")
+                return cached
+            raise
+    
+    def get_asset_series(self, symbol: str, kind: str = 'close_daily'):
+        """
+        Get asset price series (close_daily, close_monthly, dividends...) with cached fallback.
+        
+        Series known to the local time series store are served from disk with
+        incremental tail refresh. Other successful downloads are stored in the
+        cache so charts can still be served from the last known data while
+        OKAMA is unavailable.
+        
+        Args:
+            symbol: Asset symbol
+            kind: Asset attribute with the series
+            
+        Returns:
+            pandas Series
+            
+        Raises:
+            Exception: If API fails and no cached series is available
+        """
+        try:
+            if kind in SERIES_FREQ:
+                return timeseries_store.get_series(symbol, kind)
+            asset = self.create_asset(symbol)
+            series = self._retry_with_backoff(getattr, asset, kind)
+            if self._should_store(f"series:{symbol}:{kind}"):
+                try:
+                    cached_data_service.update_series(symbol, kind, series)
+                except Exception as cache_error:
+                    logger.warning(f"Could not cache series {symbol}:{kind}: {cache_error}")
+            return series
+        except Exception as e:
+            cached = cached_data_service.get_cached_series(symbol, kind)
+            if cached is not None:
+                logger.warning(f"OKAMA API failed for {symbol}, using cached {kind}: {e}")
+                return cached
+            raise
+    
+    def _should_store(self, key: str) -> bool:
+        """Throttle cache writes to once per STORE_INTERVAL for each key."""
+        with self._store_lock:
+            if self._last_stored.get(key) is not None:
+                return False
+            self._last_stored.set(key, True)
+            return True
+    
+    def probe(self):
+        """
+        Health probe: one lightweight OKAMA request through the circuit breaker.
+        
+        Raises:
+            Exception: If OKAMA is unavailable
+        """
+        def _fetch():
+            try:
+                from okama.api.api_methods import API
+                return API.get_namespaces()
+            except (ImportError, AttributeError):
+                import okama as ok
+                return ok.namespaces
+        
+        return self._attempt(_fetch)
+    
     def is_api_available(self) -> bool:
         """
         Check if OKAMA API is available.
         
+        Answered from the circuit breaker and the last background health
+        probe, without network I/O.
+        
         Returns:
             True if API is available, False otherwise
         """
-        try:
-            # Try a simple operation to test API availability
-            self.get_namespaces()
-            return True
-        except Exception as e:
-            logger.warning(f"OKAMA API availability check failed: {e}")
+        if self.circuit_breaker.is_open():
             return False
+        return health_monitor.is_available('okama')
     
     def get_api_status(self) -> Dict[str, Any]:
         """
         Get detailed API status information.
         
+        Answered from the last background health probe, without network I/O.
+        
         Returns:
             Dictionary with API status information
         """
+        health = health_monitor.get_status('okama') or {}
         status = {
-            'available': False,
-            'error': None,
-            'response_time': None,
-            'fallback_available': cached_data_service.can_provide_fallback()
+            'available': self.is_api_available(),
+            'error': health.get('last_error'),
+            'response_time': health.get('last_latency'),
+            'last_success': health.get('last_success'),
+            'last_check': health.get('last_check'),
+            'fallback_available': cached_data_service.can_provide_fallback(),
+            'circuit': self.get_circuit_state()
         }
         
-        try:
-            start_time = time.time()
-            self.get_namespaces()
-            end_time = time.time()
-            
-            status['available'] = True
-            status['response_time'] = end_time - start_time
-            
-        except Exception as e:
-            status['error'] = str(e)
+        if status['circuit']['state'] == 'open':
+            status['error'] = f"Circuit open after repeated failures: {status['circuit']['last_failure']}"
         
         return status
     
@@ -0,0 +1,217 @@
+"""
+Period Metrics Module
+Precomputed per-symbol price history for trailing-window /info metrics.
+
+Switching /info between 1Y, 5Y and MAX used to refetch the asset and
+recompute pct_change() over close_daily.tail(N) every time. A snapshot is now
+built once per symbol: the price array, prefix sums of log returns, simple
+returns and squared returns, and a running-max drawdown array. Total return,
+CAGR and volatility of any trailing window are O(1) lookups; the snapshot
+also carries the header fields of the info message, so switching periods
+does not touch okama at all while the snapshot is cached.
+"""
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from services.okama_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+PERIOD_METRICS_TTL = float(os.getenv("PERIOD_METRICS_TTL", "900"))  # seconds
+PERIOD_METRICS_MAX_ITEMS = int(os.getenv("PERIOD_METRICS_MAX_ITEMS", "256"))
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Trailing window in trading days for each /info period (None - all data)
+PERIOD_DAYS = {
+    '1Y': 252,
+    '5Y': 1260,
+    'MAX': None,
+}
+
+# Asset attributes shown in the info header
+HEADER_FIELDS = ('name', 'country', 'asset_type', 'exchange', 'isin', 'currency')
+
+
+class PriceHistory:
+    """
+    Daily prices with prefix sums for O(1) trailing-window statistics.
+    """
+
+    def __init__(self, prices):
+        """
+        Initialize the history.
+
+        Args:
+            prices: Daily close prices (array-like or pandas Series); NaN values are skipped
+        """
+        values = np.asarray(prices, dtype='float64').ravel()
+        self.prices = values[~np.isnan(values)]
+        n = len(self.prices)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = self.prices[1:] / self.prices[:-1] - 1.0 if n > 1 else np.empty(0)
+            log_returns = np.log1p(returns)
+
+        # prefix[k] - sum over the first k returns
+        self._log_prefix = np.concatenate(([0.0], np.cumsum(log_returns)))
+        self._sum_prefix = np.concatenate(([0.0], np.cumsum(returns)))
+        self._sq_prefix = np.concatenate(([0.0], np.cumsum(returns ** 2)))
+        self.returns = returns
+
+        # Drawdown from the running maximum of the whole history
+        self.drawdowns = self.prices / np.maximum.accumulate(self.prices) - 1.0 if n else np.empty(0)
+        self._window_drawdowns: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def window_start(self, days: Optional[int]) -> int:
+        """Index of the first price of the trailing window (None - all data)."""
+        if days is None:
+            return 0
+        return max(0, len(self.prices) - int(days))
+
+    def total_return(self, days: Optional[int] = None) -> Optional[float]:
+        """Compound return over the trailing window."""
+        start = self.window_start(days)
+        end = len(self.prices) - 1
+        if end <= start:
+            return None
+        return float(np.expm1(self._log_prefix[end] - self._log_prefix[start]))
+
+    def volatility(self, days: Optional[int] = None) -> Optional[float]:
+        """Annualized standard deviation of daily returns over the trailing window."""
+        start = self.window_start(days)
+        end = len(self.prices) - 1
+        count = end - start
+        if count < 2:
+            return None
+        total = self._sum_prefix[end] - self._sum_prefix[start]
+        squares = self._sq_prefix[end] - self._sq_prefix[start]
+        variance = max(0.0, (squares - total * total / count) / (count - 1))
+        return float(np.sqrt(variance * TRADING_DAYS_PER_YEAR))
+
+    def max_drawdown(self, days: Optional[int] = None) -> Optional[float]:
+        """Maximum drawdown inside the trailing window (memoized per window)."""
+        start = self.window_start(days)
+        if len(self.prices) - start < 2:
+            return None
+        if start == 0:
+            return float(self.drawdowns.min())
+        if start not in self._window_drawdowns:
+            window = self.prices[start:]
+            self._window_drawdowns[start] = float((window / np.maximum.accumulate(window) - 1.0).min())
+        return self._window_drawdowns[start]
+
+
+class AssetSnapshot:
+    """
+    Header fields and price history of an asset, enough to render /info for any period.
+    """
+
+    def __init__(self, symbol: str, history: PriceHistory, dividend_yield: Optional[float] = None,
+                 **fields):
+        self.symbol = symbol
+        self.history = history
+        self.dividend_yield = dividend_yield
+        for field in HEADER_FIELDS:
+            setattr(self, field, fields.get(field, 'N/A' if field != 'name' else symbol))
+
+    @classmethod
+    def from_asset(cls, asset, symbol: str, prices=None) -> 'AssetSnapshot':
+        """
+        Build snapshot from an ok.Asset (blocking, run it in the data pool).
+
+        Args:
+            asset: okama Asset
+            symbol: Asset symbol
+            prices: Daily close prices (defaults to asset.close_daily)
+        """
+        if prices is None:
+            prices = asset.close_daily
+        dividend_yield = None
+        try:
+            value = getattr(asset, 'dividend_yield', None)
+            if value is not None:
+                dividend_yield = float(value.iloc[-1]) if hasattr(value, 'iloc') else float(value)
+        except Exception as e:
+            logger.warning(f"Could not get dividend yield for {symbol}: {e}")
+        fields = {field: getattr(asset, field, 'N/A') for field in HEADER_FIELDS}
+        fields['name'] = getattr(asset, 'name', symbol)
+        return cls(symbol, PriceHistory(prices), dividend_yield, **fields)
+
+    def metrics(self, period: str = '1Y') -> Dict[str, Any]:
+        """
+        Key metrics for the /info period.
+
+        Args:
+            period: '1Y', '5Y' or 'MAX' (unknown periods are treated as 1Y)
+
+        Returns:
+            Metrics dictionary (empty if there is no price data)
+        """
+        history = self.history
+        if len(history) == 0:
+            return {}
+        days = PERIOD_DAYS.get(period, PERIOD_DAYS['1Y'])
+        start = history.window_start(days)
+        data_points = len(history) - start
+
+        total_return = history.total_return(days)
+        cagr = None
+        if total_return is not None:
+            if period == '5Y':
+                years = 5.0
+            elif period == 'MAX':
+                years = data_points / TRADING_DAYS_PER_YEAR
+            else:
+                years = 1.0
+            if years > 0:
+                cagr = (1 + total_return) ** (1 / years) - 1
+
+        return {
+            'current_price': float(history.prices[-1]),
+            'price_change_pct': total_return * 100 if total_return is not None else None,
+            'cagr': cagr,
+            'volatility': history.volatility(days),
+            'max_drawdown': history.max_drawdown(days),
+            'dividend_yield': self.dividend_yield,
+            'period': period,
+            'data_points': data_points,
+        }
+
+
+class PeriodMetricsCache:
+    """
+    Process-wide cache of asset snapshots keyed by symbol.
+    """
+
+    def __init__(self, max_items: int = PERIOD_METRICS_MAX_ITEMS, ttl: float = PERIOD_METRICS_TTL):
+        self._cache = TTLLRUCache(max_items=max_items, ttl=ttl)
+
+    def get(self, symbol: str) -> Optional[AssetSnapshot]:
+        """Cached snapshot or None."""
+        return self._cache.get(symbol)
+
+    def get_or_build(self, symbol: str, asset, prices=None) -> AssetSnapshot:
+        """Cached snapshot or a new one built from asset (blocking)."""
+        return self._cache.get_or_create(symbol, lambda: AssetSnapshot.from_asset(asset, symbol, prices))
+
+    def invalidate(self, symbol: str) -> bool:
+        return self._cache.invalidate(symbol)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._cache.get_stats()
+
+
+# Global instance for use throughout the application
+period_metrics_cache = PeriodMetricsCache()
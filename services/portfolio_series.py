@@ -0,0 +1,196 @@
+"""
+Portfolio Series Module
+Derived series of okama portfolios computed once per portfolio object.
+
+Drawdowns, rolling CAGR, annual returns and dividend yield charts each asked
+the okama Portfolio for its properties again, and okama recomputes them from
+the raw returns on every access (the drawdowns chart even read
+portfolio.drawdowns twice). Every derived series is now computed lazily on
+first use and memoized in a bundle attached to the portfolio object.
+
+Portfolios are shared through okama_cache, so the bundle lives exactly as
+long as the cached portfolio: switching between portfolio buttons only
+renders charts, and an evicted portfolio takes its series with it.
+AssetList objects (comparison charts) are supported the same way.
+"""
+
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marker for memoized "attribute is missing" results
+_MISSING = object()
+
+
+class PortfolioSeries:
+    """
+    Lazily computed series of one okama Portfolio / AssetList.
+
+    Series missing on the source object (e.g. recovery_period of an
+    AssetList) are None. Errors are not memoized.
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source: okama Portfolio or AssetList
+        """
+        try:
+            self._ref = weakref.ref(source)
+        except TypeError:
+            self._ref = lambda: source
+        self._values: Dict[Any, Any] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def source(self):
+        """Source object (None once it has been garbage collected)."""
+        return self._ref()
+
+    def _get(self, key: Any, compute: Callable[[Any], Any]):
+        with self._lock:
+            value = self._values.get(key, _MISSING)
+            if value is _MISSING:
+                source = self._ref()
+                if source is None:
+                    raise ReferenceError("Portfolio object no longer exists")
+                value = compute(source)
+                self._values[key] = value
+            return value
+
+    def _attribute(self, name: str):
+        return self._get(name, lambda source: getattr(source, name, None))
+
+    def is_computed(self, key: Any) -> bool:
+        with self._lock:
+            return key in self._values
+
+    @property
+    def wealth_index(self):
+        """Wealth index DataFrame (wealth_indexes for AssetList)."""
+        def compute(source):
+            if hasattr(type(source), 'wealth_index'):
+                return source.wealth_index
+            return getattr(source, 'wealth_indexes', None)
+        return self._get('wealth_index', compute)
+
+    @property
+    def wealth(self):
+        """Portfolio wealth as a Series (first column of wealth_index) without gaps."""
+        def compute(source):
+            wealth_index = self.wealth_index
+            if wealth_index is None:
+                return None
+            history = wealth_index.iloc[:, 0] if hasattr(wealth_index, 'columns') else wealth_index
+            return history.dropna()
+        return self._get('wealth', compute)
+
+    @property
+    def drawdowns(self):
+        return self._attribute('drawdowns')
+
+    @property
+    def recovery_period(self):
+        return self._attribute('recovery_period')
+
+    @property
+    def annual_returns(self):
+        """Calendar year returns (annual_return_ts)."""
+        return self._attribute('annual_return_ts')
+
+    @property
+    def dividend_yield(self):
+        """Dividend yield with assets if available, aggregated dividend yield otherwise."""
+        def compute(source):
+            if hasattr(type(source), 'dividend_yield_with_assets'):
+                return source.dividend_yield_with_assets
+            return getattr(source, 'dividend_yield', None)
+        return self._get('dividend_yield', compute)
+
+    def rolling_cagr(self, window: Optional[int] = None):
+        """Rolling CAGR (okama get_rolling_cagr), memoized per window."""
+        def compute(source):
+            if window is None:
+                return source.get_rolling_cagr()
+            return source.get_rolling_cagr(window=window)
+        return self._get(('rolling_cagr', window), compute)
+
+    def largest_drawdowns(self, n: int = 5):
+        return self._get(('largest_drawdowns', n), lambda source: self.drawdowns.nsmallest(n))
+
+    def longest_recoveries(self, n: int = 5):
+        """Longest recovery periods in years."""
+        return self._get(('longest_recoveries', n), lambda source: self.recovery_period.nlargest(n) / 12)
+
+    @property
+    def return_stats(self) -> Dict[str, Any]:
+        """Mean monthly / annual return and CAGR (scalar)."""
+        def compute(source):
+            cagr = source.get_cagr()
+            if hasattr(cagr, 'iloc'):
+                cagr = cagr.iloc[0]
+            return {
+                'mean_return_monthly': source.mean_return_monthly,
+                'mean_return_annual': source.mean_return_annual,
+                'cagr': cagr,
+            }
+        return self._get('return_stats', compute)
+
+
+class PortfolioSeriesCache:
+    """
+    Series bundles keyed by the identity of okama objects.
+
+    Entries are dropped when their object is garbage collected, so the
+    bundle lifetime follows okama_cache.
+    """
+
+    def __init__(self):
+        self._bundles: Dict[int, PortfolioSeries] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, source) -> PortfolioSeries:
+        """Series bundle of an okama Portfolio / AssetList (created on first use)."""
+        key = id(source)
+        with self._lock:
+            bundle = self._bundles.get(key)
+            if bundle is not None and bundle.source is source:
+                self.hits += 1
+                return bundle
+            self.misses += 1
+            bundle = PortfolioSeries(source)
+            try:
+                weakref.finalize(source, self._discard, key, bundle)
+            except TypeError:
+                # Not weak-referenceable: not shared, lives with the caller
+                return bundle
+            self._bundles[key] = bundle
+            return bundle
+
+    def _discard(self, key: int, bundle: PortfolioSeries) -> None:
+        with self._lock:
+            if self._bundles.get(key) is bundle:
+                del self._bundles[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bundles.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._bundles),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total) if total else 0.0,
+            }
+
+
+# Global instance for use throughout the application
+portfolio_series = PortfolioSeriesCache()
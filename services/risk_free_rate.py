@@ -0,0 +1,269 @@
+"""
+Risk-Free Rate Module
+Memoized risk-free rates with background refresh of okama rate series.
+
+get_risk_free_rate used to build a fresh ok.Rate and average its monthly
+values on every call. It is called per metrics row, per portfolio row and per
+symbol, so one report could download the same US_EFFR.RATE series many times.
+The service keeps the downloaded rate series in memory, memoizes the final
+rate per (currency, period bucket) and refreshes the series from a scheduled
+job. Request handlers never download: until the series is loaded they get the
+same fixed fallback rates that were used when okama was unavailable.
+"""
+
+import os
+import time
+import bisect
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.circuit_breaker import okama_breaker
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+# Rate series are published monthly, twice a day is more than enough
+RISK_FREE_RATE_REFRESH_INTERVAL = float(os.getenv("RISK_FREE_RATE_REFRESH_INTERVAL", str(12 * 3600)))
+
+# Upper bounds (years) of period buckets; every rule below only depends on the bucket
+PERIOD_BUCKETS = (0.25, 0.5, 1.0, 3.0, 5.0)
+
+# okama rate symbols tried in order for each currency
+RATE_SYMBOLS = {
+    'USD': ['US_EFFR.RATE'],
+    'EUR': ['EU_DFR.RATE', 'EU_MLR.RATE', 'EU_MRO.RATE'],
+    'GBP': ['UK_BR.RATE'],
+    'ILS': ['ISR_IR.RATE'],
+}
+
+# RUB: okama returns unrealistic values (33%+), OFZ yield approximations are used instead
+RUB_OFZ_RATES = (
+    0.08,   # 3 months or less - OFZ 3M approximation
+    0.085,  # 6 months or less - OFZ 6M approximation
+    0.09,   # 1 year or less - OFZ 1Y approximation
+    0.095,  # 3 years or less - OFZ 3Y approximation
+    0.10,   # 5 years or less - OFZ 5Y approximation
+    0.105,  # more than 5 years - OFZ 10Y approximation
+)
+RUB_DEFAULT_RATE = 0.09  # OFZ 1Y rate when period is unknown
+
+# Fixed rates for currencies not supported by okama
+FIXED_RATES = {
+    'HKD': 0.0285,  # 2.85% fixed rate for Hong Kong Dollar
+}
+
+# Fallback rates if okama data is not available
+FALLBACK_RATES = {
+    'USD': 0.05,  # 5% - current Fed funds rate
+    'EUR': 0.04,  # 4% - current ECB rate
+    'GBP': 0.05,  # 5% - current BoE rate
+    'RUB': 0.10,  # 10% - OFZ 5Y rate
+    'CNY': 0.035,  # 3.5% - current LPR rate
+    'JPY': 0.05,  # 5% - use US rate as proxy
+    'CHF': 0.04,  # 4% - use EU rate as proxy
+    'CAD': 0.05,  # 5% - use US rate as proxy
+    'AUD': 0.05,  # 5% - use US rate as proxy
+    'ILS': 0.045,  # 4.5% - current BoI rate
+    'HKD': 0.0285,  # 2.85% - Hong Kong Dollar fixed rate (not supported by okama)
+}
+DEFAULT_FALLBACK_RATE = 0.05
+
+
+def period_bucket(period_years: Optional[float]) -> Optional[int]:
+    """
+    Period bucket index (0 - up to 3 months, ..., 5 - more than 5 years).
+
+    Args:
+        period_years: Investment period in years (None - unknown)
+
+    Returns:
+        Bucket index or None if period is unknown
+    """
+    if period_years is None:
+        return None
+    return bisect.bisect_left(PERIOD_BUCKETS, float(period_years))
+
+
+def rate_symbols_for(currency: str, bucket: Optional[int]) -> List[str]:
+    """okama rate symbols for currency and period bucket (empty list - not supported)."""
+    currency = currency.upper()
+    if currency == 'CNY':
+        # More than 5 years - 5-year LPR, otherwise 1-year LPR
+        return ['CHN_LPR5.RATE'] if bucket == len(PERIOD_BUCKETS) else ['CHN_LPR1.RATE']
+    return list(RATE_SYMBOLS.get(currency, []))
+
+
+def _download_rate_series(rate_symbol: str):
+    import okama as ok
+
+    return ok.Rate(rate_symbol).values_monthly
+
+
+class RiskFreeRateService:
+    """
+    In-memory rate series and memoized risk-free rates.
+    """
+
+    def __init__(self, refresh_interval: float = RISK_FREE_RATE_REFRESH_INTERVAL, fetcher=None):
+        """
+        Initialize the service.
+
+        Args:
+            refresh_interval: Interval between series refreshes in seconds
+            fetcher: Callable(rate_symbol) returning monthly rate series
+        """
+        self.refresh_interval = float(refresh_interval)
+        self.fetcher = fetcher or (lambda symbol: okama_breaker.call(_download_rate_series, symbol))
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._series: Dict[str, Any] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._failed: Dict[str, str] = {}
+        self._memo: Dict[Tuple[str, Optional[int]], float] = {}
+        self.refreshes = 0
+        self.last_refresh: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    def all_rate_symbols(self) -> List[str]:
+        """Every rate symbol the service may need."""
+        symbols = []
+        for currency in list(RATE_SYMBOLS) + ['CNY']:
+            for bucket in (None, len(PERIOD_BUCKETS)):
+                for symbol in rate_symbols_for(currency, bucket):
+                    if symbol not in symbols:
+                        symbols.append(symbol)
+        return symbols
+
+    # ========= Refresh =========
+
+    def refresh(self, symbols: Optional[List[str]] = None, force: bool = False) -> Dict[str, bool]:
+        """
+        Download rate series (blocking, run it in the data pool).
+
+        Series that fail to download keep their previous values.
+
+        Args:
+            symbols: Rate symbols to refresh (None - all known symbols)
+            force: Refresh even if the series is younger than refresh_interval
+
+        Returns:
+            Dict rate symbol -> True if the series is loaded
+        """
+        symbols = symbols or self.all_rate_symbols()
+        results = {}
+        with self._refresh_lock:
+            for symbol in symbols:
+                with self._lock:
+                    loaded_at = self._loaded_at.get(symbol)
+                if not force and loaded_at is not None and time.time() - loaded_at < self.refresh_interval:
+                    results[symbol] = True
+                    continue
+                try:
+                    series = self.fetcher(symbol)
+                    if series is None or len(series) == 0:
+                        raise ValueError("empty rate series")
+                except Exception as e:
+                    logger.debug(f"Could not refresh rate {symbol}: {e}")
+                    with self._lock:
+                        self._failed[symbol] = str(e)[:200]
+                        results[symbol] = symbol in self._series
+                    continue
+                with self._lock:
+                    self._series[symbol] = series
+                    self._loaded_at[symbol] = time.time()
+                    self._failed.pop(symbol, None)
+                results[symbol] = True
+
+            with self._lock:
+                # Rates depend on the series, recompute them on next access
+                self._memo.clear()
+                self.refreshes += 1
+                self.last_refresh = time.time()
+        return results
+
+    # ========= Public API =========
+
+    def get_series(self, currency: str, period_years: Optional[float] = None):
+        """
+        Loaded monthly rate series for currency and period (no network I/O).
+
+        Returns:
+            pandas Series of rates as decimals or None if no series is loaded
+        """
+        return self._series_for(currency, period_bucket(period_years))
+
+    def _series_for(self, currency: str, bucket: Optional[int]):
+        with self._lock:
+            for symbol in rate_symbols_for(currency, bucket):
+                series = self._series.get(symbol)
+                if series is not None:
+                    return series
+        return None
+
+    def get_rate(self, currency: str, period_years: Optional[float] = None) -> float:
+        """
+        Risk-free rate for currency and period (no network I/O).
+
+        Args:
+            currency: Currency code (USD, EUR, RUB, etc.)
+            period_years: Investment period in years (for selecting appropriate rate)
+
+        Returns:
+            Risk-free rate as decimal (e.g., 0.05 for 5%)
+        """
+        currency = (currency or 'USD').upper()
+        key = (currency, period_bucket(period_years))
+        with self._lock:
+            rate = self._memo.get(key)
+            if rate is not None:
+                self.hits += 1
+                return rate
+            self.misses += 1
+
+        rate = self._compute_rate(*key)
+        with self._lock:
+            self._memo[key] = rate
+        return rate
+
+    def _compute_rate(self, currency: str, bucket: Optional[int]) -> float:
+        if currency in FIXED_RATES:
+            return FIXED_RATES[currency]
+
+        if currency == 'RUB':
+            return RUB_OFZ_RATES[bucket] if bucket is not None else RUB_DEFAULT_RATE
+
+        series = self._series_for(currency, bucket)
+        if series is not None:
+            try:
+                # Average rate over the whole history
+                rate = float(series.mean())
+                logger.debug(f"Using okama rate for {currency}: {rate:.4f}")
+                return rate
+            except Exception as e:
+                logger.warning(f"Could not average okama rate for {currency}: {e}")
+
+        if currency == 'CNY':
+            # Period-dependent: 4% for 5-year, 3.5% for 1-year rate approximation
+            return 0.04 if bucket == len(PERIOD_BUCKETS) else 0.035
+
+        return FALLBACK_RATES.get(currency, DEFAULT_FALLBACK_RATE)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get service statistics."""
+        with self._lock:
+            return {
+                'loaded': sorted(self._series),
+                'failed': dict(self._failed),
+                'memoized': len(self._memo),
+                'hits': self.hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'last_refresh': self.last_refresh,
+                'refresh_interval': self.refresh_interval,
+            }
+
+
+# Global instance for use throughout the application
+risk_free_rate_service = RiskFreeRateService()
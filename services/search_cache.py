@@ -0,0 +1,137 @@
+"""
+Search Cache Module
+Shared result cache for okama and Tushare symbol searches.
+
+/info, /search and free-text input all resolve user queries through
+ok.search and the Tushare search helpers, which download the whole listing
+on every call. The same query was searched several times per request
+(try_fuzzy_search and _unified_search both ran ok.search, and the Tushare
+English search downloaded the mainland listing once per SSE/SZSE/BSE), and
+popular or misspelled queries were repeated across users.
+
+Results are cached per source under the normalized query (case and
+whitespace insensitive). Queries with no results are cached too, with a
+shorter TTL, so misspellings stop reaching the providers while new listings
+still show up quickly. Errors are never cached.
+"""
+
+import os
+import copy
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from services.circuit_breaker import okama_breaker
+from services.okama_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "3600"))  # seconds, queries with results
+SEARCH_NEGATIVE_TTL = float(os.getenv("SEARCH_NEGATIVE_TTL", "600"))  # seconds, queries without results
+SEARCH_CACHE_MAX_ITEMS = int(os.getenv("SEARCH_CACHE_MAX_ITEMS", "2048"))
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: case-folded with collapsed whitespace."""
+    return " ".join(str(query or "").split()).casefold()
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or len(value) == 0
+
+
+class SearchCache:
+    """
+    Search results keyed by (source, normalized query, extra key parts).
+
+    Concurrent identical searches share one provider call.
+    """
+
+    def __init__(self, max_items: int = SEARCH_CACHE_MAX_ITEMS, ttl: float = SEARCH_CACHE_TTL,
+                 negative_ttl: float = SEARCH_NEGATIVE_TTL):
+        """
+        Args:
+            max_items: Maximum number of cached queries
+            ttl: Lifetime of results with at least one match (seconds)
+            negative_ttl: Lifetime of empty results (seconds)
+        """
+        self.negative_ttl = float(negative_ttl)
+        self._cache = TTLLRUCache(max_items=max_items, ttl=ttl)
+        self._lock = threading.Lock()
+        self.negative_hits = 0
+        self.provider_calls = 0
+
+    @staticmethod
+    def make_key(source: str, query: str, *extra: Hashable) -> Tuple[Hashable, ...]:
+        return (source, normalize_query(query)) + extra
+
+    def _ttl(self, value: Any) -> float:
+        return self.negative_ttl if _is_empty(value) else self._cache.ttl
+
+    def get_or_search(self, source: str, query: str, search: Callable[[], Any], *extra: Hashable) -> Any:
+        """
+        Cached result of search() for the query.
+
+        Args:
+            source: Provider name ('okama', 'tushare', ...)
+            query: User query (normalized for the key)
+            search: Provider call; must raise on errors so they are not cached
+            extra: Additional key parts (e.g. exchange)
+
+        Returns:
+            Copy of the cached result (list / DataFrame)
+        """
+        called = []
+
+        def factory():
+            called.append(True)
+            return search()
+
+        value = self._cache.get_or_create(self.make_key(source, query, *extra), factory, ttl=self._ttl)
+        with self._lock:
+            if called:
+                self.provider_calls += 1
+            elif _is_empty(value):
+                self.negative_hits += 1
+        return copy.copy(value)
+
+    def invalidate(self, source: str, query: str, *extra: Hashable) -> bool:
+        return self._cache.invalidate(self.make_key(source, query, *extra))
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self.negative_hits = 0
+            self.provider_calls = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self._cache.get_stats()
+        with self._lock:
+            stats.update({
+                'negative_ttl': self.negative_ttl,
+                'negative_hits': self.negative_hits,
+                'provider_calls': self.provider_calls,
+            })
+        return stats
+
+
+# Global instance for use throughout the application
+search_cache = SearchCache()
+
+
+def okama_search(query: str):
+    """
+    Cached ok.search(query).
+
+    Returns:
+        DataFrame of matches (empty if nothing is found)
+
+    Raises:
+        Exception: okama errors (not cached)
+    """
+    def search():
+        import okama as ok
+        return okama_breaker.call(ok.search, query)
+
+    return search_cache.get_or_search('okama', query, search)
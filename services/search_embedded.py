@@ -3,12 +3,20 @@
 # - Zero-dependency search with curated list of major tickers
 # - Russian-friendly search via aliases, transliteration, and fuzzy scoring
 # - Unified asset mappings for direct ticker resolution
+# - Trigram inverted index: only the best candidates reach the fuzzy scorer
+# - Prebuilt serialized index (scripts/build_search_index.py) loaded at startup
 # - Fallback to okama search for comprehensive coverage
 
+import os
 import re
+import json
+import heapq
+import hashlib
 import difflib
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
+from itertools import chain
+from typing import Any, List, Dict, Tuple, Optional, Set
 
 # ----------------- Curated universe (symbol, English name) --------------------
 # Add/adjust freely. Symbols are in SECID.MOEX format.
@@ -334,6 +342,32 @@ def strip_stopwords(name: str) -> str:
     tokens = [t for t in tokenize(name) if t not in STOPWORDS]
     return " ".join(tokens)
 
+# ----------------- Candidate generation --------------------------------------
+# Aliases passed to the difflib scorer per query variant (best trigram overlap)
+SEARCH_CANDIDATES = 16
+# Aliases with most shared trigrams ranked by Dice overlap, per candidate
+_PRESELECT_FACTOR = 4
+# Trigrams found in more than this share of aliases are skipped if the query has rarer ones
+_COMMON_TRIGRAM_SHARE = 0.05
+
+def trigrams(s: str) -> Set[str]:
+    # Padded, so short aliases and word starts get their own trigrams
+    padded = f"  {s} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ----------------- Prebuilt index --------------------------------------------
+# Serialized by scripts/build_search_index.py; a stale or missing file is rebuilt in memory
+SEARCH_INDEX_PATH = os.getenv(
+    "SEARCH_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_index.json"))
+# Bump when alias generation (MoexSearchIndex.add_asset) or the file layout changes
+INDEX_FORMAT = 1
+
+def index_version() -> str:
+    # Hash of everything aliases are derived from: curated list and normalization tables
+    source = [INDEX_FORMAT, EMBEDDED, sorted(STOPWORDS), _LAT2RU, _RU2LAT]
+    raw = json.dumps(source, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
 # ----------------- Core data structures --------------------------------------
 @dataclass
 class Asset:
@@ -345,6 +379,20 @@ class MoexSearchIndex:
     def __init__(self):
         self.assets: Dict[str, Asset] = {}
         self.alias2symbol: Dict[str, str] = {}
+        # Alias id -> alias / its tokens / trigram count; trigram -> alias ids
+        self._aliases: List[str] = []
+        self._alias_tokens: List[frozenset] = []
+        self._alias_trigrams: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def _index_alias(self, alias: str):
+        alias_id = len(self._aliases)
+        grams = trigrams(alias)
+        self._aliases.append(alias)
+        self._alias_tokens.append(frozenset(alias.split()))
+        self._alias_trigrams.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(alias_id)
 
     def add_asset(self, symbol: str, name_en: str):
         sym = symbol.strip()
@@ -370,7 +418,9 @@ class MoexSearchIndex:
         a.aliases = sorted({normalize_text(x) for x in base_aliases if x})
         self.assets[sym] = a
         for al in a.aliases:
-            self.alias2symbol.setdefault(al, sym)
+            if al not in self.alias2symbol:
+                self.alias2symbol[al] = sym
+                self._index_alias(al)
 
     def build_from_embedded(self):
         for sym, nm in EMBEDDED:
@@ -384,14 +434,40 @@ class MoexSearchIndex:
         dif = difflib.SequenceMatcher(a=normalize_text(q), b=normalize_text(alias)).ratio()
         return 0.6 * dif + 0.4 * jacc
 
-    def search(self, query: str, top_k: int = 5, min_score: float = 0.45) -> List[Tuple[str, float, str]]:
+    def _candidates(self, grams: Set[str], limit: int) -> List[int]:
+        # Alias ids with the best Dice overlap of trigrams, in insertion order
+        if len(self._aliases) <= limit:
+            return list(range(len(self._aliases)))
+        postings = [self._postings[g] for g in grams if g in self._postings]
+        rare = [p for p in postings if len(p) <= _COMMON_TRIGRAM_SHARE * len(self._aliases)]
+        shared = Counter(chain.from_iterable(rare or postings))
+        size = len(grams)
+        best = heapq.nlargest(limit, shared.most_common(limit * _PRESELECT_FACTOR),
+                              key=lambda item: (item[1] / (size + self._alias_trigrams[item[0]]), -item[0]))
+        return sorted(alias_id for alias_id, _ in best)
+
+    def search(self, query: str, top_k: int = 5, min_score: float = 0.45,
+               candidates: int = SEARCH_CANDIDATES) -> List[Tuple[str, float, str]]:
         qn = normalize_text(query)
-        variants = {qn, ru_to_lat(qn), lat_to_ru(qn)}
         scores: Dict[str, Tuple[float, str]] = {}
-        for v in variants:
-            for al, sym in self.alias2symbol.items():
-                score = self._score(v, al)
-                if score >= scores.get(sym, (0.0, ""))[0]:
+        for v in dict.fromkeys((qn, ru_to_lat(qn), lat_to_ru(qn))):
+            # Same score as _score, with the alias side precomputed
+            vn = normalize_text(v)
+            vt = set(vn.split())
+            matcher = difflib.SequenceMatcher(a=vn)
+            for alias_id in self._candidates(trigrams(vn), candidates):
+                al = self._aliases[alias_id]
+                at = self._alias_tokens[alias_id]
+                sym = self.alias2symbol[al]
+                best = scores.get(sym, (0.0, ""))[0]
+                jacc = len(vt & at) / max(1, len(vt | at))
+                # Length bound of the difflib ratio: skip aliases that cannot win or pass min_score
+                bound = 2.0 * min(len(vn), len(al)) / max(1, len(vn) + len(al))
+                if 0.6 * bound + 0.4 * jacc < max(best, min_score):
+                    continue
+                matcher.set_seq2(al)
+                score = 0.6 * matcher.ratio() + 0.4 * jacc
+                if score >= best:
                     scores[sym] = (score, al)
         ranked = sorted([(sym, sc, al) for sym, (sc, al) in scores.items() if sc >= min_score],
                         key=lambda x: x[1], reverse=True)
@@ -400,6 +476,48 @@ class MoexSearchIndex:
     def dump_aliases(self) -> Dict[str, List[str]]:
         return {sym: asset.aliases for sym, asset in self.assets.items()}
 
+    def to_payload(self) -> Dict[str, Any]:
+        # Columnar layout: assets and aliases refer to each other by position
+        alias_ids = {al: i for i, al in enumerate(self._aliases)}
+        asset_ids = {sym: i for i, sym in enumerate(self.assets)}
+        return {
+            "format": INDEX_FORMAT,
+            "version": index_version(),
+            "assets": [[a.symbol, a.name_en, [alias_ids[al] for al in a.aliases]] for a in self.assets.values()],
+            "aliases": self._aliases,
+            "alias_assets": [asset_ids[self.alias2symbol[al]] for al in self._aliases],
+            "trigram_counts": self._alias_trigrams,
+            "postings": self._postings,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "MoexSearchIndex":
+        if payload.get("format") != INDEX_FORMAT or payload.get("version") != index_version():
+            raise ValueError(f"index version {payload.get('format')}/{payload.get('version')} "
+                             f"does not match {INDEX_FORMAT}/{index_version()}")
+        idx = cls()
+        aliases = payload["aliases"]
+        symbols = [sym for sym, _, _ in payload["assets"]]
+        for sym, name_en, ids in payload["assets"]:
+            idx.assets[sym] = Asset(symbol=sym, name_en=name_en, aliases=[aliases[i] for i in ids])
+        idx.alias2symbol = {al: symbols[i] for al, i in zip(aliases, payload["alias_assets"])}
+        idx._aliases = aliases
+        idx._alias_tokens = [frozenset(al.split()) for al in aliases]
+        idx._alias_trigrams = payload["trigram_counts"]
+        idx._postings = payload["postings"]
+        return idx
+
+    def save(self, path: str = SEARCH_INDEX_PATH):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_payload(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = SEARCH_INDEX_PATH) -> "MoexSearchIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_payload(json.load(f))
+
 # ----------------- Fuzzy search functionality --------------------------------
 # Cache for MOEX index to avoid rebuilding it every time
 _moex_index_cache = None
@@ -447,13 +565,8 @@ def _search_moex(query: str) -> List[Dict[str, str]]:
     Returns:
         List of MOEX search results
     """
-    global _moex_index_cache
-    
     try:
-        if _moex_index_cache is None:
-            _moex_index_cache = load_default_index()
-        
-        moex_results = _moex_index_cache.search(query, top_k=5, min_score=0.45)
+        moex_results = get_default_index().search(query, top_k=5, min_score=0.45)
         
         results = []
         for symbol, score, alias in moex_results:
@@ -470,7 +583,7 @@ def _search_moex(query: str) -> List[Dict[str, str]]:
 
 def _search_okama(query: str, source: str, score: float) -> List[Dict[str, str]]:
     """
-    Helper function to search okama database.
+    Helper function to search okama database (cached, see services.search_cache).
     
     Args:
         query: Search query
@@ -481,18 +594,14 @@ def _search_okama(query: str, source: str, score: float) -> List[Dict[str, str]]
         List of search results
     """
     try:
-        import okama as ok
-        search_result = ok.search(query)
+        from services.search_cache import okama_search
+        search_result = okama_search(query)
         if len(search_result) > 0:
-            results = []
-            for _, row in search_result.iterrows():
-                results.append({
-                    'symbol': row['symbol'],
-                    'name': row.get('name', ''),
-                    'source': source,
-                    'score': score
-                })
-            return results
+            names = search_result['name'] if 'name' in search_result.columns else [''] * len(search_result)
+            return [
+                {'symbol': symbol, 'name': name, 'source': source, 'score': score}
+                for symbol, name in zip(search_result['symbol'], names)
+            ]
     except Exception as e:
         _log_warning(f"Okama search failed for '{query}': {e}")
     
@@ -554,11 +663,24 @@ def remove_asset_mapping(variant: str) -> None:
     ASSET_MAPPINGS.pop(variant.lower(), None)
 
 # ----------------- Convenience functions -------------------------------------
-def load_default_index() -> MoexSearchIndex:
+def load_default_index(path: str = SEARCH_INDEX_PATH) -> MoexSearchIndex:
+    try:
+        return MoexSearchIndex.load(path)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+        _log_warning(f"Prebuilt search index {path} is not usable, rebuilding: {e}")
     idx = MoexSearchIndex()
     idx.build_from_embedded()
     return idx
 
+def get_default_index() -> MoexSearchIndex:
+    # Loaded once per process (call at startup to avoid paying for it on the first query)
+    global _moex_index_cache
+    if _moex_index_cache is None:
+        _moex_index_cache = load_default_index()
+    return _moex_index_cache
+
 def search_with_fuzzy(query: str, moex_index: Optional[MoexSearchIndex] = None) -> Dict[str, any]:
     """
     Perform unified search with direct mappings and fallback search.
@@ -0,0 +1,138 @@
+"""
+Simulation Cache Module
+Shared store of Monte Carlo forecast runs keyed by portfolio and simulation parameters.
+
+The Monte Carlo and the percentile forecast buttons used to run independent
+simulations for the same portfolio. A run only depends on the portfolio spec
+(symbols, weights, currency, data range), the distribution, the horizon, the
+number of paths and the seed, so it is simulated once and stored normalized
+(paths start at 1.0) as a compact float32 array. Every forecast chart and
+summary is derived from that single run; runs are evicted LRU within a
+memory budget.
+"""
+
+import os
+import sys
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from services.okama_cache import TTLLRUCache
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+SIMULATION_CACHE_MAX_BYTES = int(os.getenv("SIMULATION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def make_simulation_key(symbols: Iterable[str], weights: Optional[Iterable[float]], currency: Optional[str],
+                        first_date: Any, last_date: Any, distribution: str, years: float,
+                        n_paths: int, seed: Optional[int], extra: Any = None) -> Tuple:
+    """
+    Build cache key for a simulation run.
+
+    Args:
+        symbols: Portfolio symbols
+        weights: Portfolio weights
+        currency: Portfolio base currency
+        first_date: First date of the historical returns
+        last_date: Last date of the historical returns
+        distribution: Return distribution
+        years: Forecast horizon in years
+        n_paths: Number of paths
+        seed: Random generator seed
+        extra: Optional hashable value for other inputs (e.g. rebalancing)
+
+    Returns:
+        Hashable key
+    """
+    return (
+        tuple(str(s) for s in (symbols or [])),
+        tuple(round(float(w), 6) for w in weights) if weights is not None else None,
+        currency,
+        str(first_date)[:10],
+        str(last_date)[:10],
+        distribution,
+        float(years),
+        int(n_paths),
+        seed,
+        extra,
+    )
+
+
+class SimulationCache:
+    """
+    Thread-safe LRU store of SimulationResult objects with a memory-size budget.
+    """
+
+    def __init__(self, max_bytes: int = SIMULATION_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size budget for stored paths in bytes
+        """
+        # Runs do not expire; they are only evicted by the size budget
+        self._cache = TTLLRUCache(max_items=sys.maxsize, ttl=float('inf'), max_bytes=max_bytes,
+                                  sizeof=lambda value: value.nbytes)
+        self._lock = threading.Lock()
+        self.simulations = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._cache.max_bytes
+
+    def get(self, key: Hashable):
+        """Return stored simulation or None."""
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, value) -> bool:
+        """
+        Store simulation. Runs larger than the whole budget are not stored.
+
+        Returns:
+            True if the run was stored
+        """
+        return self._cache.set(key, value)
+
+    def _simulate(self, simulate: Callable[[], Any]):
+        value = simulate().normalized('float32')
+        with self._lock:
+            self.simulations += 1
+        return value
+
+    def get_or_create(self, key: Hashable, simulate: Callable[[], Any]):
+        """
+        Return stored simulation or run it (blocking, run it in the data pool).
+
+        Concurrent callers asking for the same key wait for a single run.
+        The run is stored normalized as float32.
+        """
+        return self._cache.get_or_create(key, lambda: self._simulate(simulate))
+
+    def clear(self) -> None:
+        """Drop all stored runs (useful for tests)."""
+        self._cache.clear()
+        with self._lock:
+            self.simulations = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        stats = self._cache.get_stats()
+        return {
+            'items': stats['size'],
+            'size_bytes': stats['size_bytes'],
+            'max_bytes': stats['max_bytes'],
+            'simulations': self.simulations,
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'evictions': stats['evictions'],
+            'hit_rate': stats['hit_rate'],
+        }
+
+
+# Global instance for use throughout the application
+simulation_cache = SimulationCache()
@@ -0,0 +1,358 @@
+"""
+Symbol Catalog Module
+Local copy of the okama namespace listings with background refresh.
+
+/list paging called ok.symbols_in_namespace on every page turn and on the
+"next page" check, downloading the whole namespace (tens of thousands of
+rows for US) to show 20 rows, then walked the page with iterrows(). The
+catalog keeps every namespace listing in memory as NumPy columns (symbol,
+name, currency, type, ISIN and the remaining okama columns) and refreshes
+it from a scheduled job once a day. Pages are array slices, and ticker
+prefix / ISIN lookups use sorted arrays (searchsorted), so
+resolve_symbol_or_isin can resolve plain tickers and ISINs without a
+network call.
+
+Namespaces requested before the first refresh are loaded on demand.
+Refresh failures keep the previous listing. Background refreshes go through
+their own circuit breaker, so a slow or failing bulk download does not open
+the okama breaker that protects user requests.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from services.circuit_breaker import (
+    OKAMA_BREAKER_FAILURES, OKAMA_BREAKER_RECOVERY, CircuitBreaker, okama_breaker
+)
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+# okama publishes new listings daily
+SYMBOL_CATALOG_REFRESH_INTERVAL = float(os.getenv("SYMBOL_CATALOG_REFRESH_INTERVAL", str(24 * 3600)))
+# Comma-separated namespaces to keep (empty - all ok.namespaces)
+SYMBOL_CATALOG_NAMESPACES = [
+    ns.strip().upper() for ns in os.getenv("SYMBOL_CATALOG_NAMESPACES", "").split(",") if ns.strip()
+]
+# Timeout for the background download of one namespace (seconds)
+SYMBOL_CATALOG_FETCH_TIMEOUT = float(os.getenv("SYMBOL_CATALOG_FETCH_TIMEOUT", "300"))
+
+# Columns every listing provides (empty strings if okama does not return them)
+CATALOG_FIELDS = ('symbol', 'name', 'currency', 'type', 'isin')
+
+# Breaker for scheduled catalog downloads, separate from the user-facing okama breaker
+catalog_breaker = CircuitBreaker('okama_catalog', OKAMA_BREAKER_FAILURES, OKAMA_BREAKER_RECOVERY)
+
+# Namespaces searched first by lookups (same priority as bot symbol selection)
+PRIORITY_NAMESPACES = ('US', 'MOEX', 'LSE', 'XETR', 'XFRA', 'XAMS')
+
+
+def _download_namespace(namespace: str) -> pd.DataFrame:
+    import okama as ok
+    return ok.symbols_in_namespace(namespace)
+
+
+def _download_namespaces() -> List[str]:
+    import okama as ok
+    return list(ok.namespaces)
+
+
+def _text(value: Any, default: str = '') -> str:
+    """String value of a listing cell (default for missing / NaN)."""
+    if value is None or (isinstance(value, float) and value != value):
+        return default
+    return str(value)
+
+
+class NamespaceListing:
+    """
+    Immutable columnar listing of one namespace.
+    """
+
+    def __init__(self, namespace: str, columns: Dict[str, np.ndarray], loaded_at: Optional[float] = None):
+        """
+        Args:
+            namespace: okama namespace (US, MOEX, ...)
+            columns: Column name -> object array, in okama column order
+            loaded_at: Download time (time.time())
+        """
+        self.namespace = namespace
+        self.columns = columns
+        self.loaded_at = loaded_at if loaded_at is not None else time.time()
+        self._source_columns = list(columns)
+        size = len(next(iter(columns.values()))) if columns else 0
+        for field in CATALOG_FIELDS:
+            if field not in self.columns:
+                self.columns[field] = np.full(size, '', dtype=object)
+        self._size = size
+
+        # Sorted keys for prefix / exact lookups
+        symbols = np.array([_text(s).upper() for s in self.columns['symbol']], dtype=str)
+        self._symbol_order = np.argsort(symbols, kind='stable')
+        self._sorted_symbols = symbols[self._symbol_order]
+        isins = np.array([_text(s).upper() for s in self.columns['isin']], dtype=str)
+        self._isin_order = np.argsort(isins, kind='stable')
+        self._sorted_isins = isins[self._isin_order]
+
+    @classmethod
+    def from_frame(cls, namespace: str, df: pd.DataFrame, loaded_at: Optional[float] = None) -> "NamespaceListing":
+        columns = {str(col): df[col].to_numpy(dtype=object) for col in df.columns}
+        return cls(namespace, columns, loaded_at)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def page(self, page: int, per_page: int = 20) -> List[Dict[str, str]]:
+        """Rows of one page (symbol / name are 'N/A' if missing)."""
+        start = max(0, page) * per_page
+        symbols = self.columns['symbol'][start:start + per_page]
+        names = self.columns['name'][start:start + per_page]
+        return [{'symbol': _text(symbol, 'N/A'), 'name': _text(name, 'N/A')} for symbol, name in zip(symbols, names)]
+
+    def row(self, position: int) -> Dict[str, str]:
+        """Catalog fields of one row."""
+        return {field: _text(self.columns[field][position]) for field in CATALOG_FIELDS}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Listing with the original okama columns (e.g. for Excel export)."""
+        return pd.DataFrame({col: self.columns[col] for col in self._source_columns})
+
+    def find_prefix(self, prefix: str, limit: Optional[int] = None) -> List[int]:
+        """Row positions of symbols starting with prefix (case-insensitive), in symbol order."""
+        prefix = prefix.upper()
+        lo = np.searchsorted(self._sorted_symbols, prefix, side='left')
+        hi = np.searchsorted(self._sorted_symbols, prefix + '\uffff', side='left')
+        positions = self._symbol_order[lo:hi]
+        return positions[:limit].tolist() if limit is not None else positions.tolist()
+
+    def find_isin(self, isin: str) -> Optional[int]:
+        """Row position of the first symbol with the ISIN."""
+        isin = isin.upper()
+        if not isin:
+            return None
+        lo = np.searchsorted(self._sorted_isins, isin, side='left')
+        if lo < len(self._sorted_isins) and self._sorted_isins[lo] == isin:
+            return int(self._isin_order[lo])
+        return None
+
+
+class SymbolCatalog:
+    """
+    Namespace listings of all okama namespaces.
+    """
+
+    def __init__(self, refresh_interval: float = SYMBOL_CATALOG_REFRESH_INTERVAL,
+                 namespaces: Optional[List[str]] = None,
+                 fetcher: Optional[Callable[[str], pd.DataFrame]] = None,
+                 namespaces_fetcher: Optional[Callable[[], List[str]]] = None,
+                 refresh_breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize the catalog.
+
+        Args:
+            refresh_interval: Interval between refreshes in seconds
+            namespaces: Namespaces to keep (None - all namespaces reported by okama)
+            fetcher: Callable(namespace) returning the okama listing DataFrame
+            namespaces_fetcher: Callable returning all okama namespaces
+            refresh_breaker: Breaker for refresh downloads (on-demand loads use okama_breaker)
+        """
+        self.refresh_interval = float(refresh_interval)
+        self.namespaces = list(namespaces) if namespaces else None
+        self.fetcher = fetcher or _download_namespace
+        self.namespaces_fetcher = namespaces_fetcher or _download_namespaces
+        self.refresh_breaker = refresh_breaker or catalog_breaker
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._listings: Dict[str, NamespaceListing] = {}
+        self._failed: Dict[str, str] = {}
+        self.refreshes = 0
+        self.last_refresh: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ========= Refresh =========
+
+    def _namespace_lock(self, namespace: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(namespace, threading.Lock())
+
+    def _load(self, namespace: str, breaker: CircuitBreaker) -> NamespaceListing:
+        listing = NamespaceListing.from_frame(namespace, breaker.call(self.fetcher, namespace))
+        with self._lock:
+            self._listings[namespace] = listing
+            self._failed.pop(namespace, None)
+        return listing
+
+    def list_namespaces(self) -> List[str]:
+        """Namespaces kept by the catalog: configured or all okama namespaces (blocking)."""
+        if self.namespaces:
+            return list(self.namespaces)
+        return [ns.upper() for ns in self.refresh_breaker.call(self.namespaces_fetcher)]
+
+    def refresh(self, namespaces: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, bool]:
+        """
+        Download namespace listings (blocking, run it in the data pool).
+
+        Namespaces are refreshed one by one under their own locks, so the
+        scheduled job can submit one namespace per data pool job. Listings
+        that fail to download keep their previous rows.
+
+        Args:
+            namespaces: Namespaces to refresh (None - list_namespaces())
+            force: Refresh even if the listing is younger than refresh_interval
+
+        Returns:
+            Dict namespace -> True if the listing is loaded
+        """
+        results = {}
+        if namespaces is None:
+            namespaces = self.list_namespaces()
+        for namespace in namespaces:
+            namespace = namespace.upper()
+            with self._namespace_lock(namespace):
+                listing = self.get_loaded(namespace, count=False)
+                if not force and listing is not None and time.time() - listing.loaded_at < self.refresh_interval:
+                    results[namespace] = True
+                    continue
+                try:
+                    self._load(namespace, self.refresh_breaker)
+                except Exception as e:
+                    logger.debug(f"Could not refresh namespace {namespace}: {e}")
+                    with self._lock:
+                        self._failed[namespace] = str(e)[:200]
+                        results[namespace] = namespace in self._listings
+                    continue
+                results[namespace] = True
+
+        with self._lock:
+            self.refreshes += 1
+            self.last_refresh = time.time()
+        return results
+
+    # ========= Public API =========
+
+    def get_loaded(self, namespace: str, count: bool = True) -> Optional[NamespaceListing]:
+        """Listing of a namespace if it is loaded (no network I/O)."""
+        with self._lock:
+            listing = self._listings.get(namespace.upper())
+            if count:
+                if listing is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            return listing
+
+    def get_namespace(self, namespace: str) -> NamespaceListing:
+        """
+        Listing of a namespace, downloaded on first use (blocking).
+
+        Raises:
+            Exception: okama errors for namespaces that are not loaded
+        """
+        listing = self.get_loaded(namespace)
+        if listing is not None:
+            return listing
+        return self.load_namespace(namespace)
+
+    def load_namespace(self, namespace: str) -> NamespaceListing:
+        """
+        Download a namespace listing unless it is already loaded (blocking).
+
+        Concurrent callers wait for a single download.
+        """
+        namespace = namespace.upper()
+        with self._namespace_lock(namespace):
+            listing = self.get_loaded(namespace, count=False)
+            if listing is not None:
+                return listing
+            return self._load(namespace, okama_breaker)
+
+    def _ordered(self, namespaces: Optional[Iterable[str]]) -> List[NamespaceListing]:
+        with self._lock:
+            listings = dict(self._listings)
+        order = [ns for ns in (namespaces or PRIORITY_NAMESPACES) if ns in listings]
+        order += [ns for ns in listings if ns not in order]
+        return [listings[ns] for ns in order]
+
+    def find_isin(self, isin: str, namespaces: Optional[Iterable[str]] = None) -> Optional[Dict[str, str]]:
+        """
+        Catalog row of an ISIN in loaded namespaces (no network I/O).
+
+        Args:
+            isin: ISIN code
+            namespaces: Namespaces searched first, in order (default PRIORITY_NAMESPACES)
+        """
+        for listing in self._ordered(namespaces):
+            position = listing.find_isin(isin)
+            if position is not None:
+                return listing.row(position)
+        return None
+
+    def find_prefix(self, prefix: str, limit: int = 20,
+                    namespaces: Optional[Iterable[str]] = None) -> List[Dict[str, str]]:
+        """Catalog rows of symbols starting with prefix in loaded namespaces (no network I/O)."""
+        rows = []
+        for listing in self._ordered(namespaces):
+            for position in listing.find_prefix(prefix, limit - len(rows)):
+                rows.append(listing.row(position))
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def find_ticker(self, ticker: str, namespaces: Optional[Iterable[str]] = None) -> Optional[Dict[str, str]]:
+        """
+        Catalog row of a plain ticker (e.g. AAPL -> AAPL.US) on an exchange namespace.
+
+        Only exact <ticker>.<namespace> symbols of the given namespaces are
+        matched, so e.g. EUR never resolves to EUR.INFL. While any of them is
+        not loaded yet the answer could come from a lower priority exchange,
+        so None is returned and the caller falls back to okama search.
+
+        Args:
+            ticker: Ticker without namespace
+            namespaces: Namespaces in priority order (default PRIORITY_NAMESPACES)
+        """
+        namespaces = [ns.upper() for ns in (namespaces or PRIORITY_NAMESPACES)]
+        with self._lock:
+            listings = [self._listings.get(ns) for ns in namespaces]
+        if any(listing is None for listing in listings):
+            return None
+        for namespace, listing in zip(namespaces, listings):
+            symbol = f"{ticker}.{namespace}".upper()
+            # The exact symbol sorts first among symbols with this prefix
+            positions = listing.find_prefix(symbol, limit=1)
+            if positions and _text(listing.columns['symbol'][positions[0]]).upper() == symbol:
+                return listing.row(positions[0])
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+            self._failed.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get catalog statistics."""
+        with self._lock:
+            return {
+                'namespaces': len(self._listings),
+                'symbols': sum(len(listing) for listing in self._listings.values()),
+                'failed': dict(self._failed),
+                'hits': self.hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'last_refresh': self.last_refresh,
+                'refresh_interval': self.refresh_interval,
+                'breaker': self.refresh_breaker.get_stats(),
+            }
+
+
+# Global instance for use throughout the application
+symbol_catalog = SymbolCatalog(namespaces=SYMBOL_CATALOG_NAMESPACES)
@@ -0,0 +1,113 @@
+"""
+Telegram File Cache Module
+Maps chart content hashes to Telegram file_id values.
+
+Once a PNG has been uploaded, Telegram returns a file_id that can be sent to
+any chat without uploading the bytes again. Popular charts (e.g. SPX.INDX 1Y)
+are then sent by file_id, which saves outbound bandwidth and send latency.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+TELEGRAM_FILE_CACHE_MAX_ITEMS = int(os.getenv("TELEGRAM_FILE_CACHE_MAX_ITEMS", "5000"))
+
+
+def content_hash(data: bytes) -> str:
+    """Return stable hash of file content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class TelegramFileIdCache:
+    """
+    Thread-safe LRU mapping from content hash to Telegram file_id.
+    """
+
+    def __init__(self, max_items: int = TELEGRAM_FILE_CACHE_MAX_ITEMS):
+        """
+        Initialize the cache.
+
+        Args:
+            max_items: Maximum number of remembered file_id values
+        """
+        self.max_items = max(1, int(max_items))
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uploads_saved_bytes = 0
+
+    def get(self, data: bytes) -> Optional[str]:
+        """Return file_id for previously uploaded content or None."""
+        if not data:
+            return None
+        key = content_hash(data)
+        with self._lock:
+            file_id = self._data.get(key)
+            if file_id is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            self.uploads_saved_bytes += len(data)
+            return file_id
+
+    def remember(self, data: bytes, message: Any) -> Optional[str]:
+        """
+        Store file_id of the photo in a sent Telegram message.
+
+        Args:
+            data: Uploaded content
+            message: telegram.Message returned by send_photo / edit_message_media
+
+        Returns:
+            Stored file_id or None if the message has no photo
+        """
+        photos = getattr(message, 'photo', None)
+        if not data or not photos:
+            return None
+        # The last PhotoSize is the original resolution
+        file_id = photos[-1].file_id
+        key = content_hash(data)
+        with self._lock:
+            self._data[key] = file_id
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+        return file_id
+
+    def forget(self, data: bytes) -> None:
+        """Drop file_id for content (e.g. when Telegram rejects it)."""
+        key = content_hash(data)
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Clear all entries (useful for tests)."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.uploads_saved_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'items': len(self._data),
+                'max_items': self.max_items,
+                'hits': self.hits,
+                'misses': self.misses,
+                'uploads_saved_bytes': self.uploads_saved_bytes,
+            }
+
+
+# Global instance for use throughout the application
+telegram_file_cache = TelegramFileIdCache()
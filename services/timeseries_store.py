@@ -0,0 +1,302 @@
+"""
+Time Series Store Module
+Persistent local store of okama price, dividend and inflation history.
+
+Every close_daily / close_monthly access on a fresh ok.Asset downloads the
+whole history, although usually only the last day has changed. The store
+keeps each (symbol, series) pair on disk as two NumPy arrays (period
+ordinals and float values) opened as memory maps, and on refresh downloads
+only the tail after the last stored date. Loaded series are also kept in an
+in-memory TTL/LRU cache, so hot tickers need almost no network I/O.
+
+Adjusted closes are rescaled back through the whole history after every
+dividend or split, so their tail is downloaded with an overlap of already
+stored periods; if the overlap no longer matches, the full history is
+downloaded again instead of splicing the new tail onto stale values.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from services.circuit_breaker import okama_breaker
+from services.okama_cache import TTLLRUCache, okama_cache
+
+logger = logging.getLogger(__name__)
+
+# ========= ENV Configuration =========
+TIMESERIES_DIR = os.getenv("OKAMA_TIMESERIES_DIR", "/var/data/timeseries")
+# How often the tail of a stored series is checked for new data (seconds)
+TIMESERIES_REFRESH_INTERVAL = float(os.getenv("TIMESERIES_REFRESH_INTERVAL", str(6 * 3600)))
+TIMESERIES_MEMORY_ITEMS = int(os.getenv("TIMESERIES_MEMORY_ITEMS", "512"))
+
+# Series kinds and their period frequency
+SERIES_FREQ = {
+    'close_daily': 'D',
+    'close_monthly': 'M',
+    'adj_close': 'M',
+    'dividends': 'D',
+    'inflation': 'M',
+}
+
+# Series whose history is rescaled after dividends / splits, and the number
+# of complete stored periods re-downloaded with the tail to detect it
+ADJUSTED_SERIES = frozenset({'adj_close'})
+ADJUSTED_OVERLAP_PERIODS = 3
+
+
+def _fetch_okama_series(symbol: str, kind: str, first_date: Optional[str] = None):
+    """
+    Download series from okama through the okama circuit breaker.
+
+    Args:
+        symbol: Asset (or inflation) symbol
+        kind: Series kind from SERIES_FREQ
+        first_date: Download only data starting from this date (None - full history)
+
+    Returns:
+        pandas Series
+    """
+    return okama_breaker.call(_download_okama_series, symbol, kind, first_date)
+
+
+def _download_okama_series(symbol: str, kind: str, first_date: Optional[str] = None):
+    import okama as ok
+
+    if first_date is not None:
+        try:
+            from okama.api.data_queries import QueryData
+            if kind == 'close_daily':
+                return QueryData.get_close(symbol, first_date=first_date, period='D')
+            if kind == 'close_monthly':
+                return QueryData.get_close(symbol, first_date=first_date, period='M')
+            if kind == 'adj_close':
+                return QueryData.get_adj_close(symbol, first_date=first_date, period='M')
+            if kind == 'dividends':
+                return QueryData.get_dividends(symbol, first_date=first_date)
+        except (ImportError, AttributeError, TypeError) as e:
+            # Older okama versions without date range queries
+            logger.debug(f"Tail query is not available for {symbol}:{kind}, downloading full history: {e}")
+
+    if kind == 'inflation':
+        return ok.Inflation(symbol).values_monthly
+    return getattr(okama_cache.asset(symbol), kind)
+
+
+def _safe_name(symbol: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+
+
+class TimeSeriesStore:
+    """
+    On-disk store of series with incremental tail refresh.
+    """
+
+    def __init__(self, base_dir: str = TIMESERIES_DIR,
+                 refresh_interval: float = TIMESERIES_REFRESH_INTERVAL,
+                 memory_items: int = TIMESERIES_MEMORY_ITEMS,
+                 fetcher: Callable = _fetch_okama_series):
+        """
+        Initialize the store.
+
+        Args:
+            base_dir: Directory with stored series
+            refresh_interval: Minimum interval between tail refreshes of a series in seconds
+            memory_items: Number of series kept in memory
+            fetcher: Callable(symbol, kind, first_date) downloading a series
+        """
+        self.base_dir = base_dir
+        self.refresh_interval = float(refresh_interval)
+        self.fetcher = fetcher
+        self._memory = TTLLRUCache(max_items=memory_items, ttl=self.refresh_interval)
+        self._lock = threading.Lock()
+        self.full_downloads = 0
+        self.tail_downloads = 0
+        self.stale_reads = 0
+        self._writable = True
+        try:
+            os.makedirs(self.base_dir, exist_ok=True)
+        except Exception as e:
+            logger.warning(f"Time series directory {self.base_dir} is not writable, using memory only: {e}")
+            self._writable = False
+
+    # ========= Disk layout =========
+
+    def _paths(self, symbol: str, kind: str) -> Dict[str, str]:
+        prefix = os.path.join(self.base_dir, _safe_name(symbol), kind)
+        return {
+            'index': f"{prefix}.index.npy",
+            'values': f"{prefix}.values.npy",
+            'meta': f"{prefix}.json",
+        }
+
+    def _load(self, symbol: str, kind: str):
+        """Load stored series as memory-mapped arrays. Returns (series, meta) or (None, None)."""
+        import numpy as np
+        import pandas as pd
+
+        paths = self._paths(symbol, kind)
+        if not os.path.exists(paths['meta']):
+            return None, None
+        try:
+            with open(paths['meta'], 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            ordinals = np.load(paths['index'], mmap_mode='r')
+            values = np.load(paths['values'], mmap_mode='r')
+            if len(ordinals) != len(values) or len(values) != meta.get('length'):
+                raise ValueError("index and values length mismatch")
+            index = pd.PeriodIndex.from_ordinals(np.asarray(ordinals), freq=meta['freq'])
+            series = pd.Series(values, index=index, name=meta.get('name'), copy=False)
+            return series, meta
+        except Exception as e:
+            logger.warning(f"Corrupted stored series {symbol}:{kind}, downloading again: {e}")
+            return None, None
+
+    def _save(self, symbol: str, kind: str, series, meta: Dict[str, Any]) -> None:
+        """Atomically write series arrays and metadata."""
+        if not self._writable:
+            return
+        import numpy as np
+
+        paths = self._paths(symbol, kind)
+        os.makedirs(os.path.dirname(paths['meta']), exist_ok=True)
+        meta = dict(meta, length=len(series))
+        try:
+            # Arrays first, metadata last: metadata marks a consistent snapshot
+            for key, array in (('index', series.index.asi8), ('values', series.to_numpy(dtype='float64'))):
+                tmp_path = paths[key] + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, np.ascontiguousarray(array))
+                os.replace(tmp_path, paths[key])
+            tmp_path = paths['meta'] + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, paths['meta'])
+        except Exception as e:
+            logger.warning(f"Could not store series {symbol}:{kind}: {e}")
+
+    # ========= Refresh =========
+
+    def _normalize(self, series, freq: str):
+        """Convert downloaded series to float PeriodIndex series with the given frequency."""
+        import pandas as pd
+
+        if series is None:
+            return pd.Series(dtype='float64', index=pd.PeriodIndex([], freq=freq))
+        index = series.index
+        if isinstance(index, pd.PeriodIndex):
+            if index.freqstr != pd.PeriodIndex([], freq=freq).freqstr:
+                index = index.asfreq(freq)
+        else:
+            index = pd.DatetimeIndex(index).to_period(freq)
+        result = pd.Series(series.to_numpy(dtype='float64'), index=index, name=series.name)
+        result = result[~result.index.duplicated(keep='last')]
+        return result.sort_index()
+
+    @staticmethod
+    def _overlap_matches(stored, tail) -> bool:
+        """Whether the tail repeats the complete stored periods it overlaps."""
+        import numpy as np
+
+        # The last stored period may have been incomplete
+        complete = stored.iloc[:-1]
+        common = complete.index.intersection(tail.index)
+        if len(common) == 0:
+            return False
+        return bool(np.allclose(complete.loc[common].to_numpy(), tail.loc[common].to_numpy(),
+                                rtol=1e-9, atol=0.0, equal_nan=True))
+
+    def _refresh(self, symbol: str, kind: str):
+        """Load stored series and download missing tail if it is due."""
+        import pandas as pd
+
+        freq = SERIES_FREQ[kind]
+        stored, meta = self._load(symbol, kind)
+
+        if stored is not None and time.time() - meta.get('checked_at', 0) < self.refresh_interval:
+            return stored
+
+        try:
+            series = None
+            if stored is not None and len(stored) > 0:
+                # Re-download the last stored period: it may have been incomplete
+                overlap = ADJUSTED_OVERLAP_PERIODS if kind in ADJUSTED_SERIES else 0
+                first_period = stored.index[max(0, len(stored) - 1 - overlap)]
+                first_date = first_period.start_time.strftime('%Y-%m-%d')
+                tail = self._normalize(self.fetcher(symbol, kind, first_date), freq)
+                with self._lock:
+                    self.tail_downloads += 1
+                if overlap and not self._overlap_matches(stored, tail):
+                    logger.info(f"Stored {symbol}:{kind} was rescaled, downloading full history")
+                elif len(tail) > 0:
+                    series = pd.concat([stored[stored.index < tail.index[0]], tail])
+                else:
+                    series = stored
+            if series is None:
+                series = self._normalize(self.fetcher(symbol, kind, None), freq)
+                with self._lock:
+                    self.full_downloads += 1
+        except Exception:
+            if stored is not None:
+                logger.warning(f"Could not refresh {symbol}:{kind}, using stored series", exc_info=True)
+                with self._lock:
+                    self.stale_reads += 1
+                return stored
+            raise
+
+        if series.name is None:
+            series.name = symbol
+        self._save(symbol, kind, series, {
+            'freq': freq,
+            'name': str(series.name),
+            'checked_at': time.time(),
+        })
+        return series
+
+    # ========= Public API =========
+
+    def get_series(self, symbol: str, kind: str):
+        """
+        Get series for symbol, downloading only what is missing locally.
+
+        Args:
+            symbol: Asset symbol (or inflation symbol for kind 'inflation')
+            kind: One of SERIES_FREQ keys
+
+        Returns:
+            pandas Series with PeriodIndex
+
+        Raises:
+            ValueError: If kind is not supported
+            Exception: If nothing is stored and the download fails
+        """
+        if kind not in SERIES_FREQ:
+            raise ValueError(f"Unsupported series kind: {kind}")
+        return self._memory.get_or_create((symbol, kind), lambda: self._refresh(symbol, kind))
+
+    def invalidate(self, symbol: str, kind: Optional[str] = None) -> None:
+        """Drop in-memory copies so the next access re-checks the tail."""
+        kinds = [kind] if kind else list(SERIES_FREQ)
+        for k in kinds:
+            self._memory.invalidate((symbol, k))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            stats = {
+                'base_dir': self.base_dir,
+                'writable': self._writable,
+                'full_downloads': self.full_downloads,
+                'tail_downloads': self.tail_downloads,
+                'stale_reads': self.stale_reads,
+            }
+        stats['memory'] = self._memory.get_stats()
+        return stats
+
+
+# Global instance for use throughout the application
+timeseries_store = TimeSeriesStore()
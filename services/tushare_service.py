@@ -3,8 +3,28 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
+import os
+import time
 import logging
+import threading
 from config import Config
+from services.instrumentation import CountedClient
+from services.search_cache import search_cache
+
+# ========= ENV Configuration =========
+# Listings change at most daily (new listings / delistings)
+TUSHARE_LISTING_REFRESH_INTERVAL = float(os.getenv("TUSHARE_LISTING_REFRESH_INTERVAL", str(24 * 3600)))
+
+LISTING_FIELDS = 'ts_code,symbol,name,enname,area,industry,list_date'
+# SSE, SZSE and BSE symbols come from one mainland listing
+LISTING_MARKETS = ('CN', 'HKEX')
+EXCHANGE_SUFFIXES = {'SSE': 'SH', 'SZSE': 'SZ', 'BSE': 'BJ', 'HKEX': 'HK'}
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Listing column as strings ('' for missing values)"""
+    return df[column].fillna('').astype(str)
+
 
 class TushareService:
     """Service class for Tushare API integration for Chinese stock exchanges"""
@@ -17,11 +37,17 @@ class TushareService:
         
         # Set API token
         ts.set_token(self.api_key)
-        self.pro = ts.pro_api()
+        self.pro = CountedClient(ts.pro_api(), 'tushare')
         
         # Initialize logger
         self.logger = logging.getLogger(__name__)
         
+        # Exchange listings: market -> (loaded_at, DataFrame), exchange -> (listing, display DataFrame)
+        self._listings: Dict[str, Tuple[float, pd.DataFrame]] = {}
+        self._exchange_frames: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+        self._listing_lock = threading.Lock()
+        self._listing_load_lock = threading.Lock()
+        
         # Exchange mappings
         self.exchange_mappings = {
             'SSE': ['.SH', '.SSE'],      # Shanghai Stock Exchange
@@ -38,6 +64,16 @@ class TushareService:
             'HKEX': r'^[0-9]{5}\.(HK|HKEX)$'     # 00001.HK, 00700.HK, 00001.HKEX
         }
     
+    def probe(self):
+        """
+        Health probe: small trading calendar request.
+        
+        Raises:
+            Exception: If Tushare API is unavailable
+        """
+        today = datetime.now().strftime('%Y%m%d')
+        self.pro.trade_cal(exchange='SSE', start_date=today, end_date=today)
+    
     def is_tushare_symbol(self, symbol: str) -> bool:
         """Check if symbol belongs to Chinese exchanges supported by Tushare"""
         import re
@@ -548,247 +584,191 @@ class TushareService:
             return pd.DataFrame()
     
     def search_symbols(self, query: str, exchange: str = None) -> List[Dict[str, Any]]:
-        """Search for symbols by name or code"""
+        """Search for symbols by name or code (cached per query, see services.search_cache)"""
         try:
-            results = []
-            
-            if exchange == 'HKEX':
-                # Search Hong Kong stocks
-                df = self.pro.hk_basic(
-                    fields='ts_code,symbol,name,area,industry,list_date'
-                )
-                if not query.isdigit():
-                    # Search by name
-                    df = df[df['name'].str.contains(query, case=False, na=False)]
-                else:
-                    # Search by symbol
-                    df = df[df['symbol'].str.contains(query, na=False)]
-                
-                for _, row in df.head(10).iterrows():
-                    results.append({
-                        'symbol': f"{row['symbol']}.HK",
-                        'name': row['name'],
-                        'exchange': 'HKEX',
-                        'industry': row.get('industry', ''),
-                        'list_date': row.get('list_date', '')
-                    })
-            else:
-                # Search mainland China stocks
-                df = self.pro.stock_basic(
-                    exchange='',
-                    list_status='L',
-                    fields='ts_code,symbol,name,area,industry,list_date'
-                )
-                
-                if not query.isdigit():
-                    # Search by name
-                    df = df[df['name'].str.contains(query, case=False, na=False)]
-                else:
-                    # Search by symbol
-                    df = df[df['symbol'].str.contains(query, na=False)]
-                
-                for _, row in df.head(10).iterrows():
-                    # Determine exchange from ts_code
-                    ts_code = row['ts_code']
-                    if ts_code.endswith('.SH'):
-                        exchange_suffix = 'SH'
-                    elif ts_code.endswith('.SZ'):
-                        exchange_suffix = 'SZ'
-                    elif ts_code.endswith('.BJ'):
-                        exchange_suffix = 'BJ'
-                    else:
-                        continue
-                    
-                    results.append({
-                        'symbol': f"{row['symbol']}.{exchange_suffix}",
-                        'name': row['name'],
-                        'exchange': exchange_suffix,
-                        'industry': row.get('industry', ''),
-                        'list_date': row.get('list_date', '')
-                    })
-            
-            return results
-            
+            return search_cache.get_or_search('tushare', query, lambda: self._search_symbols(query, exchange),
+                                              self._listing_market(exchange))
         except Exception as e:
             self.logger.error(f"Error searching symbols: {e}")
             return []
+
+    def _search_symbols(self, query: str, exchange: str = None) -> List[Dict[str, Any]]:
+        """Uncached search_symbols (raises on Tushare errors)"""
+        df = self._get_listing(self._listing_market(exchange))
+        if not query.isdigit():
+            # Search by name
+            df = df[_text_column(df, 'name').str.contains(query, case=False, regex=False)]
+        else:
+            # Search by symbol
+            df = df[_text_column(df, 'symbol').str.contains(query, regex=False)]
+        
+        df = df.head(10)
+        return self._search_results(df, exchange, df['name'])
     
     def search_symbols_english(self, query: str, exchange: str = None) -> List[Dict[str, Any]]:
-        """Search for symbols by English name or code"""
+        """Search for symbols by English name or code (cached per query, see services.search_cache)"""
         try:
-            results = []
-            
-            if exchange == 'HKEX':
-                # Search Hong Kong stocks with English names
-                try:
-                    df = self.pro.hk_basic(
-                        fields='ts_code,symbol,name,enname,area,industry,list_date'
-                    )
-                    
-                    if not query.isdigit():
-                        # Search by English name first, then by Chinese name if no English results
-                        english_results = df[df['enname'].str.contains(query, case=False, na=False)]
-                        if len(english_results) > 0:
-                            df = english_results
-                        else:
-                            # Fallback to Chinese name search
-                            df = df[df['name'].str.contains(query, case=False, na=False)]
-                    else:
-                        # Search by symbol
-                        df = df[df['symbol'].str.contains(query, na=False)]
-                    
-                    for _, row in df.head(15).iterrows():  # Increased limit
-                        # Use English name if available, otherwise Chinese name
-                        name = row.get('enname') if row.get('enname') and row.get('enname').strip() else row.get('name')
-                        if name:
-                            results.append({
-                                'symbol': f"{row['symbol']}.HK",
-                                'name': name,
-                                'exchange': 'HKEX',
-                                'industry': row.get('industry', ''),
-                                'list_date': row.get('list_date', '')
-                            })
-                except Exception as e:
-                    self.logger.warning(f"HKEX English search failed, falling back to basic search: {e}")
-                    # Fallback to basic search
-                    return self.search_symbols(query, exchange)
-                    
-            else:
-                # Search mainland China stocks with English names
-                try:
-                    df = self.pro.stock_basic(
-                        exchange='',
-                        list_status='L',
-                        fields='ts_code,symbol,name,enname,area,industry,list_date'
-                    )
-                    
-                    if not query.isdigit():
-                        # Search by English name first, then by Chinese name if no English results
-                        english_results = df[df['enname'].str.contains(query, case=False, na=False)]
-                        if len(english_results) > 0:
-                            df = english_results
-                        else:
-                            # Fallback to Chinese name search
-                            df = df[df['name'].str.contains(query, case=False, na=False)]
-                    else:
-                        # Search by symbol
-                        df = df[df['symbol'].str.contains(query, na=False)]
-                    
-                    for _, row in df.head(15).iterrows():  # Increased limit
-                        # Determine exchange from ts_code
-                        ts_code = row['ts_code']
-                        if ts_code.endswith('.SH'):
-                            exchange_suffix = 'SH'
-                        elif ts_code.endswith('.SZ'):
-                            exchange_suffix = 'SZ'
-                        elif ts_code.endswith('.BJ'):
-                            exchange_suffix = 'BJ'
-                        else:
-                            continue
-                        
-                        # Use English name if available, otherwise Chinese name
-                        name = row.get('enname') if row.get('enname') and row.get('enname').strip() else row.get('name')
-                        if name:
-                            results.append({
-                                'symbol': f"{row['symbol']}.{exchange_suffix}",
-                                'name': name,
-                                'exchange': exchange_suffix,
-                                'industry': row.get('industry', ''),
-                                'list_date': row.get('list_date', '')
-                            })
-                except Exception as e:
-                    self.logger.warning(f"Mainland China English search failed, falling back to basic search: {e}")
-                    # Fallback to basic search
-                    return self.search_symbols(query, exchange)
-            
-            return results
-            
+            return search_cache.get_or_search('tushare_en', query,
+                                              lambda: self._search_symbols_english(query, exchange),
+                                              self._listing_market(exchange))
         except Exception as e:
             self.logger.error(f"Error searching symbols with English names: {e}")
             return []
+
+    def _search_symbols_english(self, query: str, exchange: str = None) -> List[Dict[str, Any]]:
+        """Uncached search_symbols_english (raises on Tushare errors)"""
+        df = self._get_listing(self._listing_market(exchange))
+        if not query.isdigit():
+            # Search by English name first, then by Chinese name if no English results
+            english_results = df[_text_column(df, 'enname').str.contains(query, case=False, regex=False)]
+            if len(english_results) > 0:
+                df = english_results
+            else:
+                # Fallback to Chinese name search
+                df = df[_text_column(df, 'name').str.contains(query, case=False, regex=False)]
+        else:
+            # Search by symbol
+            df = df[_text_column(df, 'symbol').str.contains(query, regex=False)]
+        
+        df = df.head(15)
+        # Use English name if available, otherwise Chinese name
+        english_names = _text_column(df, 'enname')
+        names = english_names.where(english_names.str.strip() != '', df['name'])
+        return self._search_results(df, exchange, names)
     
-    def get_exchange_symbols(self, exchange: str) -> List[Dict[str, Any]]:
-        """Get all symbols for a specific exchange with detailed information"""
-        try:
-            symbols_data = []
-            
-            if exchange == 'HKEX':
-                # Get HKEX symbols with English names only
-                df = self.pro.hk_basic(fields='ts_code,name,enname,list_date')
-                for _, row in df.iterrows():
-                    # Use only English name, skip if not available
-                    english_name = row.get('enname')
-                    if not (english_name and english_name.strip()):
-                        continue
-                    name = english_name
-                    symbols_data.append({
-                        'symbol': row['ts_code'],  # Already includes .HK suffix
-                        'name': name,
-                        'currency': 'HKD',
-                        'list_date': row.get('list_date', 'N/A')
-                    })
-            elif exchange == 'SSE':
-                # Get SSE symbols with English names only
-                try:
-                    df = self.pro.stock_basic(exchange='SSE', list_status='L', fields='symbol,name,enname,list_date')
-                    for _, row in df.iterrows():
-                        # Use only English name, skip if not available
-                        english_name = row.get('enname')
-                        if not (english_name and english_name.strip()):
-                            continue
-                        name = english_name
-                        symbols_data.append({
-                            'symbol': f"{row['symbol']}.SH",
-                            'name': name,
-                            'currency': 'CNY',
-                            'list_date': row.get('list_date', 'N/A')
-                        })
-                except Exception as e:
-                    self.logger.warning(f"Could not get English names for SSE: {e}")
-                    # Skip SSE if English names are not available
-                    pass
-            elif exchange == 'SZSE':
-                # Get SZSE symbols with English names only
-                try:
-                    df = self.pro.stock_basic(exchange='SZSE', list_status='L', fields='symbol,name,enname,list_date')
-                    for _, row in df.iterrows():
-                        # Use only English name, skip if not available
-                        english_name = row.get('enname')
-                        if not (english_name and english_name.strip()):
-                            continue
-                        name = english_name
-                        symbols_data.append({
-                            'symbol': f"{row['symbol']}.SZ",
-                            'name': name,
-                            'currency': 'CNY',
-                            'list_date': row.get('list_date', 'N/A')
-                        })
-                except Exception as e:
-                    self.logger.warning(f"Could not get English names for SZSE: {e}")
-                    # Skip SZSE if English names are not available
-                    pass
-            elif exchange == 'BSE':
-                # Get BSE symbols with English names only
+    def _search_results(self, df: pd.DataFrame, exchange: str, names: pd.Series) -> List[Dict[str, Any]]:
+        """Search result dicts of listing rows (rows without a name or a known exchange suffix are skipped)"""
+        if exchange == 'HKEX':
+            suffixes = pd.Series('HK', index=df.index)
+            exchanges = pd.Series('HKEX', index=df.index)
+        else:
+            # Determine exchange from ts_code
+            suffixes = _text_column(df, 'ts_code').str.rsplit('.', n=1).str[-1]
+            exchanges = suffixes
+        keep = (suffixes.isin(['SH', 'SZ', 'BJ', 'HK']) & names.notna() & (names.astype(str) != '')).to_numpy()
+        symbols = (_text_column(df, 'symbol') + '.' + suffixes).to_numpy()[keep]
+        return [
+            {
+                'symbol': symbol,
+                'name': name,
+                'exchange': exchange_code,
+                'industry': industry,
+                'list_date': list_date
+            }
+            for symbol, name, exchange_code, industry, list_date in zip(
+                symbols, names.to_numpy()[keep], exchanges.to_numpy()[keep],
+                df['industry'].to_numpy()[keep], df['list_date'].to_numpy()[keep]
+            )
+        ]
+    
+    # ========= Exchange listings =========
+    
+    @staticmethod
+    def _listing_market(exchange: str = None) -> str:
+        """Listing that contains the exchange: SSE, SZSE and BSE share the mainland listing"""
+        return 'HKEX' if exchange == 'HKEX' else 'CN'
+    
+    def _download_listing(self, market: str) -> pd.DataFrame:
+        """Download the listed symbols of a market ('CN' or 'HKEX')"""
+        if market == 'HKEX':
+            df = self.pro.hk_basic(fields=LISTING_FIELDS)
+        else:
+            df = self.pro.stock_basic(exchange='', list_status='L', fields=LISTING_FIELDS)
+        df = df.reset_index(drop=True)
+        if 'symbol' not in df.columns:
+            df['symbol'] = df['ts_code'].str.split('.').str[0]
+        for column in ('name', 'enname', 'area', 'industry', 'list_date'):
+            if column not in df.columns:
+                df[column] = ''
+        return df
+    
+    def _get_listing(self, market: str) -> pd.DataFrame:
+        """Cached listing of a market, downloaded on first use (do not modify)"""
+        with self._listing_lock:
+            entry = self._listings.get(market)
+        if entry is not None:
+            return entry[1]
+        with self._listing_load_lock:
+            with self._listing_lock:
+                entry = self._listings.get(market)
+            if entry is not None:
+                return entry[1]
+            df = self._download_listing(market)
+            with self._listing_lock:
+                self._listings[market] = (time.time(), df)
+            return df
+    
+    def refresh_listings(self, force: bool = False) -> Dict[str, bool]:
+        """
+        Download exchange listings (blocking, run it in the data pool).
+        
+        Listings that fail to download keep their previous rows.
+        
+        Args:
+            force: Refresh even if the listing is younger than TUSHARE_LISTING_REFRESH_INTERVAL
+            
+        Returns:
+            Dict market ('CN', 'HKEX') -> True if the listing is loaded
+        """
+        results = {}
+        with self._listing_load_lock:
+            for market in LISTING_MARKETS:
+                with self._listing_lock:
+                    entry = self._listings.get(market)
+                if not force and entry is not None and time.time() - entry[0] < TUSHARE_LISTING_REFRESH_INTERVAL:
+                    results[market] = True
+                    continue
                 try:
-                    df = self.pro.stock_basic(exchange='BSE', list_status='L', fields='symbol,name,enname,list_date')
-                    for _, row in df.iterrows():
-                        # Use only English name, skip if not available
-                        english_name = row.get('enname')
-                        if not (english_name and english_name.strip()):
-                            continue
-                        name = english_name
-                        symbols_data.append({
-                            'symbol': f"{row['symbol']}.BJ",
-                            'name': name,
-                            'currency': 'CNY',
-                            'list_date': row.get('list_date', 'N/A')
-                        })
+                    df = self._download_listing(market)
                 except Exception as e:
-                    self.logger.warning(f"Could not get English names for BSE: {e}")
-                    # Skip BSE if English names are not available
-                    pass
+                    self.logger.warning(f"Could not refresh {market} listing: {e}")
+                    results[market] = entry is not None
+                    continue
+                with self._listing_lock:
+                    self._listings[market] = (time.time(), df)
+                results[market] = True
+        return results
+    
+    def get_exchange_listing(self, exchange: str) -> pd.DataFrame:
+        """
+        Listed symbols of an exchange that have English names.
+        
+        Built once per listing download with column operations (do not modify).
+        
+        Returns:
+            DataFrame with columns symbol, name, currency, list_date
+        """
+        try:
+            market = self._listing_market(exchange)
+            listing = self._get_listing(market) if exchange in EXCHANGE_SUFFIXES else None
+            with self._listing_lock:
+                cached = self._exchange_frames.get(exchange)
+            if cached is not None and cached[0] is listing:
+                return cached[1]
+            
+            if listing is None:
+                return pd.DataFrame(columns=['symbol', 'name', 'currency', 'list_date'])
             
-            return symbols_data[:100]  # Limit to first 100 symbols for display
+            suffix = EXCHANGE_SUFFIXES[exchange]
+            if exchange == 'HKEX':
+                df = listing
+                symbols = df['ts_code']  # Already includes .HK suffix
+            else:
+                df = listing[listing['ts_code'].str.endswith(f".{suffix}", na=False)]
+                symbols = df['symbol'].astype(str) + f".{suffix}"
+            
+            # Use only English names, skip symbols without them
+            english_names = df['enname'].where(df['enname'].notna(), '').astype(str)
+            has_english = (english_names.str.strip() != '').to_numpy()
+            frame = pd.DataFrame({
+                'symbol': symbols.to_numpy()[has_english],
+                'name': english_names.to_numpy()[has_english],
+                'currency': 'HKD' if exchange == 'HKEX' else 'CNY',
+                'list_date': df['list_date'].to_numpy()[has_english],
+            })
+            with self._listing_lock:
+                self._exchange_frames[exchange] = (listing, frame)
+            return frame
             
         except Exception as e:
             error_msg = str(e)
@@ -800,117 +780,23 @@ class TushareService:
                 self.logger.error(f"Error getting symbols for exchange {exchange}: {e}")
                 raise Exception(f"Ошибка получения символов для биржи {exchange}: {error_msg}")
     
+    def get_exchange_symbols(self, exchange: str) -> List[Dict[str, Any]]:
+        """Get symbols for a specific exchange with detailed information (first 100 for display)"""
+        return self.get_exchange_listing(exchange).head(100).to_dict('records')
+    
+    def get_exchange_symbols_page(self, exchange: str, page: int, per_page: int = 20) -> List[Dict[str, Any]]:
+        """Get one page of symbols for a specific exchange"""
+        start = max(0, page) * per_page
+        return self.get_exchange_listing(exchange).iloc[start:start + per_page].to_dict('records')
+    
     def get_exchange_symbols_count(self, exchange: str) -> int:
         """Get total count of symbols for a specific exchange"""
         try:
-            if exchange == 'HKEX':
-                df = self.pro.hk_basic(fields='symbol')
-                return len(df)
-            elif exchange == 'SSE':
-                df = self.pro.stock_basic(exchange='SSE', list_status='L', fields='symbol')
-                return len(df)
-            elif exchange == 'SZSE':
-                df = self.pro.stock_basic(exchange='SZSE', list_status='L', fields='symbol')
-                return len(df)
-            elif exchange == 'BSE':
-                df = self.pro.stock_basic(exchange='BSE', list_status='L', fields='symbol')
-                return len(df)
-            
-            return 0
-            
+            return len(self.get_exchange_listing(exchange))
         except Exception as e:
             self.logger.error(f"Error getting symbol count for exchange {exchange}: {e}")
             return 0
     
     def get_exchange_symbols_full(self, exchange: str) -> List[Dict[str, Any]]:
         """Get ALL symbols for a specific exchange (no limit) for Excel export"""
-        try:
-            symbols_data = []
-            
-            if exchange == 'HKEX':
-                # Get HKEX symbols with English names only
-                df = self.pro.hk_basic(fields='ts_code,name,enname,list_date')
-                for _, row in df.iterrows():
-                    # Use only English name, skip if not available
-                    english_name = row.get('enname')
-                    if not (english_name and english_name.strip()):
-                        continue
-                    name = english_name
-                    symbols_data.append({
-                        'symbol': row['ts_code'],  # Already includes .HK suffix
-                        'name': name,
-                        'currency': 'HKD',
-                        'list_date': row.get('list_date', 'N/A')
-                    })
-            elif exchange == 'SSE':
-                # Get SSE symbols with English names only
-                try:
-                    df = self.pro.stock_basic(exchange='SSE', list_status='L', fields='symbol,name,enname,list_date')
-                    for _, row in df.iterrows():
-                        # Use only English name, skip if not available
-                        english_name = row.get('enname')
-                        if not (english_name and english_name.strip()):
-                            continue
-                        name = english_name
-                        symbols_data.append({
-                            'symbol': f"{row['symbol']}.SH",
-                            'name': name,
-                            'currency': 'CNY',
-                            'list_date': row.get('list_date', 'N/A')
-                        })
-                except Exception as e:
-                    self.logger.warning(f"Could not get English names for SSE: {e}")
-                    # Skip SSE if English names are not available
-                    pass
-            elif exchange == 'SZSE':
-                # Get SZSE symbols with English names only
-                try:
-                    df = self.pro.stock_basic(exchange='SZSE', list_status='L', fields='symbol,name,enname,list_date')
-                    for _, row in df.iterrows():
-                        # Use only English name, skip if not available
-                        english_name = row.get('enname')
-                        if not (english_name and english_name.strip()):
-                            continue
-                        name = english_name
-                        symbols_data.append({
-                            'symbol': f"{row['symbol']}.SZ",
-                            'name': name,
-                            'currency': 'CNY',
-                            'list_date': row.get('list_date', 'N/A')
-                        })
-                except Exception as e:
-                    self.logger.warning(f"Could not get English names for SZSE: {e}")
-                    # Skip SZSE if English names are not available
-                    pass
-            elif exchange == 'BSE':
-                # Get BSE symbols with English names only
-                try:
-                    df = self.pro.stock_basic(exchange='BSE', list_status='L', fields='symbol,name,enname,list_date')
-                    for _, row in df.iterrows():
-                        # Use only English name, skip if not available
-                        english_name = row.get('enname')
-                        if not (english_name and english_name.strip()):
-                            continue
-                        name = english_name
-                        symbols_data.append({
-                            'symbol': f"{row['symbol']}.BJ",
-                            'name': name,
-                            'currency': 'CNY',
-                            'list_date': row.get('list_date', 'N/A')
-                        })
-                except Exception as e:
-                    self.logger.warning(f"Could not get English names for BSE: {e}")
-                    # Skip BSE if English names are not available
-                    pass
-            
-            return symbols_data  # No limit for Excel export
-            
-        except Exception as e:
-            error_msg = str(e)
-            # Handle specific API permission errors
-            if "权限" in error_msg or "permission" in error_msg.lower():
-                self.logger.error(f"API permission error for exchange {exchange}: {e}")
-                raise Exception("API权限不足. Пожалуйста, проверьте ваш Tushare API ключ и убедитесь, что у вас есть доступ к данным.")
-            else:
-                self.logger.error(f"Error getting symbols for exchange {exchange}: {e}")
-                raise Exception(f"Ошибка получения символов для биржи {exchange}: {error_msg}")
+        return self.get_exchange_listing(exchange).to_dict('records')
@@ -3,6 +3,7 @@ import json
 import re
 from typing import Dict, List, Optional
 from config import Config
+from services.http_client import get_sync_session, http_client
 
 class YandexGPTService:
     """
@@ -466,6 +467,20 @@ Format responses professionally with clear sections, bullet points, and relevant
         """Check if YandexGPT service is available"""
         return bool(self.api_key and self.folder_id)
 
+    async def probe(self):
+        """Health probe: reach the completion endpoint without running a (billed) completion"""
+        if not self.is_available():
+            raise RuntimeError("YandexGPT is not configured")
+        response = await http_client.get(
+            self.base_url,
+            headers={"Authorization": f"Api-Key {self.api_key}"},
+            timeout=10,
+            retries=0
+        )
+        # GET on the completion endpoint is rejected by method, but proves the API and key work
+        if response.status_code >= 500 or response.status_code in (401, 403):
+            raise RuntimeError(f"YandexGPT API returned status {response.status_code}")
+
     def ask_question_with_vision(self, question: str, image_bytes: bytes, image_description: str = "") -> str:
         """Ask a question to YandexGPT with image analysis capability"""
         print(f"🔍 YandexGPTService.ask_question_with_vision called with question: {question[:100]}...")
@@ -665,9 +680,8 @@ Format responses professionally with clear sections, bullet points, and relevant
                     ("Alternative format", self._create_alternative_request(model_name, system_prompt, user_prompt, temperature, max_tokens))
                 ]:
                     try:
-                        # Создаем сессию без прокси
-                        session = requests.Session()
-                        session.trust_env = False  # Игнорируем переменные окружения прокси
+                        # Общая сессия с пулом соединений (без прокси)
+                        session = get_sync_session()
                         
                         response = session.post(
                             self.base_url,
@@ -789,9 +803,8 @@ Format responses professionally with clear sections, bullet points, and relevant
             # Try vision endpoint
             vision_url = "https://llm.api.cloud.yandex.net/foundationModels/v1/completion"
             
-            # Создаем сессию без прокси
-            session = requests.Session()
-            session.trust_env = False  # Игнорируем переменные окружения прокси
+            # Общая сессия с пулом соединений (без прокси)
+            session = get_sync_session()
             
             response = session.post(
                 vision_url,
@@ -842,9 +855,8 @@ Format responses professionally with clear sections, bullet points, and relevant
                 }
             }
             
-            # Создаем сессию без прокси
-            session = requests.Session()
-            session.trust_env = False  # Игнорируем переменные окружения прокси
+            # Общая сессия с пулом соединений (без прокси)
+            session = get_sync_session()
             
             response = session.post(
                 "https://llm.api.cloud.yandex.net/foundationModels/v1/completion",
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки отрисовки графиков ChartStyles (построение и кодирование PNG)
+"""
+
+import numpy as np
+import pytest
+
+from services.chart_render_pool import ChartSpec, render_spec
+from services.monte_carlo import DEFAULT_PERCENTILES, simulate_wealth
+
+SYMBOLS = ['SPY.US', 'AGG.US', 'GLD.US', 'QQQ.US']
+
+
+@pytest.fixture(scope='module')
+def asset_list(replay_modules):
+    return replay_modules.AssetList(SYMBOLS, ccy='USD')
+
+
+def render(method, *args, **kwargs):
+    return render_spec(ChartSpec(method, args, kwargs))
+
+
+def test_unified_wealth_chart(asset_list, measure):
+    """График накопленной доходности /compare"""
+    png = measure(render, 'create_unified_wealth_chart', asset_list.wealth_indexes, SYMBOLS, 'USD')
+    assert png
+
+
+def test_drawdowns_chart(asset_list, measure):
+    """График просадок"""
+    png = measure(render, 'create_drawdowns_chart', asset_list.drawdowns, SYMBOLS, 'USD')
+    assert png
+
+
+def test_correlation_matrix_chart(asset_list, measure):
+    """Корреляционная матрица"""
+    png = measure(render, 'create_correlation_matrix_chart', asset_list.assets_ror.corr())
+    assert png
+
+
+def test_monte_carlo_forecast_chart(asset_list, measure):
+    """Прогноз Монте-Карло с процентилями"""
+    returns = asset_list.assets_ror.mean(axis=1)
+    history = 1000 * (1 + returns).cumprod()
+    simulation = simulate_wealth(returns, years=10, today_value=float(history.iloc[-1]))
+    png = measure(render, 'create_monte_carlo_forecast_chart', history, simulation.sample_paths(),
+                  simulation.bands(DEFAULT_PERCENTILES), SYMBOLS, 'USD', n_paths=simulation.n_paths, years=10)
+    assert png
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки выгрузки метрик в Excel
+"""
+
+SYMBOLS = ['SPY.US', 'AGG.US', 'GLD.US', 'QQQ.US']
+
+
+def test_metrics_excel_export(bot, okama_cache, measure):
+    """Подготовка метрик сравнения и создание Excel файла"""
+    def export():
+        metrics_data = bot._prepare_comprehensive_metrics(SYMBOLS, 'USD', SYMBOLS, [], None)
+        return bot._create_metrics_excel(metrics_data, SYMBOLS, 'USD')
+
+    buffer = measure(export)
+    assert buffer.getbuffer().nbytes > 0
+
+
+def test_portfolio_metrics_excel_export(bot, okama_cache, measure):
+    """Подготовка метрик портфеля и создание Excel файла"""
+    symbols = ['SBER.MOEX', 'GAZP.MOEX', 'LKOH.MOEX']
+    portfolio = okama_cache.portfolio(symbols, weights=[0.4, 0.3, 0.3], ccy='RUB')
+
+    def export():
+        metrics_data = bot._prepare_portfolio_metrics_data(portfolio, symbols, 'RUB')
+        return bot._create_portfolio_metrics_excel(metrics_data, symbols, 'RUB')
+
+    buffer = measure(export)
+    assert buffer.getbuffer().nbytes > 0
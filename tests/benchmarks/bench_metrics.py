@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки таблиц метрик и создания портфеля на записанных данных okama
+"""
+
+SYMBOLS = ['SPY.US', 'AGG.US', 'GLD.US', 'QQQ.US']
+
+
+def test_create_summary_metrics_table(bot, okama_cache, measure):
+    """Таблица метрик /compare (AssetList.describe + коэффициенты)"""
+    table = measure(bot._create_summary_metrics_table, SYMBOLS, 'USD', SYMBOLS, [])
+    assert 'SPY.US' in table
+
+
+def test_create_summary_metrics_table_cold(bot, okama_cache, measure):
+    """Таблица метрик с пустым кэшем объектов okama"""
+    table = measure(bot._create_summary_metrics_table, SYMBOLS, 'USD', SYMBOLS, [], setup=okama_cache.clear)
+    assert 'SPY.US' in table
+
+
+def test_create_portfolio_with_period(bot, okama_cache, measure):
+    """Создание портфеля с периодом из контекста пользователя"""
+    portfolio = measure(bot._create_portfolio_with_period, ['SBER.MOEX', 'GAZP.MOEX', 'LKOH.MOEX'],
+                        [0.4, 0.3, 0.3], 'RUB', {'current_period': '5Y'}, setup=okama_cache.clear)
+    assert portfolio.symbols == ['SBER.MOEX', 'GAZP.MOEX', 'LKOH.MOEX']
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки нечеткого поиска по встроенному индексу MOEX
+"""
+
+import pytest
+
+from services.search_embedded import SEARCH_INDEX_PATH, MoexSearchIndex
+
+QUERIES = ['сбербанк', 'gazprom', 'лукойл', 'yandex', 'норильский никель', 'tatneft pref', 'xyzzy']
+
+
+@pytest.fixture(scope='module')
+def moex_index():
+    index = MoexSearchIndex()
+    index.build_from_embedded()
+    return index
+
+
+def test_build_index(measure):
+    """Построение индекса из встроенного списка"""
+    def build():
+        index = MoexSearchIndex()
+        index.build_from_embedded()
+        return index
+
+    index = measure(build)
+    assert index.assets
+
+
+def test_load_prebuilt_index(measure):
+    """Загрузка сериализованного индекса"""
+    index = measure(MoexSearchIndex.load, SEARCH_INDEX_PATH)
+    assert index.assets
+
+
+def test_moex_search(moex_index, measure):
+    """Нечеткий поиск по набору типичных запросов"""
+    def search_all():
+        return [moex_index.search(query) for query in QUERIES]
+
+    results = measure(search_all)
+    assert results[0]
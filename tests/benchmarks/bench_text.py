@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки разбора ввода и форматирования текста
+"""
+
+PORTFOLIO_INPUTS = [
+    "SBER.MOEX:0.3, GAZP.MOEX:0.7",
+    "SBER.MOEX, GAZP.MOEX, LKOH.MOEX",
+    "SBER.MOEX:0.3, GAZP.MOEX, LKOH.MOEX:0.2",
+    "spy.us 0,5 agg.us 0,3 gld.us 0,2",
+    "SPY.US:60% QQQ.US:40%",
+]
+
+
+def test_smart_parse_portfolio_input(bot, measure):
+    """Разбор вариантов ввода портфеля"""
+    def parse_all():
+        return [bot.smart_parse_portfolio_input(text) for text in PORTFOLIO_INPUTS]
+
+    results = measure(parse_all)
+    assert results[0]['success']
+
+
+def test_split_text_smart(bot, measure):
+    """Разбиение длинного ответа на сообщения Telegram"""
+    paragraph = "**Анализ портфеля**\n" + "• Доходность и риск активов за весь период данных.\n" * 40
+    text = "\n\n".join([paragraph] * 30)
+
+    parts = measure(bot._split_text_smart, text)
+    assert len(parts) > 1
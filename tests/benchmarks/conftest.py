@@ -0,0 +1,140 @@
+"""
+Benchmark suite configuration.
+
+Run separately from the behavior tests (okama/tushare are replaced with the
+offline replay for the whole session):
+
+    python -m pytest tests/benchmarks
+    python -m pytest tests/benchmarks --benchmark-autosave
+    python -m pytest tests/benchmarks --benchmark-compare
+
+Timing comes from pytest-benchmark; every benchmark also records peak and
+retained memory (tracemalloc) of a single call in extra_info, which is
+saved with --benchmark-autosave/--benchmark-json and printed at the end.
+"""
+
+import sys
+import os
+import gc
+import logging
+import tracemalloc
+from typing import Any, Callable, Dict
+
+import pytest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.benchmarks import replay
+
+_memory_report: Dict[str, Dict[str, int]] = {}
+
+
+def measure_memory(func: Callable, *args, **kwargs) -> Dict[str, int]:
+    """
+    Peak and retained memory of one call.
+
+    Returns:
+        Dict with peak_bytes (highest traced memory during the call),
+        net_bytes and net_blocks (allocations still alive after the call)
+    """
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.clear_traces()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        diff = [stat for stat in after.compare_to(before, 'filename') if stat.size_diff > 0]
+        del result
+        return {
+            'peak_bytes': max(0, peak - base),
+            'net_bytes': sum(stat.size_diff for stat in diff),
+            'net_blocks': sum(max(0, stat.count_diff) for stat in diff),
+        }
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+@pytest.fixture(scope='session')
+def replay_modules():
+    """Install offline okama / tushare replay modules for the session."""
+    for name, build in (('okama', replay.build_okama_module), ('tushare', replay.build_tushare_module)):
+        module = sys.modules.get(name)
+        if module is None:
+            sys.modules[name] = build()
+        elif not getattr(module, '__replay__', False):
+            pytest.skip(f"{name} is already imported from the network client; run benchmarks in a separate session")
+    if not replay.available_symbols():
+        pytest.skip("No recorded fixtures: run tests/benchmarks/record_fixtures.py")
+
+    from services.okama_cache import okama_cache
+    okama_cache.clear()
+    return sys.modules['okama']
+
+
+@pytest.fixture(scope='session')
+def bot(replay_modules):
+    """ShansAi instance for calling hot-path methods (no Telegram, DB or AI services)."""
+    pytest.importorskip('telegram')
+    os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'benchmark_token')
+    import bot as bot_module
+
+    instance = bot_module.ShansAi.__new__(bot_module.ShansAi)
+    instance.logger = logging.getLogger('benchmarks')
+    instance.logger.setLevel(logging.CRITICAL)
+    instance.chart_styles = bot_module.chart_styles
+    instance.user_sessions = {}
+    return instance
+
+
+@pytest.fixture
+def okama_cache(replay_modules):
+    """Global okama object cache (clear it for cold runs)."""
+    from services.okama_cache import okama_cache
+    return okama_cache
+
+
+@pytest.fixture
+def measure(benchmark):
+    """
+    Benchmark a callable: pytest-benchmark timing plus memory of one call.
+
+    Usage:
+        measure(func, *args, **kwargs)
+        measure(func, *args, setup=cache.clear, rounds=20)  # cold runs
+    """
+    def run(func: Callable, *args, setup: Callable = None, rounds: int = None, **kwargs) -> Any:
+        if setup is None and rounds is None:
+            result = benchmark(func, *args, **kwargs)
+        else:
+            result = benchmark.pedantic(func, args=args, kwargs=kwargs, setup=setup, rounds=rounds or 20,
+                                        iterations=1, warmup_rounds=0 if setup else 1)
+
+        # Measured after timing, so one-off import and font caches are not counted
+        if setup is not None:
+            setup()
+        memory = measure_memory(func, *args, **kwargs)
+        benchmark.extra_info.update(memory)
+        _memory_report[benchmark.name] = memory
+        return result
+    return run
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _memory_report:
+        return
+    terminalreporter.section("memory per call")
+    width = max(len(name) for name in _memory_report)
+    terminalreporter.write_line(f"{'Name':<{width}}  {'Peak, KiB':>10}  {'Net, KiB':>10}  {'Net blocks':>10}")
+    for name, memory in sorted(_memory_report.items()):
+        terminalreporter.write_line(
+            f"{name:<{width}}  {memory['peak_bytes'] / 1024:>10.1f}  "
+            f"{memory['net_bytes'] / 1024:>10.1f}  {memory['net_blocks']:>10}"
+        )
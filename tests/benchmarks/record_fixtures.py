@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Запись фикстур okama для бенчмарков
+
+Использование:
+    python tests/benchmarks/record_fixtures.py                 # записать ответы okama (нужна сеть)
+    python tests/benchmarks/record_fixtures.py --synthetic     # детерминированные данные без сети
+    python tests/benchmarks/record_fixtures.py SPY.US AGG.US   # только указанные символы
+"""
+
+import sys
+import os
+import json
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tests.benchmarks.replay import OKAMA_FIXTURES_DIR, fixture_path
+
+DEFAULT_SYMBOLS = ['SPY.US', 'AGG.US', 'GLD.US', 'QQQ.US', 'SBER.MOEX', 'GAZP.MOEX', 'LKOH.MOEX']
+
+# Годовые доходность и волатильность для синтетических рядов
+SYNTHETIC_PROFILES = {
+    'SPY.US': ('SPDR S&P 500 ETF Trust', 'USD', 0.10, 0.15),
+    'AGG.US': ('iShares Core U.S. Aggregate Bond ETF', 'USD', 0.03, 0.04),
+    'GLD.US': ('SPDR Gold Shares', 'USD', 0.06, 0.16),
+    'QQQ.US': ('Invesco QQQ Trust', 'USD', 0.14, 0.21),
+    'SBER.MOEX': ('Sberbank Rossii PAO', 'RUB', 0.12, 0.35),
+    'GAZP.MOEX': ('Gazprom PAO', 'RUB', 0.02, 0.30),
+    'LKOH.MOEX': ('Lukoil PAO', 'RUB', 0.15, 0.28),
+}
+
+
+def _serialize(symbol: str, close_monthly: pd.Series, meta: dict, source: str) -> dict:
+    return dict(meta, symbol=symbol, source=source, recorded_at=datetime.now().isoformat(timespec='seconds'),
+                close_monthly={str(period): round(float(value), 6) for period, value in close_monthly.items()})
+
+
+def record_okama(symbol: str) -> dict:
+    """Записать ответ okama для символа."""
+    import okama as ok
+
+    asset = ok.Asset(symbol)
+    meta = {
+        'name': asset.name,
+        'currency': asset.currency,
+        'country': getattr(asset, 'country', None),
+        'exchange': getattr(asset, 'exchange', None),
+        'type': getattr(asset, 'asset_type', None),
+        'isin': getattr(asset, 'isin', None),
+    }
+    return _serialize(symbol, asset.close_monthly, meta, 'okama')
+
+
+def synthesize(symbol: str, months: int = 240, seed: int = 0) -> dict:
+    """Сгенерировать детерминированный ряд цен (для работы без сети)."""
+    name, currency, annual_return, annual_risk = SYNTHETIC_PROFILES.get(symbol, (symbol, 'USD', 0.07, 0.18))
+    rng = np.random.default_rng(seed + sum(map(ord, symbol)))
+    returns = rng.normal(annual_return / 12, annual_risk / np.sqrt(12), months)
+    prices = 100.0 * np.cumprod(1.0 + returns)
+    index = pd.period_range(end='2024-12', periods=months, freq='M')
+    meta = {'name': name, 'currency': currency, 'exchange': symbol.split('.')[-1], 'type': None, 'isin': None}
+    return _serialize(symbol, pd.Series(prices, index=index), meta, 'synthetic')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Запись фикстур okama для бенчмарков")
+    parser.add_argument('symbols', nargs='*', default=DEFAULT_SYMBOLS)
+    parser.add_argument('--synthetic', action='store_true', help="Сгенерировать данные без обращения к okama")
+    args = parser.parse_args()
+
+    os.makedirs(OKAMA_FIXTURES_DIR, exist_ok=True)
+    for symbol in args.symbols:
+        data = synthesize(symbol) if args.synthetic else record_okama(symbol)
+        with open(fixture_path(symbol), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        print(f"✅ {symbol}: {len(data['close_monthly'])} месяцев ({data['source']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Offline replay of recorded okama / tushare responses for benchmarks.
+
+Provides drop-in `okama` and `tushare` modules backed by JSON fixtures in
+fixtures/ (written by record_fixtures.py), so bot hot paths can be timed
+without network access and with identical inputs on every run.
+
+Only the parts of the okama API used by the benchmarked paths are replayed:
+Asset, AssetList, Portfolio and Rebalance with monthly prices, returns,
+wealth indexes and a describe() table in okama's layout.
+"""
+
+import os
+import json
+import types
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+OKAMA_FIXTURES_DIR = os.path.join(FIXTURES_DIR, 'okama')
+TUSHARE_FIXTURES_DIR = os.path.join(FIXTURES_DIR, 'tushare')
+
+# Initial investment used by okama wealth indexes
+INITIAL_AMOUNT = 1000.0
+
+
+def fixture_path(symbol: str) -> str:
+    return os.path.join(OKAMA_FIXTURES_DIR, f"{symbol}.json")
+
+
+def available_symbols() -> List[str]:
+    """Symbols with recorded okama fixtures."""
+    if not os.path.isdir(OKAMA_FIXTURES_DIR):
+        return []
+    return sorted(name[:-5] for name in os.listdir(OKAMA_FIXTURES_DIR) if name.endswith('.json'))
+
+
+@lru_cache(maxsize=None)
+def load_asset(symbol: str) -> Dict[str, Any]:
+    """Recorded asset data (metadata and monthly close prices)."""
+    path = fixture_path(symbol)
+    if not os.path.exists(path):
+        raise ValueError(f"{symbol} is not found in the recorded fixtures")
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    close = data['close_monthly']
+    data['close_monthly'] = pd.Series(
+        list(close.values()), index=pd.PeriodIndex(list(close.keys()), freq='M'), name=symbol, dtype='float64'
+    )
+    return data
+
+
+def _slice(frame, first_date: Optional[str], last_date: Optional[str]):
+    if first_date:
+        frame = frame[frame.index >= pd.Period(str(first_date)[:7], freq='M')]
+    if last_date:
+        frame = frame[frame.index <= pd.Period(str(last_date)[:7], freq='M')]
+    return frame
+
+
+def _cagr(returns: pd.Series) -> float:
+    returns = returns.dropna()
+    if returns.empty:
+        return np.nan
+    return float(np.prod(1.0 + returns.values) ** (12.0 / len(returns)) - 1.0)
+
+
+def _max_drawdown(returns: pd.Series) -> float:
+    wealth = np.cumprod(1.0 + returns.dropna().values)
+    if wealth.size == 0:
+        return np.nan
+    return float((wealth / np.maximum.accumulate(wealth) - 1.0).min())
+
+
+def _describe(returns: pd.DataFrame) -> pd.DataFrame:
+    """describe() table in okama layout: property, period and one column per symbol."""
+    rows = []
+    ytd = returns[returns.index.year == returns.index[-1].year]
+    rows.append(('Compound return', 'YTD', {c: float(np.prod(1 + ytd[c]) - 1) for c in returns}))
+    for years in (1, 5, 10):
+        window = returns.iloc[-12 * years:]
+        if len(returns) >= 12 * years:
+            rows.append(('CAGR', f'{years} years', {c: _cagr(window[c]) for c in returns}))
+    rows.append(('CAGR', f'{len(returns) / 12:.1f} years', {c: _cagr(returns[c]) for c in returns}))
+    rows.append(('Annualized mean return', f'{len(returns) / 12:.1f} years',
+                 {c: float((1 + returns[c].mean()) ** 12 - 1) for c in returns}))
+    rows.append(('Dividend yield', 'LTM', {c: 0.0 for c in returns}))
+    rows.append(('Risk', f'{len(returns) / 12:.1f} years',
+                 {c: float(returns[c].std() * np.sqrt(12)) for c in returns}))
+    rows.append(('CVAR', f'{len(returns) / 12:.1f} years',
+                 {c: float(-returns[c][returns[c] <= returns[c].quantile(0.05)].mean()) for c in returns}))
+    rows.append(('Max drawdowns', f'{len(returns) / 12:.1f} years', {c: _max_drawdown(returns[c]) for c in returns}))
+    rows.append(('Inception date', None, {c: str(returns.index[0]) for c in returns}))
+    rows.append(('Last asset date', None, {c: str(returns.index[-1]) for c in returns}))
+    records = [dict({'property': prop, 'period': period}, **values) for prop, period, values in rows]
+    return pd.DataFrame(records, columns=['property', 'period'] + list(returns.columns))
+
+
+class Rebalance:
+    """Replay of ok.Rebalance."""
+
+    def __init__(self, period: str = 'month', abs_deviation=None, rel_deviation=None):
+        self.period = period
+        self.abs_deviation = abs_deviation
+        self.rel_deviation = rel_deviation
+
+
+class Asset:
+    """Replay of ok.Asset."""
+
+    def __init__(self, symbol: str = 'SPY.US'):
+        data = load_asset(symbol)
+        self.symbol = symbol
+        self.ticker = symbol.split('.')[0]
+        self.name = data.get('name', symbol)
+        self.currency = data.get('currency', 'USD')
+        self.country = data.get('country')
+        self.exchange = data.get('exchange')
+        self.asset_type = data.get('type')
+        self.isin = data.get('isin')
+        self.close_monthly = data['close_monthly']
+        self.adj_close = self.close_monthly
+        self.first_date = self.close_monthly.index[0].to_timestamp()
+        self.last_date = self.close_monthly.index[-1].to_timestamp()
+        self.price = float(self.close_monthly.iloc[-1])
+        self.dividends = pd.Series(dtype='float64')
+
+    @property
+    def ror(self) -> pd.Series:
+        return self.close_monthly.pct_change().dropna()
+
+
+def _item_returns(item, ccy: str) -> pd.Series:
+    if isinstance(item, Portfolio):
+        return item.ror.rename(item.symbol)
+    return Asset(item).ror
+
+
+class AssetList:
+    """Replay of ok.AssetList (items are symbols or replay Portfolios)."""
+
+    def __init__(self, assets=None, first_date=None, last_date=None, ccy: str = 'USD', inflation: bool = True,
+                 symbol: Optional[str] = None):
+        items = list(assets or ['SPY.US'])
+        returns = pd.concat([_item_returns(item, ccy) for item in items], axis=1).dropna()
+        self.assets_ror = _slice(returns, first_date, last_date)
+        if self.assets_ror.empty:
+            raise ValueError("No common history for the assets")
+        self.symbols = [str(c) for c in self.assets_ror.columns]
+        self.currency = ccy
+        self.first_date = self.assets_ror.index[0].to_timestamp()
+        self.last_date = self.assets_ror.index[-1].to_timestamp()
+        self.names = {s: (load_asset(s).get('name', s) if not s.endswith('.PF') else s) for s in self.symbols}
+
+    @property
+    def wealth_indexes(self) -> pd.DataFrame:
+        return INITIAL_AMOUNT * (1.0 + self.assets_ror).cumprod()
+
+    @property
+    def drawdowns(self) -> pd.DataFrame:
+        wealth = self.wealth_indexes
+        return wealth / wealth.cummax() - 1.0
+
+    @property
+    def dividend_yield(self) -> pd.DataFrame:
+        return pd.DataFrame(0.0, index=self.assets_ror.index, columns=self.symbols)
+
+    def describe(self, years=(1, 5, 10), tickers: bool = True) -> pd.DataFrame:
+        return _describe(self.assets_ror)
+
+
+class Portfolio:
+    """Replay of ok.Portfolio with monthly rebalancing."""
+
+    def __init__(self, assets=None, weights=None, ccy: str = 'USD', first_date=None, last_date=None,
+                 rebalancing_strategy=None, symbol: Optional[str] = None, inflation: bool = True):
+        self.symbols = list(assets or ['SPY.US'])
+        self.weights = list(weights) if weights is not None else [1.0 / len(self.symbols)] * len(self.symbols)
+        self.currency = ccy
+        self.rebalancing_strategy = rebalancing_strategy or Rebalance()
+        if symbol is None:
+            digest = hashlib.md5(repr((self.symbols, self.weights)).encode()).hexdigest()[:8]
+            symbol = f"portfolio_{digest}.PF"
+        self.symbol = symbol
+        self.name = symbol
+        asset_list = AssetList(self.symbols, first_date=first_date, last_date=last_date, ccy=ccy)
+        self.assets_ror = asset_list.assets_ror
+        self.first_date = asset_list.first_date
+        self.last_date = asset_list.last_date
+
+    @property
+    def ror(self) -> pd.Series:
+        return (self.assets_ror * np.asarray(self.weights)).sum(axis=1).rename(self.symbol)
+
+    @property
+    def wealth_index(self) -> pd.DataFrame:
+        return (INITIAL_AMOUNT * (1.0 + self.ror).cumprod()).to_frame()
+
+    @property
+    def mean_return_annual(self) -> float:
+        return float((1 + self.ror.mean()) ** 12 - 1)
+
+    @property
+    def risk_annual(self) -> pd.Series:
+        return self.ror.expanding().std() * np.sqrt(12)
+
+    def get_cagr(self, period=None) -> pd.Series:
+        return pd.Series({self.symbol: _cagr(self.ror)})
+
+    def describe(self, years=(1, 5, 10)) -> pd.DataFrame:
+        return _describe(self.ror.to_frame())
+
+
+def build_okama_module() -> types.ModuleType:
+    """Module object replacing `okama`."""
+    module = types.ModuleType('okama')
+    module.__replay__ = True
+    module.Asset = Asset
+    module.AssetList = AssetList
+    module.Portfolio = Portfolio
+    module.Rebalance = Rebalance
+    module.__version__ = 'replay'
+    return module
+
+
+class _TusharePro:
+    """Replay of tushare pro_api(): every API method returns its recorded frame."""
+
+    def __getattr__(self, name: str):
+        def call(*args, **kwargs):
+            path = os.path.join(TUSHARE_FIXTURES_DIR, f"{name}.json")
+            if not os.path.exists(path):
+                return pd.DataFrame()
+            return pd.read_json(path, orient='records')
+        return call
+
+
+def build_tushare_module() -> types.ModuleType:
+    """Module object replacing `tushare`."""
+    module = types.ModuleType('tushare')
+    module.__replay__ = True
+    module.set_token = lambda token: None
+    module.pro_api = lambda token=None: _TusharePro()
+    return module
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Тесты для SQLite кэша резервных данных OKAMA
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import unittest
+import importlib.util
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cached_data_service import CachedDataService
+
+
+class TestCachedDataService(unittest.TestCase):
+    """Тесты для CachedDataService"""
+
+    def setUp(self):
+        self.service = CachedDataService(':memory:', legacy_cache_file=None)
+
+    def test_asset_info_lookup(self):
+        """Информация об активе читается по символу"""
+        self.assertFalse(self.service.can_provide_fallback())
+        self.service.update_cache({'SPY.US': {'name': 'SPDR S&P 500', 'currency': 'USD'}}, {})
+
+        self.assertEqual(self.service.get_cached_asset_info('SPY.US')['currency'], 'USD')
+        self.assertIsNone(self.service.get_cached_asset_info('QQQ.US'))
+        self.assertTrue(self.service.can_provide_fallback())
+
+    def test_per_entry_ttl(self):
+        """Просроченные записи не отдаются без allow_expired"""
+        self.service.update_cache({'OLD.US': {'name': 'old'}}, {}, ttl=0.01)
+        self.service.update_cache({'NEW.US': {'name': 'new'}}, {})
+        time.sleep(0.02)
+
+        self.assertIsNone(self.service.get_cached_asset_info('OLD.US'))
+        self.assertEqual(self.service.get_cached_asset_info('OLD.US', allow_expired=True)['name'], 'old')
+        self.assertEqual(self.service.get_cached_asset_info('NEW.US')['name'], 'new')
+
+        self.assertEqual(self.service.purge_expired(), 1)
+        self.assertIsNone(self.service.get_cached_asset_info('OLD.US', allow_expired=True))
+
+    @unittest.skipUnless(importlib.util.find_spec('pandas'), 'pandas is not installed')
+    def test_series_roundtrip(self):
+        """Ценовой ряд восстанавливается с PeriodIndex"""
+        import pandas as pd
+
+        index = pd.period_range('2024-01', periods=3, freq='M')
+        series = pd.Series([1.0, 2.5, float('nan')], index=index, name='SPY.US')
+        self.service.update_series('SPY.US', 'close_monthly', series)
+
+        cached = self.service.get_cached_series('SPY.US', 'close_monthly')
+        self.assertIsInstance(cached.index, pd.PeriodIndex)
+        self.assertEqual(list(cached.index), list(index))
+        self.assertEqual(cached.iloc[1], 2.5)
+        self.assertTrue(pd.isna(cached.iloc[2]))
+        self.assertIsNone(self.service.get_cached_series('SPY.US', 'close_daily'))
+
+    def test_legacy_json_import(self):
+        """Старый JSON кэш импортируется при первом запуске"""
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_file = os.path.join(tmp, 'okama_cache.json')
+            with open(legacy_file, 'w', encoding='utf-8') as f:
+                json.dump({'assets': {'SBER.MOEX': {'currency': 'RUB'}}, 'namespaces': {'MOEX': 'Moscow'}}, f)
+
+            service = CachedDataService(os.path.join(tmp, 'cache.db'), legacy_cache_file=legacy_file)
+
+            self.assertEqual(service.get_cached_asset_info('SBER.MOEX')['currency'], 'RUB')
+            self.assertEqual(service.get_cached_namespaces(), {'MOEX': 'Moscow'})
+            self.assertFalse(os.path.exists(legacy_file))
+
+    def test_locked_database_write_is_skipped(self):
+        """Запись в заблокированную базу пропускается без исключения"""
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'cache.db')
+            service = CachedDataService(db_path, legacy_cache_file=None)
+            service._conn.execute('PRAGMA busy_timeout = 0')
+            other = sqlite3.connect(db_path, isolation_level=None)
+            try:
+                other.execute('BEGIN IMMEDIATE')
+                with self.assertLogs('services.cached_data_service', level='WARNING'):
+                    service.update_cache({'SPY.US': {'currency': 'USD'}}, {})
+                other.execute('ROLLBACK')
+            finally:
+                other.close()
+
+            self.assertFalse(service._conn.in_transaction)
+            service.update_cache({'SPY.US': {'currency': 'USD'}}, {})
+            self.assertEqual(service.get_cached_asset_info('SPY.US')['currency'], 'USD')
+            service._conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Тесты для кэша отрисованных графиков
+"""
+
+import sys
+import os
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.chart_cache import ChartBytesCache, make_chart_key
+
+
+class TestChartBytesCache(unittest.TestCase):
+    """Тесты для ChartBytesCache"""
+
+    def test_hit_and_miss_counters(self):
+        """Счетчики попаданий и промахов"""
+        cache = ChartBytesCache(max_bytes=100)
+        key = make_chart_key('daily', 'SPX.INDX', period='1Y', last_date='2024-01-31')
+
+        self.assertIsNone(cache.get(key))
+        cache.set(key, b'png')
+        self.assertEqual(cache.get(key), b'png')
+
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['size_bytes'], 3)
+
+    def test_memory_budget_evicts_lru(self):
+        """Превышение бюджета памяти вытесняет давно не использованные графики"""
+        cache = ChartBytesCache(max_bytes=10)
+        cache.set('a', b'12345')
+        cache.set('b', b'12345')
+        cache.get('a')
+        cache.set('c', b'12345')
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertLessEqual(cache.get_stats()['size_bytes'], 10)
+
+    def test_oversized_image_is_not_cached(self):
+        """Изображение больше бюджета не кэшируется"""
+        cache = ChartBytesCache(max_bytes=4)
+        self.assertFalse(cache.set('a', b'12345'))
+        self.assertEqual(len(cache), 0)
+
+    def test_key_depends_on_last_date_and_weights(self):
+        """Ключ меняется при новых данных и других весах"""
+        base = make_chart_key('wealth', ['A.US', 'B.US'], [0.5, 0.5], 'USD', last_date='2024-01-31')
+        newer = make_chart_key('wealth', ['A.US', 'B.US'], [0.5, 0.5], 'USD', last_date='2024-02-29')
+        other_weights = make_chart_key('wealth', ['A.US', 'B.US'], [0.6, 0.4], 'USD', last_date='2024-01-31')
+        self.assertNotEqual(base, newer)
+        self.assertNotEqual(base, other_weights)
+
+
+if __name__ == '__main__':
+    unittest.main()
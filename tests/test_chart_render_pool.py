@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Тесты для спецификаций графиков пула рендеринга
+"""
+
+import sys
+import os
+import pickle
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import chart_render_pool as chart_render_pool_module
+from services.chart_render_pool import ChartSpec, ChartRenderPool, render_spec
+
+
+class TestChartSpec(unittest.TestCase):
+    """Тесты для ChartSpec и render_spec"""
+
+    def test_spec_is_picklable(self):
+        """Спецификация передается в процесс-воркер через pickle"""
+        spec = ChartSpec(
+            method='create_unified_wealth_chart',
+            args=({'SPY.US': [1.0, 1.1]}, ['SPY.US'], 'USD'),
+            kwargs={'title': 'Сравнение'},
+        )
+        restored = pickle.loads(pickle.dumps(spec))
+        self.assertEqual(restored, spec)
+
+    def test_unknown_method_is_rejected(self):
+        """Произвольные методы ChartStyles не вызываются из спецификации"""
+        with self.assertRaises(ValueError):
+            render_spec(ChartSpec(method='cleanup_figure'))
+
+    def test_disabled_pool_does_not_start_processes(self):
+        """Отключенный пул не запускает процессы"""
+        pool = ChartRenderPool(max_workers=2, enabled=False)
+        self.assertIsNone(pool._get_executor())
+        self.assertFalse(pool.get_stats()['started'])
+
+
+
+class TestChartRenderPoolFallback(unittest.TestCase):
+    """Тесты выбора между процессом-воркером и рендерингом в процессе бота"""
+
+    def setUp(self):
+        # Потоки вместо процессов: render_spec подменяется в том же процессе
+        self.pool = ChartRenderPool(max_workers=1, enabled=True)
+        self.pool._executor = ThreadPoolExecutor(max_workers=1)
+        self.calls = []
+
+    def tearDown(self):
+        self.pool.shutdown(wait=True)
+
+    def test_chart_errors_are_not_retried_in_process(self):
+        """Ошибка в самой функции графика не приводит к повторному рендерингу"""
+        def broken_chart(spec):
+            self.calls.append(spec.method)
+            raise TypeError("bug in chart function")
+
+        spec = ChartSpec(method='create_price_chart')
+        with patch.object(chart_render_pool_module, 'render_spec', broken_chart):
+            with self.assertRaises(TypeError):
+                asyncio.run(self.pool.render(spec, timeout=5))
+
+        self.assertEqual(self.calls, ['create_price_chart'])
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['fallbacks'], 0)
+        self.assertEqual(stats['failed'], 1)
+
+    def test_unpicklable_spec_is_rendered_in_process(self):
+        """Непиклируемые аргументы рендерятся в процессе бота"""
+        def chart(spec):
+            self.calls.append(threading.current_thread().name)
+            return b'png'
+
+        spec = ChartSpec(method='create_price_chart', args=(threading.Lock(),))
+        with patch.object(chart_render_pool_module, 'render_spec', chart):
+            self.assertEqual(asyncio.run(self.pool.render(spec, timeout=5)), b'png')
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.pool.get_stats()['fallbacks'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Тесты для circuit breaker вызовов OKAMA
+"""
+
+import sys
+import os
+import time
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.circuit_breaker import (
+    CircuitBreaker, CircuitOpenError, is_transient_error,
+    STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+)
+
+
+def _fail():
+    raise Exception("502 Bad Gateway")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Тесты для CircuitBreaker"""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker('okama', failure_threshold=2, recovery_timeout=0.05)
+
+    def test_opens_after_consecutive_failures(self):
+        """После N ошибок подряд вызовы отклоняются без обращения к сервису"""
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.breaker.call(_fail)
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+
+        calls = []
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(calls.append, 1)
+        self.assertEqual(calls, [])
+        self.assertEqual(self.breaker.get_stats()['rejected'], 1)
+
+    def test_half_open_probe_closes_circuit(self):
+        """Успешная пробная попытка закрывает цепь"""
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.breaker.call(_fail)
+        time.sleep(0.06)
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+    def test_half_open_failure_reopens(self):
+        """Неудачная пробная попытка снова открывает цепь"""
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.breaker.call(_fail)
+        time.sleep(0.06)
+        with self.assertRaises(Exception):
+            self.breaker.call(_fail)
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        self.assertEqual(self.breaker.get_stats()['times_opened'], 2)
+
+    def test_non_transient_errors_do_not_open(self):
+        """Ошибки данных (неизвестный символ) не открывают цепь"""
+        def not_found():
+            raise ValueError("Symbol not found")
+
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                self.breaker.call(not_found)
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+    def test_nested_calls_counted_once(self):
+        """Вложенный вызов в том же потоке учитывается один раз"""
+        with self.assertRaises(Exception):
+            self.breaker.call(lambda: self.breaker.call(_fail))
+        self.assertEqual(self.breaker.get_stats()['consecutive_failures'], 1)
+
+    def test_transient_error_classification(self):
+        """Классификация временных ошибок"""
+        self.assertTrue(is_transient_error(ConnectionError("reset")))
+        self.assertTrue(is_transient_error(Exception("503 Service Unavailable")))
+        self.assertFalse(is_transient_error(ValueError("Symbol not found")))
+        self.assertFalse(is_transient_error(CircuitOpenError('okama', 10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Тесты для общего сервиса корреляций
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.correlation import (
+    CorrelationResult, CorrelationService, make_correlation_key, pairwise_correlation, rolling_correlation,
+    shrunk_covariance
+)
+
+
+def make_returns(months=120, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(months, 4)) @ rng.normal(size=(4, 4)) * 0.01
+    index = pd.period_range('2012-01', periods=months, freq='M')
+    return pd.DataFrame(values, index=index, columns=['SPY.US', 'AGG.US', 'GLD.US', 'QQQ.US'])
+
+
+class TestCorrelationMath(unittest.TestCase):
+    """Тесты для расчетов корреляции"""
+
+    def setUp(self):
+        self.returns = make_returns()
+
+    def test_matches_pandas(self):
+        """Результат совпадает с DataFrame.corr()"""
+        np.testing.assert_allclose(pairwise_correlation(self.returns.values), self.returns.corr().values, atol=1e-12)
+
+    def test_pairwise_complete_with_gaps(self):
+        """Пропуски обрабатываются попарно, как в pandas"""
+        returns = self.returns.copy()
+        returns.iloc[:30, 1] = np.nan
+        returns.iloc[90:, 2] = np.nan
+        np.testing.assert_allclose(pairwise_correlation(returns.values), returns.corr().values, atol=1e-12)
+
+    def test_min_periods(self):
+        """Пары без достаточной общей истории получают NaN"""
+        returns = self.returns.copy()
+        returns.iloc[:118, 0] = np.nan
+        corr = pairwise_correlation(returns.values, min_periods=3)
+        self.assertTrue(np.isnan(corr[0, 1]))
+        self.assertFalse(np.isnan(corr[1, 2]))
+
+    def test_rolling_matches_pandas(self):
+        """Скользящая корреляция совпадает с pandas rolling().corr()"""
+        rolling = rolling_correlation(self.returns.values, 24)
+        expected = self.returns.rolling(24).corr().values.reshape(-1, 4, 4)[23:]
+        self.assertEqual(rolling.shape, (97, 4, 4))
+        np.testing.assert_allclose(rolling, expected, atol=1e-10)
+        with self.assertRaises(ValueError):
+            rolling_correlation(self.returns.values, 1)
+
+    def test_shrinkage(self):
+        """Сжатие Ледойта-Вольфа: интенсивность в [0, 1], дисперсии близки к выборочным"""
+        covariance, intensity = shrunk_covariance(self.returns.values)
+        sample = np.cov(self.returns.values, rowvar=False)
+        self.assertTrue(0.0 <= intensity <= 1.0)
+        np.testing.assert_allclose(np.trace(covariance), np.trace(sample))
+        off_diagonal = ~np.eye(4, dtype=bool)
+        self.assertLessEqual(np.abs(covariance[off_diagonal]).sum(), np.abs(sample[off_diagonal]).sum())
+
+        # Короткая история с многими активами - сильное сжатие
+        short = np.random.default_rng(3).normal(size=(8, 6))
+        self.assertGreater(shrunk_covariance(short)[1], intensity)
+
+
+class TestCorrelationResult(unittest.TestCase):
+    """Тесты для CorrelationResult"""
+
+    def test_variants(self):
+        """Один результат обслуживает все варианты и форматы"""
+        returns = make_returns()
+        result = CorrelationResult(returns)
+
+        self.assertEqual(list(result.matrix('pearson').columns), list(returns.columns))
+        np.testing.assert_allclose(np.diag(result.matrix('shrinkage')), 1.0)
+        self.assertEqual(len(result.pairs()), 6)
+        self.assertEqual(result.pairs()[0][:2], ('SPY.US', 'AGG.US'))
+        self.assertEqual(np.array(result.to_list()).shape, (4, 4))
+        self.assertIs(result.rolling(12), result.rolling(12))
+
+        pair = result.rolling_pair('SPY.US', 'GLD.US', 12)
+        self.assertEqual(pair.index[0], returns.index[11])
+        self.assertAlmostEqual(pair.iloc[-1], returns['SPY.US'].iloc[-12:].corr(returns['GLD.US'].iloc[-12:]))
+        with self.assertRaises(ValueError):
+            result.matrix('kendall')
+
+
+class TestCorrelationService(unittest.TestCase):
+    """Тесты для CorrelationService"""
+
+    def test_computed_once_per_context(self):
+        """Одинаковые доходности и валюта - один расчет"""
+        service = CorrelationService()
+        returns = make_returns()
+        first = service.get_or_compute(returns, 'USD')
+        self.assertIs(service.get_or_compute(returns.copy(), 'USD'), first)
+        self.assertIsNot(service.get_or_compute(returns, 'RUB'), first)
+        self.assertIsNot(service.get_or_compute(returns.iloc[1:], 'USD'), first)
+        self.assertEqual(service.get_stats()['hits'], 1)
+
+    def test_key_and_validation(self):
+        """Ключ зависит от значений; один столбец отклоняется"""
+        returns = make_returns()
+        self.assertNotEqual(make_correlation_key(returns, 'USD'), make_correlation_key(returns * 2, 'USD'))
+        with self.assertRaises(ValueError):
+            CorrelationService().get_or_compute(returns[['SPY.US']], 'USD')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Тесты для кэшируемой эффективной границы с warm-start оптимизатором
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.efficient_frontier import (
+    FrontierCache, annualize_return, annualize_risk, compute_frontier, make_frontier_key
+)
+
+
+def make_returns(n_assets=5, months=180, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(size=(n_assets, n_assets)) * 0.01
+    cov = factors @ factors.T + np.eye(n_assets) * 1e-4
+    values = rng.multivariate_normal(rng.uniform(0.002, 0.012, n_assets), cov, size=months)
+    index = pd.period_range('2010-01', periods=months, freq='M')
+    return pd.DataFrame(values, index=index, columns=[f'A{i}.US' for i in range(n_assets)])
+
+
+class TestComputeFrontier(unittest.TestCase):
+    """Тесты для compute_frontier"""
+
+    def setUp(self):
+        self.returns = make_returns()
+        self.cov = np.cov(self.returns.values, rowvar=False)
+        self.mean = self.returns.values.mean(axis=0)
+
+    def test_points_layout(self):
+        """Точки в формате ef_points okama: риск и доходность растут, веса в сумме 1"""
+        result = compute_frontier(self.returns, n_points=15)
+        points = result.points
+
+        self.assertEqual(list(points.columns[:3]), ['Risk', 'Mean return', 'CAGR'])
+        self.assertEqual(list(points.columns[3:]), list(self.returns.columns))
+        self.assertEqual(len(points), 15)
+        self.assertTrue(points['Mean return'].is_monotonic_increasing)
+        self.assertTrue((points['Risk'].diff().dropna() > -1e-9).all())
+        np.testing.assert_allclose(points[result.symbols].sum(axis=1), 1.0, atol=1e-9)
+        self.assertTrue((points[result.symbols].values >= 0).all())
+
+    def test_gmv_is_minimum_variance(self):
+        """GMV не хуже любого случайного портфеля"""
+        result = compute_frontier(self.returns)
+        gmv = np.array(result.gmv['weights'])
+        random_weights = np.random.default_rng(1).dirichlet(np.ones(len(gmv)), 50000)
+        random_variance = np.einsum('ij,jk,ik->i', random_weights, self.cov, random_weights)
+        self.assertLessEqual(gmv @ self.cov @ gmv, random_variance.min() + 1e-12)
+        self.assertAlmostEqual(result.gmv['risk'], result.points['Risk'].iloc[0], places=6)
+
+    def test_points_are_optimal_for_target(self):
+        """Каждая точка - минимум дисперсии для своей доходности (сравнение с одиночным решением)"""
+        from scipy.optimize import minimize
+
+        result = compute_frontier(self.returns, n_points=8)
+        for _, row in result.points.iloc[1:-1].iterrows():
+            weights = row[result.symbols].values.astype(float)
+            target = weights @ self.mean
+            n = len(weights)
+            reference = minimize(lambda w: w @ self.cov @ w, np.full(n, 1.0 / n), method='SLSQP',
+                                 bounds=[(0, 1)] * n,
+                                 constraints=[{'type': 'eq', 'fun': lambda w: w.sum() - 1},
+                                              {'type': 'eq', 'fun': lambda w: w @ self.mean - target}],
+                                 options={'ftol': 1e-14, 'maxiter': 500})
+            self.assertLessEqual(weights @ self.cov @ weights, reference.fun * (1 + 1e-4))
+
+    def test_risk_grows_along_frontier(self):
+        """Риск и доходность растут от GMV к портфелю максимальной доходности"""
+        result = compute_frontier(self.returns)
+        self.assertTrue((np.diff(result.points['Mean return']) > 0).all())
+        self.assertTrue((np.diff(result.points['Risk']) > -1e-8).all())
+
+    def test_key_portfolios(self):
+        """Макс. доходность - лучший актив, тангенциальный портфель максимизирует Шарп"""
+        result = compute_frontier(self.returns, risk_free_rate=0.02)
+        best = int(np.argmax(self.mean))
+        self.assertEqual(int(np.argmax(result.max_return['weights'])), best)
+        self.assertAlmostEqual(result.max_return['return'], float(annualize_return(self.mean[best])))
+
+        sharpe = (result.points['Mean return'] - 0.02) / result.points['Risk']
+        self.assertGreaterEqual(result.tangency['sharpe_ratio'], sharpe.max() - 1e-6)
+
+        data = result.to_analysis_dict(['a', 'b', 'c', 'd', 'e'], 'USD')
+        self.assertEqual(set(data), {'min_risk_portfolio', 'max_return_portfolio', 'max_sharpe_portfolio',
+                                     'asset_names', 'currency'})
+        self.assertEqual(set(result.portfolio_data()), {'gmv', 'max_return', 'tangency'})
+
+    def test_annualization_matches_okama(self):
+        """Годовые риск и доходность считаются по формулам okama"""
+        self.assertAlmostEqual(float(annualize_return(0.01)), 1.01 ** 12 - 1)
+        self.assertAlmostEqual(float(annualize_risk(0.0, 0.01)), 0.0)
+        self.assertGreater(float(annualize_risk(0.04, 0.01)), 0.04 * np.sqrt(12) * 0.9)
+
+    def test_invalid_input(self):
+        """Один актив или короткая история отклоняются"""
+        with self.assertRaises(ValueError):
+            compute_frontier(self.returns.iloc[:, :1])
+        with self.assertRaises(ValueError):
+            compute_frontier(self.returns.iloc[:2])
+
+
+class TestFrontierCache(unittest.TestCase):
+    """Тесты для FrontierCache"""
+
+    def test_cached_per_assets_currency_and_period(self):
+        """Граница считается один раз на набор активов, валюту и период"""
+        returns = make_returns(n_assets=3)
+        cache = FrontierCache()
+        first = cache.get_or_compute(returns, 'USD')
+        self.assertIs(cache.get_or_compute(returns, 'USD'), first)
+        self.assertIsNot(cache.get_or_compute(returns, 'EUR'), first)
+        self.assertIsNot(cache.get_or_compute(returns.iloc[12:], 'USD'), first)
+        self.assertEqual(cache.get_stats()['size'], 3)
+
+    def test_key_depends_on_values(self):
+        """Разные доходности с теми же тикерами дают разные ключи"""
+        returns = make_returns(n_assets=3)
+        self.assertEqual(make_frontier_key(returns, 'USD'), make_frontier_key(returns.copy(), 'USD'))
+        self.assertNotEqual(make_frontier_key(returns, 'USD'), make_frontier_key(returns * 1.01, 'USD'))
+
+    def test_concurrent_requests_compute_once(self):
+        """Одновременные запросы ждут один расчет"""
+        returns = make_returns(n_assets=3)
+        cache = FrontierCache()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(returns, 'USD')))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(result is results[0] for result in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Тесты для ограниченных пулов выполнения блокирующих задач
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.executors import BoundedExecutor, ExecutorOverloadedError
+
+
+class TestBoundedExecutor(unittest.TestCase):
+    """Тесты для BoundedExecutor"""
+
+    def setUp(self):
+        self.executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def test_run_returns_result_and_counts(self):
+        """Результат возвращается, метрики обновляются"""
+        result = asyncio.run(self.executor.run(lambda a, b: a + b, 2, b=3))
+        stats = self.executor.get_stats()
+
+        self.assertEqual(result, 5)
+        self.assertEqual(stats['completed'], 1)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['active'], 0)
+
+    def test_event_loop_is_not_blocked(self):
+        """Блокирующая задача не останавливает цикл событий"""
+        async def scenario():
+            job = asyncio.ensure_future(self.executor.run(time.sleep, 0.2))
+            started = time.monotonic()
+            await asyncio.sleep(0.01)
+            elapsed = time.monotonic() - started
+            await job
+            return elapsed
+
+        self.assertLess(asyncio.run(scenario()), 0.1)
+
+    def test_queue_overflow_is_rejected(self):
+        """Переполнение очереди приводит к отказу"""
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(self.executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(self.executor.run(lambda: None))
+            await asyncio.sleep(0)
+            with self.assertRaises(ExecutorOverloadedError):
+                await self.executor.run(lambda: None)
+            release.set()
+            await running
+            await queued
+
+        asyncio.run(scenario())
+        stats = self.executor.get_stats()
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['max_queue_depth'], 1)
+
+    def test_timeout_while_queued_releases_queue_slot(self):
+        """Задача, отмененная по таймауту в очереди, освобождает место в очереди"""
+        release = threading.Event()
+        ran = []
+
+        async def scenario():
+            running = asyncio.ensure_future(self.executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.executor.run(lambda: ran.append(True), timeout=0.05)
+            release.set()
+            await running
+            # Очередь снова принимает задачи
+            await self.executor.run(lambda: None)
+
+        asyncio.run(scenario())
+        stats = self.executor.get_stats()
+        self.assertEqual(ran, [])
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['timed_out'], 1)
+        self.assertEqual(stats['rejected'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Тесты для фонового мониторинга доступности сервисов
+"""
+
+import sys
+import os
+import asyncio
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.health_monitor import HealthMonitor, LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Тесты для LatencyHistogram"""
+
+    def test_cumulative_buckets(self):
+        """Значения попадают в накопительные корзины"""
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.cumulative(), {'0.1': 1, '1.0': 3, '+Inf': 4})
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 4.25)
+
+
+class TestHealthMonitor(unittest.TestCase):
+    """Тесты для HealthMonitor"""
+
+    def test_probes_are_recorded(self):
+        """Результаты синхронных и асинхронных проб сохраняются в памяти"""
+        monitor = HealthMonitor(probe_timeout=5)
+
+        def okama_probe():
+            return True
+
+        async def gemini_probe():
+            raise RuntimeError("Gemini API returned status 503")
+
+        monitor.register('okama', okama_probe)
+        monitor.register('gemini', gemini_probe)
+
+        # До первой проверки используется значение по умолчанию
+        self.assertTrue(monitor.is_available('gemini'))
+
+        results = asyncio.run(monitor.probe_all())
+        self.assertEqual(results, {'okama': True, 'gemini': False})
+
+        self.assertTrue(monitor.is_available('okama'))
+        self.assertFalse(monitor.is_available('gemini'))
+
+        okama = monitor.get_status('okama')
+        self.assertIsNotNone(okama['last_success'])
+        self.assertEqual(okama['latency_count'], 1)
+
+        gemini = monitor.get_status('gemini')
+        self.assertIsNone(gemini['last_success'])
+        self.assertIn('503', gemini['last_error'])
+        self.assertEqual(gemini['consecutive_failures'], 1)
+
+    def test_probe_timeout(self):
+        """Зависшая проба считается недоступностью"""
+        monitor = HealthMonitor(probe_timeout=0.05)
+
+        async def slow_probe():
+            await asyncio.sleep(1)
+
+        monitor.register('yandexgpt', slow_probe)
+        self.assertFalse(asyncio.run(monitor.probe('yandexgpt')))
+        self.assertFalse(monitor.is_available('yandexgpt'))
+
+
+if __name__ == '__main__':
+    unittest.main()
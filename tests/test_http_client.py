@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Тесты для общего HTTP клиента внешних сервисов
+"""
+
+import sys
+import os
+import asyncio
+import unittest
+import importlib.util
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.http_client import AsyncHTTPClient, HTTPTimeoutError, backoff_delay
+
+HAS_AIOHTTP = importlib.util.find_spec('aiohttp') is not None
+
+
+class TestBackoff(unittest.TestCase):
+    """Тесты для задержки между попытками"""
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Задержка случайна и не превышает предел"""
+        delays = [backoff_delay(10, base=0.5, cap=2.0) for _ in range(50)]
+        self.assertTrue(all(0 <= d <= 2.0 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
+@unittest.skipUnless(HAS_AIOHTTP, 'aiohttp is not installed')
+class TestAsyncHTTPClient(unittest.TestCase):
+    """Тесты для AsyncHTTPClient на локальном сервере"""
+
+    def _run(self, handler, scenario):
+        from aiohttp import web
+
+        async def main():
+            app = web.Application()
+            app.router.add_route('*', '/', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            client = AsyncHTTPClient(timeout=2, retries=2)
+            try:
+                return await scenario(client, f"http://127.0.0.1:{port}/"), client
+            finally:
+                await client.close()
+                await runner.cleanup()
+
+        return asyncio.run(main())
+
+    def test_retry_transient_status(self):
+        """503 повторяется, затем возвращается успешный ответ"""
+        from aiohttp import web
+        calls = []
+
+        async def handler(request):
+            calls.append(await request.json())
+            if len(calls) < 2:
+                return web.Response(status=503)
+            return web.json_response({'status': 'ok'})
+
+        async def scenario(client, url):
+            return await client.post(url, json={'n': 1})
+
+        response, client = self._run(handler, scenario)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(client.get_stats()['retried'], 1)
+
+    def test_client_error_is_not_retried(self):
+        """Ошибки клиента (400) возвращаются без повторов"""
+        from aiohttp import web
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            return web.Response(status=400, text='bad request')
+
+        async def scenario(client, url):
+            return await client.get(url)
+
+        response, _ = self._run(handler, scenario)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.text, 'bad request')
+        self.assertEqual(len(calls), 1)
+
+    def test_timeout_after_retries(self):
+        """После исчерпания попыток выбрасывается HTTPTimeoutError"""
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            await asyncio.sleep(1)
+
+        async def scenario(client, url):
+            with self.assertRaises(HTTPTimeoutError):
+                await client.get(url, timeout=0.1, retries=1)
+
+        self._run(handler, scenario)
+        self.assertEqual(len(calls), 2)
+
+    def test_post_timeout_is_not_retried(self):
+        """POST после таймаута не повторяется: сервер мог уже выполнить запрос"""
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            await asyncio.sleep(1)
+
+        async def scenario(client, url):
+            with self.assertRaises(HTTPTimeoutError):
+                await client.post(url, json={'n': 1}, timeout=0.1, retries=2)
+
+        self._run(handler, scenario)
+        self.assertEqual(len(calls), 1)
+
+    def test_post_gateway_error_is_not_retried(self):
+        """POST с 502 не повторяется, 503 повторяется"""
+        from aiohttp import web
+        calls = []
+
+        async def handler(request):
+            calls.append(1)
+            return web.Response(status=502)
+
+        async def scenario(client, url):
+            return await client.post(url, json={'n': 1})
+
+        response, _ = self._run(handler, scenario)
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(len(calls), 1)
+
+
+@unittest.skipUnless(importlib.util.find_spec('requests'), 'requests is not installed')
+class TestSyncSession(unittest.TestCase):
+    """Тесты для политики повторов синхронной сессии"""
+
+    def test_post_is_not_retried_on_status(self):
+        """Синхронная сессия повторяет только идемпотентные методы"""
+        from services.http_client import get_sync_session
+
+        retry = get_sync_session().get_adapter('https://api.example.com').max_retries
+        self.assertTrue(retry.is_retry('GET', 503))
+        self.assertFalse(retry.is_retry('POST', 503))
+        self.assertGreater(retry.connect if retry.connect is not None else retry.total, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
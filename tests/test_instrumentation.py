@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Тесты для метрик задержки и ресурсов обработчиков
+"""
+
+import sys
+import os
+import time
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.executors import BoundedExecutor
+from services.circuit_breaker import CircuitBreaker
+from services.instrumentation import (
+    PHASE_COMPUTE, PHASE_FETCH, PHASE_RENDER, CountedClient, Instrumentation, callback_key, phase,
+    record_bytes_sent, telegram_payload_size
+)
+
+
+def callback_update(data):
+    return SimpleNamespace(callback_query=SimpleNamespace(data=data))
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Тесты для Instrumentation"""
+
+    def setUp(self):
+        self.instrumentation = Instrumentation(max_handlers=3)
+        self.pool = BoundedExecutor("test", max_workers=2, phase=PHASE_FETCH)
+
+    def tearDown(self):
+        self.pool.shutdown(wait=True)
+
+    def test_callback_key_uses_lowercase_prefix(self):
+        """Ключ callback - начальные слова callback_data без символов и номеров"""
+        self.assertEqual(callback_key("portfolio_wealth_chart_PF_1"), "callback:portfolio_wealth_chart")
+        self.assertEqual(callback_key("namespace_page_US_2"), "callback:namespace_page")
+        self.assertEqual(callback_key("info_SBER.MOEX"), "callback:info")
+        self.assertEqual(callback_key("SPY.US"), "callback:other")
+        self.assertEqual(callback_key(None), "callback:other")
+
+    def test_phases_are_split(self):
+        """Время запроса делится на фазы, неучтенное время считается вычислениями"""
+        breaker = CircuitBreaker('provider')
+
+        async def handler(update, context):
+            await self.pool.run(breaker.call, time.sleep, 0.05)
+            time.sleep(0.03)
+            record_bytes_sent(100)
+
+        wrapped = self.instrumentation.command("compare", handler)
+        asyncio.run(wrapped(None, None))
+
+        stats = self.instrumentation.get_stats()["command:compare"]
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(stats['external_calls'], {'provider': 1})
+        self.assertEqual(stats['bytes_sent'], 100)
+        self.assertGreaterEqual(stats['phase_seconds_total']['fetch'], 0.05)
+        self.assertGreaterEqual(stats['phase_seconds_total']['compute'], 0.03)
+        self.assertLess(stats['phase_seconds_total']['fetch'], 0.08)
+
+    def test_outer_phase_wins(self):
+        """Задача пула внутри явного блока вычислений считается вычислениями"""
+        async def handler(update, context):
+            with phase(PHASE_COMPUTE):
+                await self.pool.run(time.sleep, 0.05)
+
+        asyncio.run(self.instrumentation.command("portfolio", handler)(None, None))
+
+        totals = self.instrumentation.get_stats()["command:portfolio"]['phase_seconds_total']
+        self.assertEqual(totals['fetch'], 0.0)
+        self.assertGreaterEqual(totals['compute'], 0.05)
+
+    def test_concurrent_phases_are_all_timed(self):
+        """Параллельные фазы одного запроса учитываются каждая"""
+        render_pool = BoundedExecutor("test-render", max_workers=1, phase=PHASE_RENDER)
+
+        async def handler(update, context):
+            await asyncio.gather(
+                self.pool.run(time.sleep, 0.05),
+                render_pool.run(time.sleep, 0.05),
+            )
+
+        try:
+            asyncio.run(self.instrumentation.command("compare", handler)(None, None))
+        finally:
+            render_pool.shutdown(wait=True)
+
+        totals = self.instrumentation.get_stats()["command:compare"]['phase_seconds_total']
+        self.assertGreaterEqual(totals['fetch'], 0.05)
+        self.assertGreaterEqual(totals['render'], 0.05)
+
+    def test_errors_are_counted_and_raised(self):
+        """Исключение обработчика учитывается и пробрасывается"""
+        async def handler(update, context):
+            raise ValueError("boom")
+
+        wrapped = self.instrumentation.callback(handler)
+        with self.assertRaises(ValueError):
+            asyncio.run(wrapped(callback_update("compare_drawdowns_1"), None))
+
+        stats = self.instrumentation.get_stats()["callback:compare_drawdowns"]
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['errors'], 1)
+
+    def test_handler_cardinality_is_capped(self):
+        """Новые ключи сверх лимита агрегируются в <kind>:other"""
+        async def handler(update, context):
+            return None
+
+        wrapped = self.instrumentation.callback(handler)
+        for data in ("a", "b", "c", "d", "e"):
+            asyncio.run(wrapped(callback_update(data), None))
+
+        stats = self.instrumentation.get_stats()
+        self.assertEqual(len(stats), 4)
+        self.assertEqual(stats["callback:other"]['requests'], 2)
+
+    def test_calls_outside_handlers_are_ignored(self):
+        """Вне обработчика метрики не собираются"""
+        client = CountedClient(SimpleNamespace(daily=lambda **kwargs: 'data', token='t'), 'tushare')
+        self.assertEqual(client.daily(ts_code='1'), 'data')
+        self.assertEqual(client.token, 't')
+        record_bytes_sent(10)
+        self.assertEqual(self.instrumentation.get_stats(), {})
+
+    def test_telegram_payload_size(self):
+        """Размер запроса Bot API: JSON-параметры и загружаемые файлы"""
+        request_data = SimpleNamespace(
+            json_payload={'chat_id': '1', 'caption': 'ok'},
+            contains_files=True,
+            multipart_data={'photo': ('chart.png', b'x' * 1000, 'image/png')}
+        )
+        self.assertEqual(telegram_payload_size(request_data), 1003)
+        self.assertEqual(telegram_payload_size(None), 0)
+
+    def test_render_prometheus(self):
+        """Экспорт в текстовом формате Prometheus"""
+        async def handler(update, context):
+            record_bytes_sent(42)
+
+        asyncio.run(self.instrumentation.command("start", handler)(None, None))
+        text = self.instrumentation.render_prometheus()
+
+        self.assertIn('# TYPE shansai_handler_duration_seconds histogram', text)
+        self.assertIn('shansai_handler_duration_seconds_bucket{handler="command:start",le="+Inf"} 1', text)
+        self.assertIn('shansai_handler_phase_seconds{handler="command:start",phase="send",quantile="0.99"}', text)
+        self.assertIn('shansai_handler_requests_total{handler="command:start"} 1', text)
+        self.assertIn('shansai_handler_bytes_sent_total{handler="command:start"} 42', text)
+        self.assertTrue(text.endswith('\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
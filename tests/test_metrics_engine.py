@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Тесты для векторного расчёта метрик
+"""
+
+import sys
+import os
+import unittest
+import importlib.util
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HAS_PANDAS = importlib.util.find_spec('pandas') is not None
+
+
+@unittest.skipUnless(HAS_PANDAS, 'pandas is not installed')
+class TestMetricsEngine(unittest.TestCase):
+    """Тесты для compute_metrics"""
+
+    def setUp(self):
+        import numpy as np
+        import pandas as pd
+        self.np = np
+        self.pd = pd
+        rng = np.random.default_rng(42)
+        index = pd.period_range('2015-01', periods=120, freq='M')
+        self.returns = pd.DataFrame({
+            'SPY.US': rng.normal(0.008, 0.04, 120),
+            'AGG.US': rng.normal(0.003, 0.01, 120),
+        }, index=index)
+
+    def test_matches_per_column_calculation(self):
+        """Векторный расчёт совпадает с поэлементным для каждой колонки"""
+        from services.metrics_engine import compute_metrics
+
+        metrics = compute_metrics(self.returns, risk_free_rate=0.02)
+        for symbol in self.returns.columns:
+            r = self.returns[symbol]
+            wealth = (1 + r).cumprod()
+            cagr = wealth.iloc[-1] ** (12 / len(r)) - 1
+            max_dd = (wealth / wealth.cummax() - 1).min()
+            var_95 = r.quantile(0.05)
+
+            self.assertAlmostEqual(metrics.at['annual_return', symbol], cagr)
+            self.assertAlmostEqual(metrics.at['max_drawdown', symbol], max_dd)
+            self.assertAlmostEqual(metrics.at['calmar_ratio', symbol], cagr / abs(max_dd))
+            self.assertAlmostEqual(metrics.at['var_95', symbol], var_95)
+            self.assertAlmostEqual(metrics.at['cvar_95', symbol], r[r <= var_95].mean())
+            self.assertAlmostEqual(metrics.at['sharpe_ratio', symbol],
+                                   (cagr - 0.02) / metrics.at['volatility', symbol])
+
+    def test_shorter_history_is_ignored_per_column(self):
+        """Пропуски в начале ряда не влияют на другие колонки"""
+        from services.metrics_engine import compute_metrics
+
+        returns = self.returns.copy()
+        returns.iloc[:60, 1] = self.np.nan
+        metrics = compute_metrics(returns)
+        short = compute_metrics(self.returns.iloc[60:, [1]])
+
+        self.assertAlmostEqual(metrics.at['years', 'AGG.US'], 5.0)
+        self.assertAlmostEqual(metrics.at['years', 'SPY.US'], 10.0)
+        self.assertAlmostEqual(metrics.at['annual_return', 'AGG.US'], short.at['annual_return', 'AGG.US'])
+        self.assertAlmostEqual(metrics.at['volatility', 'AGG.US'], short.at['volatility', 'AGG.US'])
+
+    def test_empty_column(self):
+        """Колонка без данных даёт NaN вместо ошибки"""
+        from services.metrics_engine import compute_metrics, trailing
+
+        returns = self.returns.copy()
+        returns['EMPTY'] = self.np.nan
+        metrics = compute_metrics(trailing(returns, 5.0))
+        self.assertTrue(metrics['EMPTY'].drop('years').isna().all())
+        self.assertEqual(len(trailing(returns, 5.0)), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Тесты для векторизованного движка прогнозов Монте-Карло
+"""
+
+import sys
+import os
+import importlib.util
+import unittest
+
+import numpy as np
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.monte_carlo import DISTRIBUTIONS, simulate_returns, simulate_wealth
+
+
+class TestSimulateReturns(unittest.TestCase):
+    """Тесты для simulate_returns"""
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.history = rng.normal(0.01, 0.04, size=240)
+
+    def test_shape_and_seed(self):
+        """Одинаковый seed дает одинаковые траектории"""
+        for distribution in DISTRIBUTIONS:
+            first = simulate_returns(self.history, 120, 500, distribution, seed=7)
+            second = simulate_returns(self.history, 120, 500, distribution, seed=7)
+            self.assertEqual(first.shape, (120, 500))
+            np.testing.assert_array_equal(first, second)
+
+        other = simulate_returns(self.history, 120, 500, 'norm', seed=8)
+        self.assertFalse(np.array_equal(other, simulate_returns(self.history, 120, 500, 'norm', seed=7)))
+
+    def test_moments_match_history(self):
+        """Среднее и разброс симуляции соответствуют истории"""
+        for distribution in ('norm', 't', 'bootstrap'):
+            simulated = simulate_returns(self.history, 120, 2000, distribution, seed=3)
+            self.assertAlmostEqual(simulated.mean(), self.history.mean(), delta=0.002)
+            self.assertAlmostEqual(simulated.std(), self.history.std(ddof=1), delta=0.004)
+
+    def test_bootstrap_uses_historical_values(self):
+        """Бутстрэп выбирает только исторические доходности"""
+        simulated = simulate_returns(self.history, 12, 100, 'bootstrap', seed=0)
+        self.assertTrue(np.isin(simulated, self.history).all())
+
+    def test_nan_is_ignored(self):
+        """Пропуски в истории не попадают в симуляцию"""
+        history = np.append(self.history, np.nan)
+        simulated = simulate_returns(history, 12, 10, 'bootstrap', seed=0)
+        self.assertFalse(np.isnan(simulated).any())
+
+    def test_invalid_input(self):
+        """Неизвестное распределение и короткая история отклоняются"""
+        with self.assertRaises(ValueError):
+            simulate_returns(self.history, 12, 10, 'cauchy')
+        with self.assertRaises(ValueError):
+            simulate_returns([0.01], 12, 10)
+
+
+class TestSimulateWealth(unittest.TestCase):
+    """Тесты для simulate_wealth"""
+
+    def test_wealth_paths(self):
+        """Траектории начинаются с текущей стоимости и накапливают доходности"""
+        history = np.array([0.01, 0.02, -0.01, 0.03])
+        result = simulate_wealth(history, years=1, n_paths=300, distribution='bootstrap', seed=5,
+                                 today_value=1000)
+        self.assertEqual(result.wealth.shape, (13, 300))
+        self.assertEqual(result.n_paths, 300)
+        self.assertAlmostEqual(result.years, 1.0)
+        np.testing.assert_array_equal(result.wealth[0], 1000)
+
+        returns = simulate_returns(history, 12, 300, 'bootstrap', seed=5)
+        np.testing.assert_allclose(result.final_values(), 1000 * np.prod(1 + returns, axis=0))
+
+    def test_percentiles_are_ordered(self):
+        """Процентили упорядочены на каждом шаге"""
+        result = simulate_wealth(np.random.default_rng(2).normal(0.005, 0.05, 120), years=5, seed=1)
+        bands = result.percentiles((10, 50, 90))
+        self.assertEqual(bands.shape, (61, 3))
+        self.assertTrue((np.diff(bands[1:], axis=1) > 0).all())
+
+    @unittest.skipUnless(importlib.util.find_spec('pandas'), 'pandas is not installed')
+    def test_bands_follow_history_dates(self):
+        """Индекс прогноза продолжает индекс истории"""
+        import pandas as pd
+
+        index = pd.period_range('2020-01', periods=24, freq='M')
+        returns = pd.Series(np.linspace(-0.02, 0.03, 24), index=index)
+        result = simulate_wealth(returns, years=2, n_paths=50, seed=0)
+
+        bands = result.bands()
+        self.assertEqual(list(bands.columns), [10, 50, 90])
+        self.assertEqual(bands.index[0], pd.Period('2021-12', freq='M'))
+        self.assertEqual(bands.index[-1], pd.Period('2023-12', freq='M'))
+        self.assertEqual(result.sample_paths(10).shape, (25, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Тесты для кэша объектов okama (TTL + LRU)
+"""
+
+import sys
+import os
+import time
+import threading
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.okama_cache import TTLLRUCache, make_key
+
+
+class TestTTLLRUCache(unittest.TestCase):
+    """Тесты для TTLLRUCache"""
+
+    def test_get_or_create_calls_factory_once(self):
+        """Фабрика вызывается только один раз для одного ключа"""
+        cache = TTLLRUCache(max_items=10, ttl=60)
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        first = cache.get_or_create('key', factory)
+        second = cache.get_or_create('key', factory)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+    def test_factory_is_not_run_in_parallel_while_callers_wait(self):
+        """Пока есть ожидающие вызовы, новый вызов не получает свою блокировку ключа"""
+        cache = TTLLRUCache(max_items=10, ttl=60)
+        state = {'running': 0, 'max_running': 0}
+        state_lock = threading.Lock()
+
+        def factory():
+            with state_lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'], state['running'])
+            time.sleep(0.05)
+            with state_lock:
+                state['running'] -= 1
+            raise RuntimeError("download failed")
+
+        def call():
+            try:
+                cache.get_or_create('key', factory)
+            except RuntimeError:
+                pass
+
+        threads = []
+        for delay in (0.0, 0.01, 0.07):
+            thread = threading.Thread(target=call)
+            threads.append(thread)
+            time.sleep(delay)
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(state['max_running'], 1)
+        self.assertEqual(cache._key_locks, {})
+
+    def test_lru_eviction(self):
+        """Наименее используемый элемент вытесняется при переполнении"""
+        cache = TTLLRUCache(max_items=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_eviction_by_size(self):
+        """При заданном бюджете в байтах вытесняются старые элементы, слишком большие не хранятся"""
+        cache = TTLLRUCache(max_items=10, ttl=60, max_bytes=10, sizeof=len)
+        cache.set('a', b'1234')
+        cache.set('b', b'1234')
+        cache.set('c', b'1234')
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get_stats()['size_bytes'], 8)
+        self.assertFalse(cache.set('d', b'x' * 11))
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry(self):
+        """Просроченные элементы не возвращаются"""
+        cache = TTLLRUCache(max_items=10, ttl=0.01)
+        cache.set('a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
+
+
+class TestMakeKey(unittest.TestCase):
+    """Тесты для построения ключей кэша"""
+
+    def test_positional_and_keyword_assets_match(self):
+        """Позиционные и именованные активы дают одинаковый ключ"""
+        key1 = make_key('Portfolio', (['SPY.US', 'AGG.US'],), {'weights': [0.6, 0.4], 'ccy': 'USD'})
+        key2 = make_key('Portfolio', (), {'assets': ['SPY.US', 'AGG.US'], 'weights': (0.6, 0.4), 'ccy': 'USD'})
+        self.assertEqual(key1, key2)
+
+    def test_dates_and_currency_are_part_of_key(self):
+        """Валюта и даты входят в ключ"""
+        base = make_key('AssetList', (['SPY.US'],), {'ccy': 'USD'})
+        other_ccy = make_key('AssetList', (['SPY.US'],), {'ccy': 'EUR'})
+        with_dates = make_key('AssetList', (['SPY.US'],), {'ccy': 'USD', 'first_date': '2020-01-01'})
+        self.assertNotEqual(base, other_ccy)
+        self.assertNotEqual(base, with_dates)
+        hash(with_dates)
+
+
+if __name__ == '__main__':
+    unittest.main()
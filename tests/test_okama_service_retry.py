@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Тесты для повторных попыток вызовов OKAMA в OkamaService
+"""
+
+import sys
+import os
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.circuit_breaker import okama_breaker
+from services.okama_service import OkamaService
+
+
+class TestOkamaServiceRetry(unittest.TestCase):
+    """Тесты для _retry_with_backoff и run_with_retry"""
+
+    def setUp(self):
+        okama_breaker.reset()
+        self.service = OkamaService(max_retries=2, backoff_factor=0)
+        self.calls = 0
+
+    def tearDown(self):
+        okama_breaker.reset()
+
+    def flaky(self):
+        self.calls += 1
+        if self.calls < 3:
+            raise ConnectionError('502 Bad Gateway')
+        return 'ok'
+
+    def test_blocking_retry_in_worker_thread(self):
+        """В рабочем потоке блокирующие повторы сохраняются"""
+        self.assertEqual(self.service._retry_with_backoff(self.flaky), 'ok')
+        self.assertEqual(self.calls, 3)
+
+    def test_blocking_retry_does_not_sleep_on_event_loop(self):
+        """В цикле событий блокирующий помощник делает одну попытку без sleep"""
+        async def scenario():
+            return self.service._retry_with_backoff(self.flaky)
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(scenario())
+        self.assertEqual(self.calls, 1)
+
+    def test_run_with_retry_retries_in_pool(self):
+        """run_with_retry повторяет попытки в пуле данных"""
+        self.assertEqual(asyncio.run(self.service.run_with_retry(self.flaky)), 'ok')
+        self.assertEqual(self.calls, 3)
+
+
+
+class TestOkamaServiceStoreThrottle(unittest.TestCase):
+    """Тесты для ограничения записей в резервный кэш"""
+
+    def test_single_write_per_key_from_many_threads(self):
+        """Из нескольких потоков запись по ключу разрешается один раз"""
+        service = OkamaService()
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: service._should_store('info:SPY.US'), range(64)))
+        self.assertEqual(results.count(True), 1)
+
+    def test_remembered_keys_are_bounded(self):
+        """Число запомненных ключей ограничено STORE_MAX_KEYS"""
+        class SmallService(OkamaService):
+            STORE_MAX_KEYS = 10
+
+        service = SmallService()
+        for i in range(100):
+            self.assertTrue(service._should_store(f"info:{i}"))
+        self.assertEqual(len(service._last_stored), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Тесты для предрасчитанных метрик /info по периодам
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.period_metrics import AssetSnapshot, PeriodMetricsCache, PriceHistory
+
+
+def reference_metrics(prices, days):
+    """Прямой расчет по срезу, как это делалось раньше"""
+    window = prices[-days:] if days else prices
+    returns = window[1:] / window[:-1] - 1
+    total_return = np.prod(1 + returns) - 1
+    volatility = returns.std(ddof=1) * np.sqrt(252)
+    max_drawdown = (window / np.maximum.accumulate(window) - 1).min()
+    return total_return, volatility, max_drawdown
+
+
+class FakeAsset:
+    """Минимальная замена ok.Asset"""
+
+    def __init__(self, prices):
+        self.close_daily = prices
+        self.name = 'Test Asset'
+        self.currency = 'USD'
+        self.exchange = 'NYSE'
+        self.dividend_yield = 0.02
+        self.accessed = 0
+
+    def __getattribute__(self, item):
+        if item == 'close_daily':
+            object.__setattr__(self, 'accessed', object.__getattribute__(self, 'accessed') + 1)
+        return object.__getattribute__(self, item)
+
+
+class TestPriceHistory(unittest.TestCase):
+    """Тесты для PriceHistory"""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.prices = 100 * np.cumprod(1 + rng.normal(0.0003, 0.01, size=2000))
+        self.history = PriceHistory(self.prices)
+
+    def test_windows_match_direct_calculation(self):
+        """Метрики по префиксным суммам совпадают с прямым расчетом"""
+        for days in (252, 1260, None):
+            total_return, volatility, max_drawdown = reference_metrics(self.prices, days)
+            self.assertAlmostEqual(self.history.total_return(days), total_return, places=9)
+            self.assertAlmostEqual(self.history.volatility(days), volatility, places=9)
+            self.assertAlmostEqual(self.history.max_drawdown(days), max_drawdown, places=12)
+
+    def test_window_longer_than_history(self):
+        """Окно длиннее истории означает всю историю"""
+        history = PriceHistory([100.0, 110.0, 99.0])
+        self.assertAlmostEqual(history.total_return(1260), -0.01)
+        self.assertAlmostEqual(history.max_drawdown(1260), -0.1)
+
+    def test_nan_prices_are_skipped(self):
+        """Пропуски в ценах не ломают расчет"""
+        history = PriceHistory([100.0, np.nan, 110.0])
+        self.assertEqual(len(history), 2)
+        self.assertAlmostEqual(history.total_return(), 0.1)
+        self.assertIsNone(history.volatility())
+
+    def test_empty_history(self):
+        """Пустая история не дает метрик"""
+        snapshot = AssetSnapshot('EMPTY', PriceHistory([]))
+        self.assertEqual(snapshot.metrics('1Y'), {})
+
+
+class TestAssetSnapshot(unittest.TestCase):
+    """Тесты для AssetSnapshot и кэша"""
+
+    def setUp(self):
+        self.prices = np.linspace(100, 200, 1500)
+        self.asset = FakeAsset(self.prices)
+
+    def test_metrics_for_periods(self):
+        """CAGR считается по длине периода"""
+        snapshot = AssetSnapshot.from_asset(self.asset, 'TEST.US')
+
+        one_year = snapshot.metrics('1Y')
+        self.assertEqual(one_year['data_points'], 252)
+        expected = self.prices[-1] / self.prices[-252] - 1
+        self.assertAlmostEqual(one_year['cagr'], expected)
+        self.assertAlmostEqual(one_year['price_change_pct'], expected * 100)
+        self.assertAlmostEqual(one_year['current_price'], 200.0)
+        self.assertAlmostEqual(one_year['dividend_yield'], 0.02)
+
+        full = snapshot.metrics('MAX')
+        self.assertEqual(full['data_points'], 1500)
+        self.assertAlmostEqual(full['cagr'], 2.0 ** (252 / 1500) - 1)
+        self.assertEqual(full['max_drawdown'], 0.0)
+
+    def test_snapshot_keeps_header_fields(self):
+        """Снимок можно передавать в форматтер вместо актива"""
+        snapshot = AssetSnapshot.from_asset(self.asset, 'TEST.US')
+        self.assertEqual(snapshot.name, 'Test Asset')
+        self.assertEqual(snapshot.currency, 'USD')
+        self.assertEqual(snapshot.isin, 'N/A')
+
+    def test_cache_builds_snapshot_once(self):
+        """Переключение периодов не обращается к активу повторно"""
+        cache = PeriodMetricsCache(max_items=4, ttl=60)
+        for period in ('1Y', '5Y', 'MAX'):
+            cache.get_or_build('TEST.US', self.asset).metrics(period)
+        self.assertEqual(self.asset.accessed, 1)
+        self.assertIsNotNone(cache.get('TEST.US'))
+
+    def test_prices_override_asset_data(self):
+        """Цены из хранилища используются вместо close_daily актива"""
+        snapshot = AssetSnapshot.from_asset(self.asset, 'TEST.US', prices=[1.0, 2.0])
+        self.assertEqual(self.asset.accessed, 0)
+        self.assertAlmostEqual(snapshot.metrics('1Y')['price_change_pct'], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Тесты для производных рядов портфеля, вычисляемых один раз
+"""
+
+import sys
+import os
+import gc
+import unittest
+
+import pandas as pd
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.portfolio_series import PortfolioSeriesCache
+
+
+class FakePortfolio:
+    """Портфель, считающий обращения к свойствам okama"""
+
+    def __init__(self):
+        self.calls = {}
+        index = pd.period_range('2020-01', periods=6, freq='M')
+        self._wealth = pd.DataFrame({'PF': [1000.0, 1100.0, 990.0, 1050.0, 1200.0, 1150.0]}, index=index)
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @property
+    def wealth_index(self):
+        self._count('wealth_index')
+        return self._wealth
+
+    @property
+    def drawdowns(self):
+        self._count('drawdowns')
+        wealth = self._wealth['PF']
+        return wealth / wealth.cummax() - 1.0
+
+    @property
+    def recovery_period(self):
+        self._count('recovery_period')
+        return pd.Series([2.0, 12.0], index=self._wealth.index[:2])
+
+    @property
+    def annual_return_ts(self):
+        self._count('annual_return_ts')
+        return pd.Series([0.15], index=pd.period_range('2020', periods=1, freq='Y'))
+
+    def get_rolling_cagr(self, window=12):
+        self._count(f'rolling_cagr_{window}')
+        return pd.Series([0.1, 0.2])
+
+
+class TestPortfolioSeries(unittest.TestCase):
+    """Тесты для PortfolioSeriesCache"""
+
+    def setUp(self):
+        self.cache = PortfolioSeriesCache()
+
+    def test_series_are_computed_once(self):
+        """Повторное обращение не пересчитывает ряды"""
+        portfolio = FakePortfolio()
+        for _ in range(3):
+            series = self.cache.get(portfolio)
+            series.drawdowns
+            series.largest_drawdowns(5)
+            series.annual_returns
+            series.rolling_cagr()
+            series.wealth
+
+        self.assertEqual(portfolio.calls, {
+            'drawdowns': 1, 'annual_return_ts': 1, 'rolling_cagr_12': 1, 'wealth_index': 1
+        })
+        self.assertEqual(self.cache.get_stats()['hits'], 2)
+
+    def test_values(self):
+        """Значения совпадают с исходными свойствами"""
+        portfolio = FakePortfolio()
+        series = self.cache.get(portfolio)
+
+        self.assertAlmostEqual(series.drawdowns.min(), -0.1)
+        self.assertEqual(list(series.wealth), [1000.0, 1100.0, 990.0, 1050.0, 1200.0, 1150.0])
+        self.assertEqual(list(series.longest_recoveries(1)), [1.0])
+        self.assertEqual(series.rolling_cagr(window=24).tolist(), [0.1, 0.2])
+        self.assertEqual(portfolio.calls['rolling_cagr_24'], 1)
+
+    def test_missing_attribute_is_none(self):
+        """Отсутствующий у объекта ряд возвращается как None"""
+        asset_list = type('AssetListLike', (), {})()
+        series = self.cache.get(asset_list)
+        self.assertIsNone(series.recovery_period)
+        self.assertIsNone(series.dividend_yield)
+
+    def test_bundle_follows_portfolio_lifetime(self):
+        """Набор рядов удаляется вместе с портфелем"""
+        portfolio = FakePortfolio()
+        self.cache.get(portfolio).drawdowns
+        self.assertEqual(self.cache.get_stats()['size'], 1)
+
+        del portfolio
+        gc.collect()
+        self.assertEqual(self.cache.get_stats()['size'], 0)
+
+    def test_portfolios_do_not_share_bundles(self):
+        """У разных портфелей разные наборы рядов"""
+        first, second = FakePortfolio(), FakePortfolio()
+        self.assertIsNot(self.cache.get(first), self.cache.get(second))
+        self.assertIs(self.cache.get(first), self.cache.get(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
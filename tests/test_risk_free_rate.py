@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Тесты для сервиса безрисковых ставок
+"""
+
+import sys
+import os
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.risk_free_rate import RiskFreeRateService, period_bucket, rate_symbols_for
+
+
+class FakeSeries(list):
+    """Минимальная замена pandas Series: список со средним значением"""
+
+    def mean(self):
+        return sum(self) / len(self)
+
+
+class TestPeriodBuckets(unittest.TestCase):
+    """Тесты для разбиения периодов на корзины"""
+
+    def test_bucket_bounds(self):
+        """Граница корзины включается в неё"""
+        self.assertIsNone(period_bucket(None))
+        self.assertEqual(period_bucket(0.25), 0)
+        self.assertEqual(period_bucket(0.3), 1)
+        self.assertEqual(period_bucket(1.0), 2)
+        self.assertEqual(period_bucket(5.0), 4)
+        self.assertEqual(period_bucket(10), 5)
+
+    def test_cny_symbol_depends_on_period(self):
+        """Для CNY на длинных периодах используется 5-летняя LPR"""
+        self.assertEqual(rate_symbols_for('cny', period_bucket(1)), ['CHN_LPR1.RATE'])
+        self.assertEqual(rate_symbols_for('CNY', period_bucket(10)), ['CHN_LPR5.RATE'])
+        self.assertEqual(rate_symbols_for('JPY', None), [])
+
+
+class TestRiskFreeRateService(unittest.TestCase):
+    """Тесты для RiskFreeRateService"""
+
+    def setUp(self):
+        self.calls = []
+        self.data = {
+            'US_EFFR.RATE': FakeSeries([0.02, 0.04]),
+            'CHN_LPR1.RATE': FakeSeries([0.03]),
+        }
+
+        def fetcher(symbol):
+            self.calls.append(symbol)
+            if symbol not in self.data:
+                raise ConnectionError("502 Bad Gateway")
+            return self.data[symbol]
+
+        self.service = RiskFreeRateService(refresh_interval=3600, fetcher=fetcher)
+
+    def test_fallback_before_warm_up(self):
+        """До загрузки рядов используются резервные ставки без обращения к сети"""
+        self.assertAlmostEqual(self.service.get_rate('USD', 5), 0.05)
+        self.assertAlmostEqual(self.service.get_rate('CNY', 10), 0.04)
+        self.assertEqual(self.calls, [])
+
+    def test_fixed_rates(self):
+        """HKD и RUB не зависят от okama"""
+        self.assertAlmostEqual(self.service.get_rate('HKD'), 0.0285)
+        self.assertAlmostEqual(self.service.get_rate('RUB', 0.2), 0.08)
+        self.assertAlmostEqual(self.service.get_rate('RUB', 7), 0.105)
+        self.assertAlmostEqual(self.service.get_rate('RUB'), 0.09)
+
+    def test_refresh_loads_series_and_recomputes_rates(self):
+        """После прогрева ставка считается по ряду okama"""
+        self.assertAlmostEqual(self.service.get_rate('USD', 5), 0.05)
+
+        results = self.service.refresh()
+
+        self.assertTrue(results['US_EFFR.RATE'])
+        self.assertFalse(results['UK_BR.RATE'])
+        self.assertAlmostEqual(self.service.get_rate('USD', 5), 0.03)
+        self.assertAlmostEqual(self.service.get_rate('CNY', 1), 0.03)
+        self.assertIs(self.service.get_series('USD'), self.data['US_EFFR.RATE'])
+        self.assertIsNone(self.service.get_series('GBP'))
+        self.assertIn('UK_BR.RATE', self.service.get_stats()['failed'])
+
+    def test_rate_is_memoized_per_bucket(self):
+        """Повторные запросы в той же корзине берутся из памяти"""
+        self.service.refresh()
+        self.service.get_rate('USD', 4)
+        self.service.get_rate('usd', 4.5)
+        self.service.get_rate('USD', 2)
+
+        stats = self.service.get_stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_failed_refresh_keeps_previous_series(self):
+        """Неудачное обновление не затирает ранее загруженный ряд"""
+        self.service.refresh(['US_EFFR.RATE'])
+        del self.data['US_EFFR.RATE']
+
+        results = self.service.refresh(['US_EFFR.RATE'], force=True)
+
+        self.assertTrue(results['US_EFFR.RATE'])
+        self.assertAlmostEqual(self.service.get_rate('USD'), 0.03)
+
+    def test_fresh_series_is_not_downloaded_again(self):
+        """Без force свежие ряды не перезагружаются"""
+        self.service.refresh(['US_EFFR.RATE'])
+        self.service.refresh(['US_EFFR.RATE'])
+        self.assertEqual(self.calls, ['US_EFFR.RATE'])
+
+
+if __name__ == '__main__':
+    unittest.main()
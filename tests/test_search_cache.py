@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Тесты для кэша результатов поиска
+"""
+
+import sys
+import os
+import time
+import unittest
+import threading
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.search_cache import SearchCache, normalize_query
+
+
+class TestSearchCache(unittest.TestCase):
+    """Тесты для SearchCache"""
+
+    def setUp(self):
+        self.cache = SearchCache(max_items=16, ttl=60, negative_ttl=0.05)
+        self.calls = []
+
+    def search(self, result):
+        def run():
+            self.calls.append(result)
+            return result
+        return run
+
+    def test_normalized_query_shares_entry(self):
+        """Регистр и пробелы запроса не создают новых запросов к провайдеру"""
+        self.assertEqual(normalize_query("  Apple   Inc "), "apple inc")
+        first = self.cache.get_or_search('okama', 'Apple Inc', self.search([{'symbol': 'AAPL.US'}]))
+        second = self.cache.get_or_search('okama', ' apple  INC', self.search([{'symbol': 'MSFT.US'}]))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+
+    def test_sources_and_extra_keys_are_separate(self):
+        """Источник и дополнительные части ключа различают записи"""
+        self.cache.get_or_search('okama', 'tencent', self.search([1]))
+        self.cache.get_or_search('tushare', 'tencent', self.search([2]), 'CN')
+        self.assertEqual(self.cache.get_or_search('tushare', 'tencent', self.search([3]), 'HKEX'), [3])
+        self.assertEqual(len(self.calls), 3)
+
+    def test_negative_results_use_short_ttl(self):
+        """Пустой результат кэшируется на отрицательный TTL"""
+        self.assertEqual(self.cache.get_or_search('okama', 'aplpe', self.search([])), [])
+        self.assertEqual(self.cache.get_or_search('okama', 'aplpe', self.search([])), [])
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.cache.get_stats()['negative_hits'], 1)
+
+        time.sleep(0.06)
+        self.assertEqual(self.cache.get_or_search('okama', 'aplpe', self.search(['AAPL.US'])), ['AAPL.US'])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_errors_are_not_cached(self):
+        """Ошибка провайдера пробрасывается и не кэшируется"""
+        def failing():
+            raise ConnectionError("down")
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get_or_search('okama', 'sber', failing)
+        self.assertEqual(self.cache.get_or_search('okama', 'sber', self.search(['SBER.MOEX'])), ['SBER.MOEX'])
+
+    def test_results_are_copies(self):
+        """Изменение возвращенного списка не портит кэш"""
+        result = self.cache.get_or_search('okama', 'gold', self.search(['GC.COMM']))
+        result.append('junk')
+        self.assertEqual(self.cache.get_or_search('okama', 'gold', self.search([])), ['GC.COMM'])
+
+    def test_concurrent_searches_share_one_call(self):
+        """Одновременные одинаковые запросы выполняют один поиск"""
+        def slow_search():
+            time.sleep(0.05)
+            self.calls.append(1)
+            return ['SPY.US']
+
+        threads = [threading.Thread(target=self.cache.get_or_search, args=('okama', 'spy', slow_search))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.cache.get_stats()['provider_calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Тесты для нечеткого поиска по встроенному индексу MOEX
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import unittest
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.search_embedded import (
+    MoexSearchIndex, EMBEDDED, load_default_index, lat_to_ru, normalize_text, ru_to_lat, trigrams
+)
+import services.search_embedded as search_embedded
+
+QUERIES = ['сбербанк', 'gazprom', 'лукойл', 'yandex', 'норильский никель', 'tatneft pref', 'xyzzy',
+           'сбер', 'газпрон', 'lukoyl', 'аэрофлот', 'магнет', 'polus', 'втб', 'novatek', 'роснефт', '']
+
+
+def brute_force_search(index, query, top_k=5, min_score=0.45):
+    """Полный перебор всех алиасов (поведение до индекса триграмм)"""
+    qn = normalize_text(query)
+    scores = {}
+    for v in dict.fromkeys((qn, ru_to_lat(qn), lat_to_ru(qn))):
+        for alias, symbol in index.alias2symbol.items():
+            score = index._score(v, alias)
+            if score >= scores.get(symbol, (0.0, ""))[0]:
+                scores[symbol] = (score, alias)
+    ranked = sorted([(s, sc, al) for s, (sc, al) in scores.items() if sc >= min_score],
+                    key=lambda x: x[1], reverse=True)
+    return ranked[:top_k]
+
+
+class TestMoexSearchIndex(unittest.TestCase):
+    """Тесты для MoexSearchIndex"""
+
+    def test_trigrams_are_padded(self):
+        """Короткие строки тоже дают триграммы"""
+        self.assertEqual(trigrams('ab'), {'  a', ' ab', 'ab '})
+
+    def test_matches_brute_force_on_embedded_list(self):
+        """На встроенном списке результаты совпадают с полным перебором"""
+        index = load_default_index()
+        for query in QUERIES:
+            with self.subTest(query=query):
+                expected = [(s, round(sc, 9), al) for s, sc, al in brute_force_search(index, query)]
+                actual = [(s, round(sc, 9), al) for s, sc, al in index.search(query)]
+                self.assertEqual(actual, expected)
+
+    def test_large_universe_keeps_best_matches(self):
+        """На большом списке лучшие результаты совпадают с полным перебором"""
+        rng = random.Random(1)
+        syllables = [c + v for c in 'bcdfghklmnprstvz' for v in 'aeiou'] + ['neft', 'gaz', 'bank', 'prom']
+        index = MoexSearchIndex()
+        index.build_from_embedded()
+        for k in range(1000):
+            name = ' '.join(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+                            for _ in range(rng.randint(1, 3)))
+            index.add_asset(f"T{k}.MOEX", name)
+
+        for query in ['сбербанк', 'gazprom', 'норильский никель', 'аэрофлот']:
+            with self.subTest(query=query):
+                expected = brute_force_search(index, query, top_k=3)
+                self.assertEqual([r[0] for r in index.search(query, top_k=3)], [r[0] for r in expected])
+
+    def test_duplicate_alias_keeps_first_symbol(self):
+        """Повторяющийся алиас остается за первым символом и индексируется один раз"""
+        index = MoexSearchIndex()
+        index.add_asset("SBER.MOEX", "Sberbank")
+        index.add_asset("SBERP.MOEX", "Sberbank")
+
+        self.assertEqual(index.alias2symbol['sberbank'], "SBER.MOEX")
+        self.assertEqual(index._aliases.count('sberbank'), 1)
+        self.assertEqual(index.search('sberbank')[0][0], "SBER.MOEX")
+
+
+class TestPrebuiltIndex(unittest.TestCase):
+    """Тесты для сериализованного индекса"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'search_index.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Загруженный индекс совпадает с построенным"""
+        built = load_default_index(self.path)
+        built.add_asset("T1.MOEX", "Test Company")
+        built.save(self.path)
+        loaded = MoexSearchIndex.load(self.path)
+
+        self.assertEqual(loaded.dump_aliases(), built.dump_aliases())
+        self.assertEqual(loaded.alias2symbol, built.alias2symbol)
+        for query in QUERIES + ['test company']:
+            with self.subTest(query=query):
+                self.assertEqual(loaded.search(query), built.search(query))
+
+    def test_stale_index_is_rebuilt(self):
+        """Индекс с другой версией не используется, индекс строится заново"""
+        index = MoexSearchIndex()
+        index.add_asset("T1.MOEX", "Test Company")
+        index.save(self.path)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        payload['version'] = 'stale'
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+
+        with self.assertRaises(ValueError):
+            MoexSearchIndex.load(self.path)
+        self.assertEqual(len(load_default_index(self.path).assets), len(dict(EMBEDDED)))
+
+    def test_committed_index_is_current(self):
+        """Собранный индекс в репозитории соответствует EMBEDDED (scripts/build_search_index.py)"""
+        index = MoexSearchIndex.load(search_embedded.SEARCH_INDEX_PATH)
+        built = MoexSearchIndex()
+        built.build_from_embedded()
+        for symbol, aliases in built.dump_aliases().items():
+            self.assertEqual(index.assets[symbol].aliases, aliases)
+
+
+if __name__ == '__main__':
+    unittest.main()
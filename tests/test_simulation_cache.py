@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Тесты для общего кэша симуляций прогнозов
+"""
+
+import sys
+import os
+import threading
+import unittest
+
+import numpy as np
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.monte_carlo import simulate_wealth
+from services.simulation_cache import SimulationCache, make_simulation_key
+
+
+HISTORY = np.random.default_rng(0).normal(0.006, 0.04, size=180)
+
+
+def make_key(seed=42, distribution='norm'):
+    return make_simulation_key(['SPY.US', 'AGG.US'], [0.6, 0.4], 'USD', '2010-01', '2024-12',
+                               distribution, 10, 1000, seed)
+
+
+class TestSimulationCache(unittest.TestCase):
+    """Тесты для SimulationCache"""
+
+    def setUp(self):
+        self.runs = 0
+
+    def simulate(self, seed=42):
+        self.runs += 1
+        return simulate_wealth(HISTORY, years=10, n_paths=1000, seed=seed, today_value=3500.0)
+
+    def test_run_is_shared_and_compact(self):
+        """Одна симуляция хранится как нормированный float32 массив"""
+        cache = SimulationCache()
+        first = cache.get_or_create(make_key(), self.simulate)
+        second = cache.get_or_create(make_key(), self.simulate)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(first.wealth.dtype, np.float32)
+        np.testing.assert_array_equal(first.wealth[0], 1.0)
+        self.assertEqual(cache.get_stats()['size_bytes'], 121 * 1000 * 4)
+
+    def test_rescaled_outputs_match_original(self):
+        """Масштабированные процентили совпадают с исходной симуляцией"""
+        cache = SimulationCache()
+        stored = cache.get_or_create(make_key(), self.simulate)
+        original = self.simulate()
+
+        np.testing.assert_allclose(stored.rescaled(3500.0).percentiles(), original.percentiles(), rtol=1e-5)
+        np.testing.assert_allclose(stored.rescaled(1000).final_values(),
+                                   original.final_values() / 3500.0 * 1000, rtol=1e-5)
+
+    def test_different_parameters_are_separate(self):
+        """Другой seed или распределение - другая симуляция"""
+        cache = SimulationCache()
+        cache.get_or_create(make_key(seed=1), lambda: self.simulate(seed=1))
+        cache.get_or_create(make_key(seed=2), lambda: self.simulate(seed=2))
+        cache.get_or_create(make_key(distribution='t'), self.simulate)
+        self.assertEqual(self.runs, 3)
+        self.assertEqual(len(cache), 3)
+
+    def test_eviction_by_size(self):
+        """Старые симуляции вытесняются при превышении бюджета памяти"""
+        cache = SimulationCache(max_bytes=2 * 121 * 1000 * 4)
+        for seed in range(3):
+            cache.get_or_create(make_key(seed=seed), lambda: self.simulate(seed=seed))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+        self.assertIsNone(cache.get(make_key(seed=0)))
+        self.assertIsNotNone(cache.get(make_key(seed=2)))
+
+    def test_concurrent_requests_run_once(self):
+        """Одновременные запросы ждут одну симуляцию"""
+        cache = SimulationCache()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_create(make_key(), self.simulate)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.runs, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_summary(self):
+        """Сводка для подписей и AI-анализа считается из той же симуляции"""
+        cache = SimulationCache()
+        summary = cache.get_or_create(make_key(), self.simulate).rescaled(1000).summary()
+
+        self.assertEqual(summary['n_paths'], 1000)
+        self.assertAlmostEqual(summary['today_value'], 1000)
+        self.assertLess(summary['final_value'][10], summary['final_value'][90])
+        self.assertTrue(0.0 <= summary['probability_of_loss'] <= 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
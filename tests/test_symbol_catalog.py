@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Тесты для локального каталога символов пространств имен okama
+"""
+
+import sys
+import os
+import time
+import unittest
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.circuit_breaker import CircuitBreaker, okama_breaker
+from services.symbol_catalog import NamespaceListing, SymbolCatalog
+
+
+LISTINGS = {
+    'US': pd.DataFrame({
+        'symbol': ['AAPL.US', 'AA.US', 'MSFT.US', 'SPY.US'],
+        'ticker': ['AAPL', 'AA', 'MSFT', 'SPY'],
+        'name': ['Apple Inc', 'Alcoa Corp', 'Microsoft Corp', np.nan],
+        'country': ['USA'] * 4,
+        'exchange': ['NASDAQ', 'NYSE', 'NASDAQ', 'NYSE ARCA'],
+        'currency': ['USD'] * 4,
+        'type': ['Common Stock', 'Common Stock', 'Common Stock', 'ETF'],
+        'isin': ['US0378331005', 'US0138721065', 'US5949181045', 'US78462F1030'],
+    }),
+    'XETR': pd.DataFrame({
+        'symbol': ['AAPL.XETR', 'SAP.XETR'],
+        'name': ['Apple Inc', 'SAP SE'],
+        'isin': ['US0378331005', 'DE0007164600'],
+    }),
+}
+
+INFL = pd.DataFrame({
+    'symbol': ['EUR.INFL', 'RUB.INFL', 'USD.INFL'],
+    'name': ['EU Inflation', 'Russia Inflation', 'US Inflation'],
+})
+
+
+class TestSymbolCatalog(unittest.TestCase):
+    """Тесты для SymbolCatalog"""
+
+    def setUp(self):
+        self.calls = []
+        self.fail = set()
+        self.breaker = CircuitBreaker('catalog_test', failure_threshold=100)
+        self.catalog = SymbolCatalog(refresh_interval=3600, fetcher=self.fetch,
+                                     namespaces_fetcher=lambda: ['XETR', 'US'],
+                                     refresh_breaker=self.breaker)
+        okama_breaker.reset()
+
+    def tearDown(self):
+        okama_breaker.reset()
+
+    def fetch(self, namespace):
+        self.calls.append(namespace)
+        if namespace in self.fail or namespace not in LISTINGS:
+            raise ConnectionError(f"cannot load {namespace}")
+        return LISTINGS[namespace]
+
+    def test_pages_are_slices(self):
+        """Страницы - срезы колонок, пропущенные значения заменяются на N/A"""
+        listing = NamespaceListing.from_frame('US', LISTINGS['US'])
+        self.assertEqual(len(listing), 4)
+        self.assertEqual(listing.page(0, 3), [
+            {'symbol': 'AAPL.US', 'name': 'Apple Inc'},
+            {'symbol': 'AA.US', 'name': 'Alcoa Corp'},
+            {'symbol': 'MSFT.US', 'name': 'Microsoft Corp'},
+        ])
+        self.assertEqual(listing.page(1, 3), [{'symbol': 'SPY.US', 'name': 'N/A'}])
+        self.assertEqual(listing.page(2, 3), [])
+
+    def test_to_frame_keeps_okama_columns(self):
+        """Экспорт возвращает исходные колонки okama"""
+        listing = NamespaceListing.from_frame('XETR', LISTINGS['XETR'])
+        frame = listing.to_frame()
+        self.assertEqual(list(frame.columns), ['symbol', 'name', 'isin'])
+        pd.testing.assert_frame_equal(frame, LISTINGS['XETR'], check_dtype=False)
+        self.assertEqual(listing.row(1)['currency'], '')
+
+    def test_refresh_loads_all_namespaces(self):
+        """Обновление загружает все пространства имен и не скачивает свежие повторно"""
+        self.assertEqual(self.catalog.refresh(), {'XETR': True, 'US': True})
+        self.assertEqual(self.catalog.refresh(), {'XETR': True, 'US': True})
+        self.assertEqual(self.calls, ['XETR', 'US'])
+        self.assertEqual(self.catalog.get_stats()['symbols'], 6)
+
+    def test_failed_refresh_keeps_listing(self):
+        """Ошибка обновления сохраняет предыдущий список"""
+        self.catalog.refresh(['US'])
+        self.fail.add('US')
+        self.assertEqual(self.catalog.refresh(['US', 'LSE'], force=True), {'US': True, 'LSE': False})
+        self.assertEqual(len(self.catalog.get_loaded('US')), 4)
+        self.assertIn('LSE', self.catalog.get_stats()['failed'])
+
+    def test_refresh_failures_use_own_breaker(self):
+        """Ошибки фонового обновления не открывают общий breaker okama"""
+        self.catalog.refresh(['LSE'])
+        self.assertEqual(self.breaker.get_stats()['consecutive_failures'], 1)
+        self.assertEqual(okama_breaker.get_stats()['consecutive_failures'], 0)
+
+        with self.assertRaises(ConnectionError):
+            self.catalog.get_namespace('LSE')
+        self.assertEqual(okama_breaker.get_stats()['consecutive_failures'], 1)
+
+    def test_slow_namespace_does_not_block_others(self):
+        """Зависшее обновление одного пространства не блокирует другие"""
+        release = threading.Event()
+
+        def fetch(namespace):
+            if namespace == 'US':
+                release.wait(5)
+            return self.fetch(namespace)
+
+        self.catalog.fetcher = fetch
+        stuck = threading.Thread(target=self.catalog.refresh, args=(['US'],))
+        stuck.start()
+        try:
+            time.sleep(0.05)
+            self.assertEqual(self.catalog.refresh(['XETR']), {'XETR': True})
+        finally:
+            release.set()
+            stuck.join()
+
+    def test_lookups_without_network(self):
+        """Поиск по ISIN и тикеру идет по загруженным спискам с приоритетом US"""
+        self.catalog.refresh()
+        self.calls.clear()
+
+        self.assertEqual(self.catalog.find_isin('us0378331005')['symbol'], 'AAPL.US')
+        self.assertEqual(self.catalog.find_isin('DE0007164600')['symbol'], 'SAP.XETR')
+        self.assertIsNone(self.catalog.find_isin('GB0000000000'))
+
+        self.assertEqual(self.catalog.find_ticker('aapl', namespaces=['US', 'XETR'])['symbol'], 'AAPL.US')
+        self.assertEqual(self.catalog.find_ticker('AAPL', namespaces=['XETR'])['symbol'], 'AAPL.XETR')
+        self.assertEqual(self.catalog.find_ticker('AA', namespaces=['US', 'XETR'])['symbol'], 'AA.US')
+        self.assertIsNone(self.catalog.find_ticker('AAP', namespaces=['US', 'XETR']))
+        self.assertEqual([row['symbol'] for row in self.catalog.find_prefix('AA', limit=3)],
+                         ['AA.US', 'AAPL.US', 'AAPL.XETR'])
+        self.assertEqual(self.calls, [])
+
+    def test_ticker_is_not_resolved_from_non_exchange_namespaces(self):
+        """Тикер не разрешается в INFL и не разрешается, пока приоритетные биржи не загружены"""
+        self.catalog.fetcher = lambda namespace: INFL if namespace == 'INFL' else self.fetch(namespace)
+        self.catalog.refresh(['INFL', 'XETR'])
+
+        # US еще не загружен: поиск передается okama
+        self.assertIsNone(self.catalog.find_ticker('EUR'))
+        self.assertIsNone(self.catalog.find_ticker('SAP'))
+
+        # INFL не входит в приоритетные пространства имен
+        self.catalog.refresh(['US'])
+        self.assertIsNone(self.catalog.find_ticker('EUR', namespaces=['US', 'XETR']))
+        self.assertEqual(self.catalog.find_ticker('SAP', namespaces=['US', 'XETR'])['symbol'], 'SAP.XETR')
+
+    def test_on_demand_load_is_single_flight(self):
+        """Незагруженное пространство скачивается один раз при одновременных запросах"""
+        def slow_fetch(namespace):
+            time.sleep(0.05)
+            return self.fetch(namespace)
+
+        self.catalog.fetcher = slow_fetch
+        threads = [threading.Thread(target=self.catalog.get_namespace, args=('us',)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, ['US'])
+        self.assertEqual(len(self.catalog.get_namespace('US')), 4)
+        with self.assertRaises(ConnectionError):
+            self.catalog.get_namespace('LSE')
+
+
+if __name__ == '__main__':
+    unittest.main()
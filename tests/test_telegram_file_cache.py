@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Тесты для повторного использования Telegram file_id
+"""
+
+import sys
+import os
+import unittest
+from types import SimpleNamespace
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.telegram_file_cache import TelegramFileIdCache
+
+
+def _message(*file_ids):
+    """Имитация telegram.Message с набором PhotoSize"""
+    return SimpleNamespace(photo=[SimpleNamespace(file_id=file_id) for file_id in file_ids])
+
+
+class TestTelegramFileIdCache(unittest.TestCase):
+    """Тесты для TelegramFileIdCache"""
+
+    def test_remember_largest_photo_size(self):
+        """Сохраняется file_id самого большого размера фото"""
+        cache = TelegramFileIdCache()
+        self.assertIsNone(cache.get(b'chart'))
+
+        cache.remember(b'chart', _message('small', 'medium', 'large'))
+
+        self.assertEqual(cache.get(b'chart'), 'large')
+        self.assertIsNone(cache.get(b'other chart'))
+
+    def test_message_without_photo_is_ignored(self):
+        """Сообщение без фото не сохраняется"""
+        cache = TelegramFileIdCache()
+        self.assertIsNone(cache.remember(b'chart', True))
+        self.assertIsNone(cache.get(b'chart'))
+
+    def test_forget_and_eviction(self):
+        """Удаление отклоненного file_id и вытеснение старых записей"""
+        cache = TelegramFileIdCache(max_items=1)
+        cache.remember(b'a', _message('id-a'))
+        cache.remember(b'b', _message('id-b'))
+        self.assertIsNone(cache.get(b'a'))
+
+        cache.forget(b'b')
+        self.assertIsNone(cache.get(b'b'))
+
+
+if __name__ == '__main__':
+    unittest.main()
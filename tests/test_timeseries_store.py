@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Тесты для локального хранилища временных рядов
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+import importlib.util
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HAS_PANDAS = importlib.util.find_spec('pandas') is not None
+
+
+@unittest.skipUnless(HAS_PANDAS, 'pandas is not installed')
+class TestTimeSeriesStore(unittest.TestCase):
+    """Тесты для TimeSeriesStore"""
+
+    def setUp(self):
+        import pandas as pd
+        self.pd = pd
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history = pd.Series(
+            [1.0, 2.0, 3.0, 4.0],
+            index=pd.period_range('2024-01', periods=4, freq='M'),
+            name='SPY.US'
+        )
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _fetcher(self, symbol, kind, first_date):
+        self.calls.append(first_date)
+        if first_date is None:
+            return self.history
+        return self.history[self.history.index >= self.pd.Period(first_date, freq='M')]
+
+    def _store(self, refresh_interval=3600):
+        from services.timeseries_store import TimeSeriesStore
+        return TimeSeriesStore(self.tmp.name, refresh_interval=refresh_interval, fetcher=self._fetcher)
+
+    def test_full_download_then_disk(self):
+        """Первый запрос скачивает историю, следующий экземпляр читает с диска"""
+        series = self._store().get_series('SPY.US', 'close_monthly')
+        self.assertEqual(list(series), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(self.calls, [None])
+
+        series = self._store().get_series('SPY.US', 'close_monthly')
+        self.assertEqual(list(series), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(self.calls, [None])
+
+    def test_incremental_tail_refresh(self):
+        """При обновлении скачивается только хвост с последней сохранённой даты"""
+        self._store(refresh_interval=0).get_series('SPY.US', 'close_monthly')
+
+        # Последний месяц пересчитан, добавлен новый
+        self.history = self.pd.Series(
+            [1.0, 2.0, 3.0, 4.5, 5.0],
+            index=self.pd.period_range('2024-01', periods=5, freq='M'),
+            name='SPY.US'
+        )
+        store = self._store(refresh_interval=0)
+        series = store.get_series('SPY.US', 'close_monthly')
+
+        self.assertEqual(self.calls, [None, '2024-04-01'])
+        self.assertEqual(list(series), [1.0, 2.0, 3.0, 4.5, 5.0])
+        self.assertEqual(str(series.index[-1]), '2024-05')
+        self.assertEqual(store.get_stats()['tail_downloads'], 1)
+
+    def test_adjusted_tail_refresh_checks_overlap(self):
+        """Хвост скорректированных цен скачивается с перекрытием сохранённых периодов"""
+        self._store(refresh_interval=0).get_series('SPY.US', 'adj_close')
+
+        self.history = self.pd.Series(
+            [1.0, 2.0, 3.0, 4.5, 5.0],
+            index=self.pd.period_range('2024-01', periods=5, freq='M'),
+            name='SPY.US'
+        )
+        store = self._store(refresh_interval=0)
+        series = store.get_series('SPY.US', 'adj_close')
+
+        self.assertEqual(self.calls, [None, '2024-01-01'])
+        self.assertEqual(list(series), [1.0, 2.0, 3.0, 4.5, 5.0])
+        self.assertEqual(store.get_stats()['full_downloads'], 0)
+
+    def test_rescaled_adjusted_history_is_downloaded_again(self):
+        """После дивиденда или сплита вся история скорректированных цен скачивается заново"""
+        self.history = self.pd.Series(
+            [float(i) for i in range(1, 7)],
+            index=self.pd.period_range('2024-01', periods=6, freq='M'),
+            name='SPY.US'
+        )
+        self._store(refresh_interval=0).get_series('SPY.US', 'adj_close')
+
+        # Дивиденд: вся история пересчитана с коэффициентом 0.9
+        self.history = self.pd.Series(
+            [float(i) * 0.9 for i in range(1, 7)] + [7.0],
+            index=self.pd.period_range('2024-01', periods=7, freq='M'),
+            name='SPY.US'
+        )
+        store = self._store(refresh_interval=0)
+        series = store.get_series('SPY.US', 'adj_close')
+
+        self.assertEqual(self.calls, [None, '2024-03-01', None])
+        self.assertEqual(list(series), list(self.history))
+        stats = store.get_stats()
+        self.assertEqual(stats['tail_downloads'], 1)
+        self.assertEqual(stats['full_downloads'], 1)
+
+    def test_stored_series_served_when_refresh_fails(self):
+        """Если обновление не удалось, отдаются сохранённые данные"""
+        self._store(refresh_interval=0).get_series('SPY.US', 'close_monthly')
+
+        def failing_fetcher(symbol, kind, first_date):
+            raise ConnectionError('502 Bad Gateway')
+
+        from services.timeseries_store import TimeSeriesStore
+        store = TimeSeriesStore(self.tmp.name, refresh_interval=0, fetcher=failing_fetcher)
+        series = store.get_series('SPY.US', 'close_monthly')
+        self.assertEqual(list(series), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(store.get_stats()['stale_reads'], 1)
+
+    def test_unsupported_kind(self):
+        """Неизвестный вид ряда отклоняется"""
+        with self.assertRaises(ValueError):
+            self._store().get_series('SPY.US', 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
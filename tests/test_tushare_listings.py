@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Тесты для кэша списков бирж Tushare
+"""
+
+import sys
+import os
+import logging
+import threading
+import unittest
+
+import pandas as pd
+
+# Добавляем корневую директорию проекта в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from services.tushare_service import TushareService
+except ImportError:
+    TushareService = None
+
+from services.search_cache import search_cache
+
+
+MAINLAND = pd.DataFrame({
+    'ts_code': ['600000.SH', '600036.SH', '000001.SZ', '430047.BJ'],
+    'symbol': ['600000', '600036', '000001', '430047'],
+    'name': ['浦发银行', '招商银行', '平安银行', '诺思兰德'],
+    'enname': ['Shanghai Pudong Development Bank', None, 'Ping An Bank', 'Nuoss Lande'],
+    'area': ['上海', '深圳', '深圳', '北京'],
+    'industry': ['银行', '银行', '银行', '生物制药'],
+    'list_date': ['19991110', '20020409', '19910403', '20201127'],
+})
+
+HONG_KONG = pd.DataFrame({
+    'ts_code': ['00700.HK', '00005.HK'],
+    'name': ['腾讯控股', '汇丰控股'],
+    'enname': ['Tencent Holdings', ' '],
+    'list_date': ['20040616', '19910718'],
+})
+
+
+class FakePro:
+    """Клиент Tushare с записью вызовов"""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def stock_basic(self, **kwargs):
+        self.calls.append('stock_basic')
+        if self.fail:
+            raise ConnectionError("tushare down")
+        return MAINLAND.copy()
+
+    def hk_basic(self, **kwargs):
+        self.calls.append('hk_basic')
+        return HONG_KONG.copy()
+
+
+@unittest.skipIf(TushareService is None, "tushare is not installed")
+class TestTushareListings(unittest.TestCase):
+    """Тесты для списков бирж TushareService"""
+
+    def setUp(self):
+        search_cache.clear()
+        self.service = TushareService.__new__(TushareService)
+        self.service.pro = FakePro()
+        self.service.logger = logging.getLogger('test')
+        self.service._listings = {}
+        self.service._exchange_frames = {}
+        self.service._listing_lock = threading.Lock()
+        self.service._listing_load_lock = threading.Lock()
+
+    def test_mainland_exchanges_share_one_download(self):
+        """SSE, SZSE и BSE берутся из одного списка, повторные запросы не скачивают его"""
+        self.assertEqual(self.service.get_exchange_symbols_count('SSE'), 1)
+        self.assertEqual(self.service.get_exchange_symbols_count('SZSE'), 1)
+        self.assertEqual(self.service.get_exchange_symbols('BSE'), [
+            {'symbol': '430047.BJ', 'name': 'Nuoss Lande', 'currency': 'CNY', 'list_date': '20201127'}
+        ])
+        self.service.get_exchange_symbols_page('SSE', 0)
+        self.service.get_exchange_symbols_full('SZSE')
+        self.assertEqual(self.service.pro.calls, ['stock_basic'])
+
+    def test_only_english_names_are_listed(self):
+        """В списке только символы с английскими названиями"""
+        self.assertEqual(self.service.get_exchange_symbols_full('HKEX'), [
+            {'symbol': '00700.HK', 'name': 'Tencent Holdings', 'currency': 'HKD', 'list_date': '20040616'}
+        ])
+        self.assertIs(self.service.get_exchange_listing('HKEX'), self.service.get_exchange_listing('HKEX'))
+        self.assertEqual(self.service.get_exchange_symbols_page('SSE', 1, per_page=1), [])
+
+    def test_searches_use_cached_listing(self):
+        """Поиск идет по кэшированному списку с английскими названиями"""
+        results = self.service.search_symbols_english('bank')
+        self.assertEqual([r['symbol'] for r in results], ['600000.SH', '000001.SZ'])
+        self.assertEqual(results[1]['exchange'], 'SZ')
+
+        self.assertEqual(self.service.search_symbols('银行')[1]['name'], '招商银行')
+        self.assertEqual(self.service.search_symbols('00700', 'HKEX')[0]['symbol'], '00700.HK')
+        self.assertEqual(self.service.search_symbols_english('600036')[0]['name'], '招商银行')
+        self.assertEqual(self.service.pro.calls, ['stock_basic', 'hk_basic'])
+
+    def test_failed_refresh_keeps_listing(self):
+        """Ошибка обновления сохраняет предыдущий список"""
+        self.assertEqual(self.service.refresh_listings(), {'CN': True, 'HKEX': True})
+        self.service.pro.fail = True
+        self.assertEqual(self.service.refresh_listings(force=True), {'CN': True, 'HKEX': True})
+        self.assertEqual(self.service.get_exchange_symbols_count('SSE'), 1)
+
+    def test_download_errors_are_reported(self):
+        """Ошибка загрузки без сохраненного списка передается вызывающему"""
+        self.service.pro.fail = True
+        with self.assertRaises(Exception):
+            self.service.get_exchange_symbols('SSE')
+        self.assertEqual(self.service.get_exchange_symbols_count('SSE'), 0)
+        self.assertEqual(self.service.search_symbols('bank'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()